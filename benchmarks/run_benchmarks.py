@@ -0,0 +1,178 @@
+"""
+Throughput benchmarks for the client, service and pipeline layers.
+
+Runs every layer against the local mock server in tests/mock_server.py and
+reports requests/s, p50/p99 request latency and peak traced memory. Results
+are compared with benchmarks/baseline.json to catch regressions.
+
+Usage:
+    uv run python benchmarks/run_benchmarks.py                  # run and compare
+    uv run python benchmarks/run_benchmarks.py --update-baseline
+    uv run python benchmarks/run_benchmarks.py --layers client --latency 0.01
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+from tests.mock_server import MockApiServer, RepoFixture  # noqa: E402
+
+BASELINE_FILE = ROOT / "benchmarks" / "baseline.json"
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+class RequestTimer:
+    """Wraps requests.get to record the latency of every HTTP request."""
+
+    def __init__(self):
+        import requests
+        self._get = requests.get
+        self.latencies: List[float] = []
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._get(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+def _measure(name: str, fn: Callable[[], None]) -> Dict[str, float]:
+    timer = RequestTimer()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with patch("requests.get", timer):
+        fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(timer.latencies)
+    return {
+        "requests": count,
+        "seconds": round(elapsed, 4),
+        "requests_per_s": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(timer.latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(timer.latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(timer.latencies) * 1000, 3) if count else 0.0,
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+def bench_client(repos: List, rounds: int) -> Callable[[], None]:
+    from repo_radar.api.github_client import GitHubClient
+
+    def run():
+        async def crawl():
+            client = GitHubClient("bench-token")
+            for _ in range(rounds):
+                await asyncio.gather(*(client.get_commits(r) for r in repos))
+        asyncio.run(crawl())
+    return run
+
+def bench_service(repos: List, rounds: int) -> Callable[[], None]:
+    from repo_radar.services.github_service import GitHubService
+
+    def run():
+        svc = GitHubService("bench-token")
+        for _ in range(rounds):
+            for r in repos:
+                svc.get_languages(r)
+    return run
+
+def bench_pipeline(repos: List, rounds: int) -> Callable[[], None]:
+    import main
+    from repo_radar.services.github_service import GitHubService
+    from repo_radar.services.lang_analytics import to_percentages
+
+    def run():
+        svc = GitHubService("bench-token")
+        for _ in range(rounds):
+            result = svc.collect_repo_metrics([r.repo_path() for r in repos])
+            lang_pairs = to_percentages(result.languages)
+            main.metrics_text_from_sources(repos, lang_pairs, recent_commits=result.recent_commits)
+    return run
+
+LAYERS = {"client": bench_client, "service": bench_service, "pipeline": bench_pipeline}
+
+def run_benchmarks(layers: List[str], repo_count: int, rounds: int, latency: float) -> Dict[str, Dict[str, float]]:
+    fixture = RepoFixture(commits=1000, issues=300, pulls=100)
+    with MockApiServer(latency=latency, default_fixture=fixture, rate_limit=1_000_000) as server:
+        os.environ.update({
+            "GITHUB_API_URL": server.github_url,
+            "GITHUB_TOKEN": "bench-token",
+            "SENTRY_API_BASE": server.sentry_url,
+            "SENTRY_AUTH_TOKEN": "bench-token",
+            "SENTRY_ORG_SLUG": "bench",
+            "SENTRY_PROJECT_SLUG": "bench",
+            "SENTRY_PROJECT_ID": "4242",
+        })
+        os.environ.pop("SENTRY_DSN", None)
+        os.environ.pop("OPENROUTER_API_KEY", None)
+
+        from repo_radar.models.github_url import GitHubUrl
+        repos = [GitHubUrl(full_url="", org_user="bench", repo=f"repo{i}") for i in range(repo_count)]
+        return {layer: _measure(layer, LAYERS[layer](repos, rounds)) for layer in layers}
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Return a description of every metric that regressed beyond tolerance."""
+    regressions = []
+    for layer, current in results.items():
+        base = baseline.get(layer)
+        if not base:
+            continue
+        if current["requests_per_s"] < base["requests_per_s"] * (1 - tolerance):
+            regressions.append(f"{layer}: requests/s {current['requests_per_s']} < baseline {base['requests_per_s']}")
+        for key in ("p99_ms", "peak_mem_kb"):
+            if current[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{layer}: {key} {current[key]} > baseline {base[key]}")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", nargs="+", choices=sorted(LAYERS), default=list(LAYERS))
+    parser.add_argument("--repos", type=int, default=5, help="Number of mock repositories")
+    parser.add_argument("--rounds", type=int, default=3, help="Repetitions per layer")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency per request (s)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write results to {BASELINE_FILE.name}")
+    parser.add_argument("--json", type=pathlib.Path, help="Also write results to this file")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    results = run_benchmarks(args.layers, args.repos, args.rounds, args.latency)
+
+    print(f"{'layer':<10}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>12}")
+    for layer, r in results.items():
+        print(f"{layer:<10}{r['requests']:>10}{r['requests_per_s']:>10}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['peak_mem_kb']:>12}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.update_baseline:
+        BASELINE_FILE.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"✓ Baseline updated: {BASELINE_FILE}")
+        return 0
+    if not BASELINE_FILE.exists():
+        print("⚠ No baseline found. Run with --update-baseline to create one.")
+        return 0
+
+    regressions = compare(results, json.loads(BASELINE_FILE.read_text()), args.tolerance)
+    for r in regressions:
+        print(f"✗ Regression: {r}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
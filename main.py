@@ -1,4 +1,5 @@
-import sys, pathlib, os
+import sys, pathlib, os, argparse, contextlib, time
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(str(pathlib.Path(__file__).resolve().parent / "src"))
 
 from dotenv import load_dotenv
@@ -18,38 +19,186 @@ from repo_radar.services.sentry_service import (
 
 from typing import List
 from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.run_snapshot import RunSnapshot
+from repo_radar.services.cycle_time import cycle_time_metrics
 from repo_radar.services.github_service import GitHubService
-from repo_radar.services.lang_analytics import merge_language_maps, to_percentages
+from repo_radar.services.lang_analytics import to_percentages
+from repo_radar.utils.github_parsers import parse_repo_ref
+from repo_radar.services.vulnerability_index import VulnerabilityIndex, severity_counts
+from repo_radar.services.repo_state import RepoStateStore
+from repo_radar.services.run_history import RunHistory
+from repo_radar.services.sharded_runner import collect_sharded
+from repo_radar.services.report_server import ReportServer
+from repo_radar.services.webhooks import WebhookServer
+from repo_radar.config import ACTIVITY_WINDOW, OSV_INDEX_PATH, REPO_STATE_PATH, REPORT_RELOAD_INTERVAL, SHARD_WORKERS
 from repo_radar.reports.charts import save_language_bar_chart, save_line_chart  # <-- add save_line_chart
+from repo_radar.reports.html_report import ReportBuilder, overview_section, repo_section
 from repo_radar.llm.provider import summarize_state
+from repo_radar.api.transport import get_transport
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+from repo_radar.monitoring.profiling import PipelineProfiler
+from repo_radar.utils.priority_lanes import request_priority
 
 # --- config via .env (recommended) ---
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+# Optional extra tokens, one per worker process when sharding (--workers)
+GITHUB_TOKENS = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()] or [GITHUB_TOKEN]
+METRICS_FORMAT = os.getenv("REPO_RADAR_METRICS_FORMAT", "json")  # json | openmetrics | none
 
-def _repos_from_env() -> list[GitHubUrl]:
-    raw = os.getenv("GITHUB_REPOS", "")
-    parts = [p.strip() for p in raw.split(",") if p.strip()]
-    repos: list[GitHubUrl] = []
-    for p in parts:
-        if p.startswith("https://github.com/"):
-            p = p.replace("https://github.com/", "")
-        owner, name = p.split("/", 1)
-        repos.append(GitHubUrl(full_url="", org_user=owner, repo=name))
-    return repos
-
-REPOS = _repos_from_env()
-
-def collect_language_percentages(svc: GitHubService, repos: List[GitHubUrl]):
-    lang_maps = []
-    for r in repos:
-        langs = svc.get_languages(r)  # {"Python": 12345, ...}
-        lang_maps.append(langs)
-    merged = merge_language_maps(lang_maps)
-    return to_percentages(merged)     # [("Python", 55.2), ...]
-
-def metrics_text_from_sources(repos, lang_pairs):
+def _sources_from_env() -> list[str]:
+    """Repository sources from GITHUB_REPOS: 'owner/repo', URLs, 'org:NAME', 'user:NAME' or 'file:PATH'."""
+    return [p.strip() for p in os.getenv("GITHUB_REPOS", "").split(",") if p.strip()]
+
+def collect_pipelined_metrics(svc: GitHubService, sources: List[str], skip_archived=False, skip_forks=False):
+    """Discover repos and collect languages and recent commits in overlapping pipeline stages."""
+    with INSTRUMENTATION.span("fetch.github", sources=len(sources)):
+        result = svc.collect_repo_metrics(sources, skip_archived, skip_forks)
+    for repo, error in result.errors.items():
+        print(f"⚠ Could not collect {repo}: {error}")
+    print(f"✓ Discovered {len(result.repos) + len(result.errors)} repositories")
+    repos = [parse_repo_ref(r) for r in result.repos]
+    return repos, to_percentages(result.languages), result
+
+def fetch_sentry_series():
+    """Sentry error and latency series of the last 30 days (best effort, empty on failure)."""
+    errs_series, p50_series = [], []
+    try:
+        with INSTRUMENTATION.span("fetch.sentry", series="errors"):
+            errs_series = error_timeseries_30d()
+        with INSTRUMENTATION.span("fetch.sentry", series="latency_p50"):
+            p50_series = latency_p50_timeseries_30d()
+    except Exception as e:
+        print(f"⚠ Could not fetch Sentry data: {e}")
+    return errs_series, p50_series
+
+def collect_sharded_metrics(svc: GitHubService, sources: List[str], workers: int, skip_archived=False, skip_forks=False):
+    """Discover repos, then collect languages and recent commits in worker processes."""
+    repos = svc.discover_repos(sources, skip_archived, skip_forks)
+    print(f"✓ Discovered {len(repos)} repositories, collecting in {workers} worker processes")
+    with INSTRUMENTATION.span("fetch.github", repos=len(repos), workers=workers):
+        result = collect_sharded(repos, GITHUB_TOKENS, workers)
+    for repo, error in result.errors.items():
+        print(f"⚠ Could not collect {repo}: {error}")
+    collected = set(result.repos)
+    with INSTRUMENTATION.span("aggregate"):
+        return [r for r in repos if r.repo_path() in collected], to_percentages(result.languages), result
+
+def collect_cve_counts(svc: GitHubService, repos: List[GitHubUrl]):
+    """Match every repo's dependencies against the local OSV index, if one was imported."""
+    if not OSV_INDEX_PATH.exists():
+        return None
+    with INSTRUMENTATION.span("fetch.dependencies", repos=len(repos)):
+        deps, errors = svc.collect_dependencies(repos)
+    for repo, error in errors.items():
+        print(f"⚠ Could not check dependencies of {repo}: {error}")
+    with INSTRUMENTATION.span("cve_match"), VulnerabilityIndex(OSV_INDEX_PATH) as index:
+        counts = severity_counts(index.match(deps))
+    counts["dependencies"] = len({(d.ecosystem, d.name, d.version) for d in deps})
+    return counts
+
+def collect_activity(svc: GitHubService, repos: List[GitHubUrl]):
+    """Issue and pull request activity of the last 30 days.
+
+    Repos whose webhook events in REPO_STATE_PATH cover the whole window are counted from them,
+    the others with search API counts.
+    """
+    store = activity = None
+    if REPO_STATE_PATH.exists():
+        store = RepoStateStore(REPO_STATE_PATH)
+    try:
+        with INSTRUMENTATION.span("fetch.counts", repos=len(repos)):
+            activity = svc.activity_counts(repos, store, time.time())
+    except Exception as e:
+        print(f"⚠ Issue and pull request counts failed: {e}")
+    for repo, error in (activity or {}).get("errors", {}).items():
+        print(f"⚠ Could not count issues and pull requests of {repo}: {error}")
+    return store, activity
+
+def collect_cycle_times(svc: GitHubService, repos: List[GitHubUrl]):
+    """Pull request cycle time percentiles of the last 30 days, from batched GraphQL queries."""
+    since = time.time() - ACTIVITY_WINDOW
+    try:
+        with INSTRUMENTATION.span("fetch.pull_timelines", repos=len(repos)):
+            timelines = svc.get_pull_timelines(repos, since)
+    except Exception as e:
+        print(f"⚠ Pull request timelines fetch failed: {e}")
+        return None
+    return cycle_time_metrics(timelines, since)
+
+def _hours(seconds):
+    return None if seconds is None else round(seconds / 3600, 1)
+
+# Labels of the run metrics shown in trend lines
+TREND_LABELS = {
+    "recent_commits": "commits", "issues_opened": "issues opened", "issues_closed": "issues closed",
+    "pulls_merged": "PRs merged", "merge_p50_hours": "median hours to merge", "high_cves": "high CVEs",
+}
+
+def run_snapshot(repos, lang_pairs, cve_counts=None, recent_commits=None, activity=None, series=None, cycle_times=None):
+    """Collect this run's metrics for the run history."""
+    activity = activity or {}
+    cycle_times = cycle_times or {}
+    return RunSnapshot(
+        created_at=time.time(),
+        repos=[r.repo_path() for r in repos],
+        metrics={
+            "repos": len(repos),
+            "recent_commits": recent_commits,
+            "issues_opened": activity.get("issues_opened"),
+            "issues_closed": activity.get("issues_closed"),
+            "pulls_opened": activity.get("pulls_opened"),
+            "pulls_merged": activity.get("pulls_merged"),
+            "merge_p50_hours": _hours(cycle_times.get("time_to_merge", {}).get("p50")),
+            "first_review_p50_hours": _hours(cycle_times.get("time_to_first_review", {}).get("p50")),
+            "high_cves": None if cve_counts is None else cve_counts["CRITICAL"] + cve_counts["HIGH"],
+        },
+        languages=dict(lang_pairs),
+        series={name: [(t.timestamp(), v) for t, v in points] for name, points in (series or {}).items()},
+    )
+
+def trend_lines(trends):
+    lines = []
+    for period, trend in trends.items():
+        changes = ", ".join(f"{label} {trend['metrics'][m]:+g}" for m, label in TREND_LABELS.items() if m in trend["metrics"])
+        since = time.strftime("%Y-%m-%d", time.gmtime(trend["since"]))
+        lines.append(f"Trend vs last {period} ({since}): {changes or 'no comparable metrics'}")
+    return lines
+
+def metrics_text_from_sources(repos, lang_pairs, cve_counts=None, recent_commits=None, activity=None, trends=None,
+                              cycle_times=None):
     top5 = lang_pairs[:5]
     lang_str = ", ".join(f"{k} {v:.1f}%" for k, v in top5) if top5 else "n/a"
+    commits_line = "n/a" if recent_commits is None else str(recent_commits)
+
+    opened_line = closed_line = backlog_line = pulls_line = "n/a"
+    if activity is not None:
+        since = ""
+        if activity["covered_since"] > time.time() - ACTIVITY_WINDOW:
+            since = f" (webhooks since {time.strftime('%Y-%m-%d', time.gmtime(activity['covered_since']))})"
+        opened_line = f"{activity['issues_opened']}{since}"
+        closed_line = f"{activity['issues_closed']}{since}"
+        backlog_line = f"{activity['issues_opened'] - activity['issues_closed']:+d}{since}"
+        pulls_line = f"{activity['pulls_opened']} opened, {activity['pulls_merged']} merged{since}"
+
+    cycle_line = "n/a"
+    if cycle_times is not None:
+        merge, review = cycle_times["time_to_merge"], cycle_times["time_to_first_review"]
+        parts = []
+        if merge["count"]:
+            parts.append(f"merge p50 {_hours(merge['p50'])}h / p90 {_hours(merge['p90'])}h ({merge['count']} merged)")
+        if review["count"]:
+            parts.append(f"first review p50 {_hours(review['p50'])}h / p90 {_hours(review['p90'])}h")
+        if cycle_times["reviews"]["count"]:
+            parts.append(f"median {cycle_times['reviews']['p50']:g} reviews per PR")
+        cycle_line = "; ".join(parts) or "no pull requests"
+
+    cve_line = "n/a (no OSV index, see README)"
+    if cve_counts is not None:
+        cve_line = (
+            f"{cve_counts['CRITICAL'] + cve_counts['HIGH']} "
+            f"(critical {cve_counts['CRITICAL']}, high {cve_counts['HIGH']}, medium {cve_counts['MEDIUM']}) "
+            f"across {cve_counts['dependencies']} dependencies"
+        )
 
     # Sentry metrics (best effort)
     err_line = "n/a"
@@ -69,77 +218,215 @@ def metrics_text_from_sources(repos, lang_pairs):
         "Window: last 30 days",
         f"Repos: {', '.join([r.repo_path() for r in repos])}",
         f"Top languages: {lang_str}",
-        "Issues opened: TBD",
-        "Issues closed: TBD",
-        "Backlog Δ: TBD",
-        "High CVEs: TBD",
+        f"Commits (last 4 weeks): {commits_line}",
+        f"Issues opened: {opened_line}",
+        f"Issues closed: {closed_line}",
+        f"Backlog Δ: {backlog_line}",
+        f"Pull requests: {pulls_line}",
+        f"PR cycle time: {cycle_line}",
+        f"High CVEs: {cve_line}",
         f"Sentry unresolved: {err_line}",
         f"Top Sentry errors: {top_errs_str}",
         "Perf: see charts for errors/latency p50",
+        *trend_lines(trends or {}),
     ])
 
 
-def write_simple_html(summary: str, charts: list[str], out_file="reports/report.html"):
-    p = pathlib.Path(out_file)
-    p.parent.mkdir(parents=True, exist_ok=True)
+def write_sectioned_html(builder: ReportBuilder, summary: str, metrics_text: str, charts: list, result):
+    """Write the overview and one section per repo, re-rendering only sections whose data changed."""
+    sections = (
+        [overview_section(summary, metrics_text, charts, builder.out_file.parent)]
+        + [repo_section(r, result.repo_languages[r], result.repo_commits.get(r)) for r in sorted(result.repo_languages)]
+    )
+    p = builder.build("Repo Radar — MVP Report", sections)
+    print(f"✓ HTML report: {p.resolve()} ({len(builder.rendered)} parts rendered, {len(builder.reused)} reused)")
+
+def write_instrumentation(fmt: str = METRICS_FORMAT, out_dir="reports"):
+    """Export stage timings and API usage collected during the run."""
+    if fmt == "none":
+        return
+    out = pathlib.Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    if fmt == "openmetrics":
+        p = out / "run_metrics.txt"
+        p.write_text(INSTRUMENTATION.to_openmetrics(), encoding="utf-8")
+    else:
+        p = out / "run_metrics.json"
+        p.write_text(INSTRUMENTATION.to_json(), encoding="utf-8")
+    print(f"✓ Run metrics: {p.resolve()}")
 
-    summary_html = summary.replace("\n", "<br>")
-    imgs_html = "\n".join(
-        f'<h2>{pathlib.Path(c).stem}</h2><img src="{pathlib.Path(c).as_posix()}" alt="{pathlib.Path(c).name}">'
-        for c in charts
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the Repo Radar report.")
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Run under cProfile + tracemalloc and write reports/profile.{json,txt,pstats}",
+    )
+    parser.add_argument("--org", action="append", default=[], help="Include every repository of an organization")
+    parser.add_argument("--user", action="append", default=[], help="Include every repository of a user")
+    parser.add_argument(
+        "--repos-file", action="append", default=[],
+        help="Read repository references from a file, one per line ('-' for stdin)",
+    )
+    parser.add_argument("--skip-archived", action="store_true", help="Leave out archived repositories")
+    parser.add_argument("--skip-forks", action="store_true", help="Leave out forks")
+    parser.add_argument(
+        "--workers", type=int, default=SHARD_WORKERS,
+        help="Collect repositories in this many worker processes (GITHUB_TOKENS spreads tokens over them)",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep repository data in REPO_STATE_PATH fresh continuously instead of building a report",
     )
+    parser.add_argument(
+        "--webhooks", action="store_true",
+        help="Receive GitHub webhooks on WEBHOOK_HOST:WEBHOOK_PORT and apply them to REPO_STATE_PATH",
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="Serve per-repo and per-org report pages of REPO_STATE_PATH on REPORT_SERVER_HOST:REPORT_SERVER_PORT",
+    )
+    args = parser.parse_args(argv)
+    args.sources = (
+        _sources_from_env()
+        + [f"org:{o}" for o in args.org]
+        + [f"user:{u}" for u in args.user]
+        + [f"file:{f}" for f in args.repos_file]
+    )
+    return args
 
-    html = f"""<!doctype html>
-<html><head><meta charset="utf-8"><title>Repo Radar Report</title>
-<style>body{{font-family:system-ui;margin:24px}} img{{max-width:700px; display:block; margin:8px 0}}</style>
-</head><body>
-<h1>Repo Radar — MVP Report</h1>
-<h2>LLM overview</h2>
-<p>{summary_html}</p>
-{imgs_html}
-</body></html>"""
-    p.write_text(html, encoding="utf-8")
-    print(f"✓ HTML report: {p.resolve()}")
-
-def main():
-    if not GITHUB_TOKEN:
+def main(argv=None):
+    args = parse_args(argv)
+    if (args.webhooks or args.serve) and not args.watch:
+        return run_servers(args.webhooks, args.serve)  # needs no token, only reconciliation calls the API
+    # REPO_RADAR_TRANSPORT=record|replay saves/reuses every API exchange (REPO_RADAR_CASSETTE)
+    transport = get_transport()
+    if not GITHUB_TOKEN and transport.mode != "replay":
         print("⚠ GITHUB_TOKEN not set. Put it in .env or env and re-run.")
         return
 
-    chart_paths: list[str] = []  # always initialize
+    if args.watch:
+        return run_watch(args.sources, args.skip_archived, args.skip_forks, args.webhooks, args.serve)
+
+    try:
+        profiler = PipelineProfiler("reports") if args.profile else contextlib.nullcontext()
+        # Report requests go in the 'report' lane, ahead of any backfill on the same token
+        with INSTRUMENTATION.transaction("repo-radar report"), profiler, request_priority("report"):
+            run_report(args.sources, args.skip_archived, args.skip_forks, args.workers)
+        write_instrumentation()
+        if args.profile:
+            print(f"✓ Profile: {pathlib.Path('reports/profile.txt').resolve()}")
+    finally:
+        transport.close()
+        if transport.mode == "record":
+            print(f"✓ Recorded cassette: {transport.cassette.path}")
+
+def start_servers(store: RepoStateStore, webhooks: bool, serve: bool, refresh=None, reload_interval=None):
+    """Start the webhook receiver and the report server on a shared store, as requested.
 
-    # 1) GitHub → languages → %
+    refresh, e.g. WatchScheduler.request_refresh, lets the report server refresh a repository on demand.
+    reload_interval makes the report server pick up what another process saved to the store's file.
+    """
+    servers = []
+    if webhooks:
+        servers.append(WebhookServer(store).start())
+        print(f"✓ Receiving webhooks on http://{servers[-1].address[0]}:{servers[-1].address[1]}/webhook")
+    if serve:
+        servers.append(ReportServer(store, refresh=refresh, reload_interval=reload_interval).start())
+        print(f"✓ Serving reports on http://{servers[-1].address[0]}:{servers[-1].address[1]}/")
+    return servers
+
+def run_watch(sources: List[str], skip_archived: bool = False, skip_forks: bool = False, webhooks: bool = False,
+              serve: bool = False):
     svc = GitHubService(GITHUB_TOKEN)
-    lang_pairs = collect_language_percentages(svc, REPOS)
+    repos = svc.discover_repos(sources, skip_archived, skip_forks)
+    store = RepoStateStore(REPO_STATE_PATH)
+    # On-demand refreshes share the watch client and go ahead of its backfill refreshes
+    scheduler = svc.watch_scheduler(repos, store)
+    servers = start_servers(store, webhooks, serve, refresh=scheduler.request_refresh)
+    print(f"✓ Watching {len(repos)} repositories (Ctrl+C to stop)")
+    try:
+        svc.watch(repos, store, scheduler=scheduler)
+    except KeyboardInterrupt:
+        print("✓ Watch stopped, state saved")
+    finally:
+        for server in servers:
+            server.stop()
+
+def run_servers(webhooks: bool = True, serve: bool = False):
+    # Without watch mode in this process, a separate watch run may be the one keeping REPO_STATE_PATH fresh
+    servers = start_servers(RepoStateStore(REPO_STATE_PATH), webhooks, serve, reload_interval=REPORT_RELOAD_INTERVAL)
+    print("  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("✓ Servers stopped" + (", state saved" if webhooks else ""))
+    finally:
+        for server in servers:
+            server.stop()
 
-    # 2) Save language chart
-    lang_chart = save_language_bar_chart(lang_pairs, "reports/languages.png")
-    chart_paths.append(str(lang_chart))
-    print(f"✓ Saved chart: {lang_chart}")
+def run_report(sources: List[str], skip_archived: bool = False, skip_forks: bool = False, workers: int = 1):
+    chart_paths: list[pathlib.Path] = []  # always initialize
+    builder = ReportBuilder("reports/report.html")
 
-    # 3) Sentry charts (best effort)
+    # 1) Discover repos → languages and recent commits, while Sentry series are fetched in the background
+    svc = GitHubService(GITHUB_TOKEN)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentry") as pool:
+        sentry_series = pool.submit(fetch_sentry_series)
+        if workers > 1:
+            repos, lang_pairs, result = collect_sharded_metrics(svc, sources, workers, skip_archived, skip_forks)
+        else:
+            repos, lang_pairs, result = collect_pipelined_metrics(svc, sources, skip_archived, skip_forks)
+        errs_series, p50_series = sentry_series.result()
+    recent_commits = result.recent_commits
+
+    # 2) Save language chart; charts whose data did not change since the last report are reused
+    with INSTRUMENTATION.span("chart", chart="languages"):
+        lang_chart = builder.chart("languages", lang_pairs, save_language_bar_chart)
+    chart_paths.append(lang_chart)
+    print(f"✓ Chart: {lang_chart}")
+
+    # 3) Sentry charts (best effort); matplotlib stays on the main thread
     try:
-        errs_series = error_timeseries_30d()
         if errs_series:
-            err_chart = save_line_chart(
-                errs_series, "Errors (last 30 days)", "Count", "reports/sentry_errors.png"
-            )
-            chart_paths.append(str(err_chart))
-            print(f"✓ Saved chart: {err_chart}")
+            with INSTRUMENTATION.span("chart", chart="sentry_errors"):
+                err_chart = builder.chart("sentry_errors", errs_series, lambda data, path: save_line_chart(
+                    data, "Errors (last 30 days)", "Count", path
+                ))
+            chart_paths.append(err_chart)
+            print(f"✓ Chart: {err_chart}")
 
-        p50_series = latency_p50_timeseries_30d()
         if p50_series:
-            lat_chart = save_line_chart(
-                p50_series, "Latency p50 (ms, 30d)", "ms", "reports/sentry_latency.png"
-            )
-            chart_paths.append(str(lat_chart))
-            print(f"✓ Saved chart: {lat_chart}")
+            with INSTRUMENTATION.span("chart", chart="sentry_latency"):
+                lat_chart = builder.chart("sentry_latency", p50_series, lambda data, path: save_line_chart(
+                    data, "Latency p50 (ms, 30d)", "ms", path
+                ))
+            chart_paths.append(lat_chart)
+            print(f"✓ Chart: {lat_chart}")
     except Exception as e:
-        print(f"⚠ Could not fetch Sentry data: {e}")
+        print(f"⚠ Could not chart Sentry data: {e}")
 
     # 4) Build metrics + LLM summary
-    metrics_text = metrics_text_from_sources(REPOS, lang_pairs)
-    summary = summarize_state(metrics_text)
+    try:
+        cve_counts = collect_cve_counts(svc, repos)
+    except Exception as e:
+        cve_counts = None
+        print(f"⚠ CVE check failed: {e}")
+    store, activity = collect_activity(svc, repos)
+    cycle_times = collect_cycle_times(svc, repos)
+    history = RunHistory()
+    with INSTRUMENTATION.span("history"):
+        snapshot = run_snapshot(
+            repos, lang_pairs, cve_counts, recent_commits, activity,
+            {"sentry_errors": errs_series, "sentry_latency_p50": p50_series}, cycle_times,
+        )
+        trends = history.deltas(snapshot)
+    with INSTRUMENTATION.span("metrics"):
+        metrics_text = metrics_text_from_sources(
+            repos, lang_pairs, cve_counts, recent_commits, activity, trends, cycle_times,
+        )
+    with INSTRUMENTATION.span("llm"):
+        summary = summarize_state(metrics_text)
 
     # 5) CLI output + simple HTML
     print("\n=== Metrics ===")
@@ -147,7 +434,15 @@ def main():
     print("\n=== LLM Summary ===")
     print(summary)
 
-    write_simple_html(summary, chart_paths)
+    with INSTRUMENTATION.span("render"):
+        write_sectioned_html(builder, summary, metrics_text, chart_paths, result)
+    print(f"✓ Run snapshot: {history.record(snapshot).resolve()}")
+    if store is not None:
+        changed = store.dirty()
+        if changed:
+            print(f"✓ Rendered changes of {len(changed)} repositories since the last report")
+        store.mark_clean(changed)
+        store.save_if_changed()
 
 if __name__ == "__main__":
     main()
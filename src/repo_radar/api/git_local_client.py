@@ -0,0 +1,583 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from asyncio.subprocess import DEVNULL, PIPE
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Union
+from requests import Response
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.api.transport import build_response
+from repo_radar.config import (
+    GIT_FETCH_MIN_INTERVAL, GIT_MIRROR_DIR, GIT_REMOTE_TEMPLATE, GITHUB_MAX_PAGINATED, GITUB_DEFAULT_DELTA,
+)
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+from repo_radar.utils.languages import language_for
+
+# Field and record separators for 'git log' output; neither can appear in names, emails or dates
+_FS = "\x1f"
+_RS = "\x1e"
+_LOG_FORMAT = _FS.join(["%H", "%P", "%an", "%ae", "%at", "%cn", "%ce", "%ct", "%B"]) + _RS
+
+_LICENSE_NAMES = ("license", "licence", "copying", "unlicense")
+# (phrases that must all appear, key, SPDX id, name); first match wins
+_LICENSE_MARKERS = (
+    (("GNU AFFERO GENERAL PUBLIC LICENSE",), "agpl-3.0", "AGPL-3.0", "GNU Affero General Public License v3.0"),
+    (("GNU LESSER GENERAL PUBLIC LICENSE",), "lgpl-3.0", "LGPL-3.0", "GNU Lesser General Public License v3.0"),
+    (("GNU GENERAL PUBLIC LICENSE", "VERSION 3"), "gpl-3.0", "GPL-3.0", "GNU General Public License v3.0"),
+    (("GNU GENERAL PUBLIC LICENSE", "VERSION 2"), "gpl-2.0", "GPL-2.0", "GNU General Public License v2.0"),
+    (("APACHE LICENSE", "VERSION 2.0"), "apache-2.0", "Apache-2.0", "Apache License 2.0"),
+    (("MOZILLA PUBLIC LICENSE", "2.0"), "mpl-2.0", "MPL-2.0", "Mozilla Public License 2.0"),
+    (("PERMISSION IS HEREBY GRANTED, FREE OF CHARGE",), "mit", "MIT", "MIT License"),
+    (("NEITHER THE NAME",), "bsd-3-clause", "BSD-3-Clause", 'BSD 3-Clause "New" or "Revised" License'),
+    (("REDISTRIBUTION AND USE IN SOURCE AND BINARY FORMS",), "bsd-2-clause", "BSD-2-Clause", 'BSD 2-Clause "Simplified" License'),
+    (("PERMISSION TO USE, COPY, MODIFY, AND/OR DISTRIBUTE",), "isc", "ISC", "ISC License"),
+    (("THIS IS FREE AND UNENCUMBERED SOFTWARE",), "unlicense", "Unlicense", "The Unlicense"),
+)
+
+class GitCommandError(RuntimeError):
+    """Raised when a git subprocess exits with a non-zero status."""
+
+def _iso(timestamp: str) -> str:
+    """Format a unix timestamp the way the GitHub API formats dates."""
+    return datetime.fromtimestamp(int(timestamp), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _json_response(url: str, payload, status: int = 200) -> Response:
+    return build_response(status, {"Content-Type": "application/json"}, json.dumps(payload).encode(), url)
+
+def _pages(url: str, items: List[dict]) -> List[Response]:
+    """Split a collection into GITHUB_MAX_PAGINATED sized pages, like the REST API returns it."""
+    if not items:
+        return [_json_response(url, [])]
+    return [_json_response(url, items[i:i + GITHUB_MAX_PAGINATED]) for i in range(0, len(items), GITHUB_MAX_PAGINATED)]
+
+def detect_license(text: str) -> Optional[Dict[str, str]]:
+    """Identify a license text, returning GitHub's {'key', 'spdx_id', 'name'} shape or None."""
+    upper = " ".join(text.upper().split())
+    for phrases, key, spdx_id, name in _LICENSE_MARKERS:
+        if all(p in upper for p in phrases):
+            return {"key": key, "spdx_id": spdx_id, "name": name}
+    return None
+
+class LocalGitClient(AbstractGitHubApiClient):
+    """
+    GitHub client backed by local, blobless git mirrors instead of the REST API.
+
+    Each repository is kept as a bare partial clone (--filter=blob:none) under
+    mirror_dir and updated with an incremental 'git fetch'. Commits,
+    contributors, branches, comparisons and trees come from the local object
+    database, so deep history costs no API budget. Language statistics need
+    blob sizes, so the blobs of the default branch head are fetched once, in a
+    single batch; later runs only download blobs that changed.
+
+    Responses are synthesised in the shape of the corresponding REST endpoint
+    (one Response per page of GITHUB_MAX_PAGINATED items), so callers can use
+    this client wherever GitHubClient is used. Contributors are git
+    identities rather than GitHub accounts and are reported like the API's
+    anonymous contributors (name, email, no login).
+
+    Issues and pull requests do not exist in git; they are delegated to the
+    fallback client if one is given.
+
+    Args:
+        - token (str): GitHub token, sent as an HTTP header to https remotes. Never written to disk.
+        - mirror_dir (Path): Directory holding the mirrors, one '<org_user>/<repo>.git' each.
+        - remote_template (str): Clone URL with a '{repo_path}' placeholder. Any git URL works,
+          including file:// paths of local repositories.
+        - fetch_interval (int): Seconds after a fetch during which a mirror is not fetched again.
+        - fallback (AbstractGitHubApiClient, optional): Client used for issues and pull requests.
+        - clock (Callable[[], float]): Current unix time, compared with the time of the last fetch.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        mirror_dir: Path = GIT_MIRROR_DIR,
+        remote_template: str = GIT_REMOTE_TEMPLATE,
+        fetch_interval: int = GIT_FETCH_MIN_INTERVAL,
+        fallback: Optional[AbstractGitHubApiClient] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(token)
+        self.mirror_dir = Path(mirror_dir)
+        self.remote_template = remote_template
+        self.fetch_interval = fetch_interval
+        self.fallback = fallback
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._locks: Dict[Path, asyncio.Lock] = {}
+        self._fetched_at: Dict[Path, float] = {}
+
+    def remote_url(self, url: GitHubUrl) -> str:
+        """Return the clone URL of a repository."""
+        return self.remote_template.format(repo_path=url.repo_path())
+
+    def mirror_path(self, url: GitHubUrl) -> Path:
+        """Return the local mirror directory of a repository."""
+        return self.mirror_dir / url.org_user / f"{url.repo}.git"
+
+    def _env(self, remote: str) -> Dict[str, str]:
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        token = self.token.token_string
+        if token and remote.startswith("https://"):
+            # Passed as config through the environment so it never lands in the mirror's config file
+            credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+            env.update(
+                GIT_CONFIG_COUNT="1",
+                GIT_CONFIG_KEY_0="http.extraHeader",
+                GIT_CONFIG_VALUE_0=f"Authorization: Basic {credentials}",
+            )
+        return env
+
+    async def _git(self, url: GitHubUrl, *args: str, stdin: Optional[bytes] = None, bare: bool = True) -> bytes:
+        """
+        Run a git command against a repository's mirror.
+
+        Args:
+            - url (GitHubUrl): Repository whose mirror the command runs in.
+            - *args (str): git arguments, e.g. ('log', '--format=%H').
+            - stdin (bytes, optional): Data written to the command's standard input.
+            - bare (bool): Pass --git-dir of the mirror. False for commands that create it.
+
+        Returns:
+            - bytes: The command's standard output.
+
+        Raises:
+            - GitCommandError: If git exits with a non-zero status.
+        """
+        cmd = ["git"] + (["--git-dir", str(self.mirror_path(url))] if bare else []) + list(args)
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=PIPE if stdin is not None else DEVNULL,
+            stdout=PIPE,
+            stderr=PIPE,
+            env=self._env(self.remote_url(url)),
+        )
+        out, err = await process.communicate(stdin)
+        if process.returncode != 0:
+            raise GitCommandError(
+                f"git {args[0]} failed for {url.repo_path()} ({process.returncode}): "
+                f"{err.decode(errors='replace').strip()}"
+            )
+        return out
+
+    def _is_fresh(self, path: Path) -> bool:
+        fetched_at = self._fetched_at.get(path)
+        if fetched_at is None:
+            # Mirrors fetched by an earlier run are as fresh as their last fetch on disk
+            stamp = path / "FETCH_HEAD"
+            if not stamp.exists():
+                stamp = path / "HEAD"  # never fetched since the clone
+            if not stamp.exists():
+                return False
+            fetched_at = self._fetched_at[path] = stamp.stat().st_mtime
+        return self.clock() - fetched_at < self.fetch_interval
+
+    async def sync(self, url: GitHubUrl) -> Path:
+        """
+        Create or update the mirror of a repository, at most once per fetch interval.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - Path: The mirror directory.
+
+        Raises:
+            - GitCommandError: If the clone or fetch fails.
+        """
+        path = self.mirror_path(url)
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            if self._is_fresh(path):
+                return path
+            with INSTRUMENTATION.span("git.sync", repo=url.repo_path()):
+                if not (path / "HEAD").exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    await self._git(
+                        url, "clone", "--bare", "--filter=blob:none", "--no-tags",
+                        self.remote_url(url), str(path), bare=False,
+                    )
+                    # A bare clone has no fetch refspec; only branches are mirrored, not pull refs
+                    await self._git(url, "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+                else:
+                    await self._git(url, "fetch", "--prune", "--no-tags", "origin")
+            self._fetched_at[path] = self.clock()
+        return path
+
+    async def _ls_tree(self, url: GitHubUrl, ref: str, recursive: bool) -> List[dict]:
+        args = ["ls-tree", "-z", "--full-tree"] + (["-r", "-t"] if recursive else []) + [ref]
+        entries = []
+        for record in (await self._git(url, *args)).decode("utf-8", errors="surrogateescape").split("\0"):
+            if not record:
+                continue
+            meta, path = record.split("\t", 1)
+            mode, kind, sha = meta.split()
+            entries.append({"path": path, "mode": mode, "type": kind, "sha": sha})
+        return entries
+
+    async def _prefetch_blobs(self, url: GitHubUrl, treeish: str, wanted: Iterable[str]) -> None:
+        """Download the wanted blobs missing from a partial mirror in one fetch instead of one per object."""
+        wanted = set(wanted)
+        listing = await self._git(url, "rev-list", "--objects", "--missing=print", f"{treeish}^{{tree}}")
+        missing = [
+            line[1:] for line in listing.decode().splitlines()
+            if line.startswith("?") and line[1:] in wanted
+        ]
+        if not missing:
+            return
+        self.logger.info(f"Fetching {len(missing)} blobs for {url.repo_path()}")
+        await self._git(
+            url, "-c", "fetch.negotiationAlgorithm=noop", "fetch", "origin", "--no-tags",
+            "--no-write-fetch-head", "--recurse-submodules=no", "--filter=blob:none", "--stdin",
+            stdin="\n".join(missing).encode(),
+        )
+
+    async def _blob_sizes(self, url: GitHubUrl, treeish: str, shas: Iterable[str]) -> Dict[str, int]:
+        shas = sorted(set(shas))
+        if not shas:
+            return {}
+        await self._prefetch_blobs(url, treeish, shas)
+        out = await self._git(
+            url, "cat-file", "--batch-check=%(objectname) %(objectsize)", stdin="\n".join(shas).encode()
+        )
+        sizes = {}
+        for line in out.decode().splitlines():
+            sha, size = line.split()
+            sizes[sha] = int(size)
+        return sizes
+
+    async def _default_branch(self, url: GitHubUrl) -> str:
+        return (await self._git(url, "symbolic-ref", "--short", "HEAD")).decode().strip()
+
+    async def _log(self, url: GitHubUrl, *revisions: str) -> List[dict]:
+        out = await self._git(url, "log", f"--format={_LOG_FORMAT}", *revisions)
+        commits = []
+        for record in out.decode("utf-8", errors="replace").split(_RS):
+            record = record.lstrip("\n")
+            if not record:
+                continue
+            sha, parents, an, ae, at, cn, ce, ct, message = record.split(_FS, 8)
+            commits.append({
+                "sha": sha,
+                "commit": {
+                    "author": {"name": an, "email": ae, "date": _iso(at)},
+                    "committer": {"name": cn, "email": ce, "date": _iso(ct)},
+                    "message": message.rstrip("\n"),
+                },
+                "parents": [{"sha": p} for p in parents.split()],
+                "author": None,
+                "committer": None,
+            })
+        return commits
+
+    async def get_repository(self, url: GitHubUrl) -> Response:
+        """
+        Get repository metadata derivable from git: names, default branch and last push.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - Response: Synthesised repository response.
+        """
+        await self.sync(url)
+        head = await self._log(url, "-1", "HEAD")
+        return _json_response(url.api_repo_path(), {
+            "name": url.repo,
+            "full_name": url.repo_path(),
+            "owner": {"login": url.org_user},
+            "html_url": url.full_url,
+            "clone_url": self.remote_url(url),
+            "default_branch": await self._default_branch(url),
+            "pushed_at": head[0]["commit"]["committer"]["date"] if head else None,
+        })
+
+    async def iter_owner_repos(self, owner: str, org: bool = True, skip_forks: bool = False) -> AsyncIterator[Response]:
+        """
+        List an owner's repositories through the fallback client; git has no notion of owners.
+
+        Raises:
+            - NotImplementedError: If no fallback client was given.
+        """
+        if self.fallback is None:
+            raise NotImplementedError("Repository listings need the API; pass a fallback client")
+        async for response in self.fallback.iter_owner_repos(owner, org, skip_forks):
+            yield response
+
+    async def get_languages(self, url: GitHubUrl) -> Response:
+        """
+        Get bytes of code per language at the default branch head, like GitHub's /languages.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - Response: Synthesised response mapping language to bytes, largest first.
+        """
+        await self.sync(url)
+        files = [
+            (entry["sha"], language)
+            for entry in await self._ls_tree(url, "HEAD", recursive=True)
+            if entry["type"] == "blob" and (language := language_for(entry["path"]))
+        ]
+        sizes = await self._blob_sizes(url, "HEAD", (sha for sha, _ in files))
+        totals: Dict[str, int] = {}
+        for sha, language in files:
+            totals[language] = totals.get(language, 0) + sizes.get(sha, 0)
+        ranked = dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+        return _json_response(url.api_languages_path(), ranked)
+
+    async def get_license(self, url: GitHubUrl) -> Response:
+        """
+        Get the license file at the root of the default branch.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - Response: Synthesised license response, or a 404 response if there is none.
+        """
+        await self.sync(url)
+        for entry in await self._ls_tree(url, "HEAD", recursive=False):
+            if entry["type"] != "blob" or not entry["path"].lower().startswith(_LICENSE_NAMES):
+                continue
+            content = await self._git(url, "cat-file", "blob", entry["sha"])
+            return _json_response(url.api_license_path(), {
+                "name": entry["path"],
+                "path": entry["path"],
+                "sha": entry["sha"],
+                "size": len(content),
+                "encoding": "base64",
+                "content": base64.b64encode(content).decode(),
+                "license": detect_license(content.decode("utf-8", errors="replace"))
+                or {"key": "other", "spdx_id": "NOASSERTION", "name": "Other"},
+            })
+        return _json_response(url.api_license_path(), {"message": "Not Found"}, status=404)
+
+    async def get_commits(self, url: GitHubUrl) -> List[Response]:
+        """
+        Get the full commit history of the default branch from the local mirror.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - List[Response]: Synthesised pages of commits, newest first.
+        """
+        await self.sync(url)
+        return _pages(url.api_commits_path(), await self._log(url, "HEAD"))
+
+    async def count_commits(self, url: GitHubUrl, since: Optional[int] = None) -> int:
+        """
+        Count the commits of the default branch in the local mirror, see GitHubClient.count_commits.
+        """
+        await self.sync(url)
+        since_arg = [f"--since=@{since}"] if since is not None else []
+        return int(await self._git(url, "rev-list", "--count", *since_arg, "HEAD"))
+
+    async def count_issues(self, url: Union[GitHubUrl, Sequence[GitHubUrl]], qualifiers: str = "") -> int:
+        """
+        Count issues through the fallback client, see GitHubClient.count_issues.
+
+        Raises:
+            - NotImplementedError: If no fallback client was given.
+        """
+        if self.fallback is None:
+            raise NotImplementedError("Issues are not stored in git; pass a fallback client")
+        return await self.fallback.count_issues(url, qualifiers)
+
+    async def count_pulls(self, url: Union[GitHubUrl, Sequence[GitHubUrl]], qualifiers: str = "") -> int:
+        """
+        Count pull requests through the fallback client, see GitHubClient.count_pulls.
+
+        Raises:
+            - NotImplementedError: If no fallback client was given.
+        """
+        if self.fallback is None:
+            raise NotImplementedError("Pull requests are not stored in git; pass a fallback client")
+        return await self.fallback.count_pulls(url, qualifiers)
+
+    async def graphql(self, query: str, variables: Optional[dict] = None) -> Response:
+        """
+        Run a GraphQL query through the fallback client.
+
+        Raises:
+            - NotImplementedError: If no fallback client was given.
+        """
+        if self.fallback is None:
+            raise NotImplementedError("GraphQL queries need the API; pass a fallback client")
+        return await self.fallback.graphql(query, variables)
+
+    async def get_issues(self, url: GitHubUrl) -> List[Response]:
+        """
+        Get the issues of a repository from the fallback client.
+
+        Raises:
+            - NotImplementedError: If no fallback client was given.
+        """
+        if self.fallback is None:
+            raise NotImplementedError("Issues are not stored in git; pass a fallback client")
+        return await self.fallback.get_issues(url)
+
+    async def get_pulls(self, url: GitHubUrl, from_issues: bool = False) -> List[Response]:
+        """
+        Get the pull requests of a repository from the fallback client, see GitHubClient.get_pulls.
+
+        Raises:
+            - NotImplementedError: If no fallback client was given.
+        """
+        if self.fallback is None:
+            raise NotImplementedError("Pull requests are not stored in git; pass a fallback client")
+        return await self.fallback.get_pulls(url, from_issues)
+
+    async def get_contributors(self, url: GitHubUrl) -> List[Response]:
+        """
+        Get commit authors of the default branch, most commits first.
+
+        Authors are git identities (after .mailmap), reported in the shape of
+        GitHub's anonymous contributors.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - List[Response]: Synthesised pages of contributors.
+        """
+        await self.sync(url)
+        out = await self._git(url, "shortlog", "-sne", "HEAD")
+        contributors = []
+        for line in out.decode("utf-8", errors="replace").splitlines():
+            count, identity = line.strip().split("\t", 1)
+            name, _, email = identity.rpartition(" <")
+            contributors.append({
+                "type": "Anonymous", "name": name, "email": email.rstrip(">"), "contributions": int(count),
+            })
+        return _pages(url.api_contributors_path(), contributors)
+
+    async def get_branches(self, url: GitHubUrl) -> List[Response]:
+        """
+        Get the branches of a repository as of the last fetch.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - List[Response]: Synthesised pages of branches, sorted by name.
+        """
+        await self.sync(url)
+        out = await self._git(url, "for-each-ref", "--format=%(refname:short)%00%(objectname)", "refs/heads")
+        branches = []
+        for line in out.decode().splitlines():
+            name, sha = line.split("\0")
+            branches.append({"name": name, "commit": {"sha": sha}})
+        return _pages(url.api_branch_path(), branches)
+
+    async def get_tree(self, url: GitHubUrl, ref: str = "HEAD", recursive: bool = True) -> Response:
+        """
+        Get the git tree of a branch, tag, commit or tree SHA. Never truncated.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - ref (str): Tree-ish to list. Defaults to the default branch.
+            - recursive (bool): Whether to include subdirectories.
+
+        Returns:
+            - Response: Synthesised tree response.
+        """
+        await self.sync(url)
+        sha = (await self._git(url, "rev-parse", f"{ref}^{{tree}}")).decode().strip()
+        return _json_response(url.api_tree_path(ref, recursive), {
+            "sha": sha,
+            "tree": await self._ls_tree(url, ref, recursive),
+            "truncated": False,
+        })
+
+    async def get_blob(self, url: GitHubUrl, sha: str) -> Response:
+        """
+        Get a git blob by SHA, downloading it into the mirror if needed.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - sha (str): Blob SHA from a tree entry.
+
+        Returns:
+            - Response: Synthesised blob response with base64 content.
+        """
+        await self.sync(url)
+        content = await self._git(url, "cat-file", "blob", sha)
+        return _json_response(url.api_blob_path(sha), {
+            "sha": sha,
+            "size": len(content),
+            "encoding": "base64",
+            "content": base64.b64encode(content).decode(),
+        })
+
+    async def get_stats(self, url: GitHubUrl, kind: str) -> Response:
+        """
+        Get repository statistics. Weekly commit activity is computed from the mirror;
+        the other kinds need line counts, which a blobless mirror cannot provide cheaply,
+        and are delegated to the fallback client.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - kind (str): 'commit_activity', 'contributors', 'code_frequency' or 'participation'.
+
+        Returns:
+            - Response: Synthesised or fallback statistics response.
+
+        Raises:
+            - NotImplementedError: For kinds other than commit_activity without a fallback client.
+        """
+        if kind != "commit_activity":
+            if self.fallback is None:
+                raise NotImplementedError(f"stats/{kind} needs the API; pass a fallback client")
+            return await self.fallback.get_stats(url, kind)
+
+        await self.sync(url)
+        # 52 weeks starting on Sunday 00:00 UTC, the current week last, like the API
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        first_week = int(today.timestamp()) - ((today.weekday() + 1) % 7) * 86400 - 51 * 604800
+        out = await self._git(url, "log", "--format=%ct", f"--since=@{first_week}", "HEAD")
+        weeks = [{"days": [0] * 7, "total": 0, "week": first_week + i * 604800} for i in range(52)]
+        for line in out.decode().split():
+            offset = int(line) - first_week
+            if 0 <= offset < 52 * 604800:
+                week = weeks[offset // 604800]
+                week["days"][offset % 604800 // 86400] += 1
+                week["total"] += 1
+        return _json_response(url.api_stats_path(kind), weeks)
+
+    async def compare_branch(
+        self, url: GitHubUrl, sha: str, delta: int = GITUB_DEFAULT_DELTA, base: Optional[str] = None
+    ) -> List[Response]:
+        """
+        Compare a base branch with a branch or commit, listing commits of the last delta days.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - sha (str): Branch name or SHA to compare.
+            - delta (int): Maximum number of days in the past to include commits.
+            - base (str, optional): Branch or SHA to compare against. Defaults to the default branch.
+
+        Returns:
+            - List[Response]: A single synthesised compare response.
+        """
+        await self.sync(url)
+        base = base or await self._default_branch(url)
+        counts = await self._git(url, "rev-list", "--left-right", "--count", f"{base}...{sha}")
+        behind, ahead = (int(n) for n in counts.split())
+        since = int(time.time()) - delta * 86400
+        commits = await self._log(url, f"--since=@{since}", "--reverse", f"{base}..{sha}")
+        status = "identical" if not ahead and not behind else "ahead" if not behind else "behind" if not ahead else "diverged"
+        return [_json_response(url.api_compare_path(sha, since, base), {
+            "status": status,
+            "ahead_by": ahead,
+            "behind_by": behind,
+            "total_commits": ahead,
+            "commits": commits,
+        })]
@@ -1,8 +1,8 @@
-import requests
 from requests import Response
 from requests.exceptions import HTTPError
 from repo_radar.config import GITHUB_API_USER_ENDPOINT, GITHUB_MAX_PAGINATED
 from repo_radar.models.github_token import GitHubToken
+from repo_radar.api.transport import get_transport
 from repo_radar.utils.github_parsers import get_next_paginated_url
 from typing import Optional, Tuple
 
@@ -18,7 +18,7 @@ def validate_github_token(token: GitHubToken) -> Response:
     Returns:
         - requests.Response: The HTTP response object.
     """
-    response = requests.get(f"{GITHUB_API_USER_ENDPOINT}", headers=token.to_header())
+    response = get_transport().get(f"{GITHUB_API_USER_ENDPOINT}", headers=token.to_header())
     try:
         response.raise_for_status()
     except HTTPError as err:
@@ -38,9 +38,25 @@ def get_github_url(token: GitHubToken, url: str) -> Response:
     Returns:
         - requests.Response: The HTTP response object.
     """
-    response = requests.get(url, headers=token.to_header())
+    response = get_transport().get(url, headers=token.to_header())
     return response
 
+def post_github_graphql(token: GitHubToken, url: str, body: dict) -> Response:
+    """
+    Send a GraphQL request to the GitHub API and return the response.
+
+    GraphQL reports query errors in the body's 'errors' list with status 200.
+
+    Args:
+        - token (GitHubToken): GitHub Token Dataclass Object
+        - url (str): GraphQL endpoint URL
+        - body (dict): {'query': ..., 'variables': {...}}
+
+    Returns:
+        - requests.Response: The HTTP response object.
+    """
+    return get_transport().request("POST", url, json_body=body, headers=token.to_header())
+
 def paginate_github_url(token: GitHubToken, url: str, per_page: int = GITHUB_MAX_PAGINATED) -> Tuple[Response, Optional[str]]:
     """
     Fetch from GitHub API url and return response with the next page URL if any.
@@ -64,6 +80,6 @@ def paginate_github_url(token: GitHubToken, url: str, per_page: int = GITHUB_MAX
     params = {
         "per_page": per_page
     }
-    response = requests.get(url, headers=token.to_header(), params=params)
+    response = get_transport().get(url, headers=token.to_header(), params=params)
     next_url = get_next_paginated_url(response)
     return response, next_url
\ No newline at end of file
@@ -1,16 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
 from repo_radar.models.github_token import GitHubToken
 from repo_radar.models.github_url import GitHubUrl
-from repo_radar.config import GITHUB_MAX_PAGINATED, MAX_RETRIES, GITUB_DEFAULT_DELTA
+from repo_radar.models.token_validation import TokenValidation
+from repo_radar.config import GITHUB_MAX_PAGINATED, GITHUB_RATE_LIMIT_PREFLIGHT, GITUB_DEFAULT_DELTA
 import repo_radar.api.github_api as github_api
-from repo_radar.utils.rate_limit_manager import RateLimitManager
+from repo_radar.api.transport import build_response
+from repo_radar.utils.adaptive_concurrency import AdaptiveConcurrency
+from repo_radar.utils.github_parsers import last_page_number, pull_from_issue
+from repo_radar.utils.priority_lanes import current_priority
+from repo_radar.utils.json_codec import decode_json
+from repo_radar.utils.rate_limit_manager import RateLimits
+from repo_radar.utils.retry_policy import RATE_LIMIT_REASONS, RetryPolicy
+from repo_radar.utils.single_flight import SingleFlight
+from repo_radar.utils.token_cache import TOKEN_VALIDATION_CACHE
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
 import asyncio
+import json
 from requests import Response
-from requests.exceptions import HTTPError
+from requests.exceptions import HTTPError, RequestException
 import logging
 import time
 
+def search_repos(url: Union[GitHubUrl, Sequence[GitHubUrl]]) -> str:
+    """Return the search qualifiers matching one or more repositories, e.g. 'repo:octo/a repo:octo/b'."""
+    urls = [url] if isinstance(url, GitHubUrl) else url
+    return " ".join(f"repo:{u.repo_path()}" for u in urls)
+
 class AbstractGitHubApiClient(ABC):
     """
     Abstract base class for GitHub API clients.
@@ -20,13 +36,46 @@ class AbstractGitHubApiClient(ABC):
     and contributors. Implementations must provide concrete methods that
     adhere to these signatures.
 
+    The token is not validated on construction. Validation happens lazily on
+    first use and is cached per token, see ensure_token_validated.
+
     Args:
         - token (str): GitHub personal access token used for authentication.
     """
 
     def __init__(self, token: str):
         self.token = GitHubToken(token)
-        github_api.validate_github_token(self.token)
+        self.token_validation: Optional[TokenValidation] = None
+
+    async def ensure_token_validated(self) -> TokenValidation:
+        """
+        Validate the token against /user once, reusing cached results.
+
+        The blocking request runs in a worker thread and its result, including
+        scopes and rate-limit bucket, is shared through TOKEN_VALIDATION_CACHE
+        by every client using the same token until the TTL expires.
+
+        Returns:
+            - TokenValidation: The validation result for this client's token.
+
+        Raises:
+            - HTTPError: If the token is rejected by GitHub.
+        """
+        if self.token_validation is None or self.token_validation.is_expired(TOKEN_VALIDATION_CACHE.ttl):
+            self.token_validation = await asyncio.to_thread(
+                TOKEN_VALIDATION_CACHE.get_or_validate, self.token
+            )
+        return self.token_validation
+
+    @abstractmethod
+    async def get_repository(self, url: GitHubUrl) -> Response:
+        """Return repository metadata."""
+        pass
+
+    @abstractmethod
+    def iter_owner_repos(self, owner: str, org: bool = True, skip_forks: bool = False) -> AsyncIterator[Response]:
+        """Yield pages of an organization's or user's repositories as they arrive."""
+        pass
 
     @abstractmethod
     async def get_languages(self, url: GitHubUrl) -> Response:
@@ -49,8 +98,28 @@ class AbstractGitHubApiClient(ABC):
         pass
 
     @abstractmethod
-    async def get_pulls(self, url: GitHubUrl) -> List[Response]:
-        """Return all pull requests."""
+    async def get_pulls(self, url: GitHubUrl, from_issues: bool = False) -> List[Response]:
+        """Return all pull requests, optionally derived from the issues listing."""
+        pass
+
+    @abstractmethod
+    async def count_commits(self, url: GitHubUrl, since: Optional[int] = None) -> int:
+        """Return the number of commits on the default branch, optionally since a unix timestamp."""
+        pass
+
+    @abstractmethod
+    async def count_issues(self, url: Union[GitHubUrl, Sequence[GitHubUrl]], qualifiers: str = "") -> int:
+        """Return the number of issues of one or more repos matching search qualifiers, e.g. 'is:open'."""
+        pass
+
+    @abstractmethod
+    async def count_pulls(self, url: Union[GitHubUrl, Sequence[GitHubUrl]], qualifiers: str = "") -> int:
+        """Return the number of pull requests of one or more repos matching search qualifiers, e.g. 'is:merged'."""
+        pass
+
+    @abstractmethod
+    async def graphql(self, query: str, variables: Optional[dict] = None) -> Response:
+        """Return the response to a GraphQL query."""
         pass
 
     @abstractmethod
@@ -64,8 +133,23 @@ class AbstractGitHubApiClient(ABC):
         pass
     
     @abstractmethod
-    async def compare_branch(self, url: GitHubUrl, sha: str, delta: int) -> List[Response]:
-        """Return commit difference between main branch and local branch up to maximum delta (days)"""
+    async def get_tree(self, url: GitHubUrl, ref: str, recursive: bool) -> Response:
+        """Return the git tree for a ref"""
+        pass
+
+    @abstractmethod
+    async def get_blob(self, url: GitHubUrl, sha: str) -> Response:
+        """Return a git blob"""
+        pass
+
+    @abstractmethod
+    async def get_stats(self, url: GitHubUrl, kind: str) -> Response:
+        """Return a repository statistics endpoint; status 202 while it is being computed."""
+        pass
+
+    @abstractmethod
+    async def compare_branch(self, url: GitHubUrl, sha: str, delta: int, base: Optional[str] = None) -> List[Response]:
+        """Return commit difference between a base branch and local branch up to maximum delta (days)"""
         pass
 
 class GitHubClient(AbstractGitHubApiClient):
@@ -74,30 +158,137 @@ class GitHubClient(AbstractGitHubApiClient):
 
     Provides methods for fetching repository data such as languages, license,
     commits, issues, pull requests, and contributors. Automatically handles
-    API rate limits.
+    API rate limits and retries failed requests according to a RetryPolicy.
+    Concurrent requests for the same URL share one request.
     
     Attributes:
         - token (str): GitHub personal access token for authentication.
-        - rate_manager (RateLimitManager): An async-compatible class for tracking API rate limit
+        - rate_limits (RateLimits): Rate limit buckets (core, search, graphql...) of the token.
+        - rate_manager (RateLimitManager): The core REST bucket of rate_limits.
+        - preflight (bool): Read every bucket from GET /rate_limit before the first request.
+        - retry_policy (RetryPolicy): Decides which failures are retried and how long to wait.
+        - concurrency (AdaptiveConcurrency): Requests in flight, reduced when GitHub throttles.
+        - in_flight (SingleFlight): Coalesces concurrent identical GETs.
         - logger (logging.Logger): Logger instance for reporting and errors.
     """
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, retry_policy: Optional[RetryPolicy] = None, preflight: bool = GITHUB_RATE_LIMIT_PREFLIGHT):
         """Initialize the GitHub client.
 
         Args:
             - token (str): GitHub personal access token for authentication.
+            - retry_policy (RetryPolicy, optional): Retry behaviour. Defaults to RetryPolicy().
+            - preflight (bool): Read the rate limits from GET /rate_limit before the first request.
         """
         super().__init__(token)
-        self.rate_manager = RateLimitManager()
+        self.concurrency = AdaptiveConcurrency()
+        self.rate_limits = RateLimits(self.concurrency)
+        self.rate_manager = self.rate_limits.bucket("core")
+        self.preflight = preflight
+        self._preflight_done = False
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.in_flight = SingleFlight()
         self.logger = logging.getLogger(__name__)
 
+    async def sync_rate_limits(self):
+        """
+        Set every rate limit bucket from GET /rate_limit, which costs no quota.
+
+        Failures are logged and ignored; the buckets are then learnt from
+        response headers as usual.
+        """
+        try:
+            response = await asyncio.to_thread(github_api.get_github_url, self.token, GitHubUrl.api_rate_limit_path())
+            response.raise_for_status()
+            self.rate_limits.update_from_rate_limit(await decode_json(response, ("resources",)))
+        except (RequestException, ValueError, KeyError) as e:
+            self.logger.warning(f"Could not read rate limits, continuing without: {e}")
+        self._preflight_done = True
+
+    async def _send(self, url: str, paginated: bool = False, graphql: Optional[dict] = None) -> Tuple[Response, Optional[str]]:
+        """
+        Send a GET request, or a GraphQL POST, retrying rate limits and transient failures.
+
+        A request identical to one already in flight from the same priority
+        lane waits for that request instead of sending its own; lanes are not
+        shared, so an interactive request never queues behind a backfill one.
+        Validates the token on first use.
+        Each attempt is admitted by the rate limit bucket the URL is charged
+        to, in the caller's priority lane (see repo_radar.utils.priority_lanes),
+        which reserves budget and a concurrency slot, and updates rate limit
+        headers; failed attempts are retried as the retry policy decides.
+        Rate-limit responses also shrink the number of requests in flight.
+
+        Args:
+            - url (str): Full GitHub API URL to request.
+            - paginated (bool): Request a full page and return the next page's URL.
+            - graphql (dict, optional): GraphQL request body; the request is then a POST to url.
+
+        Returns:
+            - Tuple[Response, Optional[str]]: The response and the next page's URL, if any.
+
+        Raises:
+            - HTTPError: If the final response status is an error.
+            - RequestException: If the request could not be sent and retries are exhausted.
+        """
+        key = (url, paginated, json.dumps(graphql, sort_keys=True) if graphql is not None else None, current_priority())
+        return await self.in_flight.do(key, lambda: self._send_with_retries(url, paginated, graphql))
+
+    async def _send_with_retries(self, url: str, paginated: bool, graphql: Optional[dict]) -> Tuple[Response, Optional[str]]:
+        await self.ensure_token_validated()
+        if self.preflight and not self._preflight_done:
+            await self.in_flight.do("rate_limit", self.sync_rate_limits)
+        rate_manager = self.rate_limits.for_url(url)
+        attempt = 0
+        rate_limit_waits = 0
+        while True:
+            self.retry_policy.record_request(url)
+            response = error = None
+            next_url = None
+            try:
+                # Admission holds the bucket lock only until a slot of self.concurrency is free
+                async with rate_manager:
+                    if graphql is not None:
+                        response = await asyncio.to_thread(github_api.post_github_graphql, self.token, url, graphql)
+                    elif paginated:
+                        response, next_url = await asyncio.to_thread(
+                            github_api.paginate_github_url, self.token, url=url, per_page=GITHUB_MAX_PAGINATED
+                        )
+                    else:
+                        response = await asyncio.to_thread(github_api.get_github_url, self.token, url)
+                    await rate_manager.update_from_headers(response)
+            except RequestException as e:
+                error = e
+
+            if response is not None and response.ok:
+                self.concurrency.on_success()
+                return response, next_url
+            # GraphQL queries only read, so they are retried like GETs
+            decision = self.retry_policy.next_delay(url, attempt, response, error, "GET", rate_limit_waits)
+            if decision is None:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response, next_url  # 1xx/3xx are not errors
+            reason, delay = decision
+            if reason in RATE_LIMIT_REASONS:
+                rate_limit_waits += 1
+                if reason != "rate_limit":
+                    self.concurrency.on_throttle()
+                    INSTRUMENTATION.record_rate_limit_wait(delay)
+            else:
+                attempt += 1
+            INSTRUMENTATION.record_retry(url, reason)
+            self.logger.warning(f"GitHub request failed ({reason}), retrying in {delay:.1f}s: {url}")
+            await asyncio.sleep(delay)
+
     async def _get_github_page(self, url: str) -> Response:
         """
         Fetch a single GitHub API page.
 
-        Acquires the rate limit lock, sends the request, updates rate limit
-        headers, and raises any HTTP errors.
+        Validates the token on first use, waits for rate limit admission, sends
+        the request, updates rate limit headers, retries rate limits and
+        transient failures, and raises any remaining HTTP errors.
 
         Args:
             - url (str): Full GitHub API URL to request.
@@ -108,18 +299,16 @@ class GitHubClient(AbstractGitHubApiClient):
         Raises:
             - HTTPError: If the response status is an error.
         """
-        async with self.rate_manager:
-            response = await asyncio.to_thread(github_api.get_github_url, self.token, url)
-            await self.rate_manager.update_from_headers(response)
-            response.raise_for_status()
+        response, _ = await self._send(url)
         return response
 
     async def _get_paginated_github_page(self, url: str) -> Tuple[Response, Optional[str]]:
         """
         Fetch a single page of paginated GitHub API results.
 
-        Acquires the rate limit lock, sends the request, updates rate limit
-        headers, and returns both the response and the next page's URL.
+        Validates the token on first use, waits for rate limit admission, sends
+        the request, updates rate limit headers, retries like _get_github_page,
+        and returns both the response and the next page's URL.
 
         Args:
             - url (str): GitHub API URL for the current page.
@@ -130,25 +319,12 @@ class GitHubClient(AbstractGitHubApiClient):
         Raises:
             - HTTPError: If the response status is an error.
         """
-        async with self.rate_manager:
-            response, next_url = await asyncio.to_thread(
-                github_api.paginate_github_url,
-                self.token,
-                url=url,
-                per_page=GITHUB_MAX_PAGINATED
-            )
-            await self.rate_manager.update_from_headers(response)
-            response.raise_for_status()
-        return response, next_url
+        return await self._send(url, paginated=True)
 
     async def _paginate_github_url(self, url: str) -> List[Response]:
         """
         Fetch all pages of a paginated GitHub API endpoint.
 
-        Automatically retries up to MAX_RETRIES times if a 403 rate limit error
-        occurs, gives up if rate_limite_manager is unable to rectify after max
-        retries.
-
         Args:
             - url (str): GitHub API URL to paginate through.
 
@@ -158,33 +334,58 @@ class GitHubClient(AbstractGitHubApiClient):
         Raises:
             - HTTPError: If a non-retriable error occurs or retries are exhausted.
         """
-        responses = []
-        response, next_url = await self._get_paginated_github_page(url)
-        responses.append(response)
+        return [response async for response in self._iter_github_pages(url)]
 
+    async def _iter_github_pages(self, url: str) -> AsyncIterator[Response]:
+        """
+        Yield the pages of a paginated GitHub API endpoint as they arrive.
+
+        Every page, including the first, is retried according to the
+        client's RetryPolicy.
+
+        Args:
+            - url (str): GitHub API URL to paginate through.
+
+        Yields:
+            - Response: One HTTP response per page.
+
+        Raises:
+            - HTTPError: If a non-retriable error occurs or retries are exhausted.
+        """
+        next_url: Optional[str] = url
         while next_url:
-            retries = 0
-            while True:
-                try:
-                    response, next_url = await self._get_paginated_github_page(next_url)
-                    responses.append(response)
-                    break
-                except HTTPError as e:
-                    status = getattr(e.response, "status_code", None)
-                    if retries < MAX_RETRIES and status == 403:
-                        retries += 1
-                        self.logger.warning(
-                            "HTTP Error 403 while paginating GitHub URL. Retrying..."
-                        )
-                        await asyncio.sleep(1)  # Backoff
-                        continue
-                    if status == 403:
-                        self.logger.error(
-                            f"Retried {retries} times on {next_url}. Raising error."
-                        )
-                        raise e
-                    raise
-        return responses
+            response, next_url = await self._get_paginated_github_page(next_url)
+            yield response
+
+    async def get_repository(self, url: GitHubUrl) -> Response:
+        """
+        Get the repository metadata, including default branch, archived and fork flags.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - Response: The HTTP response containing repository data.
+        """
+        return await self._get_github_page(url.api_repo_path())
+
+    async def iter_owner_repos(self, owner: str, org: bool = True, skip_forks: bool = False) -> AsyncIterator[Response]:
+        """
+        Yield pages of an organization's or user's repositories as they arrive.
+
+        Args:
+            - owner (str): Organization or user login.
+            - org (bool): List an organization's repositories if True, a user's otherwise.
+            - skip_forks (bool): Let GitHub leave out forks (organizations only, type=sources).
+
+        Yields:
+            - Response: One HTTP response per page of up to 100 repositories.
+        """
+        url = GitHubUrl.api_owner_repos_path(owner, org)
+        if org and skip_forks:
+            url += "?type=sources"
+        async for response in self._iter_github_pages(url):
+            yield response
 
     async def get_languages(self, url: GitHubUrl) -> Response:
         """
@@ -234,17 +435,122 @@ class GitHubClient(AbstractGitHubApiClient):
         """
         return await self._paginate_github_url(url.api_issues_path())
 
-    async def get_pulls(self, url: GitHubUrl) -> List[Response]:
+    async def get_pulls(self, url: GitHubUrl, from_issues: bool = False) -> List[Response]:
         """
         Get the pull requests of a repository.
 
+        With from_issues=True no pulls request is made: the pull requests are
+        taken from the issues listing, which includes them. Only requests in
+        flight at the same time are shared (nothing is cached), so a caller
+        that needs issues too pays for one listing rather than two only if it
+        awaits get_issues and this call together, e.g. with asyncio.gather;
+        one after the other, the issues are listed twice. Those pull requests
+        only carry the fields described in pull_from_issue.
+
         Args:
             - url (GitHubUrl): Repository URL wrapper.
+            - from_issues (bool): Derive the pull requests from the issues listing.
 
         Returns:
             - List[Response]: List of HTTP responses containing pull request data.
         """
-        return await self._paginate_github_url(url.api_pulls_path())
+        if not from_issues:
+            return await self._paginate_github_url(url.api_pulls_path())
+        pages = []
+        for page in await self.get_issues(url):
+            pulls = [p for p in map(pull_from_issue, await decode_json(page) or []) if p is not None]
+            pages.append(build_response(page.status_code, dict(page.headers), json.dumps(pulls).encode(), url.api_pulls_path()))
+        return pages
+
+    async def count_commits(self, url: GitHubUrl, since: Optional[int] = None) -> int:
+        """
+        Count the commits of a repository's default branch with a single request.
+
+        Lists one commit per page; the number of the last page in the Link
+        header is then the number of commits.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - since (int, optional): Unix timestamp; only count commits after it.
+
+        Returns:
+            - int: Number of commits, 0 for an empty repository.
+
+        Raises:
+            - HTTPError: If the request fails.
+        """
+        try:
+            response = await self._get_github_page(url.api_commits_path(since, per_page=1))
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code == 409:  # Git Repository is empty
+                return 0
+            raise
+        last = last_page_number(response)
+        return last if last is not None else len(await decode_json(response, ("sha",)) or [])
+
+    async def _search_count(self, query: str) -> int:
+        response = await self._get_github_page(GitHubUrl.api_search_issues_path(query, per_page=1))
+        result = await decode_json(response, ("total_count", "incomplete_results"))
+        if result.get("incomplete_results"):
+            self.logger.warning(f"GitHub search timed out, count may be low: {query}")
+        return result["total_count"]
+
+    async def count_issues(self, url: Union[GitHubUrl, Sequence[GitHubUrl]], qualifiers: str = "") -> int:
+        """
+        Count issues, excluding pull requests, with a single search request.
+
+        Several repositories are searched at once, as search ORs 'repo:' qualifiers.
+
+        Args:
+            - url (GitHubUrl | Sequence[GitHubUrl]): Repository URL wrapper, or several.
+            - qualifiers (str): Search qualifiers, e.g. 'is:open' or 'created:>=2025-01-01'.
+
+        Returns:
+            - int: Number of matching issues, summed over the repositories.
+
+        Raises:
+            - HTTPError: If the request fails, e.g. 422 if a repository does not exist or cannot be searched.
+        """
+        return await self._search_count(f"{search_repos(url)} is:issue {qualifiers}".strip())
+
+    async def count_pulls(self, url: Union[GitHubUrl, Sequence[GitHubUrl]], qualifiers: str = "") -> int:
+        """
+        Count pull requests with a single search request.
+
+        Several repositories are searched at once, as search ORs 'repo:' qualifiers.
+
+        Args:
+            - url (GitHubUrl | Sequence[GitHubUrl]): Repository URL wrapper, or several.
+            - qualifiers (str): Search qualifiers, e.g. 'is:merged merged:>=2025-01-01'.
+
+        Returns:
+            - int: Number of matching pull requests, summed over the repositories.
+
+        Raises:
+            - HTTPError: If the request fails, e.g. 422 if a repository does not exist or cannot be searched.
+        """
+        return await self._search_count(f"{search_repos(url)} is:pr {qualifiers}".strip())
+
+    async def graphql(self, query: str, variables: Optional[dict] = None) -> Response:
+        """
+        Run a GraphQL query.
+
+        Nested connections of many objects can be read in one query, where
+        REST needs a request per object. Queries are retried like GET
+        requests and count against the graphql rate limit bucket.
+
+        Args:
+            - query (str): GraphQL query document.
+            - variables (dict, optional): Query variables.
+
+        Returns:
+            - Response: The HTTP response; check its 'errors' as well as its status.
+
+        Raises:
+            - HTTPError: If the response status is an error.
+        """
+        response, _ = await self._send(GitHubUrl.api_graphql_path(), graphql={"query": query, "variables": variables or {}})
+        return response
 
     async def get_contributors(self, url: GitHubUrl) -> List[Response]:
         """
@@ -270,18 +576,71 @@ class GitHubClient(AbstractGitHubApiClient):
         """
         return await self._paginate_github_url(url.api_branch_path())
 
-    async def compare_branch(self, url: GitHubUrl, sha: str, delta: int = GITUB_DEFAULT_DELTA) -> List[Response]:
+    async def get_tree(self, url: GitHubUrl, ref: str = "HEAD", recursive: bool = True) -> Response:
         """
-        Return commit difference between main branch and a given sha up to maximum delta (days).
-    
+        Get the git tree of a repository in a single call.
+
+        With recursive=True every file path in the repository is listed. GitHub
+        truncates very large trees; check the 'truncated' flag of the result.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - ref (str): Branch, tag, commit or tree SHA. Defaults to the default branch.
+            - recursive (bool): Whether to include subdirectories.
+
+        Returns:
+            - Response: The HTTP response containing the tree entries.
+        """
+        return await self._get_github_page(url.api_tree_path(ref, recursive))
+
+    async def get_blob(self, url: GitHubUrl, sha: str) -> Response:
+        """
+        Get a git blob (base64 encoded file contents) by SHA.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - sha (str): Blob SHA from a tree entry.
+
+        Returns:
+            - Response: The HTTP response containing the blob.
+        """
+        return await self._get_github_page(url.api_blob_path(sha))
+
+    async def get_stats(self, url: GitHubUrl, kind: str) -> Response:
+        """
+        Get one of the repository statistics GitHub computes in the background.
+
+        The first request for uncached statistics starts the computation and
+        answers 202 Accepted with an empty body; repeat the request later, see
+        repo_radar.services.stats_scheduler. Empty repositories answer 204.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+            - kind (str): 'commit_activity', 'contributors', 'code_frequency' or 'participation'.
+
+        Returns:
+            - Response: The HTTP response, status 200, 202 or 204.
+        """
+        return await self._get_github_page(url.api_stats_path(kind))
+
+    async def compare_branch(
+        self, url: GitHubUrl, sha: str, delta: int = GITUB_DEFAULT_DELTA, base: Optional[str] = None
+    ) -> List[Response]:
+        """
+        Return commit difference between a base branch and a given sha up to maximum delta (days).
+
+        To compare many branches, use repo_radar.services.branch_drift, which
+        resolves the default branch once and shares work between branches.
+
         Args:
             - url (GitHubUrl): Repository URL wrapper.
             - sha (str): SHA of the branch or commit to compare.
             - delta (int): Maximum number of days in the past to include commits.
-    
+            - base (str, optional): Branch or SHA to compare against. Defaults to 'main'.
+
         Returns:
             - List[Response]: List of HTTP responses from GitHub containing commit data.
         """
         since_timestamp = int(time.time()) - delta * 86400  # convert days to seconds
-        compare_url = url.api_compare_path(sha, since_timestamp)
+        compare_url = url.api_compare_path(sha, since_timestamp, base or "main")
         return await self._paginate_github_url(compare_url)
\ No newline at end of file
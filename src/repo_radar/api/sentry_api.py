@@ -1,5 +1,6 @@
 from __future__ import annotations
-import os, requests, functools
+import os, functools
+from repo_radar.api.transport import get_transport
 
 BASE = (os.getenv("SENTRY_API_BASE") or "https://repo-radar.sentry.io") + "/api/0"
 
@@ -26,7 +27,7 @@ def _project_id() -> str:
         return str(env_id)
     # slug -> id resolve
     url = f"{BASE}/projects/{_org()}/{_project_slug()}/"
-    r = requests.get(url, headers=_headers(), timeout=20)
+    r = get_transport().get(url, headers=_headers(), timeout=20)
     r.raise_for_status()
     return str(r.json().get("id"))
 
@@ -39,7 +40,7 @@ def list_issues_30d(query="is:unresolved", limit=100):
         "query": query,
         "limit": limit
     }
-    r = requests.get(url, headers=_headers(), params=params, timeout=20)
+    r = get_transport().get(url, headers=_headers(), params=params, timeout=20)
     r.raise_for_status()
     return r.json(), r.headers.get("Link")
 
@@ -52,6 +53,6 @@ def timeseries_events_30d(field="count()", interval="1d", query="event.type:erro
         "query": query,
         "yAxis": field,
     }
-    r = requests.get(url, headers=_headers(), params=params, timeout=30)
+    r = get_transport().get(url, headers=_headers(), params=params, timeout=30)
     r.raise_for_status()
     return r.json()
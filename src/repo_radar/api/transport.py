@@ -0,0 +1,270 @@
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests import Response
+from requests.exceptions import RequestException
+from requests.structures import CaseInsensitiveDict
+from repo_radar.config import TRANSPORT_CASSETTE, TRANSPORT_MODE
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+
+TRANSPORT_MODES = ("live", "record", "replay")
+
+# Only these response headers are kept in a cassette; everything else is noise for the pipeline
+_KEPT_HEADERS = ("link", "content-type", "etag", "retry-after", "x-oauth-scopes")
+_KEPT_HEADER_PREFIXES = ("x-ratelimit-",)
+
+class CassetteMiss(RequestException):
+    """Raised in replay mode when a request was never recorded."""
+
+def build_response(status_code: int, headers: Dict[str, str], content: bytes, url: str = "") -> Response:
+    """
+    Build a requests.Response without touching the network.
+
+    Args:
+        - status_code (int): HTTP status code.
+        - headers (Dict[str, str]): Response headers.
+        - content (bytes): Raw response body.
+        - url (str): URL the response claims to come from.
+
+    Returns:
+        - Response: A response usable with .json(), .headers and .raise_for_status().
+    """
+    response = Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.encoding = "utf-8"
+    response.url = url
+    try:
+        response.reason = HTTPStatus(status_code).phrase
+    except ValueError:
+        response.reason = ""
+    return response
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None) -> str:
+    """
+    Return a stable cassette key for a request.
+
+    Query parameters from the URL and from params are merged and sorted, and
+    headers are ignored so credentials never end up in a cassette.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for k, v in (params or {}).items():
+        if v is not None:
+            query.append((str(k), str(v)))
+    normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+    key = f"{method.upper()} {normalized}"
+    if body is not None:
+        digest = hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        key += f" #{digest[:16]}"
+    return key
+
+class Cassette:
+    """
+    Compressed store of recorded HTTP exchanges and call results.
+
+    Bodies are stored once per content hash, so repeated identical responses
+    cost nothing extra. Requests recorded several times are replayed in
+    order, and the last recording is repeated once the sequence runs out.
+
+    Attributes:
+        - path (Path): Location of the gzip-compressed JSON cassette file.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._exchanges: Dict[str, List[dict]] = {}
+        self._bodies: Dict[str, str] = {}
+        self._values: Dict[str, Dict[str, Any]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Cassette":
+        """Load a cassette from disk."""
+        cassette = cls(path)
+        with gzip.open(cassette.path, "rt", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+        cassette._exchanges = data.get("exchanges", {})
+        cassette._bodies = data.get("bodies", {})
+        cassette._values = data.get("values", {})
+        return cassette
+
+    def save(self):
+        """Atomically write the cassette to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with self._lock:
+            data = {"version": self.VERSION, "exchanges": self._exchanges,
+                    "bodies": self._bodies, "values": self._values}
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=9) as fh:
+                json.dump(data, fh, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def record(self, key: str, response: Response):
+        """Store a response under a request key."""
+        body = response.content.decode("utf-8", errors="surrogateescape")
+        digest = hashlib.sha256(response.content).hexdigest()[:20]
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() in _KEPT_HEADERS or k.lower().startswith(_KEPT_HEADER_PREFIXES)
+        }
+        with self._lock:
+            self._bodies.setdefault(digest, body)
+            self._exchanges.setdefault(key, []).append(
+                {"status": response.status_code, "headers": headers, "body": digest, "url": response.url}
+            )
+
+    def replay(self, key: str) -> Response:
+        """
+        Return the next recorded response for a request key.
+
+        Raises:
+            - CassetteMiss: If the request was never recorded.
+        """
+        with self._lock:
+            entries = self._exchanges.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for {key}")
+            idx = self._cursors.get(key, 0)
+            self._cursors[key] = idx + 1
+            entry = entries[min(idx, len(entries) - 1)]
+            body = self._bodies[entry["body"]].encode("utf-8", errors="surrogateescape")
+        return build_response(entry["status"], entry["headers"], body, entry.get("url", ""))
+
+    def record_value(self, namespace: str, key: str, value: Any):
+        """Store a JSON-serialisable call result."""
+        with self._lock:
+            self._values.setdefault(namespace, {})[key] = value
+
+    def replay_value(self, namespace: str, key: str) -> Any:
+        """
+        Return a recorded call result.
+
+        Raises:
+            - CassetteMiss: If the call was never recorded.
+        """
+        with self._lock:
+            values = self._values.get(namespace, {})
+            if key not in values:
+                raise CassetteMiss(f"No recorded {namespace} result for {key}")
+            return values[key]
+
+class Transport:
+    """
+    HTTP transport shared by the GitHub, Sentry and LLM integrations.
+
+    In live mode requests go straight to the network. In record mode they
+    also go to the network and every exchange is stored in a cassette. In
+    replay mode every request is answered from the cassette and the network
+    is never used.
+
+    Attributes:
+        - mode (str): One of 'live', 'record' or 'replay'.
+        - cassette (Optional[Cassette]): Cassette used for record and replay modes.
+        - logger (logging.Logger): Logger instance for reporting and errors.
+    """
+    def __init__(self, mode: str = "live", cassette_path: str | Path | None = None):
+        if mode not in TRANSPORT_MODES:
+            raise ValueError(f"Transport mode must be one of {TRANSPORT_MODES}, got {mode!r}")
+        self.mode = mode
+        self.cassette: Optional[Cassette] = None
+        self.logger = logging.getLogger(__name__)
+        if mode == "record":
+            self.cassette = Cassette(cassette_path or TRANSPORT_CASSETTE)
+        elif mode == "replay":
+            self.cassette = Cassette.load(cassette_path or TRANSPORT_CASSETTE)
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                json_body: Any = None, **kwargs) -> Response:
+        """
+        Send (or replay) an HTTP request.
+
+        Args:
+            - method (str): HTTP method.
+            - url (str): Request URL.
+            - params (Dict[str, Any], optional): Query parameters.
+            - json_body (Any, optional): JSON request body.
+            - **kwargs: Passed through to requests (headers, timeout, ...).
+
+        Returns:
+            - Response: The live or replayed HTTP response.
+        """
+        key = request_key(method, url, params, json_body) if self.cassette else ""
+        start = time.perf_counter()
+        status = None
+        try:
+            if self.mode == "replay":
+                response = self.cassette.replay(key)
+            elif method.upper() == "GET" and json_body is None:
+                response = requests.get(url, params=params, **kwargs)
+            else:
+                response = requests.request(method, url, params=params, json=json_body, **kwargs)
+            status = response.status_code
+        finally:
+            INSTRUMENTATION.observe_request(url, time.perf_counter() - start, status)
+
+        if self.mode == "record":
+            self.cassette.record(key, response)
+        return response
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Response:
+        """Send (or replay) a GET request."""
+        return self.request("GET", url, params=params, **kwargs)
+
+    def call(self, namespace: str, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run (or replay) a non-HTTP call such as an LLM completion.
+
+        Args:
+            - namespace (str): Group of the call, e.g. 'llm'.
+            - key (str): Stable identifier of the call's inputs.
+            - fn (Callable[[], Any]): Produces a JSON-serialisable result in live and record modes.
+
+        Returns:
+            - Any: The live or replayed result.
+        """
+        if self.mode == "replay":
+            return self.cassette.replay_value(namespace, key)
+        value = fn()
+        if self.mode == "record":
+            self.cassette.record_value(namespace, key, value)
+        return value
+
+    def close(self):
+        """Persist the cassette when recording."""
+        if self.mode == "record" and self.cassette is not None:
+            self.cassette.save()
+            self.logger.info(f"Saved cassette to {self.cassette.path}")
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> Transport:
+    """Return the process-wide transport, configured from REPO_RADAR_TRANSPORT on first use."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport(TRANSPORT_MODE, TRANSPORT_CASSETTE)
+        return _transport
+
+def set_transport(transport: Optional[Transport]) -> Optional[Transport]:
+    """Replace the process-wide transport and return the previous one."""
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+        return previous
@@ -17,10 +17,11 @@ GITHUB_URL_REGEX = (
 )
 
 LINK_HEADER_NEXT_REGEX = r'<([^>]+)>;\s*rel="next"'
+LINK_HEADER_LAST_REGEX = r'<([^>]+)>;\s*rel="last"'
 
-# URLs for github API
-GITHUB_API_URL = "https://api.github.com"
-GITHUB_API_USER_ENDPOINT = "https://api.github.com/user" # User Endpoint
+# URLs for github API. GITHUB_API_URL can point at a GitHub Enterprise host or a local mock server.
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_API_USER_ENDPOINT = f"{GITHUB_API_URL}/user" # User Endpoint
 
 # Set GitHub token from environment variable
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
@@ -38,16 +39,115 @@ GITHUB_AUTH_HEADERS = {
 GITHUB_MAX_PAGINATED = 100;
 MAX_RETRIES = 5
 
+# Retries (see repo_radar.utils.retry_policy): exponential backoff bounds in seconds, the wait for secondary
+# rate limits without Retry-After, rate-limit waits per request, and the per-endpoint retry budget
+# (RETRY_BUDGET_MIN retries plus RETRY_BUDGET_RATIO per request)
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 60.0
+SECONDARY_RATE_LIMIT_DELAY = 60.0
+RATE_LIMIT_MAX_WAITS = 20
+RETRY_BUDGET_MIN = 10
+RETRY_BUDGET_RATIO = 0.2
+# Requests in flight per client before secondary rate limits shrink it, see AdaptiveConcurrency
+GITHUB_MAX_CONCURRENCY = int(os.getenv("GITHUB_MAX_CONCURRENCY", "8"))
+
 # GitHub API rate limits
 GITHUB_DEFAULT_RATE = 5000
+GITHUB_RATE_WINDOW = 3600  # seconds between primary rate-limit resets
+# Request priority lanes (see repo_radar.utils.priority_lanes): each lane's share of turns while lanes compete,
+# and the share of every rate limit bucket a lane leaves unused for the lanes above it, so bulk syncs never
+# drain the budget on-demand reports need. Requests default to 'report'.
+PRIORITY_WEIGHTS = {"interactive": 8, "report": 4, "backfill": 1}
+PRIORITY_RESERVES = {"interactive": 0.0, "report": 0.0, "backfill": float(os.getenv("BACKFILL_RESERVE", "0.3"))}
+GITHUB_DEFAULT_PRIORITY = "report"
+# Read every rate limit bucket from GET /rate_limit (free) before a client's first request
+GITHUB_RATE_LIMIT_PREFLIGHT = os.getenv("GITHUB_RATE_LIMIT_PREFLIGHT", "0") == "1"
+
+# Pull request timelines over GraphQL: pull requests per page, reviews read with each, and pull requests
+# whose further reviews are read in one continuation query
+PR_TIMELINE_PAGE_SIZE = 50
+PR_TIMELINE_REVIEWS = 10
+PR_TIMELINE_BATCH = 25
+
+# Seconds a token validation result is reused before /user is called again
+GITHUB_TOKEN_VALIDATION_TTL = int(os.getenv("GITHUB_TOKEN_VALIDATION_TTL", "900"))
 
 #GitHub default delta for branch comparison in days
 GITUB_DEFAULT_DELTA = 30
+# Branch comparisons in flight when computing drift of every branch
+BRANCH_COMPARE_CONCURRENCY = 8
+# Per-repository fetches in flight while repository discovery is still listing
+REPO_FETCH_CONCURRENCY = 8
+# GitHub rejects longer search queries; activity counts put as many 'repo:' qualifiers in one query as fit
+SEARCH_QUERY_MAX_LENGTH = 256
+# Report pipeline (see repo_radar.utils.pipeline): items waiting between two stages, and JSON decoding workers
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "32"))
+PIPELINE_DECODE_WORKERS = 2
+# Worker processes a report's repositories are sharded across (1 collects in the main process)
+SHARD_WORKERS = int(os.getenv("REPO_RADAR_WORKERS", "1"))
+
+# Response bodies from this size (bytes) are JSON-decoded in a worker thread instead of on the event loop
+JSON_OFFLOAD_BYTES = int(os.getenv("JSON_OFFLOAD_BYTES", str(64 * 1024)))
+
+# Statistics endpoints answer 202 while GitHub computes them: concurrent polls, backoff bounds and give-up time (seconds)
+STATS_POLL_CONCURRENCY = 8
+STATS_POLL_INITIAL_DELAY = 1.0
+STATS_POLL_MAX_DELAY = 16.0
+STATS_POLL_TIMEOUT = int(os.getenv("STATS_POLL_TIMEOUT", "60"))
+
+# Watch mode: share of the hourly rate limit it may spend, and bounds of each repo's refresh interval (seconds).
+# A repo's interval is WATCH_HOTNESS times the time since its last push, so active repos refresh more often.
+WATCH_BUDGET_SHARE = float(os.getenv("WATCH_BUDGET_SHARE", "0.2"))
+WATCH_MIN_INTERVAL = int(os.getenv("WATCH_MIN_INTERVAL", "300"))
+WATCH_MAX_INTERVAL = int(os.getenv("WATCH_MAX_INTERVAL", "86400"))
+WATCH_HOTNESS = 0.1
+
+# Dependency discovery: blob requests in flight, and manifest count from which parsing uses a process pool
+MANIFEST_FETCH_CONCURRENCY = 8
+MANIFEST_PROCESS_POOL_MIN = 16
 
 # Load .env from project root (parent of src/)
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(PROJECT_ROOT / ".env")
 
+# HTTP transport mode: 'live', 'record' (live + save every exchange) or 'replay' (cassette only, no network)
+TRANSPORT_MODE = os.getenv("REPO_RADAR_TRANSPORT", "live")
+TRANSPORT_CASSETTE = Path(os.getenv("REPO_RADAR_CASSETTE", str(PROJECT_ROOT / ".cache" / "cassette.json.gz")))
+
+# Latest per-repository data kept by watch mode and the webhook receiver
+REPO_STATE_PATH = Path(os.getenv("REPO_STATE_PATH", str(PROJECT_ROOT / ".cache" / "repo_state.json")))
+# Seconds of issue and pull request activity kept per repository (the report covers 30 days)
+ACTIVITY_WINDOW = 30 * 86400
+
+# GitHub webhook receiver, see repo_radar.services.webhooks. Without a secret, signatures are not checked.
+WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8787"))
+
+# Report server, see repo_radar.services.report_server
+REPORT_SERVER_HOST = os.getenv("REPORT_SERVER_HOST", "127.0.0.1")
+REPORT_SERVER_PORT = int(os.getenv("REPORT_SERVER_PORT", "8788"))
+# Seconds a POST /repos/OWNER/NAME/refresh waits for the refresh before answering 202 Accepted
+REPORT_REFRESH_TIMEOUT = float(os.getenv("REPORT_REFRESH_TIMEOUT", "30"))
+# Seconds between checks of REPO_STATE_PATH for snapshots another process (e.g. a watch run) saved, when
+# the report server runs without watch mode
+REPORT_RELOAD_INTERVAL = float(os.getenv("REPORT_RELOAD_INTERVAL", "5"))
+
+# Snapshots of past report runs, used for week-over-week and month-over-month trends
+RUN_HISTORY_DIR = Path(os.getenv("RUN_HISTORY_DIR", str(PROJECT_ROOT / "reports" / "history")))
+RUN_HISTORY_KEEP = int(os.getenv("RUN_HISTORY_KEEP", "400"))
+
+# Offline OSV vulnerability index, see repo_radar.services.vulnerability_index
+OSV_INDEX_PATH = Path(os.getenv("OSV_INDEX_PATH", str(PROJECT_ROOT / ".cache" / "osv.sqlite")))
+
+# Repository data backend: 'api' (GitHub REST) or 'git' (local blobless mirrors, see repo_radar.api.git_local_client)
+GITHUB_BACKEND = os.getenv("REPO_RADAR_BACKEND", "api")
+GIT_MIRROR_DIR = Path(os.getenv("GIT_MIRROR_DIR", str(PROJECT_ROOT / ".cache" / "mirrors")))
+# Clone URL of each mirror; '{repo_path}' is replaced by 'org_user/repo'
+GIT_REMOTE_TEMPLATE = os.getenv("GIT_REMOTE_TEMPLATE", "https://github.com/{repo_path}.git")
+# Seconds after a fetch during which a mirror is considered fresh and not fetched again
+GIT_FETCH_MIN_INTERVAL = int(os.getenv("GIT_FETCH_MIN_INTERVAL", "300"))
+
 @dataclass(frozen=True)
 class LLMConfig:
     api_base: str = "https://openrouter.ai/api/v1"
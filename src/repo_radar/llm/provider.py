@@ -3,6 +3,8 @@ import hashlib, json, os, time
 from pathlib import Path
 from typing import Optional
 from litellm import completion
+from repo_radar.api.transport import CassetteMiss, get_transport
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
 
 # cache at project root so it persists across runs
 CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache"
@@ -30,13 +32,21 @@ def summarize_state(metrics_text: str, *, model: Optional[str] = None) -> str:
     - Skips if no OPENROUTER_API_KEY
     - Caches by metrics_text (identical input → no re-call)
     - Enforces DAILY_LIMIT calls per day
+    - Records/replays the result when the transport is in record/replay mode
     """
+    key = _cache_key(metrics_text)
+    try:
+        return get_transport().call("llm", key, lambda: _summarize(metrics_text, key, model))
+    except CassetteMiss:
+        return "(LLM skipped: no recorded summary for these metrics)"
+
+def _summarize(metrics_text: str, key: str, model: Optional[str]) -> str:
     if not os.getenv("OPENROUTER_API_KEY"):
         return "(LLM disabled: OPENROUTER_API_KEY not set)"
 
     # cache
-    key = _cache_key(metrics_text)
     cache_file = CACHE_DIR / f"summary_{key}.txt"
+    INSTRUMENTATION.record_cache("llm_summary", cache_file.exists())
     if cache_file.exists():
         return cache_file.read_text(encoding="utf-8")
 
@@ -0,0 +1,47 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+@dataclass(frozen=True)
+class BranchDrift:
+    """
+    How far one branch has drifted from the default branch.
+
+    Attributes:
+        - name (str): Branch name.
+        - sha (str): Head commit SHA of the branch.
+        - status (str): 'identical', 'ahead', 'behind' or 'diverged', as reported by the compare API.
+        - ahead_by (int): Commits on the branch that are not on the default branch.
+        - behind_by (int): Commits on the default branch that are not on the branch.
+        - commits (Tuple[str, ...]): SHAs of the listed ahead commits, see RepoBranchDrift.commits.
+    """
+    name: str
+    sha: str
+    status: str
+    ahead_by: int
+    behind_by: int
+    commits: Tuple[str, ...] = ()
+
+@dataclass
+class RepoBranchDrift:
+    """
+    Drift of every branch of a repository against its default branch.
+
+    Commits shared by several branches are stored once in 'commits'; each
+    BranchDrift only references them by SHA.
+
+    Attributes:
+        - repo (str): 'org_user/repo'.
+        - default_branch (str): Name of the default branch compared against.
+        - default_sha (str): Head SHA of the default branch at comparison time.
+        - branches (List[BranchDrift]): One entry per branch, sorted by name.
+        - commits (Dict[str, dict]): Compact commit (sha, author, date, message) per SHA.
+    """
+    repo: str
+    default_branch: str
+    default_sha: str
+    branches: List[BranchDrift] = field(default_factory=list)
+    commits: Dict[str, dict] = field(default_factory=dict)
+
+    def diverged(self) -> List[BranchDrift]:
+        """Return branches that are not identical to the default branch, most commits behind first."""
+        return sorted((b for b in self.branches if b.status != "identical"), key=lambda b: b.behind_by, reverse=True)
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class Dependency:
+    """
+    A third-party package declared in a dependency manifest or lockfile.
+
+    Ecosystem names follow the OSV schema (PyPI, npm, Go, crates.io) so that
+    dependencies can be matched against vulnerability databases directly.
+
+    Attributes:
+        - ecosystem (str): Package ecosystem, e.g. 'PyPI' or 'npm'.
+        - name (str): Normalised package name.
+        - version (Optional[str]): Exact version if pinned or resolved, otherwise None.
+        - spec (str): Raw version constraint as written in the manifest.
+        - manifest (str): Repository path of the manifest the dependency came from.
+        - dev (bool): True for development-only dependencies.
+    """
+    ecosystem: str
+    name: str
+    version: Optional[str] = None
+    spec: str = ""
+    manifest: str = ""
+    dev: bool = False
@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import urlencode
 from repo_radar.config import GITHUB_API_URL
 
 @dataclass
@@ -23,10 +26,49 @@ class GitHubUrl:
         class_name = self.__class__.__name__
         return f"<{class_name} org_user='{self.org_user}' repo='{self.repo}'>"
     
+    @staticmethod
+    def api_owner_repos_path(owner: str, org: bool = True) -> str:
+        """
+        Repositories of an organization or a user.
+
+        Args:
+            - owner (str): Organization or user login.
+            - org (bool): List '/orgs/{owner}/repos' if True, '/users/{owner}/repos' otherwise.
+        """
+        return f"{GITHUB_API_URL}/{'orgs' if org else 'users'}/{owner}/repos"
+
+    @staticmethod
+    def api_graphql_path() -> str:
+        """GraphQL endpoint; requests count against the separate graphql rate limit."""
+        return f"{GITHUB_API_URL}/graphql"
+
+    @staticmethod
+    def api_rate_limit_path() -> str:
+        """Rate limit status of every bucket; requests to it are not counted."""
+        return f"{GITHUB_API_URL}/rate_limit"
+
+    @staticmethod
+    def api_search_issues_path(query: str, per_page: Optional[int] = None) -> str:
+        """
+        Issue and pull request search. Counts against the search rate limit, not the core one.
+
+        Args:
+            - query (str): Search query, e.g. 'repo:octo/demo is:pr is:merged'.
+            - per_page (int, optional): Results per page; 1 when only total_count is needed.
+        """
+        params = {"q": query}
+        if per_page:
+            params["per_page"] = per_page
+        return f"{GITHUB_API_URL}/search/issues?{urlencode(params)}"
+
     def repo_path(self) -> str:
         """Return 'org_user/repo' string."""
         return f"{self.org_user}/{self.repo}"
     
+    def api_repo_path(self) -> str:
+        """Return full API endpoint for repository metadata (default branch, archived, fork...)."""
+        return f"{GITHUB_API_URL}/repos/{self.repo_path()}"
+
     def api_languages_path(self) -> str:
         """Return full API endpoint for repository languages."""
         return f"{GITHUB_API_URL}/repos/{self.repo_path()}/languages"
@@ -43,13 +85,34 @@ class GitHubUrl:
         """Repository license information."""
         return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/license"
     
-    def api_commits_path(self) -> str:
-        """Repository commits list."""
-        return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/commits"
+    def api_commits_path(self, since: Optional[int] = None, per_page: Optional[int] = None) -> str:
+        """
+        Repository commits list.
+
+        Args:
+            - since (int, optional): Unix timestamp; only commits after it are listed.
+            - per_page (int, optional): Commits per page; with 1, the last page number is the commit count.
+        """
+        url = f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/commits"
+        params = {}
+        if since is not None:
+            params["since"] = datetime.fromtimestamp(since, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        if per_page:
+            params["per_page"] = per_page
+        return f"{url}?{urlencode(params)}" if params else url
     
     def api_activity_path(self) -> str:
         """Repository weekly commit activity."""
-        return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/stats/commit_activity"
+        return self.api_stats_path("commit_activity")
+
+    def api_stats_path(self, kind: str) -> str:
+        """
+        Repository statistics computed in the background by GitHub.
+
+        Args:
+            - kind (str): 'commit_activity', 'contributors', 'code_frequency' or 'participation'.
+        """
+        return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/stats/{kind}"
     
     def api_pulls_path(self) -> str:
         """Repository pull requests list."""
@@ -67,22 +130,40 @@ class GitHubUrl:
             return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/contents/{path}"
         return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/contents"
     
+    def api_tree_path(self, ref: str = "HEAD", recursive: bool = True) -> str:
+        """
+        Repository git tree for a branch, tag, commit or tree SHA.
+
+        Args:
+            - ref (str): Tree-ish to list. Defaults to the default branch head.
+            - recursive (bool): List every entry of every subdirectory in one call.
+        """
+        url = f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/git/trees/{ref}"
+        if recursive:
+            url += "?recursive=1"
+        return url
+
+    def api_blob_path(self, sha: str) -> str:
+        """Repository git blob (base64 encoded file contents) by SHA."""
+        return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/git/blobs/{sha}"
+
     def api_branch_path(self) -> str:
         """Return the GitHub REST API path to list branches of the repository."""
         return f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/branches"
     
-    def api_compare_path(self, sha: str, since: int = None) -> str:
+    def api_compare_path(self, sha: str, since: int = None, base: str = "main") -> str:
        """
-       Return the GitHub REST API path to compare the main branch with another branch or commit.
+       Return the GitHub REST API path to compare a base branch with another branch or commit.
 
        Args:
-           - sha (str): SHA of the target branch or commit to compare with main.
+           - sha (str): SHA of the target branch or commit to compare with the base.
            - since (int, optional): Unix timestamp to filter commits. Defaults to None.
+           - base (str): Branch or SHA to compare against. Defaults to 'main'.
 
        Returns:
            - str: Full API URL for comparing branches.
        """
-       url = f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/compare/main...{sha}"
+       url = f"{GITHUB_API_URL}/repos/{self.org_user}/{self.repo}/compare/{base}...{sha}"
        if since:
            url += f"?since={since}"
        return url
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class PullTimeline:
+    """
+    The review and merge milestones of one pull request, as unix times.
+
+    Attributes:
+        - repo (str): 'org_user/repo'.
+        - number (int): Pull request number.
+        - author (Optional[str]): Login of the author, None for deleted accounts.
+        - created_at (float): When the pull request was opened.
+        - ready_at (float): When it was marked ready for review; created_at unless it was opened as a draft.
+        - merged_at (Optional[float]): When it was merged.
+        - closed_at (Optional[float]): When it was closed, merged or not.
+        - first_review_at (Optional[float]): First review by someone other than the author.
+        - reviews (int): Number of reviews, including the author's own.
+        - comments (int): Number of conversation comments.
+    """
+    repo: str
+    number: int
+    author: Optional[str]
+    created_at: float
+    ready_at: float
+    merged_at: Optional[float] = None
+    closed_at: Optional[float] = None
+    first_review_at: Optional[float] = None
+    reviews: int = 0
+    comments: int = 0
+
+    @property
+    def time_to_first_review(self) -> Optional[float]:
+        """Seconds from ready for review to the first review, if reviewed."""
+        return None if self.first_review_at is None else max(0.0, self.first_review_at - self.ready_at)
+
+    @property
+    def time_to_merge(self) -> Optional[float]:
+        """Seconds from opening to merge, if merged."""
+        return None if self.merged_at is None else self.merged_at - self.created_at
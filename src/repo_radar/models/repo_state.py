@@ -0,0 +1,46 @@
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+@dataclass
+class RepoSnapshot:
+    """
+    The latest known data of one repository, kept between runs.
+
+    Attributes:
+        - repo (str): 'org_user/repo'.
+        - refreshed_at (float): Unix time the data was last fetched.
+        - pushed_at (Optional[float]): Unix time of the last push, used to judge activity.
+        - default_branch (Optional[str]): Name of the default branch.
+        - languages (Dict[str, int]): Bytes of code per language.
+        - recent_commits (Optional[int]): Commits in the last 4 weeks, None until GitHub has computed them.
+        - open_issues (Optional[int]): Open issues and pull requests, as GitHub counts them.
+        - issues_opened (List[float]): Unix times issues were opened, within the activity window.
+        - issues_closed (List[float]): Unix times issues were closed, within the activity window.
+        - pulls_opened (List[float]): Unix times pull requests were opened, within the activity window.
+        - pulls_merged (List[float]): Unix times pull requests were merged, within the activity window.
+        - events_since (Optional[float]): Unix time webhook events started arriving for this repository.
+        - dirty (bool): Data changed since the last report render.
+        - reconcile (bool): Data is known to be incomplete and should be refreshed from the API.
+    """
+    repo: str
+    refreshed_at: float
+    pushed_at: Optional[float] = None
+    default_branch: Optional[str] = None
+    languages: Dict[str, int] = field(default_factory=dict)
+    recent_commits: Optional[int] = None
+    open_issues: Optional[int] = None
+    issues_opened: List[float] = field(default_factory=list)
+    issues_closed: List[float] = field(default_factory=list)
+    pulls_opened: List[float] = field(default_factory=list)
+    pulls_merged: List[float] = field(default_factory=list)
+    events_since: Optional[float] = None
+    dirty: bool = False
+    reconcile: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RepoSnapshot":
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+@dataclass
+class RunSnapshot:
+    """
+    The metrics one report run collected, kept so later runs can compute trends.
+
+    Attributes:
+        - created_at (float): Unix time of the run.
+        - repos (List[str]): 'org_user/repo' of every repository covered.
+        - metrics (Dict[str, Optional[float]]): Scalar metrics by name, None where unavailable.
+        - languages (Dict[str, float]): Share of code per language in percent, over all repositories.
+        - series (Dict[str, List[Tuple[float, float]]]): (unix time, value) points per series, e.g. Sentry errors.
+    """
+    created_at: float
+    repos: List[str] = field(default_factory=list)
+    metrics: Dict[str, Optional[float]] = field(default_factory=dict)
+    languages: Dict[str, float] = field(default_factory=dict)
+    series: Dict[str, List[Tuple[float, float]]] = field(default_factory=dict)
@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from repo_radar.services.lang_analytics import merge_language_maps
+
+@dataclass
+class ShardResult:
+    """
+    Metrics collected for a subset of the repositories, mergeable with other subsets.
+
+    merge is associative and ShardResult() is its identity, so partial results
+    of any split of the repository list can be reduced in any grouping and
+    give the same totals as a single run.
+
+    Attributes:
+        - repos (List[str]): 'org_user/repo' of every repository collected.
+        - languages (Dict[str, int]): Bytes of code per language, summed over the repositories.
+        - recent_commits (Optional[int]): Commits in the last 4 weeks, None if no repository's activity was computed.
+        - errors (Dict[str, str]): Error message per repository that could not be collected.
+        - repo_languages (Dict[str, Dict[str, int]]): Bytes of code per language of each repository.
+        - repo_commits (Dict[str, Optional[int]]): Commits in the last 4 weeks of each repository, None if not computed.
+    """
+    repos: List[str] = field(default_factory=list)
+    languages: Dict[str, int] = field(default_factory=dict)
+    recent_commits: Optional[int] = None
+    errors: Dict[str, str] = field(default_factory=dict)
+    repo_languages: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    repo_commits: Dict[str, Optional[int]] = field(default_factory=dict)
+
+    def merge(self, other: "ShardResult") -> "ShardResult":
+        """Return the combined result of two shards, leaving both unchanged."""
+        commits = [c for c in (self.recent_commits, other.recent_commits) if c is not None]
+        return ShardResult(
+            repos=self.repos + other.repos,
+            languages=merge_language_maps([self.languages, other.languages]),
+            recent_commits=sum(commits) if commits else None,
+            errors={**self.errors, **other.errors},
+            repo_languages={**self.repo_languages, **other.repo_languages},
+            repo_commits={**self.repo_commits, **other.repo_commits},
+        )
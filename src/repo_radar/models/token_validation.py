@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+from requests import Response
+import time
+
+@dataclass(frozen=True)
+class TokenValidation:
+    """
+    Result of validating a GitHub token against the /user endpoint.
+
+    Captures the identity, OAuth scopes and rate-limit bucket reported by
+    GitHub so that the result can be cached and shared between clients
+    that use the same token.
+
+    Attributes:
+        - login (Optional[str]): Login of the authenticated user, None if unknown.
+        - scopes (Tuple[str, ...]): OAuth scopes granted to the token (classic tokens only).
+        - rate_limit_resource (Optional[str]): Rate-limit bucket the token was charged against.
+        - rate_limit_limit (Optional[int]): Maximum requests per window for the bucket.
+        - rate_limit_remaining (Optional[int]): Requests remaining when validated.
+        - rate_limit_reset (Optional[int]): Unix timestamp of the next bucket reset.
+        - rate_limited (bool): True if validation hit a rate limit and the token was assumed valid.
+        - validated_at (float): Unix timestamp of the validation.
+    """
+    login: Optional[str] = None
+    scopes: Tuple[str, ...] = ()
+    rate_limit_resource: Optional[str] = None
+    rate_limit_limit: Optional[int] = None
+    rate_limit_remaining: Optional[int] = None
+    rate_limit_reset: Optional[int] = None
+    rate_limited: bool = False
+    validated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_response(cls, response: Response) -> "TokenValidation":
+        """
+        Build a validation result from a /user response.
+
+        Args:
+            - response (Response): Response returned by validate_github_token.
+
+        Returns:
+            - TokenValidation: Parsed validation result.
+        """
+        headers = response.headers
+        scopes = tuple(s.strip() for s in headers.get("X-OAuth-Scopes", "").split(",") if s.strip())
+        rate_limited = response.status_code == 403
+
+        login = None
+        if not rate_limited:
+            try:
+                login = (response.json() or {}).get("login")
+            except ValueError:
+                login = None
+
+        return cls(
+            login=login,
+            scopes=scopes,
+            rate_limit_resource=headers.get("X-RateLimit-Resource"),
+            rate_limit_limit=_to_int(headers.get("X-RateLimit-Limit")),
+            rate_limit_remaining=_to_int(headers.get("X-RateLimit-Remaining")),
+            rate_limit_reset=_to_int(headers.get("X-RateLimit-Reset")),
+            rate_limited=rate_limited,
+        )
+
+    def is_expired(self, ttl: float, now: Optional[float] = None) -> bool:
+        """Return True if the result is older than ttl seconds."""
+        now = time.time() if now is None else now
+        return now - self.validated_at >= ttl
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    """Parse an integer header value, returning None if missing or malformed."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
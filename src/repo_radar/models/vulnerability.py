@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+@dataclass(frozen=True)
+class VulnerabilityMatch:
+    """
+    A known vulnerability affecting a specific package version.
+
+    Attributes:
+        - vuln_id (str): OSV identifier, e.g. 'GHSA-xxxx-xxxx-xxxx' or 'PYSEC-2023-1'.
+        - aliases (Tuple[str, ...]): Other identifiers, usually including the CVE ID.
+        - ecosystem (str): Package ecosystem, e.g. 'PyPI'.
+        - package (str): Package name.
+        - version (str): Affected version in use.
+        - severity (str): CRITICAL, HIGH, MEDIUM, LOW or UNKNOWN.
+        - score (Optional[float]): CVSS base score if one was published.
+        - summary (str): One-line description.
+        - manifests (Tuple[str, ...]): Manifests declaring the affected version.
+    """
+    vuln_id: str
+    aliases: Tuple[str, ...]
+    ecosystem: str
+    package: str
+    version: str
+    severity: str
+    score: Optional[float] = None
+    summary: str = ""
+    manifests: Tuple[str, ...] = ()
+
+    def cve_ids(self) -> Tuple[str, ...]:
+        """Return the CVE identifiers of this vulnerability."""
+        ids = (self.vuln_id,) + self.aliases
+        return tuple(i for i in ids if i.startswith("CVE-"))
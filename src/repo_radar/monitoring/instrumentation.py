@@ -0,0 +1,276 @@
+from __future__ import annotations
+import bisect
+import contextvars
+import json
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import sentry_sdk
+except ImportError:  # Sentry is optional
+    sentry_sdk = None
+
+# Upper bounds (seconds) of the request latency histogram buckets
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments that identify a specific resource are replaced so latencies aggregate per endpoint
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"/compare/[^/]+"), "/compare/{basehead}"),
+    (re.compile(r"/git/(trees|blobs|commits|refs)/.+"), r"/git/\1/{ref}"),
+    (re.compile(r"/(orgs|users)/[^/]+"), r"/\1/{name}"),
+    (re.compile(r"/organizations/[^/]+"), "/organizations/{org}"),
+    (re.compile(r"/projects/[^/]+/[^/]+"), "/projects/{org}/{project}"),
+]
+
+def endpoint_template(url: str) -> str:
+    """
+    Return a low-cardinality endpoint label for a request URL.
+
+    Example:
+        'https://api.github.com/repos/octo/demo/commits?page=2' -> 'api.github.com/repos/{owner}/{repo}/commits'
+    """
+    parts = urlsplit(url)
+    path = parts.path
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return f"{parts.netloc}{path}"
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus/OpenMetrics style."""
+    buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return (le, cumulative count) pairs including +Inf."""
+        out, running = [], 0
+        for bound, n in zip(list(self.buckets) + [float("inf")], self.counts):
+            running += n
+            out.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return out
+
+@dataclass
+class SpanRecord:
+    """Timing of one completed span."""
+    name: str
+    parent: Optional[str]
+    start: float
+    wall_seconds: float
+    cpu_seconds: float
+    tags: Dict[str, str] = field(default_factory=dict)
+
+_current_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("repo_radar_span", default=None)
+
+class Instrumentation:
+    """
+    Thread-safe collector of pipeline timings and API usage.
+
+    Records a span per pipeline stage, per-endpoint request latency
+    histograms, retry counts, rate-limit waits and cache hits, and exports
+    them as JSON or OpenMetrics text. When the Sentry SDK is initialised,
+    spans are also reported as Sentry performance spans.
+
+    Attributes:
+        - spans (List[SpanRecord]): Completed spans in completion order.
+        - latency_buckets (Tuple[float, ...]): Histogram bucket bounds in seconds.
+    """
+    def __init__(self, latency_buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.latency_buckets = latency_buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        with self._lock:
+            self.spans: List[SpanRecord] = []
+            self._latency: Dict[str, Histogram] = {}
+            self._statuses: Dict[Tuple[str, str], int] = {}
+            self._retries: Dict[Tuple[str, str], int] = {}
+            self._rate_limit_waits: Dict[str, Tuple[int, float]] = {}
+            self._cache: Dict[Tuple[str, str], int] = {}
+
+    # --- recording ---
+
+    @contextmanager
+    def span(self, name: str, **tags: str) -> Iterator[None]:
+        """
+        Time a block as a named span, nested under the enclosing span if any.
+
+        Args:
+            - name (str): Span name, e.g. 'fetch' or 'render'.
+            - **tags (str): Extra labels stored with the span.
+        """
+        parent = _current_span.get()
+        token = _current_span.set(name)
+        sentry_span = self._start_sentry_span(name, tags)
+        start, wall0, cpu0 = time.time(), time.perf_counter(), time.process_time()
+        exc_info = (None, None, None)
+        try:
+            yield
+        except BaseException:
+            exc_info = sys.exc_info()  # marks the Sentry span as failed
+            raise
+        finally:
+            record = SpanRecord(name, parent, start, time.perf_counter() - wall0,
+                                time.process_time() - cpu0, {k: str(v) for k, v in tags.items()})
+            with self._lock:
+                self.spans.append(record)
+            if sentry_span is not None:
+                sentry_span.__exit__(*exc_info)
+            _current_span.reset(token)
+
+    def observe_request(self, url: str, seconds: float, status: Optional[int]):
+        """Record the latency and status of one HTTP request."""
+        endpoint = endpoint_template(url)
+        status_label = f"{status // 100}xx" if status else "error"
+        with self._lock:
+            self._latency.setdefault(endpoint, Histogram(self.latency_buckets)).observe(seconds)
+            self._statuses[(endpoint, status_label)] = self._statuses.get((endpoint, status_label), 0) + 1
+
+    def record_retry(self, url: str, reason: str):
+        """Record a retried request."""
+        key = (endpoint_template(url), reason)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def record_rate_limit_wait(self, seconds: float, resource: str = "core"):
+        """Record time spent sleeping for a rate-limit reset."""
+        with self._lock:
+            count, total = self._rate_limit_waits.get(resource, (0, 0.0))
+            self._rate_limit_waits[resource] = (count + 1, total + seconds)
+
+    def record_cache(self, cache: str, hit: bool):
+        """Record a cache lookup."""
+        key = (cache, "hit" if hit else "miss")
+        with self._lock:
+            self._cache[key] = self._cache.get(key, 0) + 1
+
+    # --- export ---
+
+    def snapshot(self) -> dict:
+        """Return everything recorded as a JSON-serialisable dict."""
+        with self._lock:
+            caches: Dict[str, Dict[str, float]] = {}
+            for (cache, result), n in self._cache.items():
+                caches.setdefault(cache, {"hit": 0, "miss": 0})[result] = n
+            for stats in caches.values():
+                lookups = stats["hit"] + stats["miss"]
+                stats["hit_ratio"] = round(stats["hit"] / lookups, 4) if lookups else 0.0
+
+            stages: Dict[str, Dict[str, float]] = {}
+            for s in self.spans:
+                stage = stages.setdefault(s.name, {"count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+                stage["count"] += 1
+                stage["wall_seconds"] += s.wall_seconds
+                stage["cpu_seconds"] += s.cpu_seconds
+
+            return {
+                "spans": [
+                    {"name": s.name, "parent": s.parent, "start": s.start,
+                     "wall_seconds": round(s.wall_seconds, 6), "cpu_seconds": round(s.cpu_seconds, 6), "tags": s.tags}
+                    for s in self.spans
+                ],
+                "stages": {name: {"count": st["count"], "wall_seconds": round(st["wall_seconds"], 6),
+                                  "cpu_seconds": round(st["cpu_seconds"], 6)} for name, st in stages.items()},
+                "requests": {
+                    endpoint: {
+                        "count": h.count,
+                        "total_seconds": round(h.total, 6),
+                        "buckets": dict(h.cumulative()),
+                        "statuses": {st: n for (ep, st), n in self._statuses.items() if ep == endpoint},
+                    }
+                    for endpoint, h in self._latency.items()
+                },
+                "retries": [{"endpoint": ep, "reason": r, "count": n} for (ep, r), n in self._retries.items()],
+                "rate_limit_waits": {res: {"count": c, "seconds": round(t, 3)} for res, (c, t) in self._rate_limit_waits.items()},
+                "caches": caches,
+            }
+
+    def to_json(self) -> str:
+        """Export as JSON."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_openmetrics(self) -> str:
+        """Export in the OpenMetrics text exposition format.
+
+        Spans are summed per stage name, so a stage entered many times, such
+        as one span per repository, is one series with its count.
+        """
+        snap = self.snapshot()
+        lines = ["# TYPE repo_radar_stage_seconds summary",
+                 "# UNIT repo_radar_stage_seconds seconds"]
+        for name, st in snap["stages"].items():
+            for kind in ("wall", "cpu"):
+                labels = f'stage="{name}",kind="{kind}"'
+                lines.append(f'repo_radar_stage_seconds_sum{{{labels}}} {st[f"{kind}_seconds"]}')
+                lines.append(f'repo_radar_stage_seconds_count{{{labels}}} {st["count"]}')
+
+        lines += ["# TYPE repo_radar_http_request_duration_seconds histogram",
+                  "# UNIT repo_radar_http_request_duration_seconds seconds"]
+        for endpoint, r in snap["requests"].items():
+            for le, n in r["buckets"].items():
+                lines.append(f'repo_radar_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{le}"}} {n}')
+            lines.append(f'repo_radar_http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {r["total_seconds"]}')
+            lines.append(f'repo_radar_http_request_duration_seconds_count{{endpoint="{endpoint}"}} {r["count"]}')
+
+        lines.append("# TYPE repo_radar_http_retries counter")
+        for r in snap["retries"]:
+            lines.append(f'repo_radar_http_retries_total{{endpoint="{r["endpoint"]}",reason="{r["reason"]}"}} {r["count"]}')
+
+        lines += ["# TYPE repo_radar_rate_limit_wait_seconds counter",
+                  "# UNIT repo_radar_rate_limit_wait_seconds seconds"]
+        for res, w in snap["rate_limit_waits"].items():
+            lines.append(f'repo_radar_rate_limit_wait_seconds_total{{resource="{res}"}} {w["seconds"]}')
+
+        lines.append("# TYPE repo_radar_cache_lookups counter")
+        for cache, stats in snap["caches"].items():
+            for result in ("hit", "miss"):
+                lines.append(f'repo_radar_cache_lookups_total{{cache="{cache}",result="{result}"}} {stats[result]}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    # --- sentry ---
+
+    @staticmethod
+    def _sentry_enabled() -> bool:
+        return sentry_sdk is not None and sentry_sdk.get_client().is_active()
+
+    def _start_sentry_span(self, name: str, tags: Dict[str, str]):
+        if not self._sentry_enabled():
+            return None
+        span = sentry_sdk.start_span(op="pipeline.stage", name=name)
+        for k, v in tags.items():
+            span.set_tag(k, v)
+        span.__enter__()
+        return span
+
+    @contextmanager
+    def transaction(self, name: str) -> Iterator[None]:
+        """Wrap a whole run in a Sentry transaction when Sentry is enabled."""
+        if not self._sentry_enabled():
+            yield
+            return
+        with sentry_sdk.start_transaction(op="pipeline", name=name):
+            yield
+
+# Process-wide collector used by the API layer and main
+INSTRUMENTATION = Instrumentation()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION, Instrumentation
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class PipelineProfiler:
+    """
+    Profiles a full pipeline run with cProfile and tracemalloc.
+
+    Use as a context manager around the run. On exit, writes next to the
+    report:
+        - profile.pstats: raw cProfile data (open with snakeviz or pstats)
+        - profile.json: per-stage wall/CPU time, top functions, top allocation sites, peak memory
+        - profile.txt: the same summary in readable form
+
+    cProfile only sees the thread that entered the profiler (the event loop,
+    aggregation, charts and rendering); time spent in worker threads shows up
+    in the per-stage wall times instead.
+
+    Attributes:
+        - out_dir (Path): Directory the profile files are written to.
+        - top (int): Number of functions and allocation sites to report.
+        - frames (int): Traceback depth recorded by tracemalloc.
+    """
+    def __init__(self, out_dir: str | Path = "reports", top: int = 25, frames: int = 1,
+                 instrumentation: Instrumentation = INSTRUMENTATION):
+        self.out_dir = Path(out_dir)
+        self.top = top
+        self.frames = frames
+        self.instrumentation = instrumentation
+        self._profiler = cProfile.Profile()
+        self._started = 0.0
+        self.summary: Dict = {}
+
+    def __enter__(self) -> "PipelineProfiler":
+        tracemalloc.start(self.frames)
+        self._started = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler.disable()
+        elapsed = time.perf_counter() - self._started
+        snapshot = tracemalloc.take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.summary = self._summarize(elapsed, snapshot, traced_peak)
+        self._write()
+
+    def _stage_times(self) -> List[Dict]:
+        stages: Dict[str, Dict] = {}
+        for span in self.instrumentation.spans:
+            stage = stages.setdefault(span.name, {"stage": span.name, "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+            stage["calls"] += 1
+            stage["wall_seconds"] += span.wall_seconds
+            stage["cpu_seconds"] += span.cpu_seconds
+        for stage in stages.values():
+            stage["wall_seconds"] = round(stage["wall_seconds"], 6)
+            stage["cpu_seconds"] = round(stage["cpu_seconds"], 6)
+        return sorted(stages.values(), key=lambda s: s["cpu_seconds"], reverse=True)
+
+    def _top_functions(self) -> List[Dict]:
+        stats = pstats.Stats(self._profiler)
+        rows = []
+        for (filename, line, func), (cc, nc, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"function": f"{filename}:{line}({func})", "calls": nc,
+                         "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+        rows.sort(key=lambda r: r["tottime"], reverse=True)
+        return rows[: self.top]
+
+    def _top_allocations(self, snapshot: tracemalloc.Snapshot) -> List[Dict]:
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        return [
+            {"site": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "blocks": stat.count}
+            for stat in snapshot.statistics("lineno")[: self.top]
+        ]
+
+    def _summarize(self, elapsed: float, snapshot: tracemalloc.Snapshot, traced_peak: int) -> Dict:
+        rss = peak_rss_bytes()
+        return {
+            "wall_seconds": round(elapsed, 6),
+            "peak_traced_mb": round(traced_peak / 2**20, 2),
+            "peak_rss_mb": round(rss / 2**20, 2) if rss is not None else None,
+            "stages": self._stage_times(),
+            "top_functions": self._top_functions(),
+            "top_allocations": self._top_allocations(snapshot),
+        }
+
+    def _write(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._profiler.dump_stats(self.out_dir / "profile.pstats")
+        (self.out_dir / "profile.json").write_text(json.dumps(self.summary, indent=2), encoding="utf-8")
+        (self.out_dir / "profile.txt").write_text(self.format_text(), encoding="utf-8")
+
+    def format_text(self) -> str:
+        """Return the profile summary as plain text."""
+        s = self.summary
+        out = io.StringIO()
+        out.write(f"Wall time: {s['wall_seconds']:.3f}s\n")
+        out.write(f"Peak traced memory: {s['peak_traced_mb']} MiB\n")
+        out.write(f"Peak RSS: {s['peak_rss_mb']} MiB\n\n")
+        out.write(f"{'stage':<20}{'calls':>6}{'wall s':>12}{'cpu s':>12}\n")
+        for st in s["stages"]:
+            out.write(f"{st['stage']:<20}{st['calls']:>6}{st['wall_seconds']:>12.4f}{st['cpu_seconds']:>12.4f}\n")
+        out.write("\nTop functions (own time):\n")
+        for f in s["top_functions"]:
+            out.write(f"  {f['tottime']:>10.4f}s {f['calls']:>8}  {f['function']}\n")
+        out.write("\nTop allocation sites:\n")
+        for a in s["top_allocations"]:
+            out.write(f"  {a['size_kb']:>10.1f} KiB {a['blocks']:>8}  {a['site']}\n")
+        return out.getvalue()
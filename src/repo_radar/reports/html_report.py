@@ -0,0 +1,166 @@
+from __future__ import annotations
+import hashlib
+import html
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+from repo_radar.services.lang_analytics import to_percentages
+
+# Part of every section and chart hash: bump it when the markup or charts change, so nothing stale is reused
+TEMPLATE_VERSION = 1
+
+_HEAD = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>body{{font-family:system-ui;margin:24px}} img{{max-width:700px; display:block; margin:8px 0}}
+section.repo{{border-top:1px solid #ddd;padding:4px 0}} .bar{{display:flex;height:10px;max-width:700px}}
+.bar span{{background:hsl(var(--h),55%,55%)}}</style>
+</head><body>
+<h1>{title}</h1>
+"""
+
+def _digest(inputs: Any) -> str:
+    data = json.dumps([TEMPLATE_VERSION, inputs], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+@dataclass
+class Section:
+    """
+    One independently cached part of a report.
+
+    Attributes:
+        - key (str): Unique name of the section, e.g. 'repo:octo/demo'.
+        - inputs (Any): JSON-serializable data the section is rendered from; the section is
+          rendered again only when it changes.
+        - render (Callable[[], str]): Returns the section's HTML.
+    """
+    key: str
+    inputs: Any
+    render: Callable[[], str]
+
+class ReportBuilder:
+    """
+    Writes an HTML report section by section, reusing sections and charts whose inputs did not change.
+
+    Rendered sections are kept as fragments next to the report, with a
+    manifest of the hash of each section's inputs. A build renders only the
+    sections whose hash changed and streams every fragment into the report
+    file, so memory does not grow with the number of sections. Chart images
+    are named after the hash of their data and drawn only if no image of that
+    hash exists.
+
+    Attributes:
+        - out_file (Path): Report written by build.
+        - cache_dir (Path): Directory of the section fragments and their manifest.
+        - rendered (List[str]): Keys of the sections and charts rendered by this builder.
+        - reused (List[str]): Keys of the sections and charts reused from earlier builds.
+    """
+    def __init__(self, out_file: str | Path = "reports/report.html", cache_dir: Optional[str | Path] = None):
+        self.out_file = Path(out_file)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.out_file.parent / ".sections"
+        self.rendered: List[str] = []
+        self.reused: List[str] = []
+        manifest = self.cache_dir / "manifest.json"
+        self._manifest: Dict[str, str] = json.loads(manifest.read_text(encoding="utf-8")) if manifest.exists() else {}
+
+    def chart(self, name: str, data: Any, draw: Callable[[Any, Path], Path]) -> Path:
+        """
+        Return the image of a chart, drawing it only if its data changed.
+
+        Args:
+            - name (str): Chart name, used as the file name prefix.
+            - data (Any): JSON-serializable data the chart is drawn from.
+            - draw (Callable): Called as draw(data, path) to save the image at path.
+
+        Returns:
+            - Path: The image, next to the report.
+        """
+        path = self.out_file.parent / f"{name}-{_digest(data)[:16]}.png"
+        hit = path.exists()
+        INSTRUMENTATION.record_cache("report_charts", hit)
+        if hit:
+            self.reused.append(f"chart:{name}")
+            return path
+        draw(data, path)
+        self.rendered.append(f"chart:{name}")
+        for old in self.out_file.parent.glob(f"{name}-*.png"):
+            if old != path:
+                old.unlink()
+        return path
+
+    def _fragment(self, section: Section) -> Path:
+        digest = _digest(section.inputs)
+        path = self.cache_dir / f"{hashlib.sha256(section.key.encode('utf-8')).hexdigest()[:24]}.html"
+        hit = self._manifest.get(section.key) == digest and path.exists()
+        INSTRUMENTATION.record_cache("report_sections", hit)
+        if hit:
+            self.reused.append(section.key)
+            return path
+        path.write_text(section.render(), encoding="utf-8")
+        self._manifest[section.key] = digest
+        self.rendered.append(section.key)
+        return path
+
+    def build(self, title: str, sections: Iterable[Section]) -> Path:
+        """
+        Write the report from its sections, in order.
+
+        The report is written to a temporary file and moved into place, so
+        readers never see a partial report. Fragments of sections that are no
+        longer part of the report are deleted.
+
+        Args:
+            - title (str): Page title.
+            - sections (Iterable[Section]): Sections of the report; may be a generator.
+
+        Returns:
+            - Path: The report file.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.out_file.with_suffix(self.out_file.suffix + ".tmp")
+        keys = set()
+        with tmp.open("w", encoding="utf-8") as out:
+            out.write(_HEAD.format(title=html.escape(title)))
+            for section in sections:
+                keys.add(section.key)
+                with self._fragment(section).open(encoding="utf-8") as fragment:
+                    for chunk in iter(lambda: fragment.read(64 * 1024), ""):
+                        out.write(chunk)
+                out.write("\n")
+            out.write("</body></html>\n")
+        os.replace(tmp, self.out_file)
+
+        for key in set(self._manifest) - keys:
+            del self._manifest[key]
+        live = {f"{hashlib.sha256(k.encode('utf-8')).hexdigest()[:24]}.html" for k in keys}
+        for fragment in self.cache_dir.glob("*.html"):
+            if fragment.name not in live:
+                fragment.unlink()
+        (self.cache_dir / "manifest.json").write_text(json.dumps(self._manifest, indent=1), encoding="utf-8")
+        return self.out_file
+
+def overview_section(summary: str, metrics_text: str, charts: List[Path], report_dir: Path) -> Section:
+    """The LLM summary, the metrics and the overview charts."""
+    images = [(c.stem.rsplit("-", 1)[0], Path(os.path.relpath(c, report_dir)).as_posix()) for c in charts]
+
+    def render() -> str:
+        imgs = "\n".join(f'<h2>{html.escape(name)}</h2><img src="{html.escape(src)}" alt="{html.escape(name)}">'
+                         for name, src in images)
+        return (f"<section id=\"overview\">\n<h2>LLM overview</h2>\n<p>{html.escape(summary).replace(chr(10), '<br>')}</p>\n"
+                f"<h2>Metrics</h2>\n<pre>{html.escape(metrics_text)}</pre>\n{imgs}\n</section>")
+    return Section("overview", {"summary": summary, "metrics": metrics_text, "charts": images}, render)
+
+def repo_section(repo: str, languages: Dict[str, int], recent_commits: Optional[int]) -> Section:
+    """One repository: its language mix as a bar and its recent commits."""
+    def render() -> str:
+        pairs: List[Tuple[str, float]] = to_percentages(languages)
+        bar = "".join(f'<span style="width:{p:.1f}%;--h:{i * 47 % 360}" title="{html.escape(k)} {p:.1f}%"></span>'
+                      for i, (k, p) in enumerate(pairs))
+        top = ", ".join(f"{html.escape(k)} {p:.1f}%" for k, p in pairs[:5]) or "n/a"
+        commits = "n/a" if recent_commits is None else str(recent_commits)
+        return (f'<section class="repo" id="{html.escape(repo)}">\n'
+                f'<h3><a href="https://github.com/{html.escape(repo)}">{html.escape(repo)}</a></h3>\n'
+                f'<div class="bar">{bar}</div>\n<p>Languages: {top} · Commits (last 4 weeks): {commits}</p>\n</section>')
+    return Section(f"repo:{repo}", {"repo": repo, "languages": languages, "recent_commits": recent_commits}, render)
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Dict, List, Tuple
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.config import BRANCH_COMPARE_CONCURRENCY, GITUB_DEFAULT_DELTA
+from repo_radar.models.branch_drift import BranchDrift, RepoBranchDrift
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.utils.json_codec import decode_json
+
+# Fields of a compare page that drift uses; file lists and patches are dropped while decoding
+_COMPARE_FIELDS = (
+    "status", "ahead_by", "behind_by",
+    "commits.sha", "commits.commit.author.name", "commits.commit.author.date", "commits.commit.message",
+)
+
+def _compact_commit(commit: dict) -> dict:
+    author = commit["commit"]["author"]
+    return {
+        "sha": commit["sha"],
+        "author": author["name"],
+        "date": author["date"],
+        "message": commit["commit"]["message"].split("\n", 1)[0],
+    }
+
+async def branch_drift(
+    client: AbstractGitHubApiClient,
+    url: GitHubUrl,
+    delta: int = GITUB_DEFAULT_DELTA,
+    concurrency: int = BRANCH_COMPARE_CONCURRENCY,
+) -> RepoBranchDrift:
+    """
+    Compare every branch of a repository with its default branch.
+
+    The default branch is read from the repository metadata rather than
+    assumed to be 'main', and its head SHA is used as the base so that all
+    comparisons see the same snapshot. Branches pointing at the same commit
+    share one compare call, branches at the default head need none, and the
+    remaining compares run concurrently. Commits listed by several branches
+    are kept once.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the API calls.
+        - url (GitHubUrl): Repository URL wrapper.
+        - delta (int): Maximum number of days in the past to include commits.
+        - concurrency (int): Maximum compare calls in flight.
+
+    Returns:
+        - RepoBranchDrift: Per-branch ahead/behind summary and the deduplicated commits.
+
+    Raises:
+        - HTTPError: If a request fails.
+    """
+    repo_response, branch_pages = await asyncio.gather(client.get_repository(url), client.get_branches(url))
+    default_branch = (await decode_json(repo_response, ("default_branch",)))["default_branch"]
+    branch_lists = await asyncio.gather(*(decode_json(page, ("name", "commit.sha")) for page in branch_pages))
+    heads = {b["name"]: b["commit"]["sha"] for branches in branch_lists for b in branches}
+    default_sha = heads.get(default_branch, "")
+    base = default_sha or default_branch
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def compare(sha: str) -> Tuple[str, int, int, List[dict]]:
+        async with semaphore:
+            pages = await client.compare_branch(url, sha, delta, base=base)
+        decoded = await asyncio.gather(*(decode_json(page, _COMPARE_FIELDS) for page in pages))
+        first = decoded[0]
+        commits = [c for page in decoded for c in page.get("commits", [])]
+        return first["status"], first["ahead_by"], first["behind_by"], commits
+
+    unique_heads = sorted({sha for sha in heads.values() if sha != default_sha})
+    compared = dict(zip(unique_heads, await asyncio.gather(*(compare(sha) for sha in unique_heads))))
+
+    drift = RepoBranchDrift(url.repo_path(), default_branch, default_sha)
+    shas_by_head: Dict[str, Tuple[str, ...]] = {}
+    for head, (_, _, _, commits) in compared.items():
+        for commit in commits:
+            if commit["sha"] not in drift.commits:
+                drift.commits[commit["sha"]] = _compact_commit(commit)
+        shas_by_head[head] = tuple(c["sha"] for c in commits)
+
+    for name, sha in sorted(heads.items()):
+        if sha == default_sha:
+            drift.branches.append(BranchDrift(name, sha, "identical", 0, 0))
+            continue
+        status, ahead_by, behind_by, _ = compared[sha]
+        drift.branches.append(BranchDrift(name, sha, status, ahead_by, behind_by, shas_by_head[sha]))
+    return drift
@@ -0,0 +1,72 @@
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+from repo_radar.models.pull_timeline import PullTimeline
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, percentiles are then computed in pure Python
+    np = None
+
+def _percentiles(values: List[float], percentiles: Sequence[float]) -> List[Optional[float]]:
+    """Linearly interpolated percentiles, as numpy.percentile computes them by default."""
+    if not values:
+        return [None] * len(percentiles)
+    values = sorted(values)
+    result = []
+    for p in percentiles:
+        rank = (len(values) - 1) * p / 100
+        low, high = math.floor(rank), math.ceil(rank)
+        result.append(values[low] + (values[high] - values[low]) * (rank - low))
+    return result
+
+def _summary(values, percentiles: Sequence[float]) -> Dict[str, Optional[float]]:
+    if np is not None:
+        found = np.percentile(values, percentiles).tolist() if len(values) else [None] * len(percentiles)
+    else:
+        found = _percentiles(values, percentiles)
+    return {"count": len(values), **{f"p{p:g}": v for p, v in zip(percentiles, found)}}
+
+def cycle_time_metrics(
+    timelines: Iterable[PullTimeline],
+    since: Optional[float] = None,
+    percentiles: Sequence[float] = (50, 90),
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Summarize pull request cycle times as percentiles.
+
+    Time to merge covers pull requests merged since 'since', time to first
+    review those that became ready for review since then, and the review
+    count every pull request given. With numpy installed all percentiles are
+    computed on arrays at once.
+
+    Args:
+        - timelines (Iterable[PullTimeline]): Pull request timelines, e.g. from fetch_pull_timelines.
+        - since (float, optional): Unix time the window starts at; None includes everything.
+        - percentiles (Sequence[float]): Percentiles to report, between 0 and 100.
+
+    Returns:
+        - Dict[str, Dict[str, Optional[float]]]: time_to_merge and time_to_first_review (seconds) and
+          reviews, each {'count': n, 'p50': ..., 'p90': ...}; percentiles are None without data.
+    """
+    timelines = list(timelines)
+    start = -math.inf if since is None else since
+    if np is not None:
+        nan = float("nan")
+        created = np.array([t.created_at for t in timelines], dtype=float)
+        ready = np.array([t.ready_at for t in timelines], dtype=float)
+        merged = np.array([nan if t.merged_at is None else t.merged_at for t in timelines], dtype=float)
+        reviewed = np.array([nan if t.first_review_at is None else t.first_review_at for t in timelines], dtype=float)
+        reviews = np.array([t.reviews for t in timelines], dtype=float)
+        # Comparisons with NaN are False, so unmerged and unreviewed pull requests drop out of the masks
+        to_merge = (merged - created)[merged >= start]
+        to_review = np.maximum(reviewed - ready, 0.0)[(ready >= start) & ~np.isnan(reviewed)]
+    else:
+        to_merge = [t.time_to_merge for t in timelines if t.merged_at is not None and t.merged_at >= start]
+        to_review = [t.time_to_first_review for t in timelines
+                     if t.first_review_at is not None and t.ready_at >= start]
+        reviews = [float(t.reviews) for t in timelines]
+    return {
+        "time_to_merge": _summary(to_merge, percentiles),
+        "time_to_first_review": _summary(to_review, percentiles),
+        "reviews": _summary(reviews, percentiles),
+    }
@@ -0,0 +1,203 @@
+from __future__ import annotations
+import asyncio
+import base64
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.config import MANIFEST_FETCH_CONCURRENCY, MANIFEST_PROCESS_POOL_MIN, REPO_FETCH_CONCURRENCY
+from repo_radar.models.dependency import Dependency
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.utils.json_codec import decode_json
+from repo_radar.utils.manifest_parsers import is_manifest, parse_manifests
+
+logger = logging.getLogger(__name__)
+
+# Recursive trees of large repositories run to megabytes; only these fields are kept
+_TREE_FIELDS = ("truncated", "tree.path", "tree.type", "tree.sha")
+
+async def _list_tree(client: AbstractGitHubApiClient, url: GitHubUrl, ref: str, prefix: str = "") -> List[dict]:
+    """
+    List every blob below a tree, falling back to a per-subtree walk if GitHub truncates the result.
+    """
+    tree = await decode_json(await client.get_tree(url, ref, recursive=True), _TREE_FIELDS)
+    entries = [{**e, "path": prefix + e["path"]} for e in tree.get("tree", [])]
+    if not tree.get("truncated"):
+        return [e for e in entries if e.get("type") == "blob"]
+
+    logger.warning(f"Tree {url.repo_path()}:{prefix or '/'} truncated, listing subtrees individually")
+    top = (await decode_json(await client.get_tree(url, ref, recursive=False), _TREE_FIELDS)).get("tree", [])
+    blobs = [{**e, "path": prefix + e["path"]} for e in top if e.get("type") == "blob"]
+    subtrees = await asyncio.gather(*(
+        _list_tree(client, url, e["sha"], f"{prefix}{e['path']}/") for e in top if e.get("type") == "tree"
+    ))
+    for entries in subtrees:
+        blobs.extend(entries)
+    return blobs
+
+async def list_manifests(client: AbstractGitHubApiClient, url: GitHubUrl, ref: str = "HEAD") -> List[Tuple[str, str]]:
+    """
+    Find every dependency manifest and lockfile in a repository with one recursive tree call.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the tree call(s).
+        - url (GitHubUrl): Repository URL wrapper.
+        - ref (str): Branch, tag or commit to scan. Defaults to the default branch.
+
+    Returns:
+        - List[Tuple[str, str]]: (path, blob sha) of each manifest, sorted by path.
+    """
+    blobs = await _list_tree(client, url, ref)
+    return sorted((e["path"], e["sha"]) for e in blobs if is_manifest(e["path"]))
+
+async def fetch_manifests(
+    client: AbstractGitHubApiClient,
+    url: GitHubUrl,
+    manifests: List[Tuple[str, str]],
+    concurrency: int = MANIFEST_FETCH_CONCURRENCY,
+) -> List[Tuple[str, str]]:
+    """
+    Fetch manifest blobs concurrently and decode them to text.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the blob calls.
+        - url (GitHubUrl): Repository URL wrapper.
+        - manifests (List[Tuple[str, str]]): (path, blob sha) pairs from list_manifests.
+        - concurrency (int): Maximum blob requests in flight.
+
+    Returns:
+        - List[Tuple[str, str]]: (path, text) pairs in the order of manifests.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(path: str, sha: str) -> Tuple[str, str]:
+        async with semaphore:
+            response = await client.get_blob(url, sha)
+        blob = await decode_json(response, ("content", "encoding"))
+        content = blob.get("content", "")
+        if blob.get("encoding", "base64") == "base64":
+            content = base64.b64decode(content).decode("utf-8", errors="replace")
+        return path, content
+
+    return list(await asyncio.gather(*(fetch(path, sha) for path, sha in manifests)))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Return the process pool manifests are parsed in, started on first use and shared by every parse_files call."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _parse_pool
+
+async def _discard_parse_pool(pool: ProcessPoolExecutor):
+    # A worker died, so the pool takes no more work; the next parse starts a new one
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    await asyncio.to_thread(pool.shutdown)
+
+async def shutdown_parse_pool():
+    """Stop the shared parse pool, if started, joining its workers off the event loop. The next use starts a new one."""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        await asyncio.to_thread(pool.shutdown)
+
+async def parse_files(files: List[Tuple[str, str]], executor: Optional[Executor] = None) -> List[Dependency]:
+    """
+    Parse manifest texts, in a process pool when there are enough of them to pay off.
+
+    Args:
+        - files (List[Tuple[str, str]]): (path, text) pairs.
+        - executor (Executor, optional): Executor to parse in. By default MANIFEST_PROCESS_POOL_MIN
+          or more files are parsed in the shared pool of get_parse_pool and small batches inline.
+
+    Returns:
+        - List[Dependency]: Every dependency found, in file order.
+    """
+    if not files:
+        return []
+    if executor is None and len(files) < MANIFEST_PROCESS_POOL_MIN:
+        results = parse_manifests(files)
+    else:
+        workers = min(len(files), os.cpu_count() or 1)
+        # One chunk per worker keeps pickling overhead to a single round trip each
+        chunks = [files[i::workers] for i in range(workers)]
+        loop = asyncio.get_running_loop()
+        pool = executor or get_parse_pool()
+        try:
+            parsed = await asyncio.gather(*(loop.run_in_executor(pool, parse_manifests, c) for c in chunks))
+        except BrokenProcessPool:
+            if executor is None:
+                await _discard_parse_pool(pool)
+            raise
+        by_path = {path: deps for chunk, result in zip(chunks, parsed) for (path, _), deps in zip(chunk, result)}
+        results = [by_path[path] for path, _ in files]
+    return [dep for deps in results for dep in deps]
+
+async def discover_dependencies(
+    client: AbstractGitHubApiClient,
+    url: GitHubUrl,
+    ref: str = "HEAD",
+    executor: Optional[Executor] = None,
+) -> List[Dependency]:
+    """
+    Discover every declared and locked dependency of a repository.
+
+    Costs one tree call plus one blob call per manifest, regardless of how
+    many directories the repository has.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for API calls.
+        - url (GitHubUrl): Repository URL wrapper.
+        - ref (str): Branch, tag or commit to scan. Defaults to the default branch.
+        - executor (Executor, optional): Executor used for parsing, see parse_files.
+
+    Returns:
+        - List[Dependency]: Dependencies from every manifest and lockfile.
+    """
+    manifests = await list_manifests(client, url, ref)
+    files = await fetch_manifests(client, url, manifests)
+    return await parse_files(files, executor)
+
+async def collect_dependencies(
+    client: AbstractGitHubApiClient,
+    urls: List[GitHubUrl],
+    concurrency: int = REPO_FETCH_CONCURRENCY,
+) -> Tuple[List[Dependency], Dict[str, str]]:
+    """
+    Discover the dependencies of many repositories on one event loop.
+
+    A repository whose discovery fails is logged and left out, so the others still count.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for API calls.
+        - urls (List[GitHubUrl]): Repositories to scan at their default branch.
+        - concurrency (int): Repositories discovered at once.
+
+    Returns:
+        - Tuple[List[Dependency], Dict[str, str]]: Dependencies of every repository that
+          succeeded, in the order of urls, and the error of each 'org_user/repo' that failed.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    errors: Dict[str, str] = {}
+
+    async def discover(url: GitHubUrl) -> List[Dependency]:
+        async with semaphore:
+            try:
+                return await discover_dependencies(client, url)
+            except Exception as e:
+                logger.warning(f"Could not discover dependencies of {url.repo_path()}: {e}")
+                errors[url.repo_path()] = str(e)
+                return []
+
+    found = await asyncio.gather(*(discover(url) for url in urls))
+    return [dep for deps in found for dep in deps], errors
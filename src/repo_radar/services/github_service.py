@@ -1,23 +1,100 @@
 from __future__ import annotations
 from repo_radar.api.github_client import GitHubClient as Client
+from repo_radar.api.git_local_client import LocalGitClient
+from repo_radar.config import GITHUB_BACKEND
 from repo_radar.models.github_url import GitHubUrl
+from repo_radar.services.branch_drift import branch_drift
+from repo_radar.services.dependency_discovery import collect_dependencies, discover_dependencies, shutdown_parse_pool
+from repo_radar.services.pr_timelines import fetch_pull_timelines
+from repo_radar.services.repo_counts import activity_counts, count_activity, count_commits
+from repo_radar.services.repo_discovery import discover_repos
+from repo_radar.services.report_pipeline import collect_repo_metrics
+from repo_radar.services.repo_state import RepoStateStore
+from repo_radar.services.stats_scheduler import STATS_KINDS, fetch_stats
+from repo_radar.services.watch_scheduler import WatchScheduler
+from repo_radar.utils.json_codec import decode_json
 from requests import Response
 from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 
 class GitHubService:
     
-    def __init__(self, token: str):
-        self.client = Client(token)
+    def __init__(self, token: str, backend: str = GITHUB_BACKEND):
+        if backend == "git":
+            # Git history comes from local mirrors; issues and pulls still need the API
+            self.client = LocalGitClient(token, fallback=Client(token))
+        elif backend == "api":
+            self.client = Client(token)
+        else:
+            raise ValueError(f"Unknown GitHub backend '{backend}', expected 'api' or 'git'")
 
     def _run(self, coro):
         return asyncio.run(coro)
         
+    def discover_repos(self, sources: List[str], skip_archived: bool = False, skip_forks: bool = False):
+        async def collect():
+            return [url async for url in discover_repos(self.client, sources, skip_archived, skip_forks)]
+        return self._run(collect())
+
+    def collect_repo_metrics(self, sources: List[str], skip_archived: bool = False, skip_forks: bool = False):
+        """Discover repos and collect their languages and recent commits in one staged pipeline. Returns a ShardResult."""
+        return self._run(collect_repo_metrics(self.client, sources, skip_archived, skip_forks))
+
     def get_languages(self, url: GitHubUrl):
-        resp: Response = self._run(self.client.get_languages(url))
-        resp.raise_for_status()
-        return resp.json() or {}
+        async def fetch():
+            resp: Response = await self.client.get_languages(url)
+            resp.raise_for_status()
+            return await decode_json(resp) or {}
+        return self._run(fetch())
         
+    def get_dependencies(self, url: GitHubUrl, ref: str = "HEAD"):
+        return self._run(discover_dependencies(self.client, url, ref))
+
+    def collect_dependencies(self, urls: List[GitHubUrl]):
+        """Dependencies of every repo, discovered in one event loop and parse pool; see collect_dependencies."""
+        async def collect():
+            try:
+                return await collect_dependencies(self.client, urls)
+            finally:
+                await shutdown_parse_pool()  # one pool serves every repo, then frees its processes
+        return self._run(collect())
+
+    def shutdown_parse_pool(self):
+        """Stop the worker processes get_dependencies parses large repos in; they start again when needed."""
+        return self._run(shutdown_parse_pool())
+
+    def get_stats(self, urls: List[GitHubUrl], kinds=STATS_KINDS):
+        return self._run(fetch_stats(self.client, urls, kinds))
+
+    def count_activity(self, urls: List[GitHubUrl], since: float):
+        """Issue and pull request counts since a time, summed over the repos, from batched searches; see count_activity."""
+        return self._run(count_activity(self.client, urls, since))
+
+    def activity_counts(self, urls: List[GitHubUrl], store: Optional[RepoStateStore], now: float):
+        """Issue and pull request counts of the activity window, from webhook events where they cover it, else search."""
+        return self._run(activity_counts(self.client, store, urls, now))
+
+    def count_commits(self, urls: List[GitHubUrl], since: float):
+        """Commits since a time per repo, one request each."""
+        return self._run(count_commits(self.client, urls, since))
+
+    def get_pull_timelines(self, urls: List[GitHubUrl], since: Optional[float] = None):
+        """Review and merge timelines of the pull requests updated since a time, from batched GraphQL queries."""
+        return self._run(fetch_pull_timelines(self.client, urls, since))
+
+    def get_branch_drift(self, url: GitHubUrl):
+        return self._run(branch_drift(self.client, url))
+
+    def watch_scheduler(self, repos: List[GitHubUrl], store: Optional[RepoStateStore] = None) -> WatchScheduler:
+        """A WatchScheduler of the repos on this service's client, e.g. to take on-demand refreshes while it runs."""
+        return WatchScheduler(self.client, store or RepoStateStore(), repos)
+
+    def watch(self, repos: List[GitHubUrl], store: Optional[RepoStateStore] = None, max_refreshes: Optional[int] = None,
+              scheduler: Optional[WatchScheduler] = None):
+        """Keep snapshots of the repos fresh in the store until interrupted, see WatchScheduler."""
+        scheduler = scheduler or self.watch_scheduler(repos, store)
+        return self._run(scheduler.run(max_refreshes))
+
     def get_license(self, url: GitHubUrl):
         response = asyncio.run(self.client.get_license(url))
         
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.config import PR_TIMELINE_BATCH, PR_TIMELINE_PAGE_SIZE, PR_TIMELINE_REVIEWS
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.pull_timeline import PullTimeline
+from repo_radar.utils.json_codec import decode_json
+
+logger = logging.getLogger(__name__)
+
+_REVIEW_PAGE = """
+fragment ReviewPage on PullRequestReviewConnection {
+  totalCount
+  pageInfo { hasNextPage endCursor }
+  nodes { submittedAt author { login } }
+}
+"""
+
+# Pull requests, most recently updated first, with everything the cycle time metrics need
+PULL_TIMELINES_QUERY = """
+query PullTimelines($owner: String!, $name: String!, $first: Int!, $after: String, $reviews: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id number createdAt updatedAt mergedAt closedAt
+        author { login }
+        comments { totalCount }
+        readyForReview: timelineItems(itemTypes: [READY_FOR_REVIEW_EVENT], last: 1) {
+          nodes { ... on ReadyForReviewEvent { createdAt } }
+        }
+        reviews(first: $reviews) { ...ReviewPage }
+      }
+    }
+  }
+}
+""" + _REVIEW_PAGE
+
+class GraphQLError(RuntimeError):
+    """Raised when a GraphQL response carries errors instead of data."""
+
+def more_reviews_query(count: int) -> str:
+    """
+    Build a query reading the next page of reviews of several pull requests at once.
+
+    Each pull request i is read through node(id: $id{i}) from cursor $after{i},
+    and its reviews are returned under the alias 'p{i}'.
+
+    Args:
+        - count (int): Number of pull requests in the query.
+
+    Returns:
+        - str: The query document.
+    """
+    params = "".join(f", $id{i}: ID!, $after{i}: String" for i in range(count))
+    fields = "\n".join(
+        f"  p{i}: node(id: $id{i}) {{ ... on PullRequest {{ reviews(first: $reviews, after: $after{i}) {{ ...ReviewPage }} }} }}"
+        for i in range(count)
+    )
+    return f"query MoreReviews($reviews: Int!{params}) {{\n{fields}\n}}\n" + _REVIEW_PAGE
+
+def _messages(body: dict) -> str:
+    return "; ".join(e.get("message", "") for e in body.get("errors") or [])
+
+async def _query(client: AbstractGitHubApiClient, query: str, variables: dict) -> dict:
+    body = await decode_json(await client.graphql(query, variables))
+    if body.get("errors") and not body.get("data"):
+        raise GraphQLError(_messages(body))
+    if body.get("errors"):
+        # Partial data: the fields that failed are null, which callers check for
+        logger.warning(f"GraphQL query returned errors: {_messages(body)}")
+    return body["data"]
+
+def _timestamp(iso: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp() if iso else None
+
+def _login(node: dict) -> Optional[str]:
+    return (node.get("author") or {}).get("login")
+
+def _first_review(timeline: PullTimeline, reviews: List[dict]):
+    """Record the earliest submitted review not written by the author."""
+    for review in reviews:
+        submitted = _timestamp(review.get("submittedAt"))
+        if submitted is None or _login(review) == timeline.author:
+            continue
+        if timeline.first_review_at is None or submitted < timeline.first_review_at:
+            timeline.first_review_at = submitted
+
+def _timeline(repo: str, node: dict) -> PullTimeline:
+    created = _timestamp(node["createdAt"])
+    ready = (node.get("readyForReview") or {}).get("nodes") or []
+    timeline = PullTimeline(
+        repo=repo,
+        number=node["number"],
+        author=_login(node),
+        created_at=created,
+        ready_at=_timestamp(ready[-1].get("createdAt")) if ready else created,
+        merged_at=_timestamp(node.get("mergedAt")),
+        closed_at=_timestamp(node.get("closedAt")),
+        reviews=node["reviews"]["totalCount"],
+        comments=node["comments"]["totalCount"],
+    )
+    _first_review(timeline, node["reviews"]["nodes"])
+    return timeline
+
+async def fetch_pull_timelines(
+    client: AbstractGitHubApiClient,
+    urls: Iterable[GitHubUrl],
+    since: Optional[float] = None,
+    page_size: int = PR_TIMELINE_PAGE_SIZE,
+    reviews: int = PR_TIMELINE_REVIEWS,
+    batch: int = PR_TIMELINE_BATCH,
+) -> List[PullTimeline]:
+    """
+    Fetch the review and merge timelines of pull requests without a request per pull request.
+
+    Each query reads a page of pull requests together with their first
+    reviews, ready-for-review events and comment counts. Pull requests are read
+    most recently updated first, so paging stops at the first one updated
+    before 'since'. Only pull requests with more reviews than were read and no
+    review by someone other than the author yet are continued, 'batch' of them
+    per query, across repositories.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the GraphQL queries.
+        - urls (Iterable[GitHubUrl]): Repositories to read.
+        - since (float, optional): Unix time; pull requests last updated before it are left out.
+        - page_size (int): Pull requests per query, at most 100.
+        - reviews (int): Reviews read per pull request and query, at most 100.
+        - batch (int): Pull requests per review continuation query.
+
+    Returns:
+        - List[PullTimeline]: One timeline per pull request, by repository in the order given.
+          Repositories GraphQL cannot resolve, e.g. deleted or inaccessible ones, are logged and left out.
+
+    Raises:
+        - GraphQLError: If a query is rejected.
+        - HTTPError: If a request fails.
+    """
+    async def repo_timelines(url: GitHubUrl) -> List[Tuple[PullTimeline, dict, dict]]:
+        found, after = [], None
+        while True:
+            data = await _query(client, PULL_TIMELINES_QUERY, {
+                "owner": url.org_user, "name": url.repo, "first": page_size, "after": after, "reviews": reviews,
+            })
+            if data.get("repository") is None:
+                logger.warning(f"Could not read pull requests of {url.repo_path()}, leaving it out")
+                return []
+            page = data["repository"]["pullRequests"]
+            for node in page["nodes"]:
+                if since is not None and _timestamp(node["updatedAt"]) < since:
+                    return found
+                found.append((_timeline(url.repo_path(), node), node, node["reviews"]["pageInfo"]))
+            if not page["pageInfo"]["hasNextPage"]:
+                return found
+            after = page["pageInfo"]["endCursor"]
+
+    per_repo = await asyncio.gather(*(repo_timelines(url) for url in urls))
+    timelines = [t for found in per_repo for t, _, _ in found]
+
+    # Pull request node ID -> (timeline, cursor) of those whose first outside review may be on a later page
+    pending: Dict[str, Tuple[PullTimeline, str]] = {
+        node["id"]: (t, info["endCursor"])
+        for found in per_repo for t, node, info in found
+        if t.first_review_at is None and info["hasNextPage"]
+    }
+    while pending:
+        chunk = list(pending.items())[:batch]
+        variables = {"reviews": reviews}
+        for i, (node_id, (_, cursor)) in enumerate(chunk):
+            variables[f"id{i}"], variables[f"after{i}"] = node_id, cursor
+        data = await _query(client, more_reviews_query(len(chunk)), variables)
+        for i, (node_id, (timeline, _)) in enumerate(chunk):
+            del pending[node_id]
+            page = (data.get(f"p{i}") or {}).get("reviews")
+            if page is None:
+                logger.warning(f"Could not read more reviews of {timeline.repo}#{timeline.number}")
+                continue
+            _first_review(timeline, page["nodes"])
+            if timeline.first_review_at is None and page["pageInfo"]["hasNextPage"]:
+                pending[node_id] = (timeline, page["pageInfo"]["endCursor"])
+    return timelines
@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from repo_radar.api.github_client import AbstractGitHubApiClient, search_repos
+from repo_radar.config import ACTIVITY_WINDOW, REPO_FETCH_CONCURRENCY, SEARCH_QUERY_MAX_LENGTH
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.services.repo_state import RepoStateStore
+
+_ACTIVITY_FIELDS = ("issues_opened", "issues_closed", "pulls_opened", "pulls_merged")
+
+def _search_date(timestamp: float) -> str:
+    """Format a unix time for search date qualifiers, e.g. 'created:>=2025-01-01T00:00:00Z'."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+async def _gather_limited(calls: List, concurrency: int) -> List[int]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call):
+        async with semaphore:
+            return await call()
+    return await asyncio.gather(*(run(c) for c in calls))
+
+def _search_batches(urls: List[GitHubUrl], qualifiers: str, max_length: int = SEARCH_QUERY_MAX_LENGTH) -> List[List[GitHubUrl]]:
+    """Group repositories so each group's search query, qualifiers included, stays within max_length."""
+    batches: List[List[GitHubUrl]] = []
+    for url in urls:
+        if batches and len(search_repos(batches[-1] + [url]) + " is:issue " + qualifiers) <= max_length:
+            batches[-1].append(url)
+        else:
+            batches.append([url])
+    return batches
+
+async def count_activity(
+    client: AbstractGitHubApiClient,
+    urls: Iterable[GitHubUrl],
+    since: float,
+    concurrency: int = REPO_FETCH_CONCURRENCY,
+) -> Dict[str, Any]:
+    """
+    Count issue and pull request activity since a time, summed over repositories.
+
+    Uses search requests instead of listing every issue and pull request.
+    Search ORs 'repo:' qualifiers, so each count covers as many repositories
+    as fit in one query (SEARCH_QUERY_MAX_LENGTH): four requests in all for
+    a few dozen repositories. Search has its own, much smaller rate limit (30
+    per minute), which the client tracks separately from the core limit.
+
+    A repository that does not exist or cannot be searched fails the whole
+    query; the repositories of a failed query are then counted one by one,
+    and those that still fail are left out and reported in 'errors'.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the counts.
+        - urls (Iterable[GitHubUrl]): Repositories to count.
+        - since (float): Unix time the counted window starts at.
+        - concurrency (int): Maximum requests in flight.
+
+    Returns:
+        - Dict[str, Any]: issues_opened, issues_closed, pulls_opened, pulls_merged and
+          covered_since, the same shape as RepoStateStore.activity, plus errors: the
+          error message per 'org_user/repo' left out.
+    """
+    date = _search_date(since)
+    queries = {
+        "issues_opened": (client.count_issues, f"created:>={date}"),
+        "issues_closed": (client.count_issues, f"closed:>={date}"),
+        "pulls_opened": (client.count_pulls, f"created:>={date}"),
+        "pulls_merged": (client.count_pulls, f"is:merged merged:>={date}"),
+    }
+    urls = list(urls)
+    semaphore = asyncio.Semaphore(concurrency)
+    errors: Dict[str, str] = {}
+
+    async def count(counter, qualifiers: str, batch: List[GitHubUrl]) -> int:
+        try:
+            async with semaphore:
+                return await counter(batch, qualifiers)
+        except Exception as e:
+            if len(batch) == 1:
+                errors[batch[0].repo_path()] = str(e)
+                return 0
+        return sum(await asyncio.gather(*(count(counter, qualifiers, [url]) for url in batch)))
+
+    async def total(counter, qualifiers: str) -> int:
+        return sum(await asyncio.gather(*(count(counter, qualifiers, b) for b in _search_batches(urls, qualifiers))))
+
+    results = await asyncio.gather(*(total(counter, qualifiers) for counter, qualifiers in queries.values()))
+    counts: Dict[str, Any] = dict(zip(queries, results))
+    counts["covered_since"] = int(since)
+    counts["errors"] = errors
+    return counts
+
+async def activity_counts(
+    client: AbstractGitHubApiClient,
+    store: Optional[RepoStateStore],
+    urls: Iterable[GitHubUrl],
+    now: float,
+    window: float = ACTIVITY_WINDOW,
+    concurrency: int = REPO_FETCH_CONCURRENCY,
+) -> Dict[str, Any]:
+    """
+    Count issue and pull request activity of a window, from webhooks where they cover it and search otherwise.
+
+    Repositories whose webhook events in the store reach back to the start
+    of the window are counted from those events at no API cost; the others,
+    including repositories that only started receiving events within the
+    window, are counted with count_activity.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the search counts.
+        - store (RepoStateStore, optional): Store of webhook events, if any.
+        - urls (Iterable[GitHubUrl]): Repositories to count.
+        - now (float): Unix time the window ends at.
+        - window (float): Length of the window in seconds.
+        - concurrency (int): Maximum search requests in flight.
+
+    Returns:
+        - Dict[str, Any]: issues_opened, issues_closed, pulls_opened, pulls_merged and
+          covered_since, summed over every repository, and errors, see count_activity.
+    """
+    urls = list(urls)
+    since = now - window
+    covered = set(store.covering([u.repo_path() for u in urls], since)) if store is not None else set()
+    counted = [u for u in urls if u.repo_path() not in covered]
+    parts = [store.activity(covered, now, window)] if covered else []
+    if counted or not parts:
+        parts.append(await count_activity(client, counted, since, concurrency))
+    counts: Dict[str, Any] = {f: sum(p[f] for p in parts) for f in _ACTIVITY_FIELDS}
+    counts["covered_since"] = int(since)
+    counts["errors"] = {repo: e for p in parts for repo, e in p.get("errors", {}).items()}
+    return counts
+
+async def count_commits(
+    client: AbstractGitHubApiClient,
+    urls: Iterable[GitHubUrl],
+    since: float,
+    concurrency: int = REPO_FETCH_CONCURRENCY,
+) -> Dict[str, int]:
+    """
+    Count default-branch commits since a time with one request per repository.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the counts.
+        - urls (Iterable[GitHubUrl]): Repositories to count.
+        - since (float): Unix time to count commits from.
+        - concurrency (int): Maximum requests in flight.
+
+    Returns:
+        - Dict[str, int]: Commit count per 'org_user/repo'.
+
+    Raises:
+        - HTTPError: If a request fails.
+    """
+    urls = list(urls)
+    results = await _gather_limited([lambda u=url: client.count_commits(u, int(since)) for url in urls], concurrency)
+    return {url.repo_path(): count for url, count in zip(urls, results)}
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import sys
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, Set, Tuple, TypeVar
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.config import REPO_FETCH_CONCURRENCY
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.utils.github_parsers import parse_repo_ref
+from repo_radar.utils.json_codec import decode_json, iter_decoded
+from repo_radar.utils.validator import is_valid_github_username
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Fields of a repository listing entry that discovery uses
+_REPO_FIELDS = ("name", "html_url", "owner.login", "archived", "fork")
+
+async def _read_lines(path: str) -> AsyncIterator[str]:
+    """Yield lines of a file, or of stdin for '-', without blocking the event loop while waiting for input."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        while line := await asyncio.to_thread(stream.readline):
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+async def discover_repos(
+    client: AbstractGitHubApiClient,
+    sources: Iterable[str],
+    skip_archived: bool = False,
+    skip_forks: bool = False,
+) -> AsyncIterator[GitHubUrl]:
+    """
+    Yield repositories from listing sources as soon as each page or line arrives.
+
+    Sources are read in order and may be:
+        - 'org:NAME' or 'user:NAME': every repository of an organization or user
+        - 'file:PATH': one repository reference per line ('file:-' reads stdin, '#' starts a comment)
+        - a repository URL or 'owner/repo'
+
+    Repositories are deduplicated case-insensitively and invalid references
+    are logged and skipped. Archived repositories and forks are filtered from
+    listings for free; for explicitly named repositories the filters cost one
+    metadata call each.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for listings and metadata.
+        - sources (Iterable[str]): Source specifications, see above.
+        - skip_archived (bool): Leave out archived repositories.
+        - skip_forks (bool): Leave out forks.
+
+    Yields:
+        - GitHubUrl: Each repository, once.
+
+    Raises:
+        - HTTPError: If a listing or metadata request fails.
+    """
+    seen: Set[str] = set()
+    filtered = skip_archived or skip_forks
+
+    def wanted(repo: dict) -> bool:
+        return not (skip_archived and repo.get("archived")) and not (skip_forks and repo.get("fork"))
+
+    def first_time(url: GitHubUrl) -> bool:
+        key = url.repo_path().lower()
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
+    async def from_ref(ref: str) -> Optional[GitHubUrl]:
+        url = parse_repo_ref(ref)
+        if url is None:
+            logger.warning(f"Skipping invalid repository reference '{ref}'")
+            return None
+        if not first_time(url):
+            return None
+        if filtered and not wanted(await decode_json(await client.get_repository(url), _REPO_FIELDS)):
+            return None
+        return url
+
+    for source in sources:
+        kind, _, value = source.strip().partition(":")
+        if kind in ("org", "user") and value:
+            if not is_valid_github_username(value):
+                logger.warning(f"Skipping invalid {kind} name '{value}'")
+                continue
+            pages = client.iter_owner_repos(value, org=kind == "org", skip_forks=skip_forks)
+            async for page in iter_decoded(pages, _REPO_FIELDS):
+                for repo in page:
+                    url = GitHubUrl(full_url=repo.get("html_url", ""), org_user=repo["owner"]["login"], repo=repo["name"])
+                    if wanted(repo) and first_time(url):
+                        yield url
+        elif kind == "file" and value:
+            async for line in _read_lines(value):
+                if url := await from_ref(line):
+                    yield url
+        elif url := await from_ref(source):
+            yield url
+
+async def fetch_as_discovered(
+    repos: AsyncIterator[GitHubUrl],
+    fetch: Callable[[GitHubUrl], Awaitable[T]],
+    concurrency: int = REPO_FETCH_CONCURRENCY,
+) -> AsyncIterator[Tuple[GitHubUrl, T]]:
+    """
+    Run fetch for each repository while discovery is still listing more.
+
+    At most 'concurrency' fetches run at once; discovery pauses while all
+    slots are busy, so a large listing never queues unbounded work.
+
+    Args:
+        - repos (AsyncIterator[GitHubUrl]): Repositories, e.g. from discover_repos.
+        - fetch (Callable): Coroutine function called with each repository.
+        - concurrency (int): Maximum fetches in flight.
+
+    Yields:
+        - Tuple[GitHubUrl, T]: Each repository with its fetch result, in completion order.
+
+    Raises:
+        - Exception: The first exception raised by discovery or a fetch; pending fetches are cancelled.
+    """
+    pending: Set[asyncio.Task] = set()
+
+    async def run(url: GitHubUrl) -> Tuple[GitHubUrl, T]:
+        return url, await fetch(url)
+
+    try:
+        async for url in repos:
+            pending.add(asyncio.create_task(run(url)))
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from repo_radar.config import ACTIVITY_WINDOW, REPO_STATE_PATH
+from repo_radar.models.repo_state import RepoSnapshot
+
+class RepoStateStore:
+    """
+    Thread-safe store of the latest RepoSnapshot per repository, persisted as JSON.
+
+    Written by watch mode and the webhook receiver, read when building the report.
+
+    Attributes:
+        - path (Path): JSON file the snapshots are loaded from and saved to.
+    """
+    def __init__(self, path: Path = REPO_STATE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, RepoSnapshot] = {}
+        self._version = 0
+        self._saved_version = 0
+        # Per-repository change counters, so readers can tell which repositories changed
+        self._revisions: Dict[str, int] = {}
+        # Identity of the file as this store last read or wrote it, see reload
+        self._file: Optional[Tuple[int, int, int]] = None
+        if self.path.exists():
+            self._file = self._stat()
+            self._snapshots = self._load()
+
+    def _stat(self) -> Tuple[int, int, int]:
+        # Saves replace the file, so its inode changes even where the mtime is too coarse to tell
+        stat = self.path.stat()
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> Dict[str, RepoSnapshot]:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        return {s["repo"]: RepoSnapshot.from_dict(s) for s in data.get("repos", [])}
+
+    def get(self, repo: str) -> Optional[RepoSnapshot]:
+        """Return the snapshot of an 'org_user/repo', if any."""
+        with self._lock:
+            return self._snapshots.get(repo)
+
+    def put(self, snapshot: RepoSnapshot):
+        """Replace the snapshot of a repository."""
+        with self._lock:
+            self._snapshots[snapshot.repo] = snapshot
+            self._version += 1
+            self._revisions[snapshot.repo] = self._revisions.get(snapshot.repo, 0) + 1
+
+    def update(self, repo: str, change: Callable[[RepoSnapshot], None]) -> RepoSnapshot:
+        """
+        Apply an in-place change to a repository's snapshot atomically.
+
+        Args:
+            - repo (str): 'org_user/repo'. An empty snapshot is created for unknown repositories.
+            - change (Callable[[RepoSnapshot], None]): Function modifying the snapshot.
+
+        Returns:
+            - RepoSnapshot: The changed snapshot.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(repo)
+            if snapshot is None:
+                snapshot = self._snapshots[repo] = RepoSnapshot(repo, refreshed_at=0.0, reconcile=True)
+            change(snapshot)
+            self._version += 1
+            self._revisions[repo] = self._revisions.get(repo, 0) + 1
+            return snapshot
+
+    def snapshots(self, repos: Optional[Iterable[str]] = None) -> List[RepoSnapshot]:
+        """Return the snapshots of the given repositories, or of all, sorted by repository."""
+        with self._lock:
+            keys = sorted(self._snapshots) if repos is None else sorted(r for r in repos if r in self._snapshots)
+            return [self._snapshots[k] for k in keys]
+
+    def revisions(self) -> Dict[str, int]:
+        """
+        Return a counter per repository that grows whenever its data changes.
+
+        Render flags such as dirty do not count as changes. Counters start at
+        0 for snapshots loaded from disk and are not persisted.
+        """
+        with self._lock:
+            return {repo: self._revisions.get(repo, 0) for repo in self._snapshots}
+
+    def dirty(self) -> List[str]:
+        """Return repositories whose data changed since the last report render."""
+        with self._lock:
+            return sorted(k for k, s in self._snapshots.items() if s.dirty)
+
+    def mark_clean(self, repos: Iterable[str]):
+        """Clear the dirty flag of rendered repositories."""
+        with self._lock:
+            for repo in repos:
+                if repo in self._snapshots and self._snapshots[repo].dirty:
+                    self._snapshots[repo].dirty = False
+                    self._version += 1
+
+    def covering(self, repos: Iterable[str], since: float) -> List[str]:
+        """
+        Return the repositories whose webhook events cover everything since a time.
+
+        Args:
+            - repos (Iterable[str]): 'org_user/repo' names.
+            - since (float): Unix time the events must reach back to.
+
+        Returns:
+            - List[str]: The repositories that received events since at least 'since', sorted.
+        """
+        return [s.repo for s in self.snapshots(repos) if s.events_since is not None and s.events_since <= since]
+
+    def activity(self, repos: Iterable[str], now: float, window: float = ACTIVITY_WINDOW) -> Optional[Dict[str, int]]:
+        """
+        Sum issue and pull request activity of the window over the given repositories.
+
+        Args:
+            - repos (Iterable[str]): 'org_user/repo' names.
+            - now (float): Unix time the window ends at.
+            - window (float): Length of the window in seconds.
+
+        Returns:
+            - Optional[Dict[str, int]]: Counts of issues_opened, issues_closed, pulls_opened and
+              pulls_merged, or None if no repository has received webhook events.
+        """
+        snapshots = [s for s in self.snapshots(repos) if s.events_since is not None]
+        if not snapshots:
+            return None
+        since = now - window
+        fields = ("issues_opened", "issues_closed", "pulls_opened", "pulls_merged")
+        counts = {f: sum(1 for s in snapshots for t in getattr(s, f) if t >= since) for f in fields}
+        counts["covered_since"] = int(max(s.events_since for s in snapshots))
+        return counts
+
+    def reload(self) -> List[str]:
+        """
+        Load what another process saved to path since this store last read or wrote it.
+
+        Snapshots that differ from the file are replaced and those no longer
+        in it dropped, and their revisions grow, so pages rendered from them
+        are rendered again. Dirty flags alone do not count as changes. Nothing
+        is loaded while this store has unsaved changes; its next save writes
+        over the file anyway.
+
+        Returns:
+            - List[str]: The repositories that changed, sorted.
+        """
+        try:
+            file = self._stat()
+        except FileNotFoundError:
+            return []
+        if file == self._file or self._version != self._saved_version:
+            return []
+        loaded = self._load()
+        with self._lock:
+            if self._version != self._saved_version:
+                return []
+            changed = sorted(
+                repo for repo in set(self._snapshots) | set(loaded)
+                if repo not in self._snapshots or repo not in loaded
+                or replace(self._snapshots[repo], dirty=False) != replace(loaded[repo], dirty=False)
+            )
+            for repo in changed:
+                self._revisions[repo] = self._revisions.get(repo, 0) + 1
+            self._snapshots = loaded
+            self._file = file
+            return changed
+
+    def save(self):
+        """Write the snapshots atomically, so readers never see a partial file."""
+        with self._lock:
+            payload = json.dumps({"repos": [s.to_dict() for s in self._snapshots.values()]}, indent=1)
+            version = self._version
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + f".{threading.get_ident()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._saved_version = version
+        self._file = self._stat()
+
+    def save_if_changed(self) -> bool:
+        """Save only if something changed since the last save. Returns True if it saved."""
+        if self._version == self._saved_version:
+            return False
+        self.save()
+        return True
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from typing import Any, Iterable, List, Optional, Tuple
+from requests import Response
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.config import (
+    PIPELINE_DECODE_WORKERS, PIPELINE_QUEUE_SIZE, REPO_FETCH_CONCURRENCY, STATS_POLL_CONCURRENCY,
+)
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.shard_result import ShardResult
+from repo_radar.services.lang_analytics import merge_language_maps
+from repo_radar.services.repo_discovery import discover_repos
+from repo_radar.services.stats_scheduler import fetch_stats, recent_commit_count
+from repo_radar.utils.json_codec import decode_json
+from repo_radar.utils.pipeline import Stage, run_pipeline
+
+logger = logging.getLogger(__name__)
+
+async def collect_repo_metrics(
+    client: AbstractGitHubApiClient,
+    sources: Iterable[str],
+    skip_archived: bool = False,
+    skip_forks: bool = False,
+    weeks: int = 4,
+    fetch_workers: int = REPO_FETCH_CONCURRENCY,
+    decode_workers: int = PIPELINE_DECODE_WORKERS,
+    stats_workers: int = STATS_POLL_CONCURRENCY,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+) -> ShardResult:
+    """
+    Discover repositories and collect their languages and recent commits in one staged pipeline.
+
+    Discovery feeds four stages connected by bounded queues: fetch (the
+    languages request), decode (its JSON), stats (the commit activity
+    request) and aggregate. A repository is decoded while the next ones are
+    fetched, and discovery pauses while the stages are full, so memory stays
+    bounded for any number of repositories.
+
+    The stats stage sends each repository's commit activity request once,
+    which starts GitHub computing it. Repositories answered with 202 Accepted
+    are polled together by one fetch_stats call once the pipeline is done, so
+    GitHub computes all of them at once and no worker waits on a single
+    repository. Commits of repositories whose activity never arrives are
+    counted directly.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for every request.
+        - sources (Iterable[str]): Discovery sources, see discover_repos.
+        - skip_archived (bool): Leave out archived repositories.
+        - skip_forks (bool): Leave out forks.
+        - weeks (int): Weeks of commits counted.
+        - fetch_workers (int): Languages requests in flight.
+        - decode_workers (int): Responses decoded at once.
+        - stats_workers (int): Commit activity requests in flight, for the first request and the polls.
+        - queue_size (int): Repositories waiting between two stages.
+
+    Returns:
+        - ShardResult: Metrics of every repository, in completion order. Repositories whose
+          languages could not be fetched are listed in errors and left out.
+
+    Raises:
+        - HTTPError: If a discovery listing fails.
+    """
+    result = ShardResult()
+    since = time.time() - weeks * 7 * 86400
+    # Repositories whose commit activity GitHub was still computing when the stats stage asked
+    pending: List[GitHubUrl] = []
+
+    async def fetch(url: GitHubUrl) -> Optional[Tuple[GitHubUrl, Response]]:
+        try:
+            response = await client.get_languages(url)
+            response.raise_for_status()
+        except Exception as e:
+            result.errors[url.repo_path()] = str(e)
+            return None
+        return url, response
+
+    async def decode(item: Tuple[GitHubUrl, Response]) -> Tuple[GitHubUrl, dict]:
+        url, response = item
+        return url, await decode_json(response) or {}
+
+    async def count(url: GitHubUrl, activity: Optional[Any]) -> Optional[int]:
+        try:
+            commits = recent_commit_count(activity, weeks)
+            if commits is None:
+                commits = await client.count_commits(url, since)
+        except Exception as e:
+            logger.warning(f"Commit activity fetch failed for {url.repo_path()}: {e}")
+            commits = None
+        return commits
+
+    def record(url: GitHubUrl, commits: Optional[int]):
+        result.repo_commits[url.repo_path()] = commits
+        if commits is not None:
+            result.recent_commits = (result.recent_commits or 0) + commits
+
+    async def stats(item: Tuple[GitHubUrl, dict]) -> Tuple[GitHubUrl, dict, Optional[int]]:
+        url, languages = item
+        try:
+            response = await client.get_stats(url, "commit_activity")
+        except Exception as e:
+            logger.warning(f"Commit activity fetch failed for {url.repo_path()}: {e}")
+            return url, languages, None
+        if response.status_code == 202:
+            pending.append(url)
+            return url, languages, None
+        activity = [] if response.status_code == 204 else await decode_json(response)
+        return url, languages, await count(url, activity)
+
+    async def aggregate(item: Tuple[GitHubUrl, dict, Optional[int]]):
+        url, languages, commits = item
+        result.repos.append(url.repo_path())
+        result.languages = merge_language_maps([result.languages, languages])
+        result.repo_languages[url.repo_path()] = languages
+        record(url, commits)
+
+    await run_pipeline(discover_repos(client, sources, skip_archived, skip_forks), [
+        Stage("fetch", fetch, fetch_workers, queue_size),
+        Stage("decode", decode, decode_workers, queue_size),
+        Stage("stats", stats, stats_workers, queue_size),
+        Stage("aggregate", aggregate, 1, queue_size),
+    ])
+
+    if pending:
+        try:
+            activity = await fetch_stats(client, pending, ("commit_activity",), concurrency=stats_workers)
+        except Exception as e:
+            logger.warning(f"Commit activity fetch failed for {len(pending)} repos still being computed: {e}")
+            activity = {}
+        semaphore = asyncio.Semaphore(stats_workers)
+
+        async def settle(url: GitHubUrl) -> Optional[int]:
+            async with semaphore:
+                return await count(url, activity.get(url.repo_path(), {}).get("commit_activity"))
+        for url, commits in zip(pending, await asyncio.gather(*(settle(url) for url in pending))):
+            record(url, commits)
+    return result
@@ -0,0 +1,287 @@
+import hashlib
+import html
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from repo_radar.config import (
+    ACTIVITY_WINDOW, REPORT_REFRESH_TIMEOUT, REPORT_SERVER_HOST, REPORT_SERVER_PORT,
+)
+from repo_radar.models.repo_state import RepoSnapshot
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+from repo_radar.services.lang_analytics import merge_language_maps, to_percentages
+from repo_radar.services.repo_state import RepoStateStore
+
+logger = logging.getLogger(__name__)
+
+# '/', '/orgs/NAME' and '/repos/OWNER/NAME', each as HTML or with '.json'
+_ROUTE = re.compile(r"^/(?:(?P<index>index)|orgs/(?P<org>[^/]+?)|repos/(?P<owner>[^/]+)/(?P<repo>[^/]+?))?(?P<json>\.json)?$")
+_REFRESH_ROUTE = re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/refresh$")
+
+_ACTIVITY_FIELDS = ("issues_opened", "issues_closed", "pulls_opened", "pulls_merged")
+
+@dataclass
+class CachedPage:
+    """
+    A rendered report page.
+
+    Attributes:
+        - body (bytes): Response body.
+        - content_type (str): Content-Type header.
+        - etag (str): Quoted hash of the body.
+        - inputs (Tuple): Revisions of the repositories it was rendered from and the hour it was rendered in.
+    """
+    body: bytes
+    content_type: str
+    etag: str
+    inputs: Tuple
+
+def _activity(snapshots: List[RepoSnapshot], since: float) -> Optional[Dict[str, int]]:
+    tracked = [s for s in snapshots if s.events_since is not None]
+    if not tracked:
+        return None
+    return {f: sum(1 for s in tracked for t in getattr(s, f) if t >= since) for f in _ACTIVITY_FIELDS}
+
+def _summary(snapshots: List[RepoSnapshot], now: float) -> dict:
+    commits = [s.recent_commits for s in snapshots if s.recent_commits is not None]
+    issues = [s.open_issues for s in snapshots if s.open_issues is not None]
+    languages = to_percentages(merge_language_maps([s.languages for s in snapshots]))
+    return {
+        "languages": [{"language": k, "percent": round(v, 1)} for k, v in languages],
+        "recent_commits": sum(commits) if commits else None,
+        "open_issues": sum(issues) if issues else None,
+        "activity": _activity(snapshots, now - ACTIVITY_WINDOW),
+        "refreshed_at": max((s.refreshed_at for s in snapshots), default=None),
+    }
+
+def _html(title: str, payload: dict, links: List[Tuple[str, str]]) -> str:
+    rows = "\n".join(
+        f"<tr><th>{html.escape(k.replace('_', ' '))}</th><td>{html.escape(_cell(v))}</td></tr>"
+        for k, v in payload.items() if k != "repos"
+    )
+    items = "\n".join(f'<li><a href="{html.escape(href)}">{html.escape(text)}</a></li>' for href, text in links)
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)} · Repo Radar</title>
+<style>body{{font-family:system-ui;margin:24px}} th{{text-align:left;padding-right:16px}}</style>
+</head><body>
+<h1>{html.escape(title)}</h1>
+<table>
+{rows}
+</table>
+<ul>
+{items}
+</ul>
+</body></html>"""
+
+def _cell(value) -> str:
+    if value is None:
+        return "n/a"
+    if isinstance(value, list):
+        return ", ".join(f"{v['language']} {v['percent']}%" for v in value) or "n/a"
+    if isinstance(value, dict):
+        return ", ".join(f"{k.replace('_', ' ')} {v}" for k, v in value.items())
+    if isinstance(value, float):
+        return time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime(value))
+    return str(value)
+
+class ReportCache:
+    """
+    Renders report pages from a RepoStateStore on first request and caches them.
+
+    Each page remembers the revisions of the repositories it was rendered
+    from (see RepoStateStore.revisions); it is rendered again only once one of
+    those repositories has changed, or the hour has turned and the activity
+    window moved. Pages of other repositories and organizations stay cached.
+
+    Pages:
+        - '/' or '/index': every organization and its repositories
+        - '/orgs/NAME': totals of an organization's or user's repositories
+        - '/repos/OWNER/NAME': one repository
+    Adding '.json' returns the same data as JSON.
+
+    Attributes:
+        - store (RepoStateStore): Store the pages are rendered from.
+    """
+    def __init__(self, store: RepoStateStore, clock: Callable[[], float] = time.time):
+        self.store = store
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pages: Dict[str, CachedPage] = {}
+
+    def get(self, path: str) -> Optional[CachedPage]:
+        """
+        Return the page of a path, rendering it if its data changed.
+
+        Args:
+            - path (str): Request path without query string.
+
+        Returns:
+            - Optional[CachedPage]: The page, or None if the path or its repositories are unknown.
+        """
+        match = _ROUTE.match(path)
+        if match is None:
+            return None
+        revisions = self.store.revisions()
+        if match["org"]:
+            owner = match["org"].lower()
+            revisions = {r: v for r, v in revisions.items() if r.split("/")[0].lower() == owner}
+        elif match["owner"]:
+            repo = f"{match['owner']}/{match['repo']}"
+            revisions = {r: v for r, v in revisions.items() if r.lower() == repo.lower()}
+        if not revisions and (match["org"] or match["owner"]):
+            return None
+
+        now = self.clock()
+        inputs = (int(now // 3600), tuple(sorted(revisions.items())))
+        key = path if match["json"] else path.rstrip("/") or "/"
+        with self._lock:
+            page = self._pages.get(key)
+            INSTRUMENTATION.record_cache("report_pages", page is not None and page.inputs == inputs)
+            if page is None or page.inputs != inputs:
+                page = self._pages[key] = self._render(match, sorted(revisions), now, inputs)
+            return page
+
+    def _render(self, match: re.Match, repos: List[str], now: float, inputs: Tuple) -> CachedPage:
+        snapshots = self.store.snapshots(repos)
+        if match["owner"]:
+            snapshot = snapshots[0]
+            title = snapshot.repo
+            payload = {"repo": snapshot.repo, "default_branch": snapshot.default_branch,
+                       "pushed_at": snapshot.pushed_at, **_summary(snapshots, now)}
+            links = [(f"/orgs/{snapshot.repo.split('/')[0]}", "Organization")]
+        elif match["org"]:
+            title = snapshots[0].repo.split("/")[0]
+            payload = {"org": title, **_summary(snapshots, now), "repos": [s.repo for s in snapshots]}
+            links = [(f"/repos/{s.repo}", s.repo) for s in snapshots]
+        else:
+            title = "Repo Radar"
+            orgs: Dict[str, List[str]] = {}
+            for s in snapshots:
+                orgs.setdefault(s.repo.split("/")[0], []).append(s.repo)
+            payload = {"orgs": {org: len(names) for org, names in orgs.items()}, **_summary(snapshots, now)}
+            links = [(f"/orgs/{org}", f"{org} ({len(names)} repositories)") for org, names in orgs.items()]
+
+        if match["json"]:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        else:
+            body, content_type = _html(title, payload, links).encode("utf-8"), "text/html; charset=utf-8"
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return CachedPage(body, content_type, etag, inputs)
+
+class ReportServer:
+    """
+    Local HTTP server for report pages of the repositories in a RepoStateStore.
+
+    Serves the pages of ReportCache with ETags, answering 304 Not Modified
+    when a client already has the current version. Page requests never call
+    the GitHub API: the store is kept fresh by watch mode and webhooks in
+    the same process, or, with a reload_interval, reloaded from its file
+    whenever another process such as a separate watch run saved it.
+
+    With a refresh callback, such as WatchScheduler.request_refresh, POST
+    '/repos/OWNER/NAME/refresh' refreshes one repository at once and answers
+    with its page as JSON, or 202 Accepted if the refresh takes longer than
+    refresh_timeout.
+
+    Attributes:
+        - cache (ReportCache): Renders and caches the pages.
+        - address (Tuple[str, int]): Host and port the server listens on.
+    """
+    def __init__(
+        self,
+        store: RepoStateStore,
+        host: str = REPORT_SERVER_HOST,
+        port: int = REPORT_SERVER_PORT,
+        clock: Callable[[], float] = time.time,
+        refresh: Optional[Callable[[str], Optional[Future]]] = None,
+        refresh_timeout: float = REPORT_REFRESH_TIMEOUT,
+        reload_interval: Optional[float] = None,
+    ):
+        self.cache = ReportCache(store, clock)
+        self.reload_interval = reload_interval
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        cache = self.cache
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                page = cache.get(self.path.split("?", 1)[0])
+                if page is None:
+                    return self._reply(HTTPStatus.NOT_FOUND, HTTPStatus.NOT_FOUND.phrase.encode(), "text/plain")
+                etags = [t.strip() for t in (self.headers.get("If-None-Match") or "").split(",")]
+                if page.etag in etags or "*" in etags:
+                    return self._reply(HTTPStatus.NOT_MODIFIED, b"", None, page.etag)
+                self._reply(HTTPStatus.OK, page.body, page.content_type, page.etag)
+
+            def do_POST(self):
+                match = _REFRESH_ROUTE.match(self.path.split("?", 1)[0])
+                pending = refresh(match["repo"]) if match and refresh else None
+                if pending is None:
+                    return self._reply(HTTPStatus.NOT_FOUND, HTTPStatus.NOT_FOUND.phrase.encode(), "text/plain")
+                try:
+                    snapshot = pending.result(timeout=refresh_timeout)
+                except FutureTimeoutError:
+                    return self._reply(HTTPStatus.ACCEPTED, HTTPStatus.ACCEPTED.phrase.encode(), "text/plain")
+                except Exception as e:
+                    logger.warning(f"On-demand refresh of {match['repo']} failed: {e}")
+                    return self._reply(HTTPStatus.BAD_GATEWAY, str(e).encode("utf-8"), "text/plain")
+                page = cache.get(f"/repos/{snapshot.repo}.json")
+                self._reply(HTTPStatus.OK, page.body, page.content_type, page.etag)
+
+            def _reply(self, status: HTTPStatus, body: bytes, content_type: Optional[str], etag: Optional[str] = None):
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                if etag:
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", "no-cache")
+                if status != HTTPStatus.NOT_MODIFIED:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.address = self._httpd.server_address[:2]
+
+    def _reload(self):
+        while not self._stopped.wait(self.reload_interval):
+            try:
+                changed = self.cache.store.reload()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Reloading {self.cache.store.path} failed: {e}")
+                continue
+            if changed:
+                logger.info(f"Reloaded {len(changed)} changed repositories from {self.cache.store.path}")
+
+    def start(self) -> "ReportServer":
+        """Serve in background threads until stop() is called."""
+        self._threads = [threading.Thread(target=self._httpd.serve_forever, name="report-server", daemon=True)]
+        if self.reload_interval is not None:
+            self._threads.append(threading.Thread(target=self._reload, name="report-reload", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self._stopped.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "ReportServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
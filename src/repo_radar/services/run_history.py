@@ -0,0 +1,133 @@
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from repo_radar.config import RUN_HISTORY_DIR, RUN_HISTORY_KEEP
+from repo_radar.models.run_snapshot import RunSnapshot
+from repo_radar.utils.columnar import ColumnReader, write_columns
+
+logger = logging.getLogger(__name__)
+
+# Trend periods in seconds. A baseline may be up to a tenth of the period younger, so a
+# weekly run that started a few hours late still counts as last week's.
+TREND_PERIODS = {"week": 7 * 86400, "month": 30 * 86400}
+
+class RunHistory:
+    """
+    Versioned snapshots of report runs with a manifest, for trends without API calls.
+
+    Each run is one columnar file (see repo_radar.utils.columnar); manifest.json
+    lists them oldest first. Baselines are read through a memory map, and only
+    the metric values a trend needs are decoded.
+
+    Attributes:
+        - directory (Path): Where snapshots and the manifest are kept.
+        - keep (int): Number of most recent runs retained; older files are deleted.
+    """
+    def __init__(self, directory: Path = RUN_HISTORY_DIR, keep: int = RUN_HISTORY_KEEP):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.manifest_path = self.directory / "manifest.json"
+
+    def runs(self) -> List[dict]:
+        """Return manifest entries (file, created_at, repos), oldest first."""
+        if not self.manifest_path.exists():
+            return []
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))["runs"]
+
+    def _write_manifest(self, runs: List[dict]):
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"version": 1, "runs": runs}, indent=1), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def record(self, snapshot: RunSnapshot) -> Path:
+        """
+        Persist a run and drop the oldest beyond 'keep'.
+
+        Args:
+            - snapshot (RunSnapshot): Metrics of the run.
+
+        Returns:
+            - Path: The snapshot file written.
+        """
+        name = time.strftime("run-%Y%m%dT%H%M%SZ", time.gmtime(snapshot.created_at)) + ".rrcol"
+        path = self.directory / name
+        metric_names = list(snapshot.metrics)
+        series_names = list(snapshot.series)
+        columns = {
+            "metrics": ("f8", [math.nan if snapshot.metrics[m] is None else snapshot.metrics[m] for m in metric_names]),
+            "repos": ("str", snapshot.repos),
+            "languages.name": ("str", list(snapshot.languages)),
+            "languages.share": ("f8", list(snapshot.languages.values())),
+        }
+        for s in series_names:
+            columns[f"series.{s}.t"] = ("f8", [t for t, _ in snapshot.series[s]])
+            columns[f"series.{s}.v"] = ("f8", [v for _, v in snapshot.series[s]])
+        meta = {"created_at": snapshot.created_at, "metrics": metric_names, "series": series_names}
+        write_columns(path, meta, columns)
+
+        runs = [r for r in self.runs() if r["file"] != name]
+        runs.append({"file": name, "created_at": snapshot.created_at, "repos": len(snapshot.repos)})
+        runs.sort(key=lambda r: r["created_at"])
+        expired, runs = runs[:-self.keep], runs[-self.keep:]
+        self._write_manifest(runs)
+        for run in expired:
+            (self.directory / run["file"]).unlink(missing_ok=True)
+        return path
+
+    def load(self, entry: dict) -> RunSnapshot:
+        """Read a whole run back from its manifest entry."""
+        with ColumnReader(self.directory / entry["file"]) as reader:
+            values = reader.column("metrics")
+            return RunSnapshot(
+                created_at=reader.meta["created_at"],
+                repos=reader.column("repos"),
+                metrics={m: None if math.isnan(v) else v for m, v in zip(reader.meta["metrics"], values)},
+                languages=dict(zip(reader.column("languages.name"), reader.column("languages.share"))),
+                series={
+                    s: list(zip(reader.column(f"series.{s}.t"), reader.column(f"series.{s}.v")))
+                    for s in reader.meta["series"]
+                },
+            )
+
+    def baseline(self, before: float, period: float) -> Optional[dict]:
+        """Return the latest run at least 'period' older than 'before' (within a tenth of it), or None."""
+        cutoff = before - period * 0.9
+        candidates = [r for r in self.runs() if r["created_at"] <= cutoff]
+        return candidates[-1] if candidates else None
+
+    def deltas(self, snapshot: RunSnapshot, periods: Dict[str, float] = TREND_PERIODS) -> Dict[str, dict]:
+        """
+        Compare a run's metrics with earlier runs.
+
+        Args:
+            - snapshot (RunSnapshot): The current run, usually not recorded yet.
+            - periods (Dict[str, float]): Seconds to look back per period name.
+
+        Returns:
+            - Dict[str, dict]: Per period with a baseline, 'since' (the baseline's unix time)
+              and 'metrics', the change of every metric known in both runs.
+        """
+        trends = {}
+        for period, seconds in periods.items():
+            entry = self.baseline(snapshot.created_at, seconds)
+            if entry is None:
+                continue
+            try:
+                with ColumnReader(self.directory / entry["file"]) as reader:
+                    index = {m: i for i, m in enumerate(reader.meta["metrics"])}
+                    changes = {}
+                    for name, value in snapshot.metrics.items():
+                        if value is None or name not in index:
+                            continue
+                        previous = reader.value("metrics", index[name])
+                        if not math.isnan(previous):
+                            changes[name] = value - previous
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable run snapshot {entry['file']}: {e}")
+                continue
+            trends[period] = {"since": entry["created_at"], "metrics": changes}
+        return trends
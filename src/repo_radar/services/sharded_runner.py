@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import reduce
+from typing import List, Optional, Sequence
+from repo_radar.config import GITHUB_BACKEND, REPO_FETCH_CONCURRENCY, SHARD_WORKERS
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.shard_result import ShardResult
+from repo_radar.services.lang_analytics import merge_language_maps
+from repo_radar.services.stats_scheduler import fetch_stats, recent_commit_count
+from repo_radar.utils.json_codec import decode_json
+
+logger = logging.getLogger(__name__)
+
+async def _collect(client, repos: List[GitHubUrl], concurrency: int) -> ShardResult:
+    semaphore = asyncio.Semaphore(concurrency)
+    result = ShardResult()
+
+    async def languages(url: GitHubUrl) -> Optional[dict]:
+        try:
+            async with semaphore:
+                response = await client.get_languages(url)
+            response.raise_for_status()
+            return await decode_json(response) or {}
+        except Exception as e:
+            result.errors[url.repo_path()] = str(e)
+            return None
+
+    lang_maps = await asyncio.gather(*(languages(url) for url in repos))
+    collected = [url for url, langs in zip(repos, lang_maps) if langs is not None]
+    result.repos = [url.repo_path() for url in collected]
+    result.languages = merge_language_maps([langs for langs in lang_maps if langs is not None])
+    result.repo_languages = {url.repo_path(): langs for url, langs in zip(repos, lang_maps) if langs is not None}
+    try:
+        stats = await fetch_stats(client, collected, ("commit_activity",))
+    except Exception as e:
+        logger.warning(f"Commit activity fetch failed for a shard of {len(collected)} repos: {e}")
+        return result
+    result.repo_commits = {repo: recent_commit_count(s["commit_activity"]) for repo, s in stats.items()}
+    known = [c for c in result.repo_commits.values() if c is not None]
+    result.recent_commits = sum(known) if known else None
+    return result
+
+def collect_shard(
+    repos: List[GitHubUrl],
+    token: str,
+    backend: str = GITHUB_BACKEND,
+    concurrency: int = REPO_FETCH_CONCURRENCY,
+) -> ShardResult:
+    """
+    Collect languages and recent commit counts of some repositories on a fresh event loop.
+
+    Runs in a worker process, so it builds its own client from the token
+    rather than sharing the parent's connections and rate-limit state.
+
+    Args:
+        - repos (List[GitHubUrl]): Repositories of this shard.
+        - token (str): GitHub token the shard's requests are made with.
+        - backend (str): 'api' or 'git', see GitHubService.
+        - concurrency (int): Repositories fetched at once within the shard.
+
+    Returns:
+        - ShardResult: Metrics of the shard. Repositories that failed are listed in errors.
+    """
+    # Imported here so a spawned worker only pays for the service imports it uses
+    from repo_radar.services.github_service import GitHubService
+    client = GitHubService(token, backend).client
+    return asyncio.run(_collect(client, repos, concurrency))
+
+def collect_sharded(
+    repos: Sequence[GitHubUrl],
+    tokens: Sequence[str],
+    workers: int = SHARD_WORKERS,
+    backend: str = GITHUB_BACKEND,
+    executor: Optional[Executor] = None,
+) -> ShardResult:
+    """
+    Collect repository metrics across worker processes and merge the results.
+
+    Repositories are dealt round-robin into one shard per worker, so large
+    and small organizations spread evenly. Each worker runs its own event
+    loop, decodes its own JSON and computes its own partial metrics; shard i
+    uses tokens[i % len(tokens)], so several tokens multiply the rate budget.
+    The parent only reduces the partial results with ShardResult.merge.
+
+    Args:
+        - repos (Sequence[GitHubUrl]): Repositories to collect.
+        - tokens (Sequence[str]): GitHub tokens to spread over the shards, at least one.
+        - workers (int): Number of shards. 1 collects in this process.
+        - backend (str): 'api' or 'git', see GitHubService.
+        - executor (Executor, optional): Executor to run the shards in. By default a
+          process pool with one process per shard is created.
+
+    Returns:
+        - ShardResult: Merged metrics of every repository.
+    """
+    if not tokens:
+        raise ValueError("At least one GitHub token is required")
+    shards = [list(repos[i::workers]) for i in range(max(1, workers))]
+    shards = [s for s in shards if s]
+    if not shards:
+        return ShardResult()
+    if executor is None and len(shards) == 1:
+        return collect_shard(shards[0], tokens[0], backend)
+
+    pool = executor or ProcessPoolExecutor(max_workers=len(shards))
+    try:
+        futures = [pool.submit(collect_shard, shard, tokens[i % len(tokens)], backend) for i, shard in enumerate(shards)]
+        results = [f.result() for f in futures]
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return reduce(ShardResult.merge, results, ShardResult())
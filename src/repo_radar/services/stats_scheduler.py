@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, Iterable, List, Optional
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.config import (
+    STATS_POLL_CONCURRENCY, STATS_POLL_INITIAL_DELAY, STATS_POLL_MAX_DELAY, STATS_POLL_TIMEOUT,
+)
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+from repo_radar.utils.json_codec import decode_json
+
+logger = logging.getLogger(__name__)
+
+STATS_KINDS = ("commit_activity", "contributors", "code_frequency", "participation")
+
+async def fetch_stats(
+    client: AbstractGitHubApiClient,
+    urls: Iterable[GitHubUrl],
+    kinds: Iterable[str] = STATS_KINDS,
+    concurrency: int = STATS_POLL_CONCURRENCY,
+    initial_delay: float = STATS_POLL_INITIAL_DELAY,
+    max_delay: float = STATS_POLL_MAX_DELAY,
+    timeout: float = STATS_POLL_TIMEOUT,
+    jitter: float = 0.25,
+) -> Dict[str, Dict[str, Optional[Any]]]:
+    """
+    Fetch background-computed statistics for many repositories at once.
+
+    Every (repository, kind) request is sent up front, so GitHub computes all
+    pending statistics in parallel. Requests answered with 202 Accepted are
+    then polled concurrently, each with its own exponential backoff and
+    jitter, until they are ready or the timeout expires. Total wall time is
+    roughly that of the slowest statistic rather than the sum of all of them.
+
+    Args:
+        - client (AbstractGitHubApiClient): Client used for the stats calls.
+        - urls (Iterable[GitHubUrl]): Repositories to fetch statistics for.
+        - kinds (Iterable[str]): Statistics to fetch, see STATS_KINDS.
+        - concurrency (int): Maximum requests in flight.
+        - initial_delay (float): Seconds before the first re-poll of a pending statistic.
+        - max_delay (float): Upper bound of the backoff between polls.
+        - timeout (float): Seconds after which still-pending statistics are given up.
+        - jitter (float): Relative random spread of each delay, so polls do not synchronise.
+
+    Returns:
+        - Dict[str, Dict[str, Optional[Any]]]: Parsed JSON per 'org_user/repo' and kind.
+          Statistics of empty repositories are [] and timed-out ones are None.
+
+    Raises:
+        - HTTPError: If a stats request fails with an error status.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    async def poll(url: GitHubUrl, kind: str) -> Optional[Any]:
+        delay = initial_delay
+        while True:
+            async with semaphore:
+                response = await client.get_stats(url, kind)
+            if response.status_code == 204:
+                return []
+            if response.status_code != 202:
+                return await decode_json(response)
+            INSTRUMENTATION.record_retry(response.url or url.api_stats_path(kind), "202")
+            wait = min(delay, max_delay) * random.uniform(1 - jitter, 1 + jitter)
+            if loop.time() + wait > deadline:
+                logger.warning(f"stats/{kind} for {url.repo_path()} still computing after {timeout}s, skipping")
+                return None
+            await asyncio.sleep(wait)
+            delay *= 2
+
+    urls = list(urls)
+    kinds = list(kinds)
+    jobs = [(url, kind) for url in urls for kind in kinds]
+    results: List[Optional[Any]] = await asyncio.gather(*(poll(url, kind) for url, kind in jobs))
+
+    stats: Dict[str, Dict[str, Optional[Any]]] = {url.repo_path(): {} for url in urls}
+    for (url, kind), result in zip(jobs, results):
+        stats[url.repo_path()][kind] = result
+    return stats
+
+def recent_commit_count(commit_activity: Optional[List[dict]], weeks: int = 4) -> Optional[int]:
+    """
+    Sum the commits of the last weeks of a stats/commit_activity result.
+
+    Args:
+        - commit_activity (List[dict], optional): Weekly entries, oldest first.
+        - weeks (int): Number of most recent weeks to include.
+
+    Returns:
+        - Optional[int]: Commit count, or None if the statistic was not available.
+    """
+    if commit_activity is None:
+        return None
+    return sum(week.get("total", 0) for week in commit_activity[-weeks:])
@@ -0,0 +1,292 @@
+"""
+Offline index of OSV vulnerability records.
+
+Import an OSV dump (e.g. https://osv-vulnerabilities.storage.googleapis.com/PyPI/all.zip)
+once, then match thousands of dependencies in a single SQL pass without network access:
+
+    python -m repo_radar.services.vulnerability_index import PyPI-all.zip npm-all.zip
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import sqlite3
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from repo_radar.config import OSV_INDEX_PATH
+from repo_radar.models.dependency import Dependency
+from repo_radar.models.vulnerability import VulnerabilityMatch
+from repo_radar.utils.manifest_parsers import normalize_pypi_name
+from repo_radar.utils.version_keys import version_key
+
+SEVERITY_ORDER = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "UNKNOWN")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vulns (
+    id TEXT PRIMARY KEY, aliases TEXT, severity TEXT, score REAL, summary TEXT, modified TEXT
+);
+CREATE TABLE IF NOT EXISTS ranges (
+    ecosystem TEXT, package TEXT, vuln_id TEXT, lo TEXT, hi TEXT, hi_inclusive INTEGER
+);
+CREATE TABLE IF NOT EXISTS versions (
+    ecosystem TEXT, package TEXT, vuln_id TEXT, key TEXT
+);
+CREATE INDEX IF NOT EXISTS ranges_pkg ON ranges (ecosystem, package, lo);
+CREATE INDEX IF NOT EXISTS versions_pkg ON versions (ecosystem, package, key);
+CREATE INDEX IF NOT EXISTS ranges_vuln ON ranges (vuln_id);
+CREATE INDEX IF NOT EXISTS versions_vuln ON versions (vuln_id);
+"""
+
+# --- CVSS ---
+
+_CVSS3_WEIGHTS = {
+    "AV": {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2},
+    "AC": {"L": 0.77, "H": 0.44},
+    "UI": {"N": 0.85, "R": 0.62},
+    "CIA": {"H": 0.56, "L": 0.22, "N": 0.0},
+}
+
+def _roundup(value: float) -> float:
+    """CVSS v3.1 Roundup: smallest one-decimal number >= value."""
+    scaled = round(value * 100000)
+    if scaled % 10000 == 0:
+        return scaled / 100000.0
+    return (math.floor(scaled / 10000) + 1) / 10.0
+
+def cvss3_base_score(vector: str) -> Optional[float]:
+    """
+    Compute the base score of a CVSS v3.x vector string.
+
+    Args:
+        - vector (str): e.g. 'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H'
+
+    Returns:
+        - Optional[float]: Base score between 0.0 and 10.0, or None if the vector is not CVSS v3.
+    """
+    if not vector.startswith("CVSS:3"):
+        return None
+    try:
+        m = dict(part.split(":", 1) for part in vector.split("/")[1:])
+        changed = m["S"] == "C"
+        pr = {"N": 0.85, "L": 0.68 if changed else 0.62, "H": 0.5 if changed else 0.27}[m["PR"]]
+        c, i, a = (_CVSS3_WEIGHTS["CIA"][m[k]] for k in ("C", "I", "A"))
+        iss = 1 - (1 - c) * (1 - i) * (1 - a)
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15 if changed else 6.42 * iss
+        exploitability = 8.22 * _CVSS3_WEIGHTS["AV"][m["AV"]] * _CVSS3_WEIGHTS["AC"][m["AC"]] * pr * _CVSS3_WEIGHTS["UI"][m["UI"]]
+    except (KeyError, ValueError):
+        return None
+    if impact <= 0:
+        return 0.0
+    total = 1.08 * (impact + exploitability) if changed else impact + exploitability
+    return _roundup(min(total, 10.0))
+
+def severity_from_score(score: Optional[float]) -> str:
+    """Map a CVSS base score to its qualitative rating."""
+    if score is None:
+        return "UNKNOWN"
+    if score >= 9.0:
+        return "CRITICAL"
+    if score >= 7.0:
+        return "HIGH"
+    if score >= 4.0:
+        return "MEDIUM"
+    return "LOW" if score > 0 else "UNKNOWN"
+
+def _severity(record: dict) -> Tuple[str, Optional[float]]:
+    """Return (severity, score) from an OSV record's CVSS vectors or database_specific rating."""
+    scores = [cvss3_base_score(s.get("score", "")) for s in record.get("severity", []) if s.get("type", "").startswith("CVSS_V3")]
+    scores = [s for s in scores if s is not None]
+    score = max(scores) if scores else None
+    if score is not None:
+        return severity_from_score(score), score
+    label = str((record.get("database_specific") or {}).get("severity", "")).upper()
+    label = {"MODERATE": "MEDIUM"}.get(label, label)
+    return (label if label in SEVERITY_ORDER else "UNKNOWN"), None
+
+# --- OSV records ---
+
+def _normalize_package(ecosystem: str, name: str) -> str:
+    return normalize_pypi_name(name) if ecosystem == "PyPI" else name
+
+def _intervals(events: List[dict], ecosystem: str) -> Iterator[Tuple[str, Optional[str], int]]:
+    """Turn an OSV range's events into (lo, hi, hi_inclusive) key intervals."""
+    lo: Optional[str] = None
+    for event in events:
+        if "introduced" in event:
+            lo = "" if event["introduced"] == "0" else version_key(event["introduced"], ecosystem)
+        elif "fixed" in event and lo is not None:
+            yield lo, version_key(event["fixed"], ecosystem), 0
+            lo = None
+        elif "last_affected" in event and lo is not None:
+            yield lo, version_key(event["last_affected"], ecosystem), 1
+            lo = None
+    if lo is not None:
+        yield lo, None, 0
+
+def iter_osv_records(source: str | Path) -> Iterator[dict]:
+    """Yield OSV records from a .json file, a directory of .json files or a .zip dump."""
+    source = Path(source)
+    if source.is_dir():
+        for path in sorted(source.rglob("*.json")):
+            yield json.loads(path.read_text(encoding="utf-8"))
+    elif source.suffix == ".zip":
+        with zipfile.ZipFile(source) as zf:
+            for name in zf.namelist():
+                if name.endswith(".json"):
+                    yield json.loads(zf.read(name))
+    else:
+        data = json.loads(source.read_text(encoding="utf-8"))
+        yield from (data if isinstance(data, list) else [data])
+
+class VulnerabilityIndex:
+    """
+    SQLite-backed index of OSV records keyed by (ecosystem, package).
+
+    Affected version ranges are stored as precomputed intervals of sortable
+    version keys (see utils.version_keys), so matching a batch of
+    dependencies is a single indexed range join.
+
+    Attributes:
+        - path (Path): Location of the SQLite database.
+    """
+    def __init__(self, path: str | Path = OSV_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> "VulnerabilityIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def import_records(self, records: Iterable[dict]) -> int:
+        """
+        Add or replace OSV records.
+
+        Args:
+            - records (Iterable[dict]): OSV-format vulnerability records.
+
+        Returns:
+            - int: Number of records imported. Withdrawn records are skipped.
+        """
+        count = 0
+        with self._conn:
+            for record in records:
+                if record.get("withdrawn"):
+                    continue
+                vuln_id = record["id"]
+                severity, score = _severity(record)
+                self._conn.execute("DELETE FROM ranges WHERE vuln_id = ?", (vuln_id,))
+                self._conn.execute("DELETE FROM versions WHERE vuln_id = ?", (vuln_id,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO vulns VALUES (?, ?, ?, ?, ?, ?)",
+                    (vuln_id, json.dumps(record.get("aliases", [])), severity, score,
+                     record.get("summary") or (record.get("details") or "")[:200], record.get("modified")),
+                )
+                range_rows, version_rows = [], []
+                for affected in record.get("affected", []):
+                    pkg = affected.get("package", {})
+                    ecosystem = pkg.get("ecosystem", "").split(":", 1)[0]
+                    name = _normalize_package(ecosystem, pkg.get("name", ""))
+                    for rng in affected.get("ranges", []):
+                        if rng.get("type") == "GIT":
+                            continue
+                        for lo, hi, inclusive in _intervals(rng.get("events", []), ecosystem):
+                            if lo is not None:
+                                range_rows.append((ecosystem, name, vuln_id, lo, hi, inclusive))
+                    for version in affected.get("versions", []):
+                        key = version_key(version, ecosystem)
+                        if key:
+                            version_rows.append((ecosystem, name, vuln_id, key))
+                self._conn.executemany("INSERT INTO ranges VALUES (?, ?, ?, ?, ?, ?)", range_rows)
+                self._conn.executemany("INSERT INTO versions VALUES (?, ?, ?, ?)", version_rows)
+                count += 1
+        return count
+
+    def import_osv(self, source: str | Path) -> int:
+        """Import an OSV dump (.zip, directory or .json file). Returns the number of records."""
+        return self.import_records(iter_osv_records(source))
+
+    def match(self, dependencies: Iterable[Dependency]) -> List[VulnerabilityMatch]:
+        """
+        Match dependencies against the index in one bulk pass.
+
+        Only dependencies with an exact version (pinned or from a lockfile)
+        can be matched. Duplicate (ecosystem, package, version) triples are
+        checked once and report every manifest they came from.
+
+        Args:
+            - dependencies (Iterable[Dependency]): Dependencies to check.
+
+        Returns:
+            - List[VulnerabilityMatch]: One entry per (vulnerability, package version), most severe first.
+        """
+        manifests: Dict[Tuple[str, str, str], set] = defaultdict(set)
+        for dep in dependencies:
+            if dep.version:
+                manifests[(dep.ecosystem, _normalize_package(dep.ecosystem, dep.name), dep.version)].add(dep.manifest)
+        if not manifests:
+            return []
+
+        rows = [(eco, name, ver, version_key(ver, eco)) for eco, name, ver in manifests]
+        cur = self._conn.cursor()
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS q (ecosystem TEXT, package TEXT, version TEXT, key TEXT)")
+        cur.execute("DELETE FROM q")
+        cur.executemany("INSERT INTO q VALUES (?, ?, ?, ?)", [r for r in rows if r[3]])
+        cur.execute("""
+            SELECT q.ecosystem, q.package, q.version, v.id, v.aliases, v.severity, v.score, v.summary
+            FROM (
+                SELECT q.rowid AS qid, r.vuln_id FROM q JOIN ranges r
+                  ON r.ecosystem = q.ecosystem AND r.package = q.package AND q.key >= r.lo
+                 AND (r.hi IS NULL OR q.key < r.hi OR (r.hi_inclusive = 1 AND q.key = r.hi))
+                UNION
+                SELECT q.rowid, x.vuln_id FROM q JOIN versions x
+                  ON x.ecosystem = q.ecosystem AND x.package = q.package AND x.key = q.key
+            ) hit
+            JOIN q ON q.rowid = hit.qid
+            JOIN vulns v ON v.id = hit.vuln_id
+        """)
+        matches = [
+            VulnerabilityMatch(
+                vuln_id=vid, aliases=tuple(json.loads(aliases or "[]")), ecosystem=eco, package=pkg,
+                version=ver, severity=severity, score=score, summary=summary or "",
+                manifests=tuple(sorted(manifests[(eco, pkg, ver)])),
+            )
+            for eco, pkg, ver, vid, aliases, severity, score, summary in cur.fetchall()
+        ]
+        cur.execute("DELETE FROM q")
+        matches.sort(key=lambda m: (SEVERITY_ORDER.index(m.severity), -(m.score or 0), m.package))
+        return matches
+
+def severity_counts(matches: Iterable[VulnerabilityMatch]) -> Dict[str, int]:
+    """Count distinct vulnerabilities per severity."""
+    seen: Dict[str, str] = {}
+    for m in matches:
+        seen[m.vuln_id] = m.severity
+    counts = {s: 0 for s in SEVERITY_ORDER}
+    for severity in seen.values():
+        counts[severity] += 1
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the offline OSV vulnerability index.")
+    parser.add_argument("--db", type=Path, default=OSV_INDEX_PATH, help="Index location")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Import OSV dumps (.zip, directory or .json)")
+    imp.add_argument("sources", nargs="+", type=Path)
+    args = parser.parse_args(argv)
+
+    with VulnerabilityIndex(args.db) as index:
+        for source in args.sources:
+            count = index.import_osv(source)
+            print(f"✓ Imported {count} records from {source}")
+
+if __name__ == "__main__":
+    main()
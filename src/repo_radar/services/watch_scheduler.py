@@ -0,0 +1,279 @@
+import asyncio
+import concurrent.futures
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Iterable, Optional, Tuple
+from repo_radar.api.github_client import AbstractGitHubApiClient
+from repo_radar.config import (
+    GITHUB_DEFAULT_RATE, GITHUB_RATE_WINDOW, WATCH_BUDGET_SHARE, WATCH_HOTNESS, WATCH_MAX_INTERVAL, WATCH_MIN_INTERVAL,
+)
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.repo_state import RepoSnapshot
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+from repo_radar.services.repo_state import RepoStateStore
+from repo_radar.services.stats_scheduler import recent_commit_count
+from repo_radar.utils.json_codec import decode_json
+from repo_radar.utils.priority_lanes import request_priority
+
+logger = logging.getLogger(__name__)
+
+def _timestamp(iso: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp() if iso else None
+
+class WatchScheduler:
+    """
+    Keeps repository snapshots fresh continuously within a share of the rate limit.
+
+    Each repository gets a refresh interval proportional to how long ago it
+    was last pushed to (hotness times the push age, bounded by min_interval
+    and max_interval), so active repositories stay minutes-fresh and dormant
+    ones are refreshed rarely. The most overdue repository, relative to its
+    interval, is refreshed first. Repositories kept current by webhooks are
+    only reconciled every max_interval, or at once when flagged for it.
+
+    Spending is paced across the rate-limit window using the client's
+    RateLimitManager: at most budget_share of the hourly limit is used per
+    window, released evenly over the window rather than in one burst. The
+    cost of a refresh is measured from the remaining counter.
+
+    Scheduled refreshes send their requests in the 'backfill' lane. While
+    run() is running, other threads can ask for a repository to be refreshed
+    at once with request_refresh; those requests go in the 'interactive'
+    lane, ahead of the scheduled ones on the same client.
+
+    Attributes:
+        - client (AbstractGitHubApiClient): Client used for refreshes.
+        - store (RepoStateStore): Where snapshots are kept and persisted.
+        - repos (Dict[str, GitHubUrl]): Watched repositories by 'org_user/repo'.
+        - budget_share (float): Share of the hourly rate limit watch mode may spend.
+        - cost_estimate (float): Moving average of API calls per refresh.
+    """
+    def __init__(
+        self,
+        client: AbstractGitHubApiClient,
+        store: RepoStateStore,
+        repos: Iterable[GitHubUrl],
+        budget_share: float = WATCH_BUDGET_SHARE,
+        min_interval: float = WATCH_MIN_INTERVAL,
+        max_interval: float = WATCH_MAX_INTERVAL,
+        hotness: float = WATCH_HOTNESS,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], "asyncio.Future"] = asyncio.sleep,
+        save_interval: float = 30.0,
+    ):
+        self.client = client
+        self.store = store
+        self.repos = {url.repo_path(): url for url in repos}
+        self.budget_share = budget_share
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hotness = hotness
+        self.clock = clock
+        self.sleep = sleep
+        self.save_interval = save_interval
+        # The local git backend has no rate limit to pace against
+        self.rate_manager = getattr(client, "rate_manager", None)
+        self.cost_estimate = 3.0  # repository, languages and commit activity
+        self._window_reset: Optional[int] = None
+        self._spent = 0.0
+        self._saved_at = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def interval_for(self, snapshot: RepoSnapshot) -> float:
+        """Return the refresh interval of a repository in seconds, from its push age at the last refresh."""
+        if snapshot.pushed_at is None or snapshot.events_since is not None:
+            return self.max_interval
+        age = max(0.0, snapshot.refreshed_at - snapshot.pushed_at)
+        return min(self.max_interval, max(self.min_interval, age * self.hotness))
+
+    def next_repo(self, now: float) -> Tuple[GitHubUrl, float]:
+        """
+        Pick the repository to refresh next.
+
+        Returns:
+            - Tuple[GitHubUrl, float]: The repository and the time it is due. Never-fetched
+              repositories and those flagged for reconciliation come first, then the most
+              overdue relative to their interval, otherwise the one due soonest.
+        """
+        soonest = None
+        most_overdue = None
+        for path, url in self.repos.items():
+            snapshot = self.store.get(path)
+            if snapshot is None or snapshot.reconcile:
+                return url, now
+            interval = self.interval_for(snapshot)
+            due = snapshot.refreshed_at + interval
+            if due <= now:
+                urgency = (now - snapshot.refreshed_at) / interval
+                if most_overdue is None or urgency > most_overdue[0]:
+                    most_overdue = (urgency, url)
+            elif soonest is None or due < soonest[0]:
+                soonest = (due, url)
+        if most_overdue:
+            return most_overdue[1], now
+        return soonest[1], soonest[0]
+
+    def _sync_window(self):
+        if self.rate_manager is not None and self.rate_manager.reset_time != self._window_reset:
+            self._window_reset = self.rate_manager.reset_time
+            self._spent = 0.0
+
+    def budget_delay(self, now: float) -> float:
+        """
+        Return how long to wait before the next refresh fits the budget.
+
+        Args:
+            - now (float): Current unix time.
+
+        Returns:
+            - float: Seconds to wait, 0 if a refresh may start now.
+        """
+        rm = self.rate_manager
+        if rm is None or rm.reset_time is None or now >= rm.reset_time:
+            return 0.0  # unknown or expired window: the next response starts a new one
+        self._sync_window()
+        allowed = (rm.limit or GITHUB_DEFAULT_RATE) * self.budget_share
+        needed = self._spent + self.cost_estimate
+        if needed > allowed or (rm.remaining is not None and rm.remaining < self.cost_estimate):
+            return rm.reset_time - now
+        # Release the budget evenly over the window; one refresh's worth may be spent up front
+        window_start = rm.reset_time - GITHUB_RATE_WINDOW
+        unlocked_at = window_start + max(0.0, needed - self.cost_estimate) / allowed * GITHUB_RATE_WINDOW
+        return max(0.0, unlocked_at - now)
+
+    def _record_cost(self, before: Tuple[Optional[int], Optional[int]]):
+        rm = self.rate_manager
+        if rm is None:
+            return
+        remaining_before, reset_before = before
+        cost = self.cost_estimate
+        if remaining_before is not None and reset_before == rm.reset_time and rm.remaining is not None:
+            cost = max(1, remaining_before - rm.remaining)
+            self.cost_estimate = 0.7 * self.cost_estimate + 0.3 * cost
+        self._sync_window()
+        self._spent += cost
+
+    @staticmethod
+    def _failed(now: float) -> Callable[[RepoSnapshot], None]:
+        # A failed refresh waits its normal interval before the next attempt
+        def change(snapshot: RepoSnapshot):
+            snapshot.refreshed_at = now
+            snapshot.reconcile = False
+        return change
+
+    async def refresh(self, url: GitHubUrl) -> RepoSnapshot:
+        """
+        Fetch a repository's metadata, languages and commit activity into its stored snapshot.
+
+        The fetched fields are applied with RepoStateStore.update once every response is in,
+        so webhook events and reloads that arrive meanwhile are kept. Commit activity that
+        GitHub is still computing (202) keeps the stored value.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - RepoSnapshot: The refreshed snapshot.
+        """
+        repo_response, languages_response, stats_response = await asyncio.gather(
+            self.client.get_repository(url),
+            self.client.get_languages(url),
+            self.client.get_stats(url, "commit_activity"),
+        )
+        repo, languages, activity = await asyncio.gather(
+            decode_json(repo_response, ("pushed_at", "default_branch", "open_issues_count")),
+            decode_json(languages_response),
+            decode_json(stats_response),
+        )
+        recent_commits = recent_commit_count(activity) if stats_response.status_code == 200 else None
+        pushed_at, refreshed_at = _timestamp(repo.get("pushed_at")), self.clock()
+
+        def change(snapshot: RepoSnapshot):
+            snapshot.refreshed_at = refreshed_at
+            snapshot.pushed_at = pushed_at
+            snapshot.default_branch = repo.get("default_branch")
+            snapshot.languages = languages or {}
+            if recent_commits is not None:
+                snapshot.recent_commits = recent_commits
+            snapshot.open_issues = repo.get("open_issues_count")
+            snapshot.dirty = True
+            snapshot.reconcile = False
+        return self.store.update(url.repo_path(), change)
+
+    async def refresh_now(self, url: GitHubUrl) -> RepoSnapshot:
+        """
+        Refresh a repository at once, in the 'interactive' priority lane.
+
+        Args:
+            - url (GitHubUrl): Repository URL wrapper.
+
+        Returns:
+            - RepoSnapshot: The refreshed snapshot.
+        """
+        with request_priority("interactive"):
+            with INSTRUMENTATION.span("watch.refresh", repo=url.repo_path(), lane="interactive"):
+                return await self.refresh(url)
+
+    def request_refresh(self, repo: str) -> Optional[concurrent.futures.Future]:
+        """
+        Refresh a watched repository at once, from another thread, while run() is running.
+
+        Args:
+            - repo (str): 'org_user/repo', in any case.
+
+        Returns:
+            - Optional[concurrent.futures.Future]: Resolves to the refreshed snapshot, or None if the
+              repository is not watched or the scheduler is not running.
+        """
+        url = next((u for path, u in self.repos.items() if path.lower() == repo.lower()), None)
+        if url is None or self._loop is None:
+            return None
+        return asyncio.run_coroutine_threadsafe(self.refresh_now(url), self._loop)
+
+    async def run(self, max_refreshes: Optional[int] = None, max_sleep: float = 60.0):
+        """
+        Refresh repositories until cancelled, or until max_refreshes refreshes were made.
+
+        Failed refreshes are logged and the repository is retried after its
+        normal interval rather than immediately. Requests are sent in the
+        'backfill' priority lane, so reports and on-demand refreshes on the
+        same client go first.
+
+        Args:
+            - max_refreshes (int, optional): Stop after this many refreshes.
+            - max_sleep (float): Longest single sleep, so the schedule is re-evaluated regularly.
+        """
+        self._loop = asyncio.get_running_loop()
+        try:
+            with request_priority("backfill"):
+                await self._run(max_refreshes, max_sleep)
+        finally:
+            self._loop = None
+
+    async def _run(self, max_refreshes: Optional[int], max_sleep: float):
+        refreshes = 0
+        try:
+            while self.repos and (max_refreshes is None or refreshes < max_refreshes):
+                now = self.clock()
+                url, due = self.next_repo(now)
+                wait = max(due - now, self.budget_delay(now))
+                if wait > 0:
+                    await self.sleep(min(wait, max_sleep))
+                    continue
+
+                rm = self.rate_manager
+                before = (rm.remaining, rm.reset_time) if rm else (None, None)
+                try:
+                    with INSTRUMENTATION.span("watch.refresh", repo=url.repo_path()):
+                        await self.refresh(url)
+                except Exception as e:
+                    logger.warning(f"Refreshing {url.repo_path()} failed: {e}")
+                    self.store.update(url.repo_path(), self._failed(self.clock()))
+                self._record_cost(before)
+                refreshes += 1
+                if self.clock() - self._saved_at >= self.save_interval:
+                    self.store.save()
+                    self._saved_at = self.clock()
+        finally:
+            self.store.save()
@@ -0,0 +1,284 @@
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Optional, Set, Tuple
+from repo_radar.config import ACTIVITY_WINDOW, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_SECRET
+from repo_radar.models.repo_state import RepoSnapshot
+from repo_radar.services.repo_state import RepoStateStore
+
+logger = logging.getLogger(__name__)
+
+# GitHub caps webhook payloads at 25 MB
+MAX_PAYLOAD_BYTES = 25 * 1024 * 1024
+
+WEBHOOK_EVENTS = ("push", "issues", "pull_request")
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    Check the X-Hub-Signature-256 header of a webhook delivery.
+
+    Args:
+        - secret (str): Webhook secret configured on GitHub.
+        - body (bytes): Raw request body.
+        - signature (str, optional): Header value, 'sha256=<hex digest>'.
+
+    Returns:
+        - bool: True if the signature matches the body.
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+def _timestamp(value, default: float) -> float:
+    """Convert a payload time, ISO 8601 or unix seconds, to unix seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return default
+
+def _prune(snapshot: RepoSnapshot, since: float):
+    for name in ("issues_opened", "issues_closed", "pulls_opened", "pulls_merged"):
+        setattr(snapshot, name, [t for t in getattr(snapshot, name) if t >= since])
+
+def apply_event(store: RepoStateStore, event: str, payload: dict, now: float) -> Optional[str]:
+    """
+    Apply one webhook event to the cached data of its repository and mark it dirty.
+
+    Only data the event fully determines is changed: commits pushed to the
+    default branch, issue and pull request openings, closings and merges, and
+    the open issue count. Repositories not yet in the store are added and
+    flagged for reconciliation, so watch mode fetches the rest from the API.
+
+    Args:
+        - store (RepoStateStore): Store holding the repository snapshots.
+        - event (str): X-GitHub-Event header, e.g. 'push'.
+        - payload (dict): Parsed webhook payload.
+        - now (float): Unix time the event was received.
+
+    Returns:
+        - Optional[str]: The affected 'org_user/repo', or None if the event was ignored.
+
+    Raises:
+        - ValueError: If a time in the payload is not a date; the snapshot is then left unchanged.
+    """
+    repository = payload.get("repository") or {}
+    repo = repository.get("full_name")
+    if event not in WEBHOOK_EVENTS or not repo:
+        return None
+    action = payload.get("action")
+
+    # Times are read before the snapshot is touched, so a bad one changes nothing
+    pushed_at = _timestamp(repository.get("pushed_at"), now) if event == "push" else None
+    activity: Optional[Tuple[str, float]] = None
+    if event == "issues":
+        issue = payload.get("issue") or {}
+        if action == "opened":
+            activity = "issues_opened", _timestamp(issue.get("created_at"), now)
+        elif action == "closed":
+            activity = "issues_closed", _timestamp(issue.get("closed_at"), now)
+    elif event == "pull_request":
+        pull = payload.get("pull_request") or {}
+        if action == "opened":
+            activity = "pulls_opened", _timestamp(pull.get("created_at"), now)
+        elif action == "closed" and pull.get("merged"):
+            activity = "pulls_merged", _timestamp(pull.get("merged_at"), now)
+
+    def change(snapshot: RepoSnapshot):
+        if snapshot.events_since is None:
+            snapshot.events_since = now
+        snapshot.default_branch = repository.get("default_branch") or snapshot.default_branch
+        if repository.get("open_issues_count") is not None:
+            snapshot.open_issues = repository["open_issues_count"]
+
+        if event == "push":
+            if payload.get("ref") == f"refs/heads/{snapshot.default_branch}":
+                pushed = sum(1 for c in payload.get("commits") or [] if c.get("distinct", True))
+                if snapshot.recent_commits is not None:
+                    snapshot.recent_commits += pushed
+            snapshot.pushed_at = pushed_at
+        elif activity is not None:
+            getattr(snapshot, activity[0]).append(activity[1])
+
+        _prune(snapshot, now - ACTIVITY_WINDOW)
+        snapshot.dirty = True
+
+    store.update(repo, change)
+    return repo
+
+class WebhookReceiver:
+    """
+    Verifies, deduplicates and applies webhook deliveries, independent of HTTP.
+
+    GitHub redelivers on timeouts and users can redeliver by hand, so the IDs
+    of recent deliveries are remembered and repeats are ignored.
+
+    Attributes:
+        - store (RepoStateStore): Store the events are applied to.
+        - secret (str): Webhook secret. If empty, signatures are not checked.
+    """
+    def __init__(
+        self,
+        store: RepoStateStore,
+        secret: str = WEBHOOK_SECRET,
+        clock: Callable[[], float] = time.time,
+        remembered_deliveries: int = 10000,
+    ):
+        self.store = store
+        self.secret = secret
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._seen: Set[str] = set()
+        self._order: Deque[str] = deque()
+        self._remembered = remembered_deliveries
+        if not secret:
+            logger.warning("GITHUB_WEBHOOK_SECRET is not set, webhook signatures are not verified")
+
+    def _first_delivery(self, delivery: Optional[str]) -> bool:
+        if not delivery:
+            return True
+        with self._lock:
+            if delivery in self._seen:
+                return False
+            self._seen.add(delivery)
+            self._order.append(delivery)
+            if len(self._order) > self._remembered:
+                self._seen.discard(self._order.popleft())
+            return True
+
+    def _forget(self, delivery: Optional[str]):
+        # A delivery that could not be applied is not remembered, so its redelivery is applied
+        if not delivery:
+            return
+        with self._lock:
+            if delivery in self._seen:
+                self._seen.discard(delivery)
+                self._order.remove(delivery)
+
+    def handle(self, event: str, delivery: Optional[str], signature: Optional[str], body: bytes) -> HTTPStatus:
+        """
+        Process one delivery.
+
+        Args:
+            - event (str): X-GitHub-Event header.
+            - delivery (str, optional): X-GitHub-Delivery header.
+            - signature (str, optional): X-Hub-Signature-256 header.
+            - body (bytes): Raw request body.
+
+        Returns:
+            - HTTPStatus: UNAUTHORIZED for a bad signature, BAD_REQUEST for an
+              unreadable payload, ACCEPTED for applied events and OK otherwise.
+        """
+        if self.secret and not verify_signature(self.secret, body, signature):
+            return HTTPStatus.UNAUTHORIZED
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST
+        if not isinstance(payload, dict):
+            return HTTPStatus.BAD_REQUEST
+        if not self._first_delivery(delivery):
+            return HTTPStatus.OK
+        try:
+            repo = apply_event(self.store, event, payload, self.clock())
+        except ValueError as e:
+            self._forget(delivery)
+            logger.warning(f"Unreadable {event} delivery {delivery}: {e}")
+            return HTTPStatus.BAD_REQUEST
+        if repo is None:
+            return HTTPStatus.OK
+        logger.info(f"Applied {event} event to {repo}")
+        return HTTPStatus.ACCEPTED
+
+class WebhookServer:
+    """
+    Local HTTP endpoint that receives GitHub webhooks on POST /webhook.
+
+    Requests are handled on their own threads. The store is saved
+    periodically while events arrive and once more when the server stops.
+
+    Attributes:
+        - receiver (WebhookReceiver): Handles the deliveries.
+        - address (Tuple[str, int]): Host and port the server listens on.
+    """
+    def __init__(
+        self,
+        store: RepoStateStore,
+        secret: str = WEBHOOK_SECRET,
+        host: str = WEBHOOK_HOST,
+        port: int = WEBHOOK_PORT,
+        save_interval: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.receiver = WebhookReceiver(store, secret, clock)
+        self.save_interval = save_interval
+        self._stopped = threading.Event()
+        self._threads = []
+        receiver = self.receiver
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.split("?", 1)[0] != "/webhook":
+                    return self._reply(HTTPStatus.NOT_FOUND)
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_PAYLOAD_BYTES:
+                    return self._reply(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                status = receiver.handle(
+                    self.headers.get("X-GitHub-Event", ""),
+                    self.headers.get("X-GitHub-Delivery"),
+                    self.headers.get("X-Hub-Signature-256"),
+                    self.rfile.read(length),
+                )
+                self._reply(status)
+
+            def _reply(self, status: HTTPStatus):
+                body = status.phrase.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.address = self._httpd.server_address[:2]
+
+    def _flush(self):
+        while not self._stopped.wait(self.save_interval):
+            self.receiver.store.save_if_changed()
+
+    def start(self) -> "WebhookServer":
+        """Serve in background threads until stop() is called."""
+        self._threads = [
+            threading.Thread(target=self._httpd.serve_forever, name="webhook-server", daemon=True),
+            threading.Thread(target=self._flush, name="webhook-flush", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and save the store."""
+        self._stopped.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+        self.receiver.store.save_if_changed()
+
+    def __enter__(self) -> "WebhookServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque
+from repo_radar.config import GITHUB_MAX_CONCURRENCY
+
+class AdaptiveConcurrency:
+    """
+    Limits requests in flight with additive-increase, multiplicative-decrease (AIMD).
+
+    Every successful request raises the limit by 1/limit, so about one per
+    round of requests; a throttling response cuts it by 'decrease', at most
+    once per cooldown since the requests already in flight were sent under
+    the old limit. Secondary rate limits thus shrink the request rate
+    quickly and it recovers gradually.
+
+    Waiters are plain futures of the running loop, so one instance can be
+    used across successive asyncio.run calls.
+
+    Attributes:
+        - limit (float): Current limit; int(limit) requests may be in flight.
+        - minimum (int): Lowest limit.
+        - maximum (int): Highest limit.
+        - in_flight (int): Requests currently holding a slot.
+    """
+    def __init__(
+        self,
+        maximum: int = GITHUB_MAX_CONCURRENCY,
+        minimum: int = 1,
+        decrease: float = 0.5,
+        cooldown: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = float(maximum)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.clock = clock
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._decreased_at = float("-inf")
+        self.logger = logging.getLogger(__name__)
+
+    async def __aenter__(self) -> "AdaptiveConcurrency":
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self):
+        """Additive increase after a request that was not throttled."""
+        if self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_throttle(self):
+        """Multiplicative decrease after a rate-limit response."""
+        now = self.clock()
+        if now - self._decreased_at < self.cooldown:
+            return
+        self._decreased_at = now
+        self.limit = max(self.minimum, self.limit * self.decrease)
+        self.logger.warning(f"Throttled by GitHub, allowing {int(self.limit)} requests in flight")
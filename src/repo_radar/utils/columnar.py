@@ -0,0 +1,104 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+# File layout: MAGIC, header length (u64), JSON header, then one 8-byte aligned block per column.
+# Numeric columns are raw little-endian arrays, so single values can be read from a memory map
+# without decoding the rest of the file; string columns are zlib-compressed and NUL-separated.
+MAGIC = b"RRCOL1\n\0"
+_NUMERIC = {"f8": "d", "i8": "q"}
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 8)
+
+def write_columns(path: Path, meta: dict, columns: Dict[str, Tuple[str, Sequence]]):
+    """
+    Write named columns to a file atomically.
+
+    Args:
+        - path (Path): File to write.
+        - meta (dict): JSON-serialisable metadata stored in the header.
+        - columns (Dict[str, Tuple[str, Sequence]]): (kind, values) per column name, where
+          kind is 'f8' (float64), 'i8' (int64) or 'str' (strings without NUL characters).
+    """
+    blocks = []
+    index = {}
+    offset = 0
+    for name, (kind, values) in columns.items():
+        values = list(values)
+        if kind == "str":
+            data = zlib.compress("\0".join(values).encode("utf-8"))
+        elif kind in _NUMERIC:
+            data = struct.pack(f"<{len(values)}{_NUMERIC[kind]}", *values)
+        else:
+            raise ValueError(f"Unknown column kind '{kind}' for column '{name}'")
+        index[name] = {"kind": kind, "offset": offset, "length": len(data), "count": len(values)}
+        blocks.append(_pad(data))
+        offset += len(blocks[-1])
+
+    header = json.dumps({"meta": meta, "columns": index}, separators=(",", ":")).encode("utf-8")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_pad(MAGIC + struct.pack("<Q", len(header)) + header))
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp, path)
+
+class ColumnReader:
+    """
+    Memory-mapped reader of a file written by write_columns.
+
+    Only the header is parsed on open; columns and single values are decoded
+    on access, so reading a few metrics of a large file touches a few pages.
+
+    Attributes:
+        - path (Path): File being read.
+        - meta (dict): Metadata stored with the columns.
+        - columns (Dict[str, dict]): Kind, offset, length and count per column name.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a columnar snapshot")
+        (header_length,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self._mm[start:start + header_length])
+        self.meta: dict = header["meta"]
+        self.columns: Dict[str, dict] = header["columns"]
+        self._data_start = start + header_length + (-(start + header_length) % 8)
+
+    def column(self, name: str) -> List[Union[float, int, str]]:
+        """Return every value of a column."""
+        info = self.columns[name]
+        offset = self._data_start + info["offset"]
+        if info["kind"] == "str":
+            if not info["count"]:
+                return []
+            return zlib.decompress(self._mm[offset:offset + info["length"]]).decode("utf-8").split("\0")
+        return list(struct.unpack_from(f"<{info['count']}{_NUMERIC[info['kind']]}", self._mm, offset))
+
+    def value(self, name: str, i: int) -> Union[float, int]:
+        """Return the i-th value of a numeric column, reading only its 8 bytes."""
+        info = self.columns[name]
+        if info["kind"] not in _NUMERIC or not 0 <= i < info["count"]:
+            raise IndexError(f"No numeric value {i} in column '{name}'")
+        (value,) = struct.unpack_from(f"<{_NUMERIC[info['kind']]}", self._mm, self._data_start + info["offset"] + 8 * i)
+        return value
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self) -> "ColumnReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
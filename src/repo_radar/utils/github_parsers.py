@@ -1,8 +1,16 @@
 import re
+from urllib.parse import parse_qs, urlparse
 from requests import Response
-from typing import List
+from typing import List, Optional
 from repo_radar.models.github_url import GitHubUrl
-from repo_radar.config import GITHUB_URL_REGEX, LINK_HEADER_NEXT_REGEX
+from repo_radar.config import GITHUB_URL_REGEX, LINK_HEADER_LAST_REGEX, LINK_HEADER_NEXT_REGEX
+from repo_radar.utils.validator import is_valid_github_repo_name, is_valid_github_username
+
+# Compiled once; these run for every listed repository and every paginated response
+_GITHUB_URL_RE = re.compile(GITHUB_URL_REGEX)
+_LINK_HEADER_NEXT_RE = re.compile(LINK_HEADER_NEXT_REGEX)
+_LINK_HEADER_LAST_RE = re.compile(LINK_HEADER_LAST_REGEX)
+_OWNER_REPO_RE = re.compile(r"^(?P<org_user>[^/\s]+)/(?P<repo>[^/\s]+?)(?:\.git)?/?$")
 
 def extract_github_urls(text: str) -> List[GitHubUrl]:
     """
@@ -19,8 +27,7 @@ def extract_github_urls(text: str) -> List[GitHubUrl]:
     Returns:
         - List[GitHubUrl]: A list of `GitHubUrl` objects representing each matched URL.
     """
-    regex = re.compile(GITHUB_URL_REGEX)
-    matches = regex.finditer(text)
+    matches = _GITHUB_URL_RE.finditer(text)
     results = []
 
     for match in matches:
@@ -47,7 +54,48 @@ def paginated_has_next(response: Response) -> bool:
     link_header = response.headers.get("Link", "")
     if not link_header:
         return False
-    return bool(re.search(LINK_HEADER_NEXT_REGEX, link_header))
+    return bool(_LINK_HEADER_NEXT_RE.search(link_header))
+
+def last_page_number(response: Response) -> Optional[int]:
+    """
+    Return the page number of the `rel="last"` link of a paginated response.
+
+    Requested with per_page=1, this is the number of items in the listing.
+
+    Args:
+        - response (Response): The HTTP response object from a GitHub API request.
+
+    Returns:
+        - Optional[int]: The last page number, or None if the response has a single page.
+    """
+    match = _LINK_HEADER_LAST_RE.search(response.headers.get("Link", ""))
+    if not match:
+        return None
+    page = parse_qs(urlparse(match.group(1)).query).get("page")
+    return int(page[0]) if page else None
+
+def parse_repo_ref(text: str) -> Optional[GitHubUrl]:
+    """
+    Parse a single repository reference and validate its owner and name.
+
+    Accepts everything extract_github_urls does plus the short 'owner/repo'
+    form, which also allows dots in repository names (e.g. 'socketio/socket.io').
+
+    Args:
+        - text (str): A repository URL or 'owner/repo'.
+
+    Returns:
+        - Optional[GitHubUrl]: The repository, or None if the text is not a valid reference.
+    """
+    text = text.strip()
+    match = _OWNER_REPO_RE.match(text) if "github.com" not in text else _GITHUB_URL_RE.search(text)
+    if not match:
+        return None
+    org_user, repo = match.group("org_user"), match.group("repo")
+    if not is_valid_github_username(org_user) or not is_valid_github_repo_name(repo):
+        return None
+    full_url = match.group() if "github.com" in text else f"https://github.com/{org_user}/{repo}"
+    return GitHubUrl(full_url=full_url, org_user=org_user, repo=repo)
 
 
 def get_next_paginated_url(response: Response) -> str:
@@ -72,3 +120,31 @@ def get_next_paginated_url(response: Response) -> str:
                 next_url = section[0].strip()[1:-1]  # remove < >
                 break
     return next_url
+
+# Fields an issues-endpoint item carries for a pull request, under their pulls-endpoint names
+_ISSUE_PULL_FIELDS = (
+    "id", "number", "title", "state", "user", "labels", "assignees", "milestone", "body",
+    "created_at", "updated_at", "closed_at", "html_url", "draft", "author_association",
+)
+
+def pull_from_issue(item: dict) -> Optional[dict]:
+    """
+    Convert a pull request listed by the issues endpoint to the shape of the pulls endpoint.
+
+    The issues endpoint lists pull requests too, marked by a 'pull_request'
+    key. Only the fields it carries are available: there is no head, base,
+    mergeability or review data, so use this only when those are not needed.
+
+    Args:
+        - item (dict): One item of an issues page.
+
+    Returns:
+        - Optional[dict]: The pull request, or None if the item is a plain issue.
+    """
+    pull = item.get("pull_request")
+    if pull is None:
+        return None
+    converted = {k: item[k] for k in _ISSUE_PULL_FIELDS if k in item}
+    converted["url"] = pull.get("url")
+    converted["merged_at"] = pull.get("merged_at")
+    return converted
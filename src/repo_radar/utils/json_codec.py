@@ -0,0 +1,129 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+from requests import Response
+from repo_radar.config import JSON_OFFLOAD_BYTES
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library decoder is used instead
+    orjson = None
+
+FieldTree = Dict[str, "FieldTree"]
+
+def loads(body: bytes) -> Any:
+    """Decode a JSON body with orjson when installed, otherwise with the json module."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def field_tree(fields: Iterable[str]) -> FieldTree:
+    """
+    Compile dotted field paths into a tree for project.
+
+    Args:
+        - fields (Iterable[str]): Paths such as 'sha' or 'commit.author.date'.
+
+    Returns:
+        - FieldTree: Nested dict of wanted keys; an empty dict keeps the whole value.
+    """
+    tree: FieldTree = {}
+    for path in fields:
+        node = tree
+        for key in path.split("."):
+            node = node.setdefault(key, {})
+    return tree
+
+def project(value: Any, tree: FieldTree) -> Any:
+    """
+    Keep only the fields of a tree in a decoded JSON value.
+
+    Lists are projected element-wise, so one tree serves a whole page of
+    objects. Missing keys are left out rather than set to None.
+
+    Args:
+        - value (Any): Decoded JSON.
+        - tree (FieldTree): Wanted fields, see field_tree.
+
+    Returns:
+        - Any: The projected value.
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], sub) for key, sub in tree.items() if key in value}
+    return value
+
+def decode(body: bytes, fields: Optional[Iterable[str]] = None) -> Any:
+    """Decode a JSON body and project it onto fields, if given. Empty bodies decode to None."""
+    if not body:
+        return None
+    value = loads(body)
+    return project(value, field_tree(fields)) if fields else value
+
+async def decode_json(
+    response: Response,
+    fields: Optional[Iterable[str]] = None,
+    offload_bytes: int = JSON_OFFLOAD_BYTES,
+) -> Any:
+    """
+    Decode a response body without stalling the event loop.
+
+    Bodies of offload_bytes or more are decoded and projected in a worker
+    thread, so the full objects never reach the loop thread and other
+    coroutines keep running; small bodies are decoded inline, where a
+    thread hop would cost more than it saves.
+
+    Args:
+        - response (Response): HTTP response with a JSON body.
+        - fields (Iterable[str], optional): Dotted field paths to keep, see field_tree.
+        - offload_bytes (int): Body size from which decoding moves off the loop.
+
+    Returns:
+        - Any: The decoded value, or None for an empty body (e.g. 202 or 204).
+
+    Raises:
+        - ValueError: If the body is not valid JSON.
+    """
+    body = response.content
+    fields = tuple(fields) if fields else None
+    if len(body) < offload_bytes:
+        return decode(body, fields)
+    return await asyncio.to_thread(decode, body, fields)
+
+async def iter_decoded(
+    pages: AsyncIterator[Response],
+    fields: Optional[Iterable[str]] = None,
+    offload_bytes: int = JSON_OFFLOAD_BYTES,
+) -> AsyncIterator[Any]:
+    """
+    Decode pages of a paginated endpoint while the next page is being fetched.
+
+    Each page's decoding starts as soon as it arrives and runs alongside the
+    request for the following page, so decoding overlaps network I/O rather
+    than adding to it.
+
+    Args:
+        - pages (AsyncIterator[Response]): Pages as they arrive, e.g. from iter_owner_repos.
+        - fields (Iterable[str], optional): Dotted field paths to keep, see field_tree.
+        - offload_bytes (int): Body size from which decoding moves off the loop.
+
+    Yields:
+        - Any: The decoded value of each page, in page order.
+    """
+    fields = tuple(fields) if fields else None
+    pending: Optional[asyncio.Task] = None
+    try:
+        async for response in pages:
+            task = asyncio.create_task(decode_json(response, fields, offload_bytes))
+            if pending is not None:
+                yield await pending
+            pending = task
+        if pending is not None:
+            task, pending = pending, None
+            yield await task
+    finally:
+        if pending is not None:
+            pending.cancel()
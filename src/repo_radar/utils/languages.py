@@ -0,0 +1,54 @@
+from posixpath import basename, splitext
+from typing import Optional
+from repo_radar.utils.manifest_parsers import SKIPPED_DIRECTORIES
+
+# File extensions mapped to the language names GitHub's /languages endpoint uses.
+# Only programming and markup languages are listed; data and prose files are not counted, as on GitHub.
+EXTENSION_LANGUAGES = {
+    ".py": "Python", ".pyi": "Python", ".pyx": "Cython",
+    ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".jsx": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".mts": "TypeScript", ".cts": "TypeScript",
+    ".go": "Go", ".rs": "Rust", ".java": "Java", ".kt": "Kotlin", ".kts": "Kotlin",
+    ".scala": "Scala", ".groovy": "Groovy", ".swift": "Swift",
+    ".c": "C", ".h": "C", ".cc": "C++", ".cpp": "C++", ".cxx": "C++", ".hpp": "C++", ".hh": "C++",
+    ".m": "Objective-C", ".mm": "Objective-C++", ".cs": "C#", ".fs": "F#", ".vb": "Visual Basic .NET",
+    ".rb": "Ruby", ".php": "PHP", ".pl": "Perl", ".pm": "Perl", ".lua": "Lua", ".r": "R",
+    ".dart": "Dart", ".ex": "Elixir", ".exs": "Elixir", ".erl": "Erlang", ".hs": "Haskell",
+    ".clj": "Clojure", ".ml": "OCaml", ".jl": "Julia", ".zig": "Zig", ".nim": "Nim",
+    ".sh": "Shell", ".bash": "Shell", ".zsh": "Shell", ".ps1": "PowerShell", ".bat": "Batchfile",
+    ".html": "HTML", ".htm": "HTML", ".css": "CSS", ".scss": "SCSS", ".sass": "Sass", ".less": "Less",
+    ".vue": "Vue", ".svelte": "Svelte", ".jinja": "Jinja", ".j2": "Jinja",
+    ".sql": "SQL", ".proto": "Protocol Buffer", ".tf": "HCL", ".hcl": "HCL",
+    ".cmake": "CMake", ".mk": "Makefile", ".nix": "Nix", ".ipynb": "Jupyter Notebook",
+}
+
+# Files recognised by name rather than extension
+FILENAME_LANGUAGES = {
+    "Dockerfile": "Dockerfile", "Makefile": "Makefile", "GNUmakefile": "Makefile",
+    "CMakeLists.txt": "CMake", "Rakefile": "Ruby", "Gemfile": "Ruby", "Justfile": "Just",
+}
+
+# Generated or bundled files GitHub excludes from language statistics
+_GENERATED_SUFFIXES = (".min.js", ".min.css", ".bundle.js", ".pb.go", "_pb2.py")
+
+def language_for(path: str) -> Optional[str]:
+    """
+    Return the language a repository file counts towards, or None if it is not counted.
+
+    Vendored directories and well-known generated files are excluded, like
+    GitHub does for the /languages endpoint.
+
+    Args:
+        - path (str): Repository-relative file path.
+
+    Returns:
+        - Optional[str]: Language name as GitHub reports it, e.g. 'Python'.
+    """
+    if any(f"/{d}" in f"/{path}" for d in SKIPPED_DIRECTORIES) or path.endswith(_GENERATED_SUFFIXES):
+        return None
+    name = basename(path)
+    if name in FILENAME_LANGUAGES:
+        return FILENAME_LANGUAGES[name]
+    if name.startswith("Dockerfile."):
+        return "Dockerfile"
+    return EXTENSION_LANGUAGES.get(splitext(name)[1].lower())
@@ -0,0 +1,221 @@
+import fnmatch
+import json
+import re
+import tomllib
+from posixpath import basename
+from typing import Callable, Dict, Iterable, List, Optional
+from repo_radar.models.dependency import Dependency
+
+# Directories whose contents are vendored or generated and never scanned
+SKIPPED_DIRECTORIES = ("node_modules/", "vendor/", ".venv/", "site-packages/", "third_party/")
+
+_PEP508_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*(.*)$")
+_EXACT_PIN = re.compile(r"^===?\s*([^\s,*;]+)$")
+_EXACT_SEMVER = re.compile(r"^v?=?\s*(\d+\.\d+\.\d+[0-9A-Za-z.+-]*)$")
+
+def normalize_pypi_name(name: str) -> str:
+    """Normalise a Python package name as described in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def _pep508(requirement: str, manifest: str, dev: bool = False) -> Optional[Dependency]:
+    """Parse a PEP 508 requirement string such as 'requests[socks]>=2.31; python_version>"3.8"'."""
+    requirement = requirement.split(";", 1)[0].strip()
+    if not requirement or "://" in requirement or requirement.startswith((".", "/")):
+        return None
+    match = _PEP508_NAME.match(requirement)
+    if not match:
+        return None
+    name, _, spec = match.groups()
+    spec = spec.strip().strip("()").strip()
+    pinned = _EXACT_PIN.match(spec)
+    return Dependency("PyPI", normalize_pypi_name(name), pinned.group(1) if pinned else None, spec, manifest, dev)
+
+def parse_requirements_txt(path: str, text: str) -> List[Dependency]:
+    """Parse a pip requirements file. Options, includes, editables and URLs are skipped."""
+    deps = []
+    dev = "dev" in basename(path).lower() or "test" in basename(path).lower()
+    for line in text.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        dep = _pep508(line, path, dev)
+        if dep:
+            deps.append(dep)
+    return deps
+
+def parse_pyproject_toml(path: str, text: str) -> List[Dependency]:
+    """Parse PEP 621 and Poetry dependency tables of a pyproject.toml."""
+    data = tomllib.loads(text)
+    deps: List[Dependency] = []
+    project = data.get("project", {})
+    for req in project.get("dependencies", []):
+        deps.append(_pep508(req, path))
+    for group in project.get("optional-dependencies", {}).values():
+        deps.extend(_pep508(req, path, dev=True) for req in group)
+    for group in data.get("dependency-groups", {}).values():
+        deps.extend(_pep508(req, path, dev=True) for req in group if isinstance(req, str))
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    tables = [(poetry.get("dependencies", {}), False), (poetry.get("dev-dependencies", {}), True)]
+    tables += [(g.get("dependencies", {}), True) for g in poetry.get("group", {}).values()]
+    for table, dev in tables:
+        for name, spec in table.items():
+            if name.lower() == "python":
+                continue
+            spec = spec.get("version", "") if isinstance(spec, dict) else str(spec)
+            exact = spec if re.match(r"^\d[\w.]*$", spec) else None
+            deps.append(Dependency("PyPI", normalize_pypi_name(name), exact, spec, path, dev))
+    return [d for d in deps if d]
+
+def parse_toml_lock(ecosystem: str) -> Callable[[str, str], List[Dependency]]:
+    """Return a parser for lockfiles with [[package]] name/version tables (uv.lock, poetry.lock, Cargo.lock)."""
+    def parse(path: str, text: str) -> List[Dependency]:
+        deps = []
+        for pkg in tomllib.loads(text).get("package", []):
+            source = pkg.get("source", {})
+            # Skip the project itself and path dependencies
+            if isinstance(source, dict) and ({"editable", "virtual", "directory"} & source.keys()):
+                continue
+            name = pkg.get("name")
+            version = pkg.get("version")
+            if not name or not version:
+                continue
+            if ecosystem == "PyPI":
+                name = normalize_pypi_name(name)
+            deps.append(Dependency(ecosystem, name, version, f"=={version}", path))
+        return deps
+    return parse
+
+def parse_pipfile_lock(path: str, text: str) -> List[Dependency]:
+    """Parse a Pipfile.lock."""
+    data = json.loads(text)
+    deps = []
+    for section, dev in (("default", False), ("develop", True)):
+        for name, info in data.get(section, {}).items():
+            spec = info.get("version", "")
+            deps.append(Dependency("PyPI", normalize_pypi_name(name), spec.lstrip("=") or None, spec, path, dev))
+    return deps
+
+def parse_package_json(path: str, text: str) -> List[Dependency]:
+    """Parse dependency sections of an npm package.json."""
+    data = json.loads(text)
+    deps = []
+    for section, dev in (("dependencies", False), ("optionalDependencies", False),
+                         ("peerDependencies", False), ("devDependencies", True)):
+        for name, spec in (data.get(section) or {}).items():
+            exact = _EXACT_SEMVER.match(str(spec).strip())
+            deps.append(Dependency("npm", name, exact.group(1) if exact else None, str(spec), path, dev))
+    return deps
+
+def parse_package_lock_json(path: str, text: str) -> List[Dependency]:
+    """Parse an npm package-lock.json (lockfileVersion 1, 2 and 3)."""
+    data = json.loads(text)
+    deps = []
+    packages = data.get("packages")
+    if packages:
+        for key, info in packages.items():
+            if not key or "version" not in info:
+                continue  # "" is the root project
+            name = info.get("name") or key.rsplit("node_modules/", 1)[-1]
+            deps.append(Dependency("npm", name, info["version"], info["version"], path, bool(info.get("dev"))))
+        return deps
+
+    def walk(tree: Dict):
+        for name, info in tree.items():
+            if "version" in info:
+                deps.append(Dependency("npm", name, info["version"], info["version"], path, bool(info.get("dev"))))
+            walk(info.get("dependencies", {}))
+    walk(data.get("dependencies", {}))
+    return deps
+
+def parse_go_mod(path: str, text: str) -> List[Dependency]:
+    """Parse require directives of a go.mod file."""
+    deps = []
+    in_block = False
+    for raw in text.splitlines():
+        line = raw.split("//", 1)[0].strip()
+        if line.startswith("require ("):
+            in_block = True
+            continue
+        if in_block and line == ")":
+            in_block = False
+            continue
+        if line.startswith("require "):
+            line = line[len("require "):].strip()
+        elif not in_block:
+            continue
+        parts = line.split()
+        if len(parts) >= 2:
+            # '// indirect' requirements still ship in the build, so they are not dev dependencies
+            deps.append(Dependency("Go", parts[0], parts[1], parts[1], path))
+    return deps
+
+def parse_cargo_toml(path: str, text: str) -> List[Dependency]:
+    """Parse dependency tables of a Cargo.toml."""
+    data = tomllib.loads(text)
+    deps = []
+    for section, dev in (("dependencies", False), ("dev-dependencies", True), ("build-dependencies", True)):
+        for name, spec in data.get(section, {}).items():
+            if isinstance(spec, dict):
+                name = spec.get("package", name)
+                spec = spec.get("version", "")
+            exact = re.match(r"^=\s*(\S+)$", spec)
+            deps.append(Dependency("crates.io", name, exact.group(1) if exact else None, spec, path, dev))
+    return deps
+
+# Filename patterns mapped to their parser. Order matters: first match wins.
+MANIFEST_PARSERS: Dict[str, Callable[[str, str], List[Dependency]]] = {
+    "requirements*.txt": parse_requirements_txt,
+    "pyproject.toml": parse_pyproject_toml,
+    "uv.lock": parse_toml_lock("PyPI"),
+    "poetry.lock": parse_toml_lock("PyPI"),
+    "Pipfile.lock": parse_pipfile_lock,
+    "package.json": parse_package_json,
+    "package-lock.json": parse_package_lock_json,
+    "go.mod": parse_go_mod,
+    "Cargo.toml": parse_cargo_toml,
+    "Cargo.lock": parse_toml_lock("crates.io"),
+}
+
+def parser_for(path: str) -> Optional[Callable[[str, str], List[Dependency]]]:
+    """Return the parser for a repository path, or None if it is not a known manifest."""
+    if any(f"/{d}" in f"/{path}" for d in SKIPPED_DIRECTORIES):
+        return None
+    name = basename(path)
+    for pattern, parser in MANIFEST_PARSERS.items():
+        if fnmatch.fnmatchcase(name, pattern):
+            return parser
+    # requirements/*.txt layouts
+    if fnmatch.fnmatchcase(path, "*requirements/*.txt"):
+        return parse_requirements_txt
+    return None
+
+def is_manifest(path: str) -> bool:
+    """Return True if the path is a supported dependency manifest or lockfile."""
+    return parser_for(path) is not None
+
+def parse_manifest(path: str, text: str) -> List[Dependency]:
+    """
+    Parse a manifest's text into dependencies.
+
+    Top-level function so it can run in a process pool. Malformed files
+    yield no dependencies rather than failing the whole scan.
+
+    Args:
+        - path (str): Repository path of the manifest, used to select the parser.
+        - text (str): File contents.
+
+    Returns:
+        - List[Dependency]: Dependencies declared in the file.
+    """
+    parser = parser_for(path)
+    if parser is None:
+        return []
+    try:
+        return parser(path, text)
+    except (ValueError, tomllib.TOMLDecodeError, AttributeError, TypeError):
+        return []
+
+def parse_manifests(files: Iterable[tuple]) -> List[List[Dependency]]:
+    """Parse a batch of (path, text) pairs. Used to amortise process-pool overhead."""
+    return [parse_manifest(path, text) for path, text in files]
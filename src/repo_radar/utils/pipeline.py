@@ -0,0 +1,80 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, List, Sequence
+from repo_radar.config import PIPELINE_QUEUE_SIZE
+
+# Put on a stage's input queue once per worker when the stage before it has finished
+_DONE = object()
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline, see run_pipeline.
+
+    Attributes:
+        - name (str): Name added as a note to exceptions its handler raises, so tracebacks tell the stage.
+        - handler (Callable): Coroutine function called with each item; its result is passed
+          to the next stage, or dropped if it is None.
+        - workers (int): Items handled at once.
+        - queue_size (int): Items waiting for this stage before the stage before it blocks.
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+    queue_size: int = PIPELINE_QUEUE_SIZE
+
+async def run_pipeline(source: AsyncIterable[Any], stages: Sequence[Stage]):
+    """
+    Pass every item of a source through stages that run concurrently.
+
+    Stages are connected by bounded queues: a stage whose queue is full
+    blocks the one before it, down to the source, so at most the queue sizes
+    plus the workers' items are in flight however long the source is. All
+    stages overlap, so network-bound stages keep working while CPU-bound
+    ones do. Results of the last stage are dropped; it is the sink.
+
+    Args:
+        - source (AsyncIterable[Any]): Items to process, read only as fast as the first stage takes them.
+        - stages (Sequence[Stage]): Stages in order.
+
+    Raises:
+        - Exception: The first exception raised by the source or a handler, with the stage's name as a
+          note if a handler raised it; every other task is cancelled.
+    """
+    queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=s.queue_size) for s in stages]
+    running = [s.workers for s in stages]
+
+    async def close(i: int):
+        for _ in range(stages[i].workers):
+            await queues[i].put(_DONE)
+
+    async def feed():
+        async for item in source:
+            await queues[0].put(item)
+        await close(0)
+
+    async def work(i: int):
+        stage = stages[i]
+        while (item := await queues[i].get()) is not _DONE:
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                e.add_note(f"Raised in pipeline stage '{stage.name}'")
+                raise
+            if result is not None and i + 1 < len(stages):
+                await queues[i + 1].put(result)
+        running[i] -= 1
+        if running[i] == 0 and i + 1 < len(stages):
+            await close(i + 1)
+
+    tasks = [asyncio.create_task(feed())]
+    tasks += [asyncio.create_task(work(i)) for i, s in enumerate(stages) for _ in range(s.workers)]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
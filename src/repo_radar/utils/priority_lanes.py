@@ -0,0 +1,113 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+from repo_radar.config import GITHUB_DEFAULT_PRIORITY, PRIORITY_WEIGHTS
+
+_current_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "repo_radar_priority", default=GITHUB_DEFAULT_PRIORITY
+)
+
+def current_priority() -> str:
+    """Return the priority lane of requests sent from the current context."""
+    return _current_priority.get()
+
+@contextmanager
+def request_priority(lane: str) -> Iterator[str]:
+    """
+    Send the GitHub requests made inside the block in a priority lane.
+
+    The lane is a context variable, so tasks created inside the block and
+    coroutines run by asyncio.run inherit it.
+
+    Args:
+        - lane (str): 'interactive', 'report' or 'backfill', see PRIORITY_WEIGHTS.
+
+    Raises:
+        - ValueError: If the lane is unknown.
+    """
+    if lane not in PRIORITY_WEIGHTS:
+        raise ValueError(f"Unknown priority lane '{lane}', expected one of {', '.join(PRIORITY_WEIGHTS)}")
+    token = _current_priority.set(lane)
+    try:
+        yield lane
+    finally:
+        _current_priority.reset(token)
+
+class WeightedFairLock:
+    """
+    Lock granted to waiters by weighted fair queuing over priority lanes.
+
+    Each acquisition gets a virtual finish time of max(now, lane's previous
+    finish) + 1/weight, and the waiter with the earliest finish time is
+    granted next. A lane with weight 8 thus gets eight turns for every turn
+    of a weight 1 lane while both are busy, yet no lane starves, and a lane
+    that was idle is served almost at once. Within a lane, waiters are FIFO.
+
+    Waiters are plain futures of the running loop, so one instance can be
+    used across successive asyncio.run calls.
+
+    Attributes:
+        - weights (Dict[str, float]): Share of turns per lane.
+    """
+    def __init__(self, weights: Dict[str, float] = PRIORITY_WEIGHTS):
+        self.weights = dict(weights)
+        self._locked = False
+        self._virtual_time = 0.0
+        self._finish: Dict[str, float] = {}
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []
+        self._order = itertools.count()
+
+    def locked(self) -> bool:
+        return self._locked
+
+    def _finish_time(self, lane: str) -> float:
+        if lane not in self.weights:
+            raise ValueError(f"Unknown priority lane '{lane}'")
+        finish = max(self._virtual_time, self._finish.get(lane, 0.0)) + 1.0 / self.weights[lane]
+        self._finish[lane] = finish
+        return finish
+
+    async def acquire(self, lane: str) -> bool:
+        """
+        Wait for the lock in a lane.
+
+        Args:
+            - lane (str): Priority lane of the caller.
+
+        Returns:
+            - bool: True once acquired.
+        """
+        finish = self._finish_time(lane)
+        if not self._locked and not self._waiters:
+            self._locked = True
+            self._virtual_time = finish
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (finish, next(self._order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # granted just before the cancellation arrived
+            raise
+        return True
+
+    def release(self):
+        """
+        Release the lock to the waiter with the earliest finish time.
+
+        Raises:
+            - RuntimeError: If the lock is not held.
+        """
+        if not self._locked:
+            raise RuntimeError("Lock is not acquired")
+        while self._waiters:
+            finish, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._virtual_time = finish
+                waiter.set_result(True)
+                return
+        self._locked = False
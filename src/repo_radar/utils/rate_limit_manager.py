@@ -1,81 +1,143 @@
 import asyncio
+import math
 import time
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional
 import logging
+from urllib.parse import urlparse
 from requests import Response
-from datetime import datetime
-from repo_radar.config import GITHUB_DEFAULT_RATE
+from datetime import datetime, timezone
+from repo_radar.config import PRIORITY_RESERVES
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+from repo_radar.utils.priority_lanes import WeightedFairLock, current_priority
+
+if TYPE_CHECKING:
+    from repo_radar.utils.adaptive_concurrency import AdaptiveConcurrency
 
 class RateLimitManager:
     """
     RateLimitManager async-compatible class
 
-    Tracks API rate limits using state variables and updates them by parsing
-    rate limit headers from an HTTP response.
-    
+    Tracks one GitHub rate limit bucket using state variables and updates them
+    by parsing rate limit headers from an HTTP response. GitHub budgets core,
+    search, code search and GraphQL requests separately; RateLimits keeps one
+    manager per bucket.
+
+    Entering the manager admits one request: it reserves one request of the
+    budget and, if a concurrency limiter is given, takes a slot of it. Only
+    admission is serialized; any number of admitted requests may be in flight.
     Users must use update_from_headers to update state variables before exiting.
 
     Attributes:
-        - remaining (Optional[int]): Remaining API requests allowed before reset.
+        - resource (str): Rate limit bucket tracked, e.g. 'core' or 'search'.
+        - siblings (Optional[RateLimits]): Buckets of the same token, updated when a response
+          reports another bucket in X-RateLimit-Resource.
+        - concurrency (Optional[AdaptiveConcurrency]): Limiter whose slot admitted requests hold.
+        - limit (Optional[int]): Requests allowed per rate-limit window.
+        - remaining (Optional[int]): Remaining API requests allowed before reset, less those in flight.
         - reset_time (Optional[int]): Unix timestamp for the next rate limit reset.
-        - _lock (asyncio.Lock): Synchronisation primitive for blocking tasks.
-        - _lock_owner (Optional[asyncio.Task]): Current owner of the lock.
-        - _headers_updated (bool): Whether headers were updated before exiting.
+        - _reported (Optional[int]): Lowest remaining count reported for the current window.
+        - _lock (WeightedFairLock): Admits one request at a time, by priority lane.
+        - _admitted (Dict[asyncio.Task, bool]): Tasks with an admitted request, and whether
+          they updated headers.
         - logger (logging.Logger): Logger instance for reporting and errors.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        resource: str = "core",
+        siblings: Optional["RateLimits"] = None,
+        concurrency: Optional["AdaptiveConcurrency"] = None,
+    ):
+        self.resource = resource
+        self.siblings = siblings
+        self.concurrency = concurrency
+        self.limit: Optional[int] = None
         self.remaining: Optional[int] = None
         self.reset_time: Optional[int] = None
-        self._lock = asyncio.Lock()
-        self._lock_owner: Optional[asyncio.Task] = None
-        self._headers_updated: bool = False
+        self._reported: Optional[int] = None
+        self._lock = WeightedFairLock()
+        self._admitted: Dict[asyncio.Task, bool] = {}
         self.logger = logging.getLogger(__name__)
 
     async def __aenter__(self):
         """
         Implements the __aenter asyncio interface for use with asyncio
         
-        Acquires the lock, checks current state of rate_limiter and sleeps if
-        necessary.
+        Waits for the admission lock in the caller's priority lane (see
+        repo_radar.utils.priority_lanes), checks current state of
+        rate_limiter and sleeps if necessary. Lower lanes stop short of the
+        end of the budget, leaving PRIORITY_RESERVES of it to the lanes above,
+        and wait for the reset without holding the lock. Once the window has
+        reset the budget is assumed full at the last known limit; the next
+        response's headers give the exact count.
+
+        The lock is held until the request has a concurrency slot, so lanes
+        also decide who gets the next free slot, and released before the
+        request is sent.
         
         Raises:
-            - RuntimeError: If lock is acquired by same coroutine twice
+            - RuntimeError: If the same task enters twice
         """
-        if self._lock_owner == asyncio.current_task():
+        task = asyncio.current_task()
+        if task in self._admitted:
             self.logger.error("RateLimitManager is not reentrant")
             raise RuntimeError("RateLimitManager is not reentrant")
         
-        await self._lock.acquire()
-        self._headers_updated = False
-        self._lock_owner = asyncio.current_task()
-        
-        if self.remaining and self.remaining <= 0:
+        lane = current_priority()
+        while True:
+            await self._lock.acquire(lane)
+            if self.remaining is None or self.remaining > self.reserved_for(lane):
+                break
             now = time.time()
-            wait_time = max(0, (self.reset_time or now) - now)
-            
-            if wait_time > 0:
-                reset_dt = datetime.utcfromtimestamp(self.reset_time).strftime("%Y-%m-%d %H:%M:%S")
-                self.logger.warning(f"Rate limit hit, sleeping until {reset_dt} ({wait_time:.1f}s)")
-                await asyncio.sleep(wait_time)
-                self.remaining = GITHUB_DEFAULT_RATE
-            
+            if self.reset_time is None or now >= self.reset_time:
+                self.remaining = self._reported = self.limit  # the window reset since the last response
+                break
+
+            wait_time = self.reset_time - now
+            self._lock.release()
+            reset_dt = datetime.fromtimestamp(self.reset_time, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            if self.remaining <= 0:
+                self.logger.warning(f"{self.resource} rate limit hit, sleeping until {reset_dt} ({wait_time:.1f}s)")
+            else:
+                self.logger.info(f"{self.resource} budget left is reserved above the {lane} lane, waiting until {reset_dt}")
+            await asyncio.sleep(wait_time)
+            INSTRUMENTATION.record_rate_limit_wait(wait_time, self.resource)
+
+        try:
+            if self.concurrency is not None:
+                await self.concurrency.__aenter__()
+        finally:
+            self._lock.release()
+        if self.remaining is not None:
+            self.remaining -= 1
+        self._admitted[task] = False
         return self
 
+    def reserved_for(self, lane: str) -> int:
+        """Requests of the current window a lane must leave to the lanes above it."""
+        return math.ceil((self.limit or 0) * PRIORITY_RESERVES.get(lane, 0.0))
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         Implements the __aexit asyncio interface for use with asyncio.
         
-        Checks if headers were updated before releasing the lock.
+        Always ends the admission and frees the concurrency slot. A request
+        that ended without rate limit headers, for example because it failed
+        before reaching GitHub, gives its reservation back. If the block
+        raised, that exception propagates unchanged; otherwise headers must
+        have been updated.
         
         Raises:
-            - RuntimeError: If lock is released without updating state variables
+            - RuntimeError: If the block completed without updating state variables
         """
-        if self._headers_updated == False:
-            self.logger.error("Must call update_from_headers() before releasing the rate limit lock")
-            raise RuntimeError("Must call update_from_headers() before releasing the rate limit lock")
-            
-        self._lock_owner = None
-        self._lock.release()
+        headers_updated = self._admitted.pop(asyncio.current_task(), False)
+        try:
+            self._reconcile()
+            if exc_type is None and not headers_updated:
+                self.logger.error("Must call update_from_headers() before leaving the rate limit manager")
+                raise RuntimeError("Must call update_from_headers() before leaving the rate limit manager")
+        finally:
+            if self.concurrency is not None:
+                await self.concurrency.__aexit__(exc_type, exc_val, exc_tb)
 
     async def update_from_headers(self, response: Response):
         """
@@ -84,24 +146,115 @@ class RateLimitManager:
         Args:
             - response (Response): The HTTP Response object to be parsed
         
+        Responses without rate limit headers, such as errors from a proxy in
+        front of the API, leave the state unchanged.
+        
         Raises:
-            - RuntimeError: If function is called by task that isn't the lock owner
-                          or Response is missing limit headers.
+            - RuntimeError: If function is called by a task the RateLimitManager did not admit.
         """
-        if self._lock_owner != asyncio.current_task():
-            self.logger.error("update_from_headers must be called within the RateLimitManager task holding the lock")
-            raise RuntimeError("update_from_headers must be called within the RateLimitManager task holding the lock")
+        task = asyncio.current_task()
+        if task not in self._admitted:
+            self.logger.error("update_from_headers must be called within a task admitted by the RateLimitManager")
+            raise RuntimeError("update_from_headers must be called within a task admitted by the RateLimitManager")
             
+        self._admitted[task] = True
         try:
             remaining = int(response.headers.get("X-RateLimit-Remaining"))
             reset = int(response.headers.get("X-RateLimit-Reset"))
-            
-            if self.reset_time is None or self.reset_time < reset:
-                self.reset_time = reset
-                self.remaining = remaining
-            
-            self._headers_updated = True
-            
+            limit = response.headers.get("X-RateLimit-Limit")
         except (ValueError, TypeError):
             self.logger.warning("Rate limit headers missing from response.")
-            raise RuntimeError("Rate limit headers missing from response.")
+            return
+        resource = response.headers.get("X-RateLimit-Resource") or self.resource
+        target = self
+        if resource != self.resource and self.siblings is not None:
+            # The request was charged to another bucket than expected; keep this one as it was
+            target = self.siblings.bucket(resource)
+        target.observe(remaining, reset, int(limit) if limit else None)
+
+    def observe(self, remaining: int, reset: int, limit: Optional[int] = None):
+        """
+        Record a remaining count and reset time reported for this bucket.
+
+        Responses can arrive out of order: within one window the lowest
+        count is the latest, and counts of an older window are ignored.
+        Requests still in flight may not be counted yet, so they stay
+        subtracted from remaining until their own response arrives.
+
+        Args:
+            - remaining (int): Requests left in the window.
+            - reset (int): Unix time the window resets.
+            - limit (int, optional): Requests allowed per window.
+        """
+        if self.reset_time is None or self.reset_time < reset:
+            self.reset_time = reset
+            self._reported = remaining
+        elif self.reset_time == reset:
+            self._reported = min(self._reported, remaining) if self._reported is not None else remaining
+        self._reconcile()
+        if limit:
+            self.limit = limit
+
+    def _reconcile(self):
+        # Admitted requests without headers yet are not in the reported count
+        if self._reported is not None:
+            self.remaining = self._reported - sum(1 for updated in self._admitted.values() if not updated)
+
+def resource_for_url(url: str) -> str:
+    """
+    Return the rate limit bucket GitHub charges a request URL to.
+
+    Args:
+        - url (str): Full GitHub API URL.
+
+    Returns:
+        - str: 'code_search', 'search', 'graphql' or 'core'.
+    """
+    path = urlparse(url).path
+    if "/search/code" in path:
+        return "code_search"
+    if "/search/" in path:
+        return "search"
+    if path.endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+class RateLimits:
+    """
+    The rate limit buckets of one token, one RateLimitManager each.
+
+    Requests queue only behind requests for the same bucket, so an exhausted
+    search quota never delays core REST requests. Buckets are created on
+    first use; their limits come from response headers or from
+    update_from_rate_limit.
+
+    Attributes:
+        - buckets (Dict[str, RateLimitManager]): Manager per resource name.
+        - concurrency (Optional[AdaptiveConcurrency]): Limiter shared by the requests of every bucket.
+    """
+    def __init__(self, concurrency: Optional["AdaptiveConcurrency"] = None):
+        self.buckets: Dict[str, RateLimitManager] = {}
+        self.concurrency = concurrency
+
+    def bucket(self, resource: str = "core") -> RateLimitManager:
+        """Return the manager of a resource, creating it on first use."""
+        if resource not in self.buckets:
+            self.buckets[resource] = RateLimitManager(resource, siblings=self, concurrency=self.concurrency)
+        return self.buckets[resource]
+
+    def for_url(self, url: str) -> RateLimitManager:
+        """Return the manager of the bucket a request URL is charged to."""
+        return self.bucket(resource_for_url(url))
+
+    def update_from_rate_limit(self, payload: dict):
+        """
+        Set every bucket from a GET /rate_limit response body.
+
+        The /rate_limit endpoint does not count against any bucket, so it can
+        be called before a run to start with known budgets.
+
+        Args:
+            - payload (dict): Parsed body, with a 'resources' mapping of name to limit, remaining and reset.
+        """
+        for resource, state in (payload.get("resources") or {}).items():
+            self.bucket(resource).observe(int(state["remaining"]), int(state["reset"]), int(state["limit"]))
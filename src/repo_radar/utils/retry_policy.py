@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from requests import Response
+from requests.exceptions import ChunkedEncodingError, ConnectionError, Timeout
+from repo_radar.config import (
+    MAX_RETRIES, RATE_LIMIT_MAX_WAITS, RETRY_BASE_DELAY, RETRY_BUDGET_MIN, RETRY_BUDGET_RATIO, RETRY_MAX_DELAY,
+    SECONDARY_RATE_LIMIT_DELAY,
+)
+from repo_radar.monitoring.instrumentation import endpoint_template
+
+# Methods that may be repeated after an unknown outcome without changing anything twice
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Reasons a request was not processed at all, so any method may be retried
+RATE_LIMIT_REASONS = frozenset({"rate_limit", "secondary_limit", "429"})
+
+_TRANSIENT_ERRORS = (ConnectionError, Timeout, ChunkedEncodingError)
+_TRANSIENT_STATUSES = frozenset({500, 502, 503, 504})
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed GitHub request is retried.
+
+    Rate limits (429, secondary-limit 403s and exhausted primary limits) are
+    waited out as GitHub asks: for Retry-After when given, at least
+    secondary_delay for secondary limits without it, and until
+    X-RateLimit-Reset for the primary limit (the RateLimitManager does that
+    wait). They are not failures, so they do not use the retry budget and are
+    bounded by max_rate_limit_waits instead.
+
+    Transient failures (5xx and connection errors) are retried with
+    exponential backoff and full jitter, only for idempotent methods, and only
+    while the endpoint's retry budget lasts: each endpoint may retry
+    budget_min times plus budget_ratio times its request count, so a failing
+    endpoint fails fast instead of multiplying load. Other errors are never
+    retried.
+
+    Attributes:
+        - max_retries (int): Retries of transient failures per request.
+        - max_rate_limit_waits (int): Rate-limit waits per request.
+        - base_delay (float): Backoff of the first transient retry in seconds.
+        - max_delay (float): Upper bound of the backoff.
+        - secondary_delay (float): Wait for a secondary limit that sends no Retry-After.
+    """
+    def __init__(
+        self,
+        max_retries: int = MAX_RETRIES,
+        max_rate_limit_waits: int = RATE_LIMIT_MAX_WAITS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        secondary_delay: float = SECONDARY_RATE_LIMIT_DELAY,
+        budget_ratio: float = RETRY_BUDGET_RATIO,
+        budget_min: float = RETRY_BUDGET_MIN,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_retries = max_retries
+        self.max_rate_limit_waits = max_rate_limit_waits
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.secondary_delay = secondary_delay
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, float] = {}
+
+    @staticmethod
+    def reason(response: Optional[Response] = None, error: Optional[BaseException] = None) -> Optional[str]:
+        """
+        Classify a failed attempt.
+
+        Returns:
+            - Optional[str]: 'rate_limit', 'secondary_limit', '429', the 5xx status,
+              'connection', or None if the outcome is not retryable.
+        """
+        if error is not None:
+            return "connection" if isinstance(error, _TRANSIENT_ERRORS) else None
+        status = response.status_code
+        if status == 429:
+            return "429"
+        if status == 403:
+            if response.headers.get("Retry-After") or "secondary rate limit" in response.text.lower():
+                return "secondary_limit"
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                return "rate_limit"
+            return None
+        if status in _TRANSIENT_STATUSES:
+            return str(status)
+        return None
+
+    def _retry_after(self, response: Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None  # malformed, so the caller backs off instead
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)  # '-0000' dates are UTC of unknown origin
+        return max(0.0, date.timestamp() - self.clock())
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def record_request(self, url: str):
+        """Count a request towards its endpoint's retry budget."""
+        endpoint = endpoint_template(url)
+        with self._lock:
+            self._budgets[endpoint] = self._budgets.get(endpoint, self.budget_min) + self.budget_ratio
+
+    def _spend_budget(self, url: str) -> bool:
+        endpoint = endpoint_template(url)
+        with self._lock:
+            tokens = self._budgets.get(endpoint, self.budget_min)
+            if tokens < 1:
+                return False
+            self._budgets[endpoint] = tokens - 1
+            return True
+
+    def next_delay(
+        self,
+        url: str,
+        attempt: int,
+        response: Optional[Response] = None,
+        error: Optional[BaseException] = None,
+        method: str = "GET",
+        rate_limit_waits: int = 0,
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Decide whether to retry a failed attempt and how long to wait first.
+
+        Args:
+            - url (str): Requested URL, for the endpoint's retry budget.
+            - attempt (int): Transient retries of this request so far.
+            - response (Response, optional): The response, if one was received.
+            - error (BaseException, optional): The exception, if no response was received.
+            - method (str): HTTP method, for idempotency.
+            - rate_limit_waits (int): Rate-limit waits of this request so far.
+
+        Returns:
+            - Optional[Tuple[str, float]]: (reason, seconds to wait), or None to give up.
+        """
+        reason = self.reason(response, error)
+        if reason is None:
+            return None
+        if reason in RATE_LIMIT_REASONS:
+            if rate_limit_waits >= self.max_rate_limit_waits:
+                return None
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                # A little spread so clients told the same time do not return at once
+                return reason, retry_after + random.uniform(0, min(self.base_delay, 0.1 * retry_after))
+            if reason == "rate_limit":
+                return reason, 0.0  # RateLimitManager sleeps until X-RateLimit-Reset
+            if reason == "secondary_limit":
+                return reason, self.secondary_delay + self._backoff(rate_limit_waits)
+            return reason, self._backoff(rate_limit_waits)
+        if method.upper() not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+            return None
+        if not self._spend_budget(url):
+            return None
+        return reason, self._backoff(attempt)
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one.
+
+    While a call for a key is in flight, further calls for the same key wait
+    for its result instead of starting their own; once it completes, the next
+    call starts afresh, so nothing is cached beyond the call's lifetime. The
+    shared call keeps running if one of its waiters is cancelled.
+
+    Attributes:
+        - name (str): Label under which joined and started calls are recorded.
+    """
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here so a failure without waiters is not reported as unhandled
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return the result of call(), sharing it with concurrent calls of the same key.
+
+        Args:
+            - key (Hashable): Identity of the call, e.g. the request URL.
+            - call (Callable[[], Awaitable[T]]): Starts the call if none is in flight.
+
+        Returns:
+            - T: The shared result.
+
+        Raises:
+            - Exception: Whatever the shared call raised, to every waiter.
+        """
+        task = self._calls.get(key)
+        # A call left over from another event loop cannot be awaited here
+        joined = task is not None and task.get_loop() is asyncio.get_running_loop()
+        INSTRUMENTATION.record_cache(self.name, joined)
+        if not joined:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import time
+import logging
+from dataclasses import replace
+from typing import Callable, Dict, Optional
+from requests import Response
+from repo_radar.config import GITHUB_TOKEN_VALIDATION_TTL
+from repo_radar.models.github_token import GitHubToken
+from repo_radar.models.token_validation import TokenValidation
+from repo_radar.monitoring.instrumentation import INSTRUMENTATION
+import repo_radar.api.github_api as github_api
+
+class TokenValidationCache:
+    """
+    Thread-safe, per-token cache of GitHub token validation results.
+
+    Results are keyed by a hash of the token string so the raw token is never
+    stored, and expire after ttl seconds. Concurrent lookups for the same
+    token share a single validation request.
+
+    Attributes:
+        - ttl (float): Lifetime of a cached validation in seconds.
+        - logger (logging.Logger): Logger instance for reporting and errors.
+    """
+    def __init__(self, ttl: float = GITHUB_TOKEN_VALIDATION_TTL, clock: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self._clock = clock
+        self._results: Dict[str, TokenValidation] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _key(token: GitHubToken) -> str:
+        """Return the cache key for a token."""
+        return hashlib.sha256(token.token_string.encode("utf-8")).hexdigest()
+
+    def get(self, token: GitHubToken) -> Optional[TokenValidation]:
+        """Return the cached, unexpired validation for a token, or None."""
+        with self._lock:
+            result = self._results.get(self._key(token))
+        if result is None or result.is_expired(self.ttl, self._clock()):
+            return None
+        return result
+
+    def get_or_validate(
+        self,
+        token: GitHubToken,
+        validate: Optional[Callable[[GitHubToken], Response]] = None,
+    ) -> TokenValidation:
+        """
+        Return the cached validation for a token, validating it if needed.
+
+        Blocking; async callers should run it with asyncio.to_thread.
+
+        Args:
+            - token (GitHubToken): Token to validate.
+            - validate (Callable, optional): Validation function, defaults to github_api.validate_github_token.
+
+        Returns:
+            - TokenValidation: The cached or freshly obtained validation.
+
+        Raises:
+            - HTTPError: If the token is rejected by GitHub. Failures are not cached.
+        """
+        cached = self.get(token)
+        INSTRUMENTATION.record_cache("token_validation", cached is not None)
+        if cached is not None:
+            return cached
+
+        key = self._key(token)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have validated while we waited
+            cached = self.get(token)
+            if cached is not None:
+                return cached
+            validate = validate or github_api.validate_github_token
+            response = validate(token)
+            result = TokenValidation.from_response(response)
+            result = replace(result, validated_at=self._clock())
+            if result.rate_limited:
+                self.logger.warning("Token validation hit a rate limit. Treating token as valid.")
+            with self._lock:
+                self._results[key] = result
+            return result
+
+    def invalidate(self, token: Optional[GitHubToken] = None):
+        """Drop the cached result for a token, or every result if token is None."""
+        with self._lock:
+            if token is None:
+                self._results.clear()
+            else:
+                self._results.pop(self._key(token), None)
+
+# Process-wide cache shared by every client
+TOKEN_VALIDATION_CACHE = TokenValidationCache()
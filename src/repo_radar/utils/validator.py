@@ -7,3 +7,6 @@ def is_valid_github_repo_url(url: str) -> bool:
 
 def is_valid_github_username(username: str) -> bool:
     return re.match(r"^[a-zA-Z0-9-]{1,39}$", username) is not None
+
+def is_valid_github_repo_name(name: str) -> bool:
+    return re.match(r"^[a-zA-Z0-9._-]{1,100}$", name) is not None and name not in (".", "..")
@@ -0,0 +1,67 @@
+import re
+from typing import List, Optional
+
+# Markers are chosen so that plain byte-wise comparison of keys orders versions:
+#   pre-release < release end < post-release < further release segment
+_PRE = "1"
+_END = "3"
+_POST = "4"
+_NUM = "5"
+
+# Rank of well-known pre-release labels; unknown labels sort between beta and rc
+_PRE_RANKS = {"dev": "0", "a": "1", "alpha": "1", "b": "2", "beta": "2", "c": "4", "rc": "4", "pre": "4", "preview": "4"}
+_POST_LABELS = {"post", "rev", "r"}
+
+_RELEASE = re.compile(r"^(?:(\d+)!)?(\d+(?:\.\d+)*)(.*)$")
+_TOKENS = re.compile(r"[A-Za-z]+|\d+")
+
+def _num(token: str) -> str:
+    digits = token.lstrip("0") or "0"
+    return f"{_NUM}{len(digits):02d}{digits}"
+
+def version_key(version: str, ecosystem: str = "") -> Optional[str]:
+    """
+    Return a string whose byte-wise order matches version precedence.
+
+    Handles the common shapes of PEP 440, SemVer (npm, crates.io) and Go
+    module versions (including the leading 'v' and pseudo-versions), so
+    version ranges can be compared with plain string comparison, e.g. in
+    SQLite. It is an approximation of each ecosystem's full rules: build
+    metadata and local version labels are ignored.
+
+    Args:
+        - version (str): Version string, e.g. '1.2.3', 'v0.3.7', '2.0.0-rc.1', '1.0.post2'.
+        - ecosystem (str): OSV ecosystem name. For 'PyPI', '1.0-1' is a post-release.
+
+    Returns:
+        - Optional[str]: Sortable key, or None if the string is not a version.
+    """
+    if not version:
+        return None
+    v = version.strip().lstrip("=vV ").split("+", 1)[0]
+    match = _RELEASE.match(v)
+    if not match:
+        return None
+    epoch, release, rest = match.groups()
+
+    segments = [int(x) for x in release.split(".")]
+    while len(segments) > 1 and segments[-1] == 0:
+        segments.pop()
+    parts: List[str] = [_num(epoch or "0")] + [_num(str(s)) for s in segments]
+
+    tokens = _TOKENS.findall(rest)
+    if tokens and tokens[0].isdigit() and rest.lstrip().startswith("-"):
+        # '1.0-1' is a post-release in PEP 440 and a numeric pre-release in SemVer
+        parts.append(_POST if ecosystem == "PyPI" else _PRE + "3")
+    for token in tokens:
+        if token.isdigit():
+            parts.append(_num(token))
+            continue
+        label = token.lower()
+        if label in _POST_LABELS:
+            parts.append(_POST)
+        else:
+            # Unknown labels keep their text so that e.g. 'alpha' < 'alphab'; '!' terminates the label
+            parts.append(_PRE + _PRE_RANKS.get(label, "3" + label + "!"))
+    parts.append(_END)
+    return "".join(parts)
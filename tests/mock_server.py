@@ -0,0 +1,653 @@
+"""
+Local stand-in for the GitHub REST API and the Sentry read API.
+
+Serves deterministic fixtures with Link pagination and X-RateLimit-* headers,
+and can inject latency, 403/429 errors, primary rate-limit exhaustion and
+secondary rate limits. Used by the offline tests and the benchmark suite.
+
+Example:
+    with MockApiServer(latency=0.005) as server:
+        os.environ["GITHUB_API_URL"] = server.github_url
+        ...
+"""
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlencode, urlparse
+
+LANGUAGES = ["Python", "TypeScript", "Go", "Rust", "Shell", "HTML", "CSS", "Dockerfile"]
+
+# Files served through /git/trees and /git/blobs for every repository
+REPO_FILES = {
+    "README.md": "# demo\n",
+    "pyproject.toml": '[project]\nname = "demo"\ndependencies = ["requests>=2.31", "jinja2==3.1.2"]\n',
+    "uv.lock": '[[package]]\nname = "requests"\nversion = "2.31.0"\n\n[[package]]\nname = "jinja2"\nversion = "3.1.2"\n',
+    "src/app/main.py": "print('hi')\n",
+    "services/api/requirements.txt": "flask==2.2.0\ngunicorn>=21\n",
+    "services/api/requirements-dev.txt": "pytest==8.0.0\n",
+    "web/package.json": '{"dependencies": {"lodash": "4.17.20"}, "devDependencies": {"jest": "^29.0.0"}}',
+    "web/node_modules/lodash/package.json": '{"name": "lodash"}',
+    "tools/go.mod": "module example.com/tools\n\nrequire (\n\tgolang.org/x/text v0.3.7\n)\n",
+}
+
+@dataclass
+class Fault:
+    """
+    An injected error response.
+
+    Attributes:
+        - status (int): HTTP status to return (e.g. 403, 429, 502).
+        - count (int): Number of matching requests that receive the fault.
+        - path_prefix (str): Only requests whose path starts with this prefix match.
+        - retry_after (Optional[int]): Value for the Retry-After header, if any.
+        - secondary (bool): Mimic a GitHub secondary rate limit message.
+    """
+    status: int
+    count: int = 1
+    path_prefix: str = ""
+    retry_after: Optional[int] = None
+    secondary: bool = False
+
+@dataclass
+class RepoFixture:
+    """Sizes of the generated collections for one repository."""
+    commits: int = 250
+    issues: int = 120
+    pulls: int = 60
+    contributors: int = 30
+    branches: int = 12
+
+@dataclass
+class MockState:
+    """Mutable server state shared between handler threads."""
+    rate_limit: int = 5000
+    remaining: int = 5000
+    reset_window: int = 3600
+    reset_time: int = 0
+    # Buckets other than core, by X-RateLimit-Resource: [limit, remaining, reset_time, window seconds]
+    buckets: Dict[str, List[int]] = field(default_factory=dict)
+    secondary_limit_per_second: int = 0
+    faults: Deque[Fault] = field(default_factory=deque)
+    recent: Deque[float] = field(default_factory=deque)
+    request_log: List[str] = field(default_factory=list)
+    stats_polls: Dict[str, int] = field(default_factory=dict)
+    # Requests being answered now, and the most ever answered at once
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+class MockApiServer:
+    """
+    Threaded HTTP server serving GitHub and Sentry fixtures.
+
+    GitHub endpoints are served under /github and Sentry endpoints under
+    /sentry/api/0, so one server can stand in for both APIs.
+
+    Attributes:
+        - latency (float): Seconds to sleep before answering each request.
+        - default_fixture (RepoFixture): Collection sizes for repos without an explicit fixture.
+        - fixtures (Dict[str, RepoFixture]): Per 'org/repo' collection sizes.
+        - stats_pending (int): Number of 202 Accepted answers each stats endpoint gives before its data.
+        - owner_repo_count (int): Number of repositories listed for any organization or user.
+        - missing_repos (Set[str]): 'org/repo' names search and GraphQL answer as not found.
+        - state (MockState): Rate-limit counters, injected faults and request log.
+    """
+    def __init__(
+        self,
+        latency: float = 0.0,
+        default_fixture: Optional[RepoFixture] = None,
+        rate_limit: int = 5000,
+        secondary_limit_per_second: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        stats_pending: int = 0,
+        owner_repo_count: int = 250,
+    ):
+        self.latency = latency
+        self.stats_pending = stats_pending
+        self.owner_repo_count = owner_repo_count
+        self.default_fixture = default_fixture or RepoFixture()
+        self.fixtures: Dict[str, RepoFixture] = {}
+        self.missing_repos: Set[str] = set()
+        self._collections: Dict[tuple, List[dict]] = {}
+        self.state = MockState(
+            rate_limit=rate_limit,
+            remaining=rate_limit,
+            reset_time=int(time.time()) + 3600,
+            buckets={"search": [30, 30, int(time.time()) + 60, 60],
+                     "graphql": [rate_limit, rate_limit, int(time.time()) + 3600, 3600]},
+            secondary_limit_per_second=secondary_limit_per_second,
+        )
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # --- lifecycle ---
+
+    def start(self) -> "MockApiServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and release the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockApiServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def github_url(self) -> str:
+        """Value to use for GITHUB_API_URL."""
+        return f"{self.base_url}/github"
+
+    @property
+    def sentry_url(self) -> str:
+        """Value to use for SENTRY_API_BASE."""
+        return f"{self.base_url}/sentry"
+
+    # --- configuration ---
+
+    def inject_fault(self, status: int, count: int = 1, path_prefix: str = "",
+                     retry_after: Optional[int] = None, secondary: bool = False):
+        """Queue an error response for the next matching request(s)."""
+        with self.state.lock:
+            self.state.faults.append(Fault(status, count, path_prefix, retry_after, secondary))
+
+    def set_remaining(self, remaining: int, reset_in: int = 3600):
+        """Set the primary rate-limit budget and seconds until it resets."""
+        with self.state.lock:
+            self.state.remaining = remaining
+            self.state.reset_time = int(time.time()) + reset_in
+
+    def set_search_remaining(self, remaining: int, reset_in: int = 60):
+        """Set the search rate-limit budget and seconds until it resets."""
+        with self.state.lock:
+            self.state.buckets["search"][1:3] = [remaining, int(time.time()) + reset_in]
+
+    @property
+    def request_count(self) -> int:
+        return len(self.state.request_log)
+
+    def owner_repos(self, owner: str) -> List[dict]:
+        """Return the generated repository listing of an organization or user.
+
+        Every 10th repository is archived and every 7th is a fork.
+        """
+        key = (owner, "repos")
+        if key not in self._collections:
+            self._collections[key] = [
+                {"name": f"repo-{i}", "full_name": f"{owner}/repo-{i}", "owner": {"login": owner},
+                 "html_url": f"https://github.com/{owner}/repo-{i}", "archived": i % 10 == 0, "fork": i % 7 == 0}
+                for i in range(self.owner_repo_count)
+            ]
+        return self._collections[key]
+
+    def fixture_for(self, repo_path: str) -> RepoFixture:
+        return self.fixtures.get(repo_path, self.default_fixture)
+
+    def collection(self, repo_path: str, kind: str) -> List[dict]:
+        """Return the generated items of one paginated collection, memoised per repo."""
+        key = (repo_path, kind)
+        if key not in self._collections:
+            self._collections[key] = _collection(repo_path, kind, self.fixture_for(repo_path))
+        return self._collections[key]
+
+# --- fixture generation ---
+
+def _rng(*parts) -> random.Random:
+    return random.Random("/".join(str(p) for p in parts))
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _user(login: str, i: int) -> dict:
+    return {"login": login, "id": 1000 + i, "type": "User",
+            "url": f"https://api.github.com/users/{login}"}
+
+def _commit(repo: str, i: int) -> dict:
+    rng = _rng(repo, "commit", i)
+    sha = "%040x" % rng.getrandbits(160)
+    login = f"dev{rng.randint(0, 29)}"
+    date = _iso(datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i * 7))
+    return {
+        "sha": sha,
+        "commit": {
+            "author": {"name": login, "email": f"{login}@example.com", "date": date},
+            "committer": {"name": login, "email": f"{login}@example.com", "date": date},
+            "message": f"Change {i} in {repo}\n\n" + "detail " * rng.randint(5, 40),
+        },
+        "author": _user(login, i),
+        "committer": _user(login, i),
+        "parents": [{"sha": "%040x" % rng.getrandbits(160)}],
+    }
+
+def _issue(repo: str, i: int, pull: bool = False) -> dict:
+    rng = _rng(repo, "pull" if pull else "issue", i)
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i * 5)
+    closed = rng.random() < 0.6
+    item = {
+        "id": 50000 + i,
+        "number": i + 1,
+        "title": f"{'PR' if pull else 'Issue'} {i + 1}",
+        "state": "closed" if closed else "open",
+        "user": _user(f"dev{rng.randint(0, 29)}", i),
+        "labels": [{"name": rng.choice(["bug", "enhancement", "docs"])}],
+        "comments": rng.randint(0, 15),
+        "created_at": _iso(created),
+        "updated_at": _iso(created + timedelta(hours=3)),
+        "closed_at": _iso(created + timedelta(hours=rng.randint(1, 200))) if closed else None,
+        "body": "lorem ipsum " * rng.randint(10, 80),
+    }
+    if pull:
+        item["merged_at"] = item["closed_at"] if closed and rng.random() < 0.8 else None
+        item["head"] = {"ref": f"feature-{i}", "sha": "%040x" % rng.getrandbits(160)}
+        item["base"] = {"ref": "main"}
+    return item
+
+def _collection(repo: str, kind: str, fx: RepoFixture) -> List[dict]:
+    if kind == "commits":
+        return [_commit(repo, i) for i in range(fx.commits)]
+    if kind == "issues":
+        # GitHub's issues endpoint includes pull requests
+        items = [_issue(repo, i) for i in range(fx.issues)]
+        for i in range(fx.pulls):
+            pr = _issue(repo, i, pull=True)
+            # Pull request fields live under 'pull_request' here; head and base are not listed
+            del pr["head"], pr["base"]
+            pr["pull_request"] = {
+                "url": f"https://api.github.com/repos/{repo}/pulls/{i + 1}",
+                "html_url": f"https://github.com/{repo}/pull/{i + 1}",
+                "merged_at": pr.pop("merged_at"),
+            }
+            items.append(pr)
+        return items
+    if kind == "pulls":
+        return [_issue(repo, i, pull=True) for i in range(fx.pulls)]
+    if kind == "contributors":
+        return [{**_user(f"dev{i}", i), "contributions": max(1, fx.commits // (i + 2))}
+                for i in range(fx.contributors)]
+    if kind == "branches":
+        # Pairs of feature branches share a head commit, as after a fast-forward merge
+        names = ["main"] + [f"feature-{i}" for i in range(fx.branches - 1)]
+        return [{"name": n, "commit": {"sha": _commit(repo, (idx + 1) // 2)["sha"]}, "protected": n == "main"}
+                for idx, n in enumerate(names)]
+    return []
+
+_PULL_NODE_ID = re.compile(r"^PR_(?P<repo>.+)_(?P<number>\d+)$")
+
+def _connection(items: List[dict], first: int, after: Optional[str]) -> dict:
+    """A GraphQL connection page; cursors are item offsets."""
+    start = int(after) if after else 0
+    end = start + first
+    return {"totalCount": len(items), "nodes": items[start:end],
+            "pageInfo": {"hasNextPage": end < len(items), "endCursor": str(min(end, len(items)))}}
+
+def _reviews(repo: str, pull: dict) -> List[dict]:
+    # Up to 18 reviews an hour apart; on every 5th pull request the first 12 are the author's own replies
+    created = datetime.fromisoformat(pull["created_at"].replace("Z", "+00:00"))
+    rng = _rng(repo, "reviews", pull["number"])
+    return [{"submittedAt": _iso(created + timedelta(hours=k + 1)),
+             "author": {"login": pull["user"]["login"] if pull["number"] % 5 == 0 and k < 12
+                        else f"reviewer{rng.randint(0, 9)}"}}
+            for k in range(pull["number"] % 7 * 3)]
+
+def _pull_node(repo: str, pull: dict, reviews: int) -> dict:
+    created = datetime.fromisoformat(pull["created_at"].replace("Z", "+00:00"))
+    ready = [{"createdAt": _iso(created + timedelta(minutes=30))}] if pull["number"] % 4 == 0 else []
+    return {
+        "id": f"PR_{repo}_{pull['number']}", "number": pull["number"], "author": {"login": pull["user"]["login"]},
+        "createdAt": pull["created_at"], "updatedAt": pull["updated_at"],
+        "mergedAt": pull["merged_at"], "closedAt": pull["closed_at"],
+        "comments": {"totalCount": pull["comments"]},
+        "readyForReview": {"nodes": ready},
+        "reviews": _connection(_reviews(repo, pull), reviews, None),
+    }
+
+def _languages(repo: str) -> Dict[str, int]:
+    rng = _rng(repo, "languages")
+    return {lang: rng.randint(1_000, 2_000_000) for lang in rng.sample(LANGUAGES, 4)}
+
+def _blob_sha(content: str) -> str:
+    return hashlib.sha1(f"blob {len(content.encode())}\0{content}".encode()).hexdigest()
+
+def _blobs() -> Dict[str, str]:
+    return {_blob_sha(c): c for c in REPO_FILES.values()}
+
+def _tree() -> dict:
+    entries, dirs = [], set()
+    for path, content in REPO_FILES.items():
+        parts = path.split("/")
+        for i in range(1, len(parts)):
+            dirs.add("/".join(parts[:i]))
+        entries.append({"path": path, "mode": "100644", "type": "blob",
+                        "sha": _blob_sha(content), "size": len(content)})
+    entries += [{"path": d, "mode": "040000", "type": "tree", "sha": hashlib.sha1(d.encode()).hexdigest()}
+                for d in sorted(dirs)]
+    return {"sha": "0" * 40, "tree": entries, "truncated": False}
+
+def _sentry_issues(limit: int) -> List[dict]:
+    return [
+        {"id": str(9000 + i), "title": f"ValueError: case {i}", "count": str(100 - i),
+         "status": "unresolved", "culprit": f"module.fn{i}"}
+        for i in range(min(limit, 25))
+    ]
+
+def _sentry_events_stats() -> dict:
+    start = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp())
+    return {"data": [[start + d * 86400, [{"count": (d * 37) % 50}]] for d in range(30)]}
+
+# --- request handling ---
+
+_PAGINATED = {"commits", "issues", "pulls", "contributors", "branches"}
+_OWNER_REPOS_ROUTE = re.compile(r"^/github/(?P<kind>orgs|users)/(?P<owner>[^/]+)/repos$")
+_REPO_ROUTE = re.compile(r"^/github/repos/(?P<org>[^/]+)/(?P<repo>[^/]+)(?:/(?P<rest>.*))?$")
+
+def _make_handler(server: MockApiServer):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body, headers: Optional[Dict[str, str]] = None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _rate_headers(self, resource: str = "core") -> Dict[str, str]:
+            st = server.state
+            if resource in st.buckets:
+                limit, remaining, reset, _ = st.buckets[resource]
+            else:
+                limit, remaining, reset = st.rate_limit, st.remaining, st.reset_time
+            return {
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(max(0, remaining)),
+                "X-RateLimit-Reset": str(reset),
+                "X-RateLimit-Used": str(limit - max(0, remaining)),
+                "X-RateLimit-Resource": resource,
+            }
+
+        def _take_fault(self, path: str) -> Optional[Fault]:
+            st = server.state
+            for fault in st.faults:
+                if path.startswith(fault.path_prefix):
+                    fault.count -= 1
+                    if fault.count <= 0:
+                        st.faults.remove(fault)
+                    return fault
+            return None
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            path, query = parsed.path, parse_qs(parsed.query)
+            fault, headers = self._admit(path)
+            if fault:
+                return self._send_fault(fault, headers)
+            if path.startswith("/sentry/api/0"):
+                return self._sentry(path[len("/sentry/api/0"):], query)
+            return self._github(path, query, headers)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            fault, headers = self._admit(self.path)
+            if fault:
+                return self._send_fault(fault, headers)
+            if self.path == "/github/graphql":
+                return self._graphql(body.get("query", ""), body.get("variables") or {}, headers)
+            return self._send(404, {"message": "Not Found"}, headers)
+
+        def _admit(self, path: str):
+            """Log the request, charge its rate limit bucket and pick an injected or rate-limit fault."""
+            st = server.state
+            with st.lock:
+                st.request_log.append(self.path)  # in arrival order, before the latency
+                st.in_flight += 1
+                st.peak_in_flight = max(st.peak_in_flight, st.in_flight)
+            try:
+                if server.latency:
+                    time.sleep(server.latency)
+            finally:
+                with st.lock:
+                    st.in_flight -= 1
+
+            with st.lock:
+                now = time.time()
+                if now >= st.reset_time:
+                    st.remaining = st.rate_limit
+                    st.reset_time = int(now) + st.reset_window
+                for bucket in st.buckets.values():
+                    if now >= bucket[2]:
+                        bucket[1], bucket[2] = bucket[0], int(now) + bucket[3]
+                resource = "search" if path.startswith("/github/search/") else \
+                    "graphql" if path == "/github/graphql" else "core"
+                fault = self._take_fault(path)
+                secondary_hit = False
+                if st.secondary_limit_per_second:
+                    while st.recent and now - st.recent[0] > 1.0:
+                        st.recent.popleft()
+                    st.recent.append(now)
+                    secondary_hit = len(st.recent) > st.secondary_limit_per_second
+                if resource in st.buckets and not fault and not secondary_hit:
+                    if st.buckets[resource][1] <= 0:
+                        fault = Fault(403)
+                    else:
+                        st.buckets[resource][1] -= 1
+                elif path.startswith("/github") and path != "/github/rate_limit" and not fault and not secondary_hit:
+                    if st.remaining <= 0:
+                        fault = Fault(403)
+                    else:
+                        st.remaining -= 1
+                headers = self._rate_headers(resource)
+
+            if secondary_hit:
+                fault = Fault(403, retry_after=1, secondary=True)
+            return fault, headers
+
+        def _send_fault(self, fault: Fault, headers: Dict[str, str]):
+            if fault.retry_after is not None:
+                headers["Retry-After"] = str(fault.retry_after)
+            if fault.secondary:
+                message = "You have exceeded a secondary rate limit. Please wait a few minutes before you try again."
+            elif fault.status == 403:
+                headers["X-RateLimit-Remaining"] = "0"
+                message = "API rate limit exceeded"
+            else:
+                message = f"Injected error {fault.status}"
+            self._send(fault.status, {"message": message}, headers)
+
+        def _github(self, path: str, query: Dict[str, List[str]], headers: Dict[str, str]):
+            if path == "/github/user":
+                headers["X-OAuth-Scopes"] = "repo, read:org"
+                return self._send(200, {"login": "mock-user", "id": 1}, headers)
+            if path == "/github/rate_limit":
+                st = server.state
+                core = {"limit": st.rate_limit, "remaining": st.remaining, "reset": st.reset_time,
+                        "used": st.rate_limit - st.remaining}
+                resources = {"core": core}
+                for name, (limit, remaining, reset, _) in st.buckets.items():
+                    resources[name] = {"limit": limit, "remaining": remaining, "reset": reset, "used": limit - remaining}
+                return self._send(200, {"resources": resources, "rate": core}, headers)
+            if path == "/github/search/issues":
+                return self._search_issues(query, headers)
+
+            m = _OWNER_REPOS_ROUTE.match(path)
+            if m:
+                repos = server.owner_repos(m["owner"])
+                if query.get("type", [""])[0] == "sources":
+                    repos = [r for r in repos if not r["fork"]]
+                return self._paginate(path, query, repos, headers)
+
+            m = _REPO_ROUTE.match(path)
+            if not m:
+                return self._send(404, {"message": "Not Found"}, headers)
+            repo = f"{m['org']}/{m['repo']}"
+            rest = m["rest"] or ""
+
+            if rest == "":
+                return self._send(200, {"full_name": repo, "default_branch": "main",
+                                        "archived": False, "fork": False}, headers)
+            if rest.startswith("git/trees/"):
+                return self._send(200, _tree(), headers)
+            if rest.startswith("git/blobs/"):
+                sha = rest.rsplit("/", 1)[-1]
+                content = _blobs().get(sha)
+                if content is None:
+                    return self._send(404, {"message": "Not Found"}, headers)
+                return self._send(200, {"sha": sha, "encoding": "base64", "size": len(content),
+                                        "content": base64.b64encode(content.encode()).decode()}, headers)
+            if rest == "languages":
+                return self._send(200, _languages(repo), headers)
+            if rest == "license":
+                return self._send(200, {"license": {"spdx_id": "MIT", "name": "MIT License"}}, headers)
+            if rest.startswith("stats/"):
+                with server.state.lock:
+                    polls = server.state.stats_polls[path] = server.state.stats_polls.get(path, 0) + 1
+                if polls <= server.stats_pending:
+                    return self._send(202, {}, headers)
+                return self._stats(rest[len("stats/"):], headers)
+            if rest.startswith("compare/"):
+                # The branch at commit index h is h commits behind and lists commits h..h+4 as ahead
+                base, _, head = rest[len("compare/"):].partition("...")
+                all_commits = server.collection(repo, "commits")
+                index = {c["sha"]: i for i, c in enumerate(all_commits)}
+                h = index.get(head, 0)
+                commits = [] if head == base else all_commits[h:h + 5]
+                status = "identical" if not commits else "diverged" if h else "ahead"
+                return self._send(200, {"status": status, "ahead_by": len(commits), "behind_by": h,
+                                        "total_commits": len(commits), "commits": commits}, headers)
+            if rest == "commits" and "since" in query:
+                since = query["since"][0]
+                commits = [c for c in server.collection(repo, rest) if c["commit"]["committer"]["date"] >= since]
+                return self._paginate(path, query, commits, headers)
+            if rest in _PAGINATED:
+                return self._paginate(path, query, server.collection(repo, rest), headers)
+            return self._send(404, {"message": "Not Found"}, headers)
+
+        def _search_issues(self, query: Dict[str, List[str]], headers: Dict[str, str]):
+            # Supports the qualifiers the client uses: repo:, is:issue/pr/open/closed/merged and DATE:>=VALUE
+            items = []
+            terms = query.get("q", [""])[0].split()
+            for term in terms:
+                if term.startswith("repo:"):
+                    if term[len("repo:"):] in server.missing_repos:
+                        return self._send(422, {"message": "Validation Failed", "errors": [{
+                            "message": "The listed users and repositories cannot be searched either because the "
+                                       "resources do not exist or you do not have permission to view them.",
+                        }]}, headers)
+                    items += server.collection(term[len("repo:"):], "issues")
+            for term in terms:
+                key, _, value = term.partition(":")
+                if term == "is:issue":
+                    items = [i for i in items if "pull_request" not in i]
+                elif term == "is:pr":
+                    items = [i for i in items if "pull_request" in i]
+                elif term in ("is:open", "is:closed"):
+                    items = [i for i in items if i["state"] == value]
+                elif term == "is:merged":
+                    items = [i for i in items if (i.get("pull_request") or {}).get("merged_at")]
+                elif value.startswith(">=") and key in ("created", "closed", "merged"):
+                    field = (lambda i: (i.get("pull_request") or {}).get("merged_at")) if key == "merged" \
+                        else (lambda i, k=f"{key}_at": i.get(k))
+                    items = [i for i in items if (field(i) or "") >= value[2:]]
+            per_page = max(1, min(100, int(query.get("per_page", ["30"])[0])))
+            self._send(200, {"total_count": len(items), "incomplete_results": False, "items": items[:per_page]}, headers)
+
+        def _graphql(self, document: str, variables: dict, headers: Dict[str, str]):
+            # Answers the two queries of repo_radar.services.pr_timelines
+            if "query PullTimelines" in document:
+                repo = f"{variables['owner']}/{variables['name']}"
+                if repo in server.missing_repos:
+                    return self._send(200, {"data": {"repository": None}, "errors": [{
+                        "type": "NOT_FOUND", "path": ["repository"],
+                        "message": f"Could not resolve to a Repository with the name '{repo}'.",
+                    }]}, headers)
+                pulls = sorted(server.collection(repo, "pulls"), key=lambda p: p["updated_at"], reverse=True)
+                page = _connection(pulls, variables["first"], variables.get("after"))
+                page["nodes"] = [_pull_node(repo, p, variables["reviews"]) for p in page["nodes"]]
+                return self._send(200, {"data": {"repository": {"pullRequests": page}}}, headers)
+            if "query MoreReviews" in document:
+                data = {}
+                for i in range(len(variables) // 2):
+                    m = _PULL_NODE_ID.match(variables[f"id{i}"])
+                    if not m:
+                        return self._send(200, {"data": None, "errors": [{"message": "Could not resolve to a node"}]}, headers)
+                    pull = server.collection(m["repo"], "pulls")[int(m["number"]) - 1]
+                    data[f"p{i}"] = {"reviews": _connection(_reviews(m["repo"], pull), variables["reviews"],
+                                                            variables.get(f"after{i}"))}
+                return self._send(200, {"data": data}, headers)
+            return self._send(200, {"data": None, "errors": [{"message": "Unsupported query"}]}, headers)
+
+        def _stats(self, kind: str, headers: Dict[str, str]):
+            weeks = [1735689600 + w * 604800 for w in range(52)]
+            if kind == "commit_activity":
+                return self._send(200, [{"week": w, "total": i % 9, "days": [i % 3] * 7}
+                                        for i, w in enumerate(weeks)], headers)
+            if kind == "code_frequency":
+                return self._send(200, [[w, 10 * (i % 5), -3 * (i % 4)] for i, w in enumerate(weeks)], headers)
+            if kind == "participation":
+                return self._send(200, {"all": [i % 9 for i in range(52)], "owner": [i % 2 for i in range(52)]}, headers)
+            if kind == "contributors":
+                return self._send(200, [{"author": _user(f"dev{i}", i), "total": 10 - i,
+                                         "weeks": [{"w": weeks[-1], "a": 5, "d": 1, "c": 10 - i}]}
+                                        for i in range(3)], headers)
+            return self._send(404, {"message": "Not Found"}, headers)
+
+        def _paginate(self, path: str, query: Dict[str, List[str]], items: List[dict], headers: Dict[str, str]):
+            per_page = max(1, min(100, int(query.get("per_page", ["30"])[0])))
+            page = max(1, int(query.get("page", ["1"])[0]))
+            last = max(1, -(-len(items) // per_page))
+            chunk = items[(page - 1) * per_page: page * per_page]
+
+            def link(p: int) -> str:
+                params = {k: v[0] for k, v in query.items()}
+                params.update(per_page=per_page, page=p)
+                return f"<{server.base_url}{path}?{urlencode(params)}>"
+
+            rels = []
+            if page < last:
+                rels += [f'{link(page + 1)}; rel="next"', f'{link(last)}; rel="last"']
+            if page > 1:
+                rels += [f'{link(1)}; rel="first"', f'{link(page - 1)}; rel="prev"']
+            if rels:
+                headers["Link"] = ", ".join(rels)
+            self._send(200, chunk, headers)
+
+        def _sentry(self, path: str, query: Dict[str, List[str]]):
+            if re.match(r"^/projects/[^/]+/[^/]+/$", path):
+                return self._send(200, {"id": "4242", "slug": path.split("/")[3]})
+            if re.match(r"^/organizations/[^/]+/issues/$", path):
+                return self._send(200, _sentry_issues(int(query.get("limit", ["100"])[0])))
+            if re.match(r"^/organizations/[^/]+/events-stats/$", path):
+                return self._send(200, _sentry_events_stats())
+            return self._send(404, {"detail": "Not Found"})
+
+    return Handler
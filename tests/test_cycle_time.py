@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+from repo_radar.models.pull_timeline import PullTimeline
+from repo_radar.services import cycle_time
+from repo_radar.services.cycle_time import cycle_time_metrics
+
+HOUR = 3600.0
+
+def timeline(number, created, merged=None, first_review=None, ready=None, reviews=0):
+    return PullTimeline(repo="octo/demo", number=number, author="ada", created_at=created,
+                        ready_at=created if ready is None else ready, merged_at=merged,
+                        first_review_at=first_review, reviews=reviews)
+
+TIMELINES = [
+    timeline(1, 0, merged=10 * HOUR, first_review=1 * HOUR, reviews=2),
+    timeline(2, 0, merged=20 * HOUR, first_review=2 * HOUR, ready=HOUR, reviews=4),
+    timeline(3, 0, merged=30 * HOUR, reviews=0),
+    timeline(4, 0, merged=40 * HOUR, first_review=5 * HOUR, reviews=1),
+    timeline(5, 0, first_review=3 * HOUR, reviews=3),  # open
+    timeline(6, -100 * HOUR, merged=-50 * HOUR, first_review=-90 * HOUR, reviews=9),  # before the window
+]
+
+class TestCycleTime(unittest.TestCase):
+
+    def check(self, metrics):
+        expected = {"time_to_merge": (25 * HOUR, 37 * HOUR), "time_to_first_review": (2 * HOUR, 4.4 * HOUR)}
+        for name, (p50, p90) in expected.items():
+            self.assertEqual(metrics[name]["count"], 4)
+            self.assertAlmostEqual(metrics[name]["p50"], p50)
+            self.assertAlmostEqual(metrics[name]["p90"], p90)
+        self.assertEqual(metrics["reviews"]["count"], 6)
+        self.assertEqual(metrics["reviews"]["p50"], 2.5)
+
+    @unittest.skipIf(cycle_time.np is None, "numpy is not installed")
+    def test_percentiles_with_numpy(self):
+        self.check(cycle_time_metrics(TIMELINES, since=0))
+
+    def test_percentiles_without_numpy(self):
+        with patch.object(cycle_time, "np", None):
+            self.check(cycle_time_metrics(TIMELINES, since=0))
+
+    def test_empty_window(self):
+        for np in (cycle_time.np, None):
+            with patch.object(cycle_time, "np", np):
+                metrics = cycle_time_metrics([], since=0)
+                self.assertEqual(metrics["time_to_merge"], {"count": 0, "p50": None, "p90": None})
+
+if __name__ == "__main__":
+    unittest.main()
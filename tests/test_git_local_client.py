@@ -0,0 +1,141 @@
+import asyncio
+import base64
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from repo_radar.api.git_local_client import GitCommandError, LocalGitClient, detect_license
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.services.branch_drift import branch_drift
+from repo_radar.services.dependency_discovery import discover_dependencies
+
+MIT = "MIT License\n\nPermission is hereby granted, free of charge, to any person obtaining a copy\n"
+
+def git(cwd, *args):
+    env = {**os.environ, "GIT_AUTHOR_DATE": "2024-01-02T03:04:05Z", "GIT_COMMITTER_DATE": "2024-01-02T03:04:05Z"}
+    return subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestLocalGitClient(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        source = self.tmp / "remotes" / "acme" / "widgets"
+        source.mkdir(parents=True)
+        git(source, "init", "-q", "-b", "main")
+        git(source, "config", "user.name", "Ada")
+        git(source, "config", "user.email", "ada@example.com")
+        # Allow partial clones and single-object fetches over file://, as GitHub does
+        git(source, "config", "uploadpack.allowFilter", "true")
+        git(source, "config", "uploadpack.allowAnySHA1InWant", "true")
+        (source / "LICENSE").write_text(MIT)
+        (source / "app.py").write_text("print('hello')\n")
+        (source / "web").mkdir()
+        (source / "web" / "index.js").write_text("console.log(1);\n")
+        (source / "requirements.txt").write_text("flask==3.0.0\n")
+        git(source, "add", ".")
+        git(source, "commit", "-qm", "Initial commit")
+        git(source, "checkout", "-qb", "feature")
+        (source / "app.py").write_text("print('hello, world')\n")
+        git(source, "commit", "-qam", "Greet the world", "--author", "Bob <bob@example.com>")
+        git(source, "checkout", "-q", "main")
+        self.source = source
+
+        self.url = GitHubUrl("https://github.com/acme/widgets", "acme", "widgets")
+        self.client = LocalGitClient(
+            "", mirror_dir=self.tmp / "mirrors", remote_template=f"file://{self.tmp}/remotes/{{repo_path}}",
+        )
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_languages_from_blobless_mirror(self):
+        languages = self.run_async(self.client.get_languages(self.url)).json()
+        self.assertEqual(languages, {"Python": 15, "JavaScript": 16})
+        self.assertTrue((self.tmp / "mirrors" / "acme" / "widgets.git" / "HEAD").exists())
+
+    def test_commits_contributors_and_branches(self):
+        commits = self.run_async(self.client.get_commits(self.url))[0].json()
+        self.assertEqual([c["commit"]["message"] for c in commits], ["Initial commit"])
+        self.assertEqual(commits[0]["commit"]["author"]["date"], "2024-01-02T03:04:05Z")
+
+        contributors = self.run_async(self.client.get_contributors(self.url))[0].json()
+        self.assertEqual(contributors, [
+            {"type": "Anonymous", "name": "Ada", "email": "ada@example.com", "contributions": 1},
+        ])
+        branches = self.run_async(self.client.get_branches(self.url))[0].json()
+        self.assertEqual([b["name"] for b in branches], ["feature", "main"])
+
+    def test_compare_and_repository(self):
+        compare = self.run_async(self.client.compare_branch(self.url, "feature", delta=3650))[0].json()
+        self.assertEqual((compare["status"], compare["ahead_by"], compare["behind_by"]), ("ahead", 1, 0))
+        self.assertEqual(compare["commits"][0]["commit"]["author"]["name"], "Bob")
+        repo = self.run_async(self.client.get_repository(self.url)).json()
+        self.assertEqual(repo["default_branch"], "main")
+        drift = self.run_async(branch_drift(self.client, self.url, delta=3650))
+        self.assertEqual([(b.name, b.status, b.ahead_by) for b in drift.branches],
+                         [("feature", "ahead", 1), ("main", "identical", 0)])
+
+    def test_count_commits(self):
+        self.assertEqual(self.run_async(self.client.count_commits(self.url)), 1)
+        self.assertEqual(self.run_async(self.client.count_commits(self.url, since=1704164646)), 0)
+
+    def test_commit_activity(self):
+        subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "Recent"], cwd=self.source, check=True)
+        weeks = self.run_async(self.client.get_stats(self.url, "commit_activity")).json()
+        self.assertEqual(len(weeks), 52)
+        self.assertEqual(weeks[-1]["total"], 1)
+        self.assertEqual(sum(w["total"] for w in weeks), 1)
+
+    def test_license_and_dependency_discovery(self):
+        license_data = self.run_async(self.client.get_license(self.url)).json()
+        self.assertEqual(license_data["license"]["spdx_id"], "MIT")
+        self.assertEqual(base64.b64decode(license_data["content"]).decode(), MIT)
+        deps = self.run_async(discover_dependencies(self.client, self.url))
+        self.assertEqual([(d.name, d.version) for d in deps], [("flask", "3.0.0")])
+
+    def test_incremental_fetch(self):
+        self.run_async(self.client.get_commits(self.url))
+        (self.source / "more.py").write_text("x = 1\n")
+        git(self.source, "add", ".")
+        git(self.source, "commit", "-qm", "More")
+
+        fresh = LocalGitClient("", mirror_dir=self.tmp / "mirrors",
+                               remote_template=self.client.remote_template, fetch_interval=0)
+        commits = self.run_async(fresh.get_commits(self.url))[0].json()
+        self.assertEqual(commits[0]["commit"]["message"], "More")
+
+    def test_long_lived_client_fetches_again_after_the_interval(self):
+        now = [time.time()]
+        client = LocalGitClient("", mirror_dir=self.tmp / "mirrors", remote_template=self.client.remote_template,
+                                fetch_interval=60, clock=lambda: now[0])
+
+        async def newest_commit():
+            return (await client.get_commits(self.url))[0].json()[0]["commit"]["message"]
+        self.assertEqual(self.run_async(newest_commit()), "Initial commit")
+        (self.source / "more.py").write_text("x = 1\n")
+        git(self.source, "add", ".")
+        git(self.source, "commit", "-qm", "More")
+
+        now[0] += 30
+        self.assertEqual(self.run_async(newest_commit()), "Initial commit")  # still within the interval
+        now[0] += 31
+        self.assertEqual(self.run_async(newest_commit()), "More")
+
+    def test_issues_need_fallback_and_errors_surface(self):
+        with self.assertRaises(NotImplementedError):
+            self.run_async(self.client.get_issues(self.url))
+        missing = GitHubUrl("https://github.com/acme/missing", "acme", "missing")
+        with self.assertRaises(GitCommandError):
+            self.run_async(self.client.get_commits(missing))
+
+    def test_detect_license(self):
+        self.assertEqual(detect_license("Apache License\nVersion 2.0, January 2004")["spdx_id"], "Apache-2.0")
+        self.assertIsNone(detect_license("All rights reserved."))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from repo_radar.utils.github_parsers import extract_github_urls
+from requests import Response
+from repo_radar.utils.github_parsers import extract_github_urls, last_page_number, parse_repo_ref
 from repo_radar.models.github_url import GitHubUrl
 
 class TestGitHubUrlParser(unittest.TestCase):
@@ -42,5 +43,23 @@ class TestGitHubUrlParser(unittest.TestCase):
         result = extract_github_urls(test_input)
         self.assertEqual(result, expected)
 
+    def test_last_page_number(self):
+        response = Response()
+        response.headers["Link"] = ('<https://api.github.com/repos/o/r/commits?per_page=1&page=2>; rel="next", '
+                                    '<https://api.github.com/repos/o/r/commits?per_page=1&page=1234>; rel="last"')
+        self.assertEqual(last_page_number(response), 1234)
+        self.assertIsNone(last_page_number(Response()))
+        url = GitHubUrl("", "o", "r")
+        self.assertTrue(url.api_commits_path(0, per_page=1).endswith("/repos/o/r/commits?since=1970-01-01T00%3A00%3A00Z&per_page=1"))
+        self.assertTrue(GitHubUrl.api_search_issues_path("repo:o/r is:pr", 1).endswith("/search/issues?q=repo%3Ao%2Fr+is%3Apr&per_page=1"))
+
+    def test_parse_repo_ref(self):
+        self.assertEqual(parse_repo_ref(" socketio/socket.io "),
+                         GitHubUrl("https://github.com/socketio/socket.io", "socketio", "socket.io"))
+        self.assertEqual(parse_repo_ref("git@github.com:octocat/Hello-World.git"),
+                         GitHubUrl("git@github.com:octocat/Hello-World.git", "octocat", "Hello-World"))
+        for invalid in ["octocat", "a/b/c", "bad owner/repo", "-/..", "octocat/.."]:
+            self.assertIsNone(parse_repo_ref(invalid), invalid)
+
 if __name__ == "__main__":
     unittest.main()
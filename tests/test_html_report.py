@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from pathlib import Path
+from repo_radar.reports.html_report import ReportBuilder, overview_section, repo_section
+
+LANGUAGES = {f"octo/repo-{i}": {"Python": 100 + i, "Go": 50} for i in range(200)}
+
+def sections(languages, commits, summary="All quiet.", charts=(), report_dir=Path(".")):
+    yield overview_section(summary, "Repos: 200", list(charts), report_dir)
+    for repo in sorted(languages):
+        yield repo_section(repo, languages[repo], commits.get(repo))
+
+class TestReportBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.out = self.dir / "report.html"
+        self.commits = {repo: i for i, repo in enumerate(sorted(LANGUAGES))}
+
+    def build(self, languages=LANGUAGES, commits=None, **kwargs):
+        builder = ReportBuilder(self.out)
+        builder.build("Report", sections(languages, commits or self.commits, **kwargs))
+        return builder
+
+    def test_unchanged_sections_are_reused(self):
+        first = self.build()
+        self.assertEqual((len(first.rendered), first.reused), (201, []))
+        report = self.out.read_text(encoding="utf-8")
+
+        second = self.build()
+        self.assertEqual((second.rendered, len(second.reused)), ([], 201))
+        self.assertEqual(self.out.read_text(encoding="utf-8"), report)
+
+        commits = {**self.commits, "octo/repo-7": 99}
+        third = self.build(commits=commits, summary="Busy week.")
+        self.assertEqual(sorted(third.rendered), ["overview", "repo:octo/repo-7"])
+        html = self.out.read_text(encoding="utf-8")
+        self.assertIn("Busy week.", html)
+        self.assertIn("Commits (last 4 weeks): 99", html)
+        self.assertLess(html.index("octo/repo-10"), html.index("octo/repo-7"))  # sections keep their order
+
+    def test_dropped_sections_are_pruned(self):
+        self.build()
+        fewer = {r: v for r, v in LANGUAGES.items() if r != "octo/repo-3"}
+        self.build(languages=fewer)
+        self.assertNotIn("octo/repo-3<", self.out.read_text(encoding="utf-8"))
+        self.assertEqual(len(list((self.dir / ".sections").glob("*.html"))), 200)
+        # Back again: rendered anew rather than served from a stale fragment
+        self.assertEqual(self.build().rendered, ["repo:octo/repo-3"])
+
+    def test_charts_are_drawn_only_when_their_data_changes(self):
+        drawn = []
+
+        def draw(data, path):
+            drawn.append(data)
+            path.write_bytes(b"png")
+            return path
+
+        builder = ReportBuilder(self.out)
+        first = builder.chart("languages", [("Python", 60.0)], draw)
+        self.assertEqual(builder.chart("languages", [("Python", 60.0)], draw), first)
+        second = builder.chart("languages", [("Python", 70.0)], draw)
+        self.assertNotEqual(second, first)
+        self.assertEqual(len(drawn), 2)
+        self.assertEqual(list(self.dir.glob("languages-*.png")), [second])
+
+        builder.build("Report", sections(LANGUAGES, self.commits, charts=[second], report_dir=self.dir))
+        self.assertIn(f'<img src="{second.name}" alt="languages">', self.out.read_text(encoding="utf-8"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+from repo_radar.monitoring.instrumentation import Instrumentation, endpoint_template
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = Instrumentation(latency_buckets=(0.1, 1.0))
+
+    def test_endpoint_template(self):
+        self.assertEqual(
+            endpoint_template("https://api.github.com/repos/octo/demo/commits?page=2"),
+            "api.github.com/repos/{owner}/{repo}/commits",
+        )
+        self.assertEqual(
+            endpoint_template("https://api.github.com/repos/octo/demo/compare/main...abc123"),
+            "api.github.com/repos/{owner}/{repo}/compare/{basehead}",
+        )
+
+    def test_spans_are_nested(self):
+        with self.metrics.span("fetch"):
+            with self.metrics.span("decode", repo="octo/demo"):
+                pass
+        inner, outer = self.metrics.spans
+        self.assertEqual((inner.name, inner.parent, inner.tags), ("decode", "fetch", {"repo": "octo/demo"}))
+        self.assertEqual((outer.name, outer.parent), ("fetch", None))
+        self.assertGreaterEqual(outer.wall_seconds, inner.wall_seconds)
+
+    def test_request_histogram_and_statuses(self):
+        for seconds, status in [(0.05, 200), (0.5, 200), (5.0, 403)]:
+            self.metrics.observe_request("https://api.github.com/repos/a/b/issues", seconds, status)
+        stats = self.metrics.snapshot()["requests"]["api.github.com/repos/{owner}/{repo}/issues"]
+        self.assertEqual(stats["buckets"], {"0.1": 1, "1.0": 2, "+Inf": 3})
+        self.assertEqual(stats["statuses"], {"2xx": 2, "4xx": 1})
+
+    def test_cache_hit_ratio(self):
+        for hit in (True, True, False, True):
+            self.metrics.record_cache("token_validation", hit)
+        self.assertEqual(self.metrics.snapshot()["caches"]["token_validation"]["hit_ratio"], 0.75)
+
+    def test_exports(self):
+        self.metrics.observe_request("https://api.github.com/user", 0.2, 200)
+        self.metrics.record_retry("https://api.github.com/repos/a/b/commits?page=3", "403")
+        self.metrics.record_rate_limit_wait(12.5)
+        with self.metrics.span("render"):
+            pass
+
+        self.assertEqual(json.loads(self.metrics.to_json())["rate_limit_waits"]["core"], {"count": 1, "seconds": 12.5})
+        text = self.metrics.to_openmetrics()
+        self.assertIn('repo_radar_http_request_duration_seconds_bucket{endpoint="api.github.com/user",le="1.0"} 1', text)
+        self.assertIn('repo_radar_http_retries_total{endpoint="api.github.com/repos/{owner}/{repo}/commits",reason="403"} 1', text)
+        self.assertIn('repo_radar_stage_seconds_count{stage="render",kind="wall"} 1', text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_repeated_spans_are_one_series_per_stage(self):
+        for repo in ("octo/a", "octo/b", "octo/c"):
+            with self.metrics.span("watch.refresh", repo=repo):
+                pass
+        with self.metrics.span("render"):
+            pass
+        self.assertEqual(self.metrics.snapshot()["stages"]["watch.refresh"]["count"], 3)
+        series = [line.rsplit(" ", 1)[0] for line in self.metrics.to_openmetrics().splitlines()
+                  if not line.startswith("#")]
+        self.assertEqual(len(series), len(set(series)))
+        self.assertIn('repo_radar_stage_seconds_count{stage="watch.refresh",kind="cpu"}', series)
+
+    def test_failed_spans_pass_the_exception_to_sentry(self):
+        sentry_span = MagicMock()
+        with patch.object(Instrumentation, "_start_sentry_span", return_value=sentry_span):
+            with self.assertRaises(ValueError):
+                with self.metrics.span("decode"):
+                    raise ValueError("bad payload")
+            with self.metrics.span("render"):
+                pass
+        failed, ok = [c.args for c in sentry_span.__exit__.call_args_list]
+        self.assertIs(failed[0], ValueError)
+        self.assertEqual(str(failed[1]), "bad payload")
+        self.assertEqual(ok, (None, None, None))
+        self.assertEqual([s.name for s in self.metrics.spans], ["decode", "render"])
+
+if __name__ == "__main__":
+    unittest.main()
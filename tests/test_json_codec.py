@@ -0,0 +1,68 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import patch
+from repo_radar.api.transport import build_response
+from repo_radar.utils import json_codec
+from repo_radar.utils.json_codec import decode, decode_json, field_tree, iter_decoded, project
+
+COMMITS = [
+    {"sha": f"{i:040x}", "url": "https://api.github.com/...", "files": [{"patch": "x" * 100}],
+     "commit": {"message": f"Commit {i}", "author": {"name": "Ada", "date": "2024-01-02T03:04:05Z"}}}
+    for i in range(3)
+]
+
+def response(payload, status=200):
+    return build_response(status, {}, json.dumps(payload).encode())
+
+class TestJsonCodec(unittest.TestCase):
+
+    def test_projection(self):
+        tree = field_tree(["sha", "commit.author.date", "missing"])
+        self.assertEqual(tree, {"sha": {}, "commit": {"author": {"date": {}}}, "missing": {}})
+        self.assertEqual(project(COMMITS, tree)[0], {"sha": "0" * 40, "commit": {"author": {"date": "2024-01-02T03:04:05Z"}}})
+        self.assertEqual(project(COMMITS, {}), COMMITS)
+        self.assertEqual(project({"tree": [{"path": "a", "mode": "100644"}]}, field_tree(["tree.path"])), {"tree": [{"path": "a"}]})
+
+    def test_decode_with_and_without_orjson(self):
+        body = json.dumps(COMMITS).encode()
+        self.assertEqual(decode(body), COMMITS)
+        with patch.object(json_codec, "orjson", None):
+            self.assertEqual(decode(body, ["sha"]), [{"sha": c["sha"]} for c in COMMITS])
+        self.assertIsNone(decode(b""))
+
+    def test_large_bodies_decode_off_the_loop(self):
+        threads = []
+        original = json_codec.decode
+
+        def record(body, fields=None):
+            threads.append(threading.current_thread())
+            return original(body, fields)
+
+        with patch.object(json_codec, "decode", record):
+            small = asyncio.run(decode_json(response({"Python": 1})))
+            large = asyncio.run(decode_json(response(COMMITS), ["sha"], offload_bytes=10))
+        self.assertEqual((small, len(large)), ({"Python": 1}, 3))
+        self.assertIs(threads[0], threading.main_thread())
+        self.assertIsNot(threads[1], threading.main_thread())
+        with self.assertRaises(ValueError):
+            asyncio.run(decode_json(build_response(200, {}, b"{")))
+
+    def test_pages_decode_while_the_next_is_fetched(self):
+        events = []
+
+        async def pages():
+            for i in range(3):
+                await asyncio.sleep(0.01)
+                events.append(f"fetched {i}")
+                yield response([{"page": i, "extra": "x"}])
+
+        async def consume():
+            return [page async for page in iter_decoded(pages(), ["page"], offload_bytes=0)]
+
+        self.assertEqual(asyncio.run(consume()), [[{"page": 0}], [{"page": 1}], [{"page": 2}]])
+        self.assertEqual(events, ["fetched 0", "fetched 1", "fetched 2"])
+
+if __name__ == "__main__":
+    unittest.main()
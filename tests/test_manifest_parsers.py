@@ -0,0 +1,86 @@
+import unittest
+from repo_radar.config import MANIFEST_PROCESS_POOL_MIN
+from repo_radar.models.dependency import Dependency
+from repo_radar.services import dependency_discovery
+from repo_radar.services.dependency_discovery import get_parse_pool, parse_files, shutdown_parse_pool
+from repo_radar.utils.manifest_parsers import is_manifest, parse_manifest
+
+class TestManifestParsers(unittest.TestCase):
+
+    def test_manifest_detection(self):
+        for path in ["pyproject.toml", "a/b/requirements-dev.txt", "requirements/base.txt",
+                     "web/package-lock.json", "go.mod", "crates/x/Cargo.lock", "uv.lock"]:
+            self.assertTrue(is_manifest(path), path)
+        for path in ["README.md", "web/node_modules/x/package.json", "vendor/go.mod", "notes.txt"]:
+            self.assertFalse(is_manifest(path), path)
+
+    def test_requirements_txt(self):
+        text = "# pinned\nRequests[socks]==2.31.0 ; python_version > '3.8'\nflask>=2\n-r other.txt\ngit+https://x/y.git\n"
+        self.assertEqual(parse_manifest("requirements.txt", text), [
+            Dependency("PyPI", "requests", "2.31.0", "==2.31.0", "requirements.txt"),
+            Dependency("PyPI", "flask", None, ">=2", "requirements.txt"),
+        ])
+
+    def test_pyproject_pep621_and_poetry(self):
+        text = """
+[project]
+dependencies = ["Jinja2==3.1.2", "httpx>=0.27"]
+[project.optional-dependencies]
+test = ["pytest"]
+[tool.poetry.dependencies]
+python = "^3.12"
+Django = {version = "4.2.1"}
+"""
+        deps = {(d.name, d.version, d.dev) for d in parse_manifest("pyproject.toml", text)}
+        self.assertEqual(deps, {("jinja2", "3.1.2", False), ("httpx", None, False),
+                                ("pytest", None, True), ("django", "4.2.1", False)})
+
+    def test_uv_lock_skips_project_itself(self):
+        text = """
+[[package]]
+name = "repo-radar"
+version = "0.1.0"
+source = { virtual = "." }
+
+[[package]]
+name = "Python_Dotenv"
+version = "1.1.1"
+"""
+        self.assertEqual(parse_manifest("uv.lock", text),
+                         [Dependency("PyPI", "python-dotenv", "1.1.1", "==1.1.1", "uv.lock")])
+
+    def test_package_json_and_lock(self):
+        deps = parse_manifest("package.json", '{"dependencies": {"lodash": "4.17.20", "react": "^18"}}')
+        self.assertEqual([(d.name, d.version) for d in deps], [("lodash", "4.17.20"), ("react", None)])
+        lock = '{"lockfileVersion": 3, "packages": {"": {}, "node_modules/@babel/core": {"version": "7.0.0", "dev": true}}}'
+        self.assertEqual(parse_manifest("package-lock.json", lock),
+                         [Dependency("npm", "@babel/core", "7.0.0", "7.0.0", "package-lock.json", True)])
+
+    def test_go_mod(self):
+        text = "module x\n\nrequire github.com/a/b v1.2.3\nrequire (\n\tgolang.org/x/net v0.1.0 // indirect\n)\n"
+        self.assertEqual([(d.name, d.version, d.dev) for d in parse_manifest("go.mod", text)],
+                         [("github.com/a/b", "v1.2.3", False), ("golang.org/x/net", "v0.1.0", False)])
+
+    def test_malformed_file_yields_nothing(self):
+        self.assertEqual(parse_manifest("package.json", "{not json"), [])
+
+class TestParseFiles(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await shutdown_parse_pool()
+
+    async def test_large_batches_share_one_process_pool(self):
+        files = [(f"svc{i}/requirements.txt", f"pkg{i}==1.{i}\n") for i in range(MANIFEST_PROCESS_POOL_MIN)]
+        deps = await parse_files(files)
+        self.assertEqual([(d.name, d.version) for d in deps], [(f"pkg{i}", f"1.{i}") for i in range(len(files))])
+        pool = get_parse_pool()
+        self.assertEqual(len(await parse_files(files)), len(files))
+        self.assertIs(get_parse_pool(), pool)  # reused, not started per batch
+
+        await shutdown_parse_pool()
+        self.assertIsNone(dependency_discovery._parse_pool)
+        self.assertEqual(len(await parse_files(files)), len(files))
+        self.assertIsNot(get_parse_pool(), pool)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,380 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+from requests.exceptions import HTTPError
+from repo_radar.api.github_client import GitHubClient
+from repo_radar.api import sentry_api
+from repo_radar.config import ACTIVITY_WINDOW
+from repo_radar.models.branch_drift import BranchDrift
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.repo_state import RepoSnapshot
+from repo_radar.services import sentry_service
+from repo_radar.services.branch_drift import branch_drift
+from repo_radar.services.dependency_discovery import collect_dependencies, discover_dependencies
+from repo_radar.services.lang_analytics import merge_language_maps
+from repo_radar.services.pr_timelines import fetch_pull_timelines
+from repo_radar.services.repo_counts import activity_counts, count_activity
+from repo_radar.services.repo_discovery import discover_repos, fetch_as_discovered
+from repo_radar.services.repo_state import RepoStateStore
+from repo_radar.services.report_pipeline import collect_repo_metrics
+from repo_radar.services.stats_scheduler import STATS_KINDS, fetch_stats, recent_commit_count
+from repo_radar.utils.priority_lanes import request_priority
+from repo_radar.utils.retry_policy import RetryPolicy
+from repo_radar.utils.token_cache import TokenValidationCache
+from tests.mock_server import MockApiServer, RepoFixture, _languages
+
+class TestClientAgainstMockServer(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.server = MockApiServer(default_fixture=RepoFixture(commits=250, issues=40, pulls=10)).start()
+        self.addCleanup(self.server.stop)
+        for target, value in [
+            ("repo_radar.models.github_url.GITHUB_API_URL", self.server.github_url),
+            ("repo_radar.api.github_api.GITHUB_API_USER_ENDPOINT", f"{self.server.github_url}/user"),
+            ("repo_radar.api.github_client.TOKEN_VALIDATION_CACHE", TokenValidationCache()),
+        ]:
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = GitHubClient("mock-token")
+        self.url = GitHubUrl(full_url="", org_user="octo", repo="demo")
+
+    async def test_pagination_follows_link_headers(self):
+        pages = await self.client.get_commits(self.url)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(sum(len(p.json()) for p in pages), 250)
+        self.assertEqual(self.client.rate_manager.reset_time, self.server.state.reset_time)
+
+    async def test_issues_include_pull_requests(self):
+        pages = await self.client.get_issues(self.url)
+        items = [i for p in pages for i in p.json()]
+        self.assertEqual(sum("pull_request" in i for i in items), 10)
+
+    async def test_pulls_derived_from_issues(self):
+        await self.client.ensure_token_validated()
+        before = self.server.request_count
+        pulls = [p for page in await self.client.get_pulls(self.url, from_issues=True) for p in page.json()]
+        self.assertEqual(self.server.request_count - before, 1)
+        direct = [p for page in await self.client.get_pulls(self.url) for p in page.json()]
+        self.assertEqual([(p["number"], p["merged_at"]) for p in pulls],
+                         [(p["number"], p["merged_at"]) for p in direct])
+
+    async def test_issues_and_derived_pulls_share_a_listing_only_when_concurrent(self):
+        await self.client.ensure_token_validated()
+        before = self.server.request_count
+        await self.client.get_issues(self.url)
+        await self.client.get_pulls(self.url, from_issues=True)
+        self.assertEqual(self.server.request_count - before, 2)  # nothing is cached between the calls
+
+        before = self.server.request_count
+        issues, pulls = await asyncio.gather(self.client.get_issues(self.url),
+                                             self.client.get_pulls(self.url, from_issues=True))
+        self.assertEqual(self.server.request_count - before, 1)
+        self.assertEqual(sum(len(p.json()) for p in pulls), 10)
+        self.assertEqual(sum("pull_request" in i for p in issues for i in p.json()), 10)
+
+    async def test_identical_concurrent_requests_are_coalesced(self):
+        await self.client.ensure_token_validated()
+        before = self.server.request_count
+        responses = await asyncio.gather(*(self.client.get_languages(self.url) for _ in range(5)))
+        self.assertEqual(self.server.request_count - before, 1)
+        self.assertEqual(len({id(r) for r in responses}), 1)
+        await self.client.get_languages(self.url)
+        self.assertEqual(self.server.request_count - before, 2)
+
+    async def test_coalescing_keeps_priority_lanes_apart(self):
+        await self.client.ensure_token_validated()
+        before = self.server.request_count
+
+        async def fetch(lane):
+            with request_priority(lane):
+                return await self.client.get_languages(self.url)
+        backfill, interactive = await asyncio.gather(fetch("backfill"), fetch("interactive"))
+        self.assertEqual(self.server.request_count - before, 2)
+        self.assertIsNot(backfill, interactive)
+
+    async def test_counts_take_one_request_each(self):
+        await self.client.ensure_token_validated()
+        before = self.server.request_count
+        self.assertEqual(await self.client.count_commits(self.url), 250)
+        since = int(datetime(2025, 1, 30, tzinfo=timezone.utc).timestamp())  # commits are 7 hours apart from 2025-01-01
+        self.assertEqual(await self.client.count_commits(self.url, since), 150)
+        self.assertEqual(self.server.request_count - before, 2)
+        issues = [i for p in await self.client.get_issues(self.url) for i in p.json()]
+        before_search = self.server.request_count
+        self.assertEqual(await self.client.count_issues(self.url, "is:open"),
+                         sum("pull_request" not in i and i["state"] == "open" for i in issues))
+        self.assertEqual(await self.client.count_pulls(self.url, "is:merged merged:>=2025-01-01"),
+                         sum(bool((i.get("pull_request") or {}).get("merged_at")) for i in issues))
+        self.assertEqual(self.server.request_count - before_search, 2)
+        self.assertEqual(self.client.rate_limits.bucket("search").remaining, 28)
+        self.assertGreater(self.client.rate_manager.remaining, 28)
+
+    async def test_activity_counts_use_webhooks_only_where_they_cover_the_window(self):
+        await self.client.ensure_token_validated()
+        now = datetime(2025, 1, 20, tzinfo=timezone.utc).timestamp()  # the whole mock history is in the window
+        since = now - ACTIVITY_WINDOW
+        urls = [GitHubUrl(full_url="", org_user="octo", repo=r) for r in ("hooked", "recent", "plain")]
+        store = RepoStateStore(Path(tempfile.mkdtemp()) / "state.json")
+        store.put(RepoSnapshot("octo/hooked", now, events_since=since - 86400, issues_opened=[now - 10, since - 10],
+                               pulls_merged=[now - 20]))
+        store.put(RepoSnapshot("octo/recent", now, events_since=now - 86400, issues_opened=[now - 10]))
+        searched = await count_activity(self.client, urls[1:], since)
+        self.assertGreater(searched["issues_opened"], 0)
+        before = self.server.request_count
+
+        counts = await activity_counts(self.client, store, urls, now)
+        self.assertEqual(self.server.request_count - before, 4)  # both searched repos in one query per count
+        self.assertEqual(counts, {**{k: searched[k] + v for k, v in [("issues_opened", 1), ("issues_closed", 0),
+                                                                     ("pulls_opened", 0), ("pulls_merged", 1)]},
+                                  "covered_since": int(since), "errors": {}})
+        before = self.server.request_count
+        self.assertEqual((await activity_counts(self.client, store, urls[:1], now))["issues_opened"], 1)
+        self.assertEqual(self.server.request_count, before)
+
+    async def test_activity_counts_put_many_repos_in_one_search(self):
+        await self.client.ensure_token_validated()
+        since = datetime(2024, 12, 1, tzinfo=timezone.utc).timestamp()
+        urls = [GitHubUrl(full_url="", org_user="octo", repo=f"repository-{i:02d}") for i in range(12)]
+        before = self.server.request_count
+        counts = await count_activity(self.client, urls, since)
+        self.assertEqual(self.server.request_count - before, 8)  # 12 repos take two queries per count
+        self.assertEqual(counts["errors"], {})
+
+    async def test_activity_counts_collect_errors_per_repo(self):
+        await self.client.ensure_token_validated()
+        since = datetime(2024, 12, 1, tzinfo=timezone.utc).timestamp()
+        a, b = (GitHubUrl(full_url="", org_user="octo", repo=name) for name in ("a", "b"))
+        found = await count_activity(self.client, [a, b], since)
+        self.server.missing_repos.add("octo/gone")
+        before = self.server.request_count
+        counts = await count_activity(self.client, [a, GitHubUrl(full_url="", org_user="octo", repo="gone"), b], since)
+        self.assertEqual(self.server.request_count - before, 4 + 4 * 3)  # the failed queries are split up
+        self.assertEqual(list(counts["errors"]), ["octo/gone"])
+        self.assertIn("422", counts["errors"]["octo/gone"])
+        for name in ("issues_opened", "issues_closed", "pulls_opened", "pulls_merged"):
+            self.assertEqual(counts[name], found[name])
+
+    async def test_pull_timelines_take_one_query_per_repo_plus_continuations(self):
+        await self.client.ensure_token_validated()
+        urls = [self.url, GitHubUrl(full_url="", org_user="octo", repo="other")]
+        before = self.server.request_count
+        timelines = await fetch_pull_timelines(self.client, urls, page_size=50, reviews=10)
+        # One page of pull requests per repo, then one query continuing the reviews of #5 in both repos
+        self.assertEqual(self.server.request_count - before, 3)
+        self.assertEqual(len(timelines), 20)
+        self.assertEqual(self.client.rate_limits.bucket("graphql").remaining, 5000 - 3)
+
+        by_number = {t.number: t for t in timelines if t.repo == "octo/demo"}
+        self.assertEqual(by_number[3].time_to_first_review, 3600)
+        self.assertEqual(by_number[4].ready_at - by_number[4].created_at, 1800)  # opened as a draft
+        self.assertEqual(by_number[4].time_to_first_review, 1800)
+        # The author's own 12 replies come first; the first outside review is on the second page
+        self.assertEqual(by_number[5].first_review_at - by_number[5].created_at, 13 * 3600)
+        self.assertEqual(by_number[5].reviews, 15)
+        self.assertIsNone(by_number[10].first_review_at)  # only the author's replies
+        self.assertIsNone(by_number[7].first_review_at)  # no reviews at all
+
+        since = max(t.created_at for t in timelines)  # pulls are updated 3 hours after they are opened
+        recent = await fetch_pull_timelines(self.client, urls, since=since)
+        self.assertEqual({(t.repo, t.number) for t in recent}, {("octo/demo", 10), ("octo/other", 10)})
+
+    async def test_pull_timelines_skip_repos_graphql_cannot_resolve(self):
+        self.server.missing_repos.add("octo/gone")
+        urls = [GitHubUrl(full_url="", org_user="octo", repo="gone"), self.url]
+        timelines = await fetch_pull_timelines(self.client, urls, page_size=50, reviews=10)
+        self.assertEqual({t.repo for t in timelines}, {"octo/demo"})
+        self.assertEqual(len(timelines), 10)
+
+    async def test_preflight_and_drained_search_bucket_leaves_core_alone(self):
+        self.server.set_search_remaining(0, reset_in=3600)
+        client = GitHubClient("mock-token", preflight=True)
+        search = asyncio.ensure_future(client.count_issues(self.url))
+        await asyncio.sleep(0.2)
+        response = await asyncio.wait_for(client.get_languages(self.url), timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(search.done())
+        search.cancel()
+        self.assertEqual(client.rate_limits.bucket("search").remaining, 0)
+        self.assertEqual(client.rate_manager.limit, 5000)
+
+    async def test_injected_429_is_retried_then_raised(self):
+        self.server.inject_fault(429, retry_after=0, path_prefix="/github/repos")
+        response = await self.client.get_languages(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        client = GitHubClient("mock-token", RetryPolicy(max_rate_limit_waits=2))
+        self.server.inject_fault(429, count=3, retry_after=0, path_prefix="/github/repos")
+        with self.assertRaises(HTTPError) as context:
+            await client.get_languages(self.url)
+        self.assertEqual(context.exception.response.status_code, 429)
+
+    async def test_secondary_limit_waits_retry_after_and_shrinks_concurrency(self):
+        self.server.inject_fault(403, secondary=True, retry_after=0, path_prefix="/github/repos")
+        pages = await self.client.get_commits(self.url)
+        self.assertEqual(sum(len(p.json()) for p in pages), 250)
+        self.assertTrue(4 < self.client.concurrency.limit < 5)  # halved, then recovering one success at a time
+
+    async def test_requests_overlap_up_to_the_concurrency_limit(self):
+        await self.client.ensure_token_validated()
+        self.server.latency = 0.05
+        urls = [GitHubUrl(full_url="", org_user="octo", repo=f"r{i}") for i in range(16)]
+        await asyncio.gather(*(self.client.get_languages(u) for u in urls))
+        self.assertGreater(self.server.state.peak_in_flight, 1)
+        self.assertEqual(self.client.rate_manager.remaining, self.server.state.remaining)
+
+        self.client.concurrency.on_throttle()
+        self.server.state.peak_in_flight = 0
+        await asyncio.gather(*(self.client.get_license(u) for u in urls))
+        self.assertLessEqual(self.server.state.peak_in_flight, int(self.client.concurrency.limit))
+        self.assertLess(self.server.state.peak_in_flight, self.client.concurrency.maximum)
+
+    async def test_lanes_interleave_under_concurrent_load(self):
+        await self.client.ensure_token_validated()
+        self.server.latency = 0.02
+        # One request in flight, so requests reach the server in the order they were admitted
+        self.client.concurrency.limit = self.client.concurrency.maximum = 1
+
+        async def request(lane, i):
+            with request_priority(lane):
+                return await self.client.get_languages(GitHubUrl(full_url="", org_user="octo", repo=f"{lane}{i}"))
+        backfill = [asyncio.ensure_future(request("backfill", i)) for i in range(20)]
+        await asyncio.sleep(0.03)
+        await asyncio.gather(*(request("interactive", i) for i in range(8)))
+        self.assertEqual(len(await asyncio.gather(*backfill)), 20)
+        sent = [p.split("/")[4].rstrip("0123456789") for p in self.server.state.request_log if p.endswith("/languages")]
+        first = sent.index("interactive")
+        last = len(sent) - sent[::-1].index("interactive")
+        # Interactive requests overtake the queued backfill, which still gets its weighted turn meanwhile
+        self.assertTrue(1 <= sent[first:last].count("backfill") <= 3, sent)
+
+    async def test_server_errors_are_retried_with_backoff(self):
+        client = GitHubClient("mock-token", RetryPolicy(base_delay=0.01))
+        self.server.inject_fault(502, count=2, path_prefix="/github/repos")
+        self.assertEqual((await client.get_languages(self.url)).status_code, 200)
+        self.server.inject_fault(404, path_prefix="/github/repos")
+        requests_before = self.server.request_count
+        with self.assertRaises(HTTPError):
+            await client.get_languages(self.url)
+        self.assertEqual(self.server.request_count - requests_before, 1)
+
+    async def test_stats_are_polled_until_computed(self):
+        self.server.stats_pending = 2
+        urls = [GitHubUrl(full_url="", org_user="octo", repo=f"demo{i}") for i in range(3)]
+        stats = await fetch_stats(self.client, urls, initial_delay=0.01)
+        self.assertEqual(set(stats), {u.repo_path() for u in urls})
+        self.assertEqual(set(stats["octo/demo0"]), set(STATS_KINDS))
+        self.assertEqual(recent_commit_count(stats["octo/demo1"]["commit_activity"]), 3 + 4 + 5 + 6)
+        # Every statistic: two 202 answers, then the data
+        self.assertEqual(set(self.server.state.stats_polls.values()), {3})
+
+    async def test_stats_give_up_after_timeout(self):
+        self.server.stats_pending = 1000
+        stats = await fetch_stats(self.client, [self.url], kinds=["participation"],
+                                  initial_delay=0.01, timeout=0.1)
+        self.assertEqual(stats, {"octo/demo": {"participation": None}})
+
+    async def test_branch_drift_shares_compares_and_commits(self):
+        before = self.server.request_count
+        drift = await branch_drift(self.client, self.url)
+        # 1 token validation + repo + branches + one compare per distinct head (12 branches, 6 heads besides main)
+        self.assertEqual(self.server.request_count - before, 9)
+        self.assertEqual(drift.default_branch, "main")
+        self.assertEqual(len(drift.branches), 12)
+        self.assertEqual(len(drift.commits), 10)
+        by_name = {b.name: b for b in drift.branches}
+        self.assertEqual(by_name["main"].status, "identical")
+        feature = by_name["feature-1"]
+        self.assertEqual(by_name["feature-0"], BranchDrift("feature-0", feature.sha, "diverged", 5, 1, feature.commits))
+        self.assertEqual(drift.diverged()[0].behind_by, 6)
+        compares = [p for p in self.server.state.request_log if "/compare/" in p]
+        self.assertTrue(all(f"/compare/{drift.default_sha}..." in p for p in compares))
+
+    async def test_discovery_streams_filters_and_dedupes(self):
+        sources = ["org:acme", "acme/repo-3", "ACME/Repo-1", "not a repo", "octo/demo"]
+        repos = [u.repo_path() async for u in discover_repos(self.client, sources, skip_archived=True, skip_forks=True)]
+        expected = [f"acme/repo-{i}" for i in range(250) if i % 10 and i % 7]
+        self.assertEqual(repos, expected + ["octo/demo"])
+        listings = [p for p in self.server.state.request_log if "/orgs/acme/repos" in p]
+        self.assertTrue(all("type=sources" in p for p in listings))
+
+    async def test_fetch_starts_before_listing_completes(self):
+        self.server.owner_repo_count = 450
+        order = []
+
+        async def fetch(url):
+            order.append(("fetch", self.server.request_count))
+            return url.repo
+
+        async for url, result in fetch_as_discovered(discover_repos(self.client, ["user:octo"]), fetch, concurrency=4):
+            self.assertEqual(result, url.repo)
+        listing_requests = 1 + 5  # token validation + 5 pages of 100
+        self.assertEqual(len(order), 450)
+        self.assertLess(order[0][1], listing_requests)
+
+    async def test_report_pipeline_collects_every_repo_through_bounded_stages(self):
+        self.server.owner_repo_count = 120
+        self.server.inject_fault(404, path_prefix="/github/repos/octo/repo-3/languages")
+        result = await collect_repo_metrics(self.client, ["user:octo"], fetch_workers=4, queue_size=2)
+        expected = [f"octo/repo-{i}" for i in range(120) if i != 3]
+        self.assertEqual(sorted(result.repos), sorted(expected))
+        self.assertEqual(list(result.errors), ["octo/repo-3"])
+        self.assertEqual(result.languages, merge_language_maps([_languages(r) for r in expected]))
+        self.assertEqual(result.recent_commits, 119 * (3 + 4 + 5 + 6))  # last 4 weeks of the mock's commit activity
+
+    async def test_report_pipeline_starts_every_commit_activity_before_polling(self):
+        self.server.owner_repo_count = 6
+        self.server.stats_pending = 1
+        result = await collect_repo_metrics(self.client, ["user:octo"], stats_workers=1)
+        self.assertEqual(result.recent_commits, 6 * (3 + 4 + 5 + 6))
+        stats = [p.split("/")[4] for p in self.server.state.request_log if p.endswith("/stats/commit_activity")]
+        # Each repository is asked once by the stats stage, then all are polled together
+        self.assertEqual(len(stats), 12)
+        self.assertEqual(len(set(stats[:6])), 6)
+
+    async def test_dependency_discovery_uses_tree_and_blob_calls(self):
+        before = self.server.request_count
+        deps = await discover_dependencies(self.client, self.url)
+        # 1 token validation + 1 tree call + 1 blob call per manifest (6 manifests)
+        self.assertEqual(self.server.request_count - before, 8)
+        found = {(d.ecosystem, d.name, d.version, d.manifest) for d in deps}
+        self.assertIn(("PyPI", "requests", "2.31.0", "uv.lock"), found)
+        self.assertIn(("PyPI", "flask", "2.2.0", "services/api/requirements.txt"), found)
+        self.assertIn(("npm", "lodash", "4.17.20", "web/package.json"), found)
+        self.assertIn(("Go", "golang.org/x/text", "v0.3.7", "tools/go.mod"), found)
+        self.assertFalse(any("node_modules" in d.manifest for d in deps))
+
+    async def test_collect_dependencies_skips_failing_repos(self):
+        urls = [GitHubUrl(full_url="", org_user="octo", repo=name) for name in ("a", "broken", "b")]
+        self.server.inject_fault(404, path_prefix="/github/repos/octo/broken/git/trees")
+        deps, errors = await collect_dependencies(self.client, urls, concurrency=2)
+        self.assertEqual(list(errors), ["octo/broken"])
+        single = await discover_dependencies(self.client, self.url)
+        self.assertEqual(len(deps), 2 * len(single))
+
+class TestSentryAgainstMockServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockApiServer().start()
+        self.addCleanup(self.server.stop)
+        env = {"SENTRY_AUTH_TOKEN": "t", "SENTRY_ORG_SLUG": "org", "SENTRY_PROJECT_SLUG": "proj"}
+        for patcher in [patch.dict(os.environ, env),
+                        patch.object(sentry_api, "BASE", f"{self.server.sentry_url}/api/0")]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.environ.pop("SENTRY_PROJECT_ID", None)
+        sentry_api._project_id.cache_clear()
+        self.addCleanup(sentry_api._project_id.cache_clear)
+
+    def test_issues_and_events_stats(self):
+        self.assertEqual(sentry_service.unresolved_issue_count_30d(), 25)
+        self.assertEqual(len(sentry_service.error_timeseries_30d()), 30)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from repo_radar.utils.pipeline import Stage, run_pipeline
+
+class TestPipeline(unittest.IsolatedAsyncioTestCase):
+
+    async def test_items_pass_through_and_none_is_dropped(self):
+        collected = []
+
+        async def source():
+            for i in range(50):
+                yield i
+
+        async def double(x):
+            await asyncio.sleep(0.001 * (x % 3))
+            return None if x % 10 == 0 else x * 2
+
+        async def sink(x):
+            collected.append(x)
+
+        await run_pipeline(source(), [Stage("double", double, workers=4, queue_size=2), Stage("sink", sink)])
+        self.assertEqual(sorted(collected), [i * 2 for i in range(50) if i % 10])
+
+    async def test_backpressure_bounds_items_in_flight(self):
+        read, sunk, peak = [0], [0], [0]
+
+        async def source():
+            for i in range(100):
+                read[0] += 1
+                peak[0] = max(peak[0], read[0] - sunk[0])
+                yield i
+
+        async def passthrough(x):
+            return x
+
+        async def slow_sink(x):
+            await asyncio.sleep(0.001)
+            sunk[0] += 1
+
+        await run_pipeline(source(), [Stage("fetch", passthrough, workers=2, queue_size=3),
+                                      Stage("sink", slow_sink, workers=1, queue_size=3)])
+        self.assertEqual(sunk[0], 100)
+        # Two queues of 3, two fetch workers, one sink worker and the item the source is putting
+        self.assertLessEqual(peak[0], 3 + 3 + 2 + 1 + 1)
+
+    async def test_stages_overlap(self):
+        events = []
+
+        async def source():
+            for i in range(3):
+                yield i
+
+        async def fetch(x):
+            events.append(("fetch", x))
+            await asyncio.sleep(0.01)
+            return x
+
+        async def render(x):
+            events.append(("render", x))
+
+        await run_pipeline(source(), [Stage("fetch", fetch), Stage("render", render)])
+        # The first item is rendered before the last one is fetched
+        self.assertLess(events.index(("render", 0)), events.index(("fetch", 2)))
+
+    async def test_failure_cancels_every_stage(self):
+        cancelled = []
+
+        async def endless():
+            i = 0
+            while True:
+                yield i
+                i += 1
+
+        async def fetch(x):
+            if x == 2:
+                await asyncio.sleep(0.01)
+                raise ValueError(x)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(x)
+                raise
+
+        async def sink(x):
+            pass
+
+        with self.assertRaises(ValueError) as ctx:
+            await asyncio.wait_for(run_pipeline(endless(), [Stage("fetch", fetch, workers=3), Stage("sink", sink)]), 2)
+        self.assertEqual(ctx.exception.__notes__, ["Raised in pipeline stage 'fetch'"])
+        self.assertEqual(sorted(cancelled), [0, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+from repo_radar.utils.priority_lanes import WeightedFairLock, current_priority, request_priority
+
+class TestPriorityLanes(unittest.IsolatedAsyncioTestCase):
+
+    async def grant_order(self, lock, lanes):
+        order = []
+
+        async def waiter(i, lane):
+            await lock.acquire(lane)
+            order.append(i)
+            lock.release()
+
+        await lock.acquire("report")
+        tasks = [asyncio.ensure_future(waiter(i, lane)) for i, lane in enumerate(lanes)]
+        await asyncio.sleep(0)
+        lock.release()
+        await asyncio.gather(*tasks)
+        self.assertFalse(lock.locked())
+        return [lanes[i] for i in order]
+
+    async def test_higher_weight_lanes_go_first_without_starving_others(self):
+        lock = WeightedFairLock({"interactive": 8, "report": 4, "backfill": 1})
+        order = await self.grant_order(lock, ["backfill"] * 4 + ["interactive"] * 4)
+        self.assertEqual(order, ["interactive"] * 4 + ["backfill"] * 4)
+
+        order = await self.grant_order(WeightedFairLock({"interactive": 8, "report": 4, "backfill": 1}),
+                                       ["backfill"] * 2 + ["interactive"] * 16)
+        self.assertEqual(order.index("backfill"), 7)  # one backfill turn per eight interactive ones
+        self.assertEqual(order[-1], "interactive")
+
+    async def test_cancelled_waiters_are_skipped(self):
+        lock = WeightedFairLock()
+        await lock.acquire("report")
+        cancelled = asyncio.ensure_future(lock.acquire("interactive"))
+        queued = asyncio.ensure_future(lock.acquire("backfill"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        lock.release()
+        self.assertTrue(await queued)
+        lock.release()
+        self.assertFalse(lock.locked())
+
+    def test_request_priority_is_scoped(self):
+        self.assertEqual(current_priority(), "report")
+        with request_priority("backfill"):
+            self.assertEqual(asyncio.run(asyncio.sleep(0, current_priority())), "backfill")
+        self.assertEqual(current_priority(), "report")
+        with self.assertRaises(ValueError):
+            with request_priority("urgent"):
+                pass
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from repo_radar.monitoring.instrumentation import Instrumentation
+from repo_radar.monitoring.profiling import PipelineProfiler
+
+class TestPipelineProfiler(unittest.TestCase):
+
+    def test_writes_stage_times_and_allocations(self):
+        out_dir = Path(tempfile.mkdtemp())
+        instrumentation = Instrumentation()
+        with PipelineProfiler(out_dir, top=5, instrumentation=instrumentation):
+            with instrumentation.span("aggregate"):
+                blob = [str(i) * 10 for i in range(20000)]
+            with instrumentation.span("render"):
+                "".join(blob)
+
+        summary = json.loads((out_dir / "profile.json").read_text())
+        self.assertEqual({s["stage"] for s in summary["stages"]}, {"aggregate", "render"})
+        self.assertLessEqual(len(summary["top_functions"]), 5)
+        self.assertTrue(summary["top_allocations"])
+        self.assertGreater(summary["peak_traced_mb"], 0)
+        self.assertTrue((out_dir / "profile.pstats").exists())
+        self.assertIn("Top allocation sites", (out_dir / "profile.txt").read_text())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,21 @@
+import asyncio
+import time
 import unittest
 from unittest.mock import MagicMock
 from requests.models import Response
-from repo_radar.utils.rate_limit_manager import RateLimitManager
+from repo_radar.utils.adaptive_concurrency import AdaptiveConcurrency
+from repo_radar.utils.priority_lanes import request_priority
+from repo_radar.utils.rate_limit_manager import RateLimitManager, RateLimits, resource_for_url
 import logging
 
+def rate_response(remaining, reset, limit=5000, resource=None):
+    r = MagicMock(spec=Response)
+    r.headers = {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(remaining),
+                 "X-RateLimit-Reset": str(reset)}
+    if resource:
+        r.headers["X-RateLimit-Resource"] = resource
+    return r
+
 class TestRateLimitManager(unittest.IsolatedAsyncioTestCase):
 
     async def asyncSetUp(self):
@@ -14,7 +26,13 @@ class TestRateLimitManager(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(RuntimeError) as context:
             async with self.rate_limit_manager:
                 pass
-        self.assertIn("Must call update_from_headers() before releasing the rate limit lock", str(context.exception))
+        self.assertIn("Must call update_from_headers() before leaving the rate limit manager", str(context.exception))
+
+    async def test_errors_propagate_and_release_the_lock(self):
+        with self.assertRaises(ConnectionError):
+            async with self.rate_limit_manager:
+                raise ConnectionError("connection reset")
+        self.assertFalse(self.rate_limit_manager._lock.locked())
 
     async def test_update_from_headers_requires_lock(self):
         response = MagicMock(spec=Response)
@@ -24,10 +42,9 @@ class TestRateLimitManager(unittest.IsolatedAsyncioTestCase):
         }
         with self.assertRaises(RuntimeError) as context:
             await self.rate_limit_manager.update_from_headers(response)
-        self.assertIn("update_from_headers must be called within the RateLimitManager task holding the lock", str(context.exception))
+        self.assertIn("update_from_headers must be called within a task admitted by the RateLimitManager", str(context.exception))
         self.assertEqual(self.rate_limit_manager.remaining, None)
         self.assertEqual(self.rate_limit_manager.reset_time, None)
-        self.assertFalse(self.rate_limit_manager._headers_updated)
 
     async def test_update_from_headers_and_release(self):
         response = MagicMock(spec=Response)
@@ -39,7 +56,126 @@ class TestRateLimitManager(unittest.IsolatedAsyncioTestCase):
             await self.rate_limit_manager.update_from_headers(response)
             self.assertEqual(self.rate_limit_manager.remaining, 10)
             self.assertEqual(self.rate_limit_manager.reset_time, int(1e10))
-            self.assertTrue(self.rate_limit_manager._headers_updated)
+        self.assertEqual(self.rate_limit_manager._admitted, {})
+
+    async def test_remaining_tracks_the_current_window(self):
+        def response(remaining, reset):
+            r = MagicMock(spec=Response)
+            r.headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": str(remaining),
+                         "X-RateLimit-Reset": str(reset)}
+            return r
+        seen = []
+        # The 95 arrives late, after the 90 of the same window; the new window resets the count
+        for remaining, reset in [(100, 1000), (90, 1000), (95, 1000), (4999, 2000)]:
+            async with self.rate_limit_manager:
+                await self.rate_limit_manager.update_from_headers(response(remaining, reset))
+            seen.append(self.rate_limit_manager.remaining)
+        self.assertEqual(seen, [100, 90, 90, 4999])
+        self.assertEqual(self.rate_limit_manager.limit, 5000)
+
+    async def test_budget_after_reset_is_the_known_limit(self):
+        manager = RateLimitManager("search")
+        manager.observe(0, int(time.time()) + 1, limit=30)
+        async with manager:
+            self.assertEqual(manager.remaining, 29)  # this request out of 30, not the core default of 5000
+            await manager.update_from_headers(rate_response(29, int(time.time()) + 60, limit=30))
+
+    async def test_buckets_queue_independently(self):
+        limits = RateLimits()
+        limits.update_from_rate_limit({"resources": {
+            "core": {"limit": 5000, "remaining": 4000, "reset": int(1e10)},
+            "search": {"limit": 30, "remaining": 0, "reset": int(1e10)},
+        }})
+        self.assertIs(limits.for_url("https://api.github.com/search/issues?q=x"), limits.bucket("search"))
+
+        async def search():
+            async with limits.bucket("search"):
+                pass
+        blocked = asyncio.ensure_future(search())
+        await asyncio.sleep(0)
+        core = limits.for_url("https://api.github.com/repos/o/r/commits")
+        async with core:
+            await core.update_from_headers(rate_response(3999, int(1e10)))
+        self.assertFalse(blocked.done())
+        blocked.cancel()
+        await asyncio.sleep(0)
+        self.assertFalse(limits.bucket("search")._lock.locked())
+        self.assertEqual((core.remaining, limits.bucket("search").remaining), (3999, 0))
+
+    async def test_backfill_leaves_reserved_budget_to_higher_lanes(self):
+        manager = RateLimitManager()
+        manager.observe(200, int(time.time()) + 3600, limit=1000)
+
+        async def request(lane):
+            with request_priority(lane):
+                async with manager:
+                    # remaining already counts this request
+                    await manager.update_from_headers(rate_response(manager.remaining, manager.reset_time, 1000))
+        backfill = asyncio.ensure_future(request("backfill"))
+        await asyncio.wait_for(request("interactive"), timeout=1)
+        await asyncio.wait_for(request("report"), timeout=1)
+        self.assertFalse(backfill.done())
+        backfill.cancel()
+        self.assertEqual(manager.remaining, 198)
+
+    async def test_requests_in_flight_are_reserved_until_their_headers_arrive(self):
+        manager = RateLimitManager(concurrency=AdaptiveConcurrency(maximum=4))
+        manager.observe(100, int(1e10), limit=5000)
+        sent = asyncio.Event()
+        release = asyncio.Event()
+
+        async def request(remaining):
+            async with manager:
+                sent.set()
+                await release.wait()
+                if remaining is None:
+                    raise ConnectionError("connection reset")
+                await manager.update_from_headers(rate_response(remaining, int(1e10)))
+        tasks = [asyncio.ensure_future(request(r)) for r in (99, 98, None)]
+        await sent.wait()
+        await asyncio.sleep(0.01)
+        # Admission does not wait for the requests in flight, but it charges them
+        self.assertEqual((manager.concurrency.in_flight, manager.remaining), (3, 97))
+        self.assertFalse(manager._lock.locked())
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertIsInstance(results[2], ConnectionError)
+        # The failed request gave its reservation back; the others are counted by GitHub
+        self.assertEqual((manager.concurrency.in_flight, manager.remaining), (0, 98))
+
+    async def test_admission_waits_for_a_concurrency_slot_in_lane_order(self):
+        manager = RateLimitManager(concurrency=AdaptiveConcurrency(maximum=1))
+        release = asyncio.Event()
+        order = []
+
+        async def request(lane, name):
+            with request_priority(lane):
+                async with manager:
+                    order.append(name)
+                    await release.wait()
+                    await manager.update_from_headers(rate_response(100, int(1e10)))
+        first = asyncio.ensure_future(request("backfill", "first"))
+        await asyncio.sleep(0)
+        waiting = [asyncio.ensure_future(request(lane, lane)) for lane in ("backfill", "report", "interactive")]
+        await asyncio.sleep(0.01)
+        self.assertEqual(order, ["first"])
+        release.set()
+        await asyncio.gather(first, *waiting)
+        # One backfill request took the lock and waits for the slot; the rest queue by lane
+        self.assertEqual(order, ["first", "backfill", "interactive", "report"])
+
+    async def test_headers_update_the_bucket_they_name(self):
+        limits = RateLimits()
+        core = limits.bucket("core")
+        async with core:
+            await core.update_from_headers(rate_response(9, 2000, limit=10, resource="graphql"))
+        self.assertIsNone(core.remaining)
+        self.assertEqual((limits.bucket("graphql").remaining, limits.bucket("graphql").limit), (9, 10))
+
+    def test_resource_for_url(self):
+        self.assertEqual([resource_for_url(f"https://api.github.com{p}") for p in
+                          ("/repos/o/r", "/search/issues", "/search/code", "/graphql")],
+                         ["core", "search", "code_search", "graphql"])
 
     async def test_reentry(self):
         response = MagicMock(spec=Response)
@@ -50,7 +186,7 @@ class TestRateLimitManager(unittest.IsolatedAsyncioTestCase):
         async def enter_twice():
             async with self.rate_limit_manager:
                 await self.rate_limit_manager.update_from_headers(response)
-                # Attempt to reenter while already holding the lock
+                # Attempt to reenter while already admitted
                 await self.rate_limit_manager.__aenter__()
 
         with self.assertRaises(RuntimeError) as context:
@@ -0,0 +1,137 @@
+import json
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from http import HTTPStatus
+from pathlib import Path
+from repo_radar.models.repo_state import RepoSnapshot
+from repo_radar.services.repo_state import RepoStateStore
+from repo_radar.services.report_server import ReportCache, ReportServer
+
+NOW = 1_700_000_000.0
+
+class TestReportServer(unittest.TestCase):
+
+    def setUp(self):
+        self.store = RepoStateStore(Path(tempfile.mkdtemp()) / "state.json")
+        self.store.put(RepoSnapshot("acme/api", NOW - 60, languages={"Python": 300, "Go": 100}, recent_commits=12,
+                                    open_issues=4, events_since=NOW - 3600, issues_opened=[NOW - 10, NOW - 40 * 86400]))
+        self.store.put(RepoSnapshot("acme/web", NOW - 60, languages={"TypeScript": 400}, recent_commits=3))
+        self.store.put(RepoSnapshot("octo/cli", NOW - 60, languages={"Rust": 50}))
+        self.cache = ReportCache(self.store, clock=lambda: NOW)
+
+    def test_pages_have_repo_org_and_index_data(self):
+        repo = json.loads(self.cache.get("/repos/acme/api.json").body)
+        self.assertEqual((repo["recent_commits"], repo["open_issues"]), (12, 4))
+        self.assertEqual(repo["activity"]["issues_opened"], 1)  # the other is outside the 30 day window
+        self.assertEqual(repo["languages"][0], {"language": "Python", "percent": 75.0})
+
+        org = json.loads(self.cache.get("/orgs/ACME.json").body)
+        self.assertEqual((org["repos"], org["recent_commits"]), (["acme/api", "acme/web"], 15))
+        self.assertEqual(json.loads(self.cache.get("/index.json").body)["orgs"], {"acme": 2, "octo": 1})
+        page = self.cache.get("/orgs/acme")
+        self.assertEqual(page.content_type, "text/html; charset=utf-8")
+        self.assertIn(b'<a href="/repos/acme/web">acme/web</a>', page.body)
+        self.assertIsNone(self.cache.get("/repos/acme/missing"))
+        self.assertIsNone(self.cache.get("/admin"))
+
+    def test_only_pages_of_changed_repos_are_rendered_again(self):
+        pages = {p: self.cache.get(p) for p in ("/repos/acme/api.json", "/repos/acme/web", "/orgs/acme", "/orgs/octo", "/")}
+        self.assertTrue(all(self.cache.get(p) is page for p, page in pages.items()))
+
+        self.store.update("acme/web", lambda s: setattr(s, "recent_commits", 5))
+        self.store.mark_clean(["acme/api"])  # render flags are not data changes
+        changed = {p for p, page in pages.items() if self.cache.get(p) is not page}
+        self.assertEqual(changed, {"/repos/acme/web", "/orgs/acme", "/"})
+        self.assertNotEqual(self.cache.get("/repos/acme/web").etag, pages["/repos/acme/web"].etag)
+
+        self.cache.clock = lambda: NOW + 3600  # the activity window moved
+        self.assertIsNot(self.cache.get("/orgs/octo"), pages["/orgs/octo"])
+
+    def test_server_answers_etag_revalidation_with_304(self):
+        with ReportServer(self.store, port=0, clock=lambda: NOW) as server:
+            host, port = server.address
+            url = f"http://{host}:{port}/repos/acme/api"
+            with urllib.request.urlopen(url) as response:
+                etag = response.headers["ETag"]
+                self.assertIn(b"acme/api", response.read())
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(urllib.request.Request(url, headers={"If-None-Match": etag}))
+            self.assertEqual(ctx.exception.code, HTTPStatus.NOT_MODIFIED)
+
+            with ThreadPoolExecutor(8) as pool:
+                bodies = set(pool.map(lambda _: urllib.request.urlopen(f"{url}.json").read(), range(32)))
+            self.assertEqual(len(bodies), 1)
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(f"http://{host}:{port}/repos/acme/missing")
+            self.assertEqual(ctx.exception.code, HTTPStatus.NOT_FOUND)
+
+    def test_post_refresh_answers_with_the_refreshed_page(self):
+        requested = []
+
+        def refresh(repo):
+            requested.append(repo)
+            if repo != "acme/api":
+                return None
+            pending = Future()
+            snapshot = replace(self.store.get("acme/api"), recent_commits=20)
+            self.store.put(snapshot)
+            pending.set_result(snapshot)
+            return pending
+        with ReportServer(self.store, port=0, clock=lambda: NOW, refresh=refresh) as server:
+            host, port = server.address
+            request = urllib.request.Request(f"http://{host}:{port}/repos/acme/api/refresh", method="POST")
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(json.loads(response.read())["recent_commits"], 20)
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(urllib.request.Request(f"http://{host}:{port}/repos/acme/gone/refresh", method="POST"))
+            self.assertEqual(ctx.exception.code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(requested, ["acme/api", "acme/gone"])
+
+        with ReportServer(self.store, port=0, clock=lambda: NOW) as server:
+            host, port = server.address
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(urllib.request.Request(f"http://{host}:{port}/repos/acme/api/refresh", method="POST"))
+            self.assertEqual(ctx.exception.code, HTTPStatus.NOT_FOUND)
+
+    def test_server_reloads_what_another_process_saved(self):
+        self.store.save()
+        pages = {p: self.cache.get(p) for p in ("/repos/acme/api", "/repos/acme/web", "/orgs/octo")}
+        self.assertEqual(self.store.reload(), [])  # its own save is not reloaded
+
+        watcher = RepoStateStore(self.store.path)  # e.g. a watch run in another process
+        watcher.update("acme/web", lambda s: setattr(s, "recent_commits", 7))
+        watcher.mark_clean(["acme/api"])
+        watcher.save()
+        self.assertEqual(self.store.reload(), ["acme/web"])
+        self.assertEqual(self.store.get("acme/web").recent_commits, 7)
+        changed = {p for p, page in pages.items() if self.cache.get(p) is not page}
+        self.assertEqual(changed, {"/repos/acme/web"})
+
+        watcher.put(RepoSnapshot("octo/new", NOW, recent_commits=1))
+        watcher.save()
+        self.store.put(replace(self.store.get("octo/cli"), recent_commits=2))
+        self.assertEqual(self.store.reload(), [])  # unsaved changes of its own are kept
+
+        self.store.save()
+        watcher = RepoStateStore(self.store.path)
+        watcher.put(RepoSnapshot("octo/new", NOW, recent_commits=1))
+        watcher.save()
+        with ReportServer(self.store, port=0, clock=lambda: NOW, reload_interval=0.01) as server:
+            host, port = server.address
+            for _ in range(200):
+                try:
+                    with urllib.request.urlopen(f"http://{host}:{port}/repos/octo/new.json") as response:
+                        self.assertEqual(json.loads(response.read())["recent_commits"], 1)
+                    break
+                except urllib.error.HTTPError:
+                    time.sleep(0.01)
+            else:
+                self.fail("octo/new was never reloaded")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import unittest
+from requests.exceptions import ConnectionError
+from repo_radar.api.transport import build_response
+from repo_radar.utils.adaptive_concurrency import AdaptiveConcurrency
+from repo_radar.utils.retry_policy import RetryPolicy
+
+URL = "https://api.github.com/repos/octo/demo/commits?page=2"
+
+def response(status, headers=None, message=""):
+    return build_response(status, headers or {}, json.dumps({"message": message}).encode())
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(base_delay=1.0, max_delay=8.0, budget_min=2, budget_ratio=0.5, clock=lambda: 1000.0)
+
+    def test_classification(self):
+        self.assertEqual(RetryPolicy.reason(response(429)), "429")
+        self.assertEqual(RetryPolicy.reason(response(403, message="You have exceeded a secondary rate limit")), "secondary_limit")
+        self.assertEqual(RetryPolicy.reason(response(403, {"X-RateLimit-Remaining": "0"})), "rate_limit")
+        self.assertIsNone(RetryPolicy.reason(response(403, {"X-RateLimit-Remaining": "42"})))
+        self.assertEqual(RetryPolicy.reason(response(503)), "503")
+        self.assertIsNone(RetryPolicy.reason(response(404)))
+        self.assertEqual(RetryPolicy.reason(error=ConnectionError("reset")), "connection")
+
+    def test_rate_limit_delays(self):
+        self.assertEqual(self.policy.next_delay(URL, 0, response(429, {"Retry-After": "0"})), ("429", 0.0))
+        reason, delay = self.policy.next_delay(URL, 0, response(403, {"Retry-After": "Thu, 01 Jan 1970 00:17:00 GMT"}))
+        self.assertEqual(reason, "secondary_limit")
+        self.assertTrue(20.0 <= delay <= 21.0)
+        _, delay = self.policy.next_delay(URL, 0, response(403, message="secondary rate limit"))
+        self.assertGreaterEqual(delay, 60.0)
+        self.assertEqual(self.policy.next_delay(URL, 0, response(403, {"X-RateLimit-Remaining": "0"})), ("rate_limit", 0.0))
+        self.assertIsNone(self.policy.next_delay(URL, 0, response(429), rate_limit_waits=20))
+
+    def test_malformed_or_naive_retry_after_dates(self):
+        _, delay = self.policy.next_delay(URL, 0, response(429, {"Retry-After": "Thu, 01 Jan 1970 00:17:00 -0000"}))
+        self.assertTrue(20.0 <= delay <= 21.0)  # a date without zone is read as UTC
+        for value in ("soon", "Thu, 32 Foo 1970 25:00:00 GMT"):
+            reason, delay = self.policy.next_delay(URL, 0, response(429, {"Retry-After": value}))
+            self.assertEqual(reason, "429")
+            self.assertTrue(0.0 <= delay <= 1.0)  # backoff of the first wait
+
+    def test_transient_failures_back_off_within_budget(self):
+        for attempt in range(2):
+            reason, delay = self.policy.next_delay(URL, attempt, response(502))
+            self.assertEqual(reason, "502")
+            self.assertTrue(0 <= delay <= 2 ** attempt)
+        self.assertIsNone(self.policy.next_delay(URL, 2, response(502)))  # budget of 2 spent
+        self.policy.record_request(URL)
+        self.policy.record_request("https://api.github.com/repos/other/repo/commits")
+        self.assertIsNotNone(self.policy.next_delay(URL, 2, response(502)))  # one request per endpoint earns a retry
+        self.assertIsNone(self.policy.next_delay(URL, 0, response(502), method="POST"))
+        self.assertIsNone(RetryPolicy(max_retries=1).next_delay(URL, 1, error=ConnectionError()))
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+
+    def test_aimd_limit(self):
+        now = [0.0]
+        controller = AdaptiveConcurrency(maximum=8, cooldown=5.0, clock=lambda: now[0])
+        controller.on_throttle()
+        controller.on_throttle()  # within the cooldown: requests sent under the old limit
+        self.assertEqual(controller.limit, 4.0)
+        now[0] = 10.0
+        controller.on_throttle()
+        self.assertEqual(controller.limit, 2.0)
+        for _ in range(3):
+            controller.on_success()
+        self.assertTrue(3.0 < controller.limit < 3.5)  # about +1 per round of requests
+
+    def test_waiters_respect_the_limit(self):
+        controller = AdaptiveConcurrency(maximum=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with controller:
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(*(request() for _ in range(6)))
+
+        asyncio.run(run())
+        asyncio.run(run())  # reusable across event loops
+        self.assertEqual((peak, controller.in_flight), (2, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import math
+import tempfile
+import unittest
+from pathlib import Path
+from repo_radar.models.run_snapshot import RunSnapshot
+from repo_radar.services.run_history import RunHistory
+from repo_radar.utils.columnar import ColumnReader, write_columns
+
+DAY = 86400
+NOW = 1_700_000_000.0
+
+def snapshot(created_at, commits, cves=None):
+    return RunSnapshot(
+        created_at=created_at,
+        repos=["octo/a", "octo/b"],
+        metrics={"repos": 2, "recent_commits": commits, "high_cves": cves},
+        languages={"Python": 75.0, "Go": 25.0},
+        series={"sentry_errors": [(created_at - DAY, 3.0), (created_at, 5.0)]},
+    )
+
+class TestColumnar(unittest.TestCase):
+
+    def test_round_trip_and_single_values(self):
+        path = Path(tempfile.mkdtemp()) / "cols.rrcol"
+        write_columns(path, {"run": 1}, {
+            "names": ("str", ["Python", "Go", "Jupyter Notebook"]),
+            "bytes": ("i8", [10, 2**40, -1]),
+            "share": ("f8", [0.5, math.nan]),
+            "empty": ("str", []),
+        })
+        with ColumnReader(path) as reader:
+            self.assertEqual(reader.meta, {"run": 1})
+            self.assertEqual(reader.column("names"), ["Python", "Go", "Jupyter Notebook"])
+            self.assertEqual(reader.column("bytes"), [10, 2**40, -1])
+            self.assertEqual(reader.value("bytes", 1), 2**40)
+            self.assertTrue(math.isnan(reader.value("share", 1)))
+            self.assertEqual(reader.column("empty"), [])
+            with self.assertRaises(IndexError):
+                reader.value("bytes", 3)
+
+    def test_rejects_other_files(self):
+        path = Path(tempfile.mkdtemp()) / "other.json"
+        path.write_text('{"not": "columnar"}')
+        with self.assertRaises(ValueError):
+            ColumnReader(path)
+
+class TestRunHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.history = RunHistory(Path(tempfile.mkdtemp()), keep=3)
+
+    def test_record_and_load(self):
+        run = snapshot(NOW, 12)
+        self.history.record(run)
+        self.assertEqual(self.history.runs(), [{"file": "run-20231114T221320Z.rrcol", "created_at": NOW, "repos": 2}])
+        self.assertEqual(self.history.load(self.history.runs()[0]), run)
+
+    def test_week_and_month_deltas(self):
+        self.history.record(snapshot(NOW - 31 * DAY, 40, cves=3))
+        self.history.record(snapshot(NOW - 7 * DAY + 3600, 10))  # a slightly late weekly run still counts
+        self.history.record(snapshot(NOW - DAY, 99))
+        trends = self.history.deltas(snapshot(NOW, 15, cves=1))
+        self.assertEqual(trends["week"], {"since": NOW - 7 * DAY + 3600, "metrics": {"repos": 0, "recent_commits": 5}})
+        self.assertEqual(trends["month"]["metrics"], {"repos": 0, "recent_commits": -25, "high_cves": -2})
+
+    def test_no_baseline_and_pruning(self):
+        self.assertEqual(self.history.deltas(snapshot(NOW, 1)), {})
+        for day in range(5):
+            self.history.record(snapshot(NOW + day * DAY, day))
+        runs = self.history.runs()
+        self.assertEqual([r["created_at"] for r in runs], [NOW + d * DAY for d in (2, 3, 4)])
+        self.assertEqual(sorted(p.name for p in self.history.directory.glob("*.rrcol")), [r["file"] for r in runs])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import logging
+import os
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import reduce
+from unittest.mock import patch
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.shard_result import ShardResult
+from repo_radar.services.sharded_runner import collect_sharded
+from repo_radar.utils.token_cache import TokenValidationCache
+from tests.mock_server import MockApiServer
+
+class TestShardResult(unittest.TestCase):
+
+    def test_merge_is_associative_with_identity(self):
+        a = ShardResult(["o/a"], {"Python": 10}, 3)
+        b = ShardResult(["o/b"], {"Python": 5, "Go": 1}, None, {"o/x": "404"})
+        c = ShardResult(["o/c"], {"Go": 2}, 4)
+        self.assertEqual(a.merge(b).merge(c), a.merge(b.merge(c)))
+        self.assertEqual(ShardResult().merge(a), a)
+        merged = reduce(ShardResult.merge, [a, b, c], ShardResult())
+        self.assertEqual(merged, ShardResult(["o/a", "o/b", "o/c"], {"Python": 15, "Go": 3}, 7, {"o/x": "404"}))
+        self.assertEqual(a.languages, {"Python": 10})  # inputs are not modified
+
+class TestCollectSharded(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.server = MockApiServer().start()
+        self.addCleanup(self.server.stop)
+        for target, value in [
+            ("repo_radar.models.github_url.GITHUB_API_URL", self.server.github_url),
+            ("repo_radar.api.github_api.GITHUB_API_USER_ENDPOINT", f"{self.server.github_url}/user"),
+            ("repo_radar.api.github_client.TOKEN_VALIDATION_CACHE", TokenValidationCache()),
+        ]:
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.repos = [GitHubUrl("", "octo", f"demo{i}") for i in range(9)]
+
+    def test_shards_match_a_single_run(self):
+        single = collect_sharded(self.repos, ["mock-token"], workers=1)
+        with ThreadPoolExecutor(3) as pool:
+            sharded = collect_sharded(self.repos, ["token-a", "token-b"], workers=3, executor=pool)
+        self.assertEqual(sorted(sharded.repos), sorted(single.repos))
+        self.assertEqual(len(sharded.repos), 9)
+        self.assertEqual(sharded.languages, single.languages)
+        self.assertEqual(sharded.recent_commits, single.recent_commits)
+        self.assertEqual((sharded.repo_languages, sharded.repo_commits), (single.repo_languages, single.repo_commits))
+
+    def test_worker_processes(self):
+        self.server.inject_fault(404, path_prefix="/github/repos/octo/demo4/languages")
+        # Spawned workers read the API URL from the environment when importing the config
+        context = multiprocessing.get_context("spawn")
+        with patch.dict(os.environ, {"GITHUB_API_URL": self.server.github_url}), \
+                ProcessPoolExecutor(2, mp_context=context) as pool:
+            result = collect_sharded(self.repos, ["mock-token"], workers=2, executor=pool)
+        self.assertEqual(len(result.repos), 8)
+        self.assertEqual(list(result.errors), ["octo/demo4"])
+        self.assertTrue(result.languages)
+
+    def test_requires_a_token(self):
+        with self.assertRaises(ValueError):
+            collect_sharded(self.repos, [], workers=2)
+
+if __name__ == "__main__":
+    unittest.main()
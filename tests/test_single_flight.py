@@ -0,0 +1,34 @@
+import asyncio
+import unittest
+from repo_radar.utils.single_flight import SingleFlight
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_share_result_and_failure(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            if value == "bad":
+                raise ValueError(value)
+            return value
+
+        results = await asyncio.gather(*(flight.do("k", lambda: fetch("good")) for _ in range(3)))
+        self.assertEqual((results, calls), (["good"] * 3, ["good"]))
+        failures = await asyncio.gather(*(flight.do("k", lambda: fetch("bad")) for _ in range(2)),
+                                        return_exceptions=True)
+        self.assertTrue(all(isinstance(f, ValueError) for f in failures))
+        self.assertEqual(calls, ["good", "bad"])
+
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("k", lambda: asyncio.sleep(0.01, "done")))
+        second = asyncio.ensure_future(flight.do("k", lambda: asyncio.sleep(0.01, "other")))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, "done")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from requests.models import Response
+from repo_radar.models.github_token import GitHubToken
+from repo_radar.utils.token_cache import TokenValidationCache
+from repo_radar.api.github_client import GitHubClient
+
+def make_user_response(status_code=200, remaining="4999"):
+    response = MagicMock(spec=Response)
+    response.status_code = status_code
+    response.headers = {
+        "X-OAuth-Scopes": "repo, read:org",
+        "X-RateLimit-Resource": "core",
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": remaining,
+        "X-RateLimit-Reset": str(int(1e10)),
+    }
+    response.json.return_value = {"login": "octocat"}
+    return response
+
+class TestTokenValidationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.cache = TokenValidationCache(ttl=60, clock=lambda: self.now)
+        self.token = GitHubToken("ghp_example")
+
+    def test_result_is_parsed_and_cached(self):
+        validate = MagicMock(return_value=make_user_response())
+        first = self.cache.get_or_validate(self.token, validate)
+        second = self.cache.get_or_validate(self.token, validate)
+
+        self.assertIs(first, second)
+        self.assertEqual(validate.call_count, 1)
+        self.assertEqual(first.login, "octocat")
+        self.assertEqual(first.scopes, ("repo", "read:org"))
+        self.assertEqual(first.rate_limit_resource, "core")
+        self.assertEqual(first.rate_limit_remaining, 4999)
+
+    def test_result_expires_after_ttl(self):
+        validate = MagicMock(return_value=make_user_response())
+        self.cache.get_or_validate(self.token, validate)
+        self.now += 61
+        self.cache.get_or_validate(self.token, validate)
+        self.assertEqual(validate.call_count, 2)
+
+    def test_rate_limited_validation_is_treated_as_valid(self):
+        validate = MagicMock(return_value=make_user_response(status_code=403, remaining="0"))
+        result = self.cache.get_or_validate(self.token, validate)
+        self.assertTrue(result.rate_limited)
+        self.assertIsNone(result.login)
+
+    def test_failures_are_not_cached(self):
+        validate = MagicMock(side_effect=RuntimeError("401"))
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_validate(self.token, validate)
+        validate.side_effect = None
+        validate.return_value = make_user_response()
+        self.cache.get_or_validate(self.token, validate)
+        self.assertEqual(validate.call_count, 2)
+
+    def test_concurrent_lookups_share_one_validation(self):
+        def slow_validate(token):
+            time.sleep(0.05)
+            return make_user_response()
+        validate = MagicMock(side_effect=slow_validate)
+        threads = [
+            threading.Thread(target=self.cache.get_or_validate, args=(self.token, validate))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(validate.call_count, 1)
+
+class TestLazyClientValidation(unittest.IsolatedAsyncioTestCase):
+
+    async def test_client_does_not_validate_on_construction(self):
+        with patch("repo_radar.api.github_api.validate_github_token") as validate:
+            GitHubClient("ghp_example")
+            validate.assert_not_called()
+
+    async def test_client_validates_once_on_first_use(self):
+        cache = TokenValidationCache(ttl=60)
+        validate = MagicMock(return_value=make_user_response())
+        with patch("repo_radar.api.github_client.TOKEN_VALIDATION_CACHE", cache), \
+             patch("repo_radar.api.github_api.validate_github_token", validate):
+            client = GitHubClient("ghp_example")
+            other = GitHubClient("ghp_example")
+            result = await client.ensure_token_validated()
+            await client.ensure_token_validated()
+            await other.ensure_token_validated()
+        self.assertEqual(result.login, "octocat")
+        self.assertEqual(validate.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
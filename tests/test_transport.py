@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+import logging
+from pathlib import Path
+from unittest.mock import patch
+from repo_radar.api.github_client import GitHubClient
+from repo_radar.api.transport import CassetteMiss, Transport, request_key, set_transport
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.utils.token_cache import TokenValidationCache
+from tests.mock_server import MockApiServer, RepoFixture
+
+class TestRequestKey(unittest.TestCase):
+
+    def test_query_parameters_are_merged_and_sorted(self):
+        self.assertEqual(
+            request_key("get", "https://x/a?page=2&per_page=100", {"per_page": 100}),
+            request_key("GET", "https://x/a?per_page=100&page=2&per_page=100"),
+        )
+
+    def test_body_is_part_of_key(self):
+        self.assertNotEqual(
+            request_key("POST", "https://x/graphql", body={"query": "a"}),
+            request_key("POST", "https://x/graphql", body={"query": "b"}),
+        )
+
+class TestRecordReplay(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.cassette_path = Path(tempfile.mkdtemp()) / "run.json.gz"
+        self.url = GitHubUrl(full_url="", org_user="octo", repo="demo")
+        self.addCleanup(set_transport, None)
+
+    async def _crawl(self, api_url: str):
+        with patch("repo_radar.models.github_url.GITHUB_API_URL", api_url), \
+             patch("repo_radar.api.github_api.GITHUB_API_USER_ENDPOINT", f"{api_url}/user"), \
+             patch("repo_radar.api.github_client.TOKEN_VALIDATION_CACHE", TokenValidationCache()):
+            client = GitHubClient("mock-token")
+            languages = await client.get_languages(self.url)
+            commits = await client.get_commits(self.url)
+        return languages.json(), [c for page in commits for c in page.json()]
+
+    async def test_replay_matches_recording_without_network(self):
+        with MockApiServer(default_fixture=RepoFixture(commits=150)) as server:
+            api_url = server.github_url
+            set_transport(Transport("record", self.cassette_path))
+            recorded = await self._crawl(api_url)
+            set_transport(None).close()
+            live_requests = server.request_count
+
+        set_transport(Transport("replay", self.cassette_path))
+        replayed = await self._crawl(api_url)
+
+        self.assertEqual(live_requests, 4)  # /user, languages, 2 commit pages
+        self.assertEqual(replayed, recorded)
+
+    def test_call_results_are_recorded(self):
+        recorder = Transport("record", self.cassette_path)
+        self.assertEqual(recorder.call("llm", "abc", lambda: "summary"), "summary")
+        recorder.close()
+
+        replayer = Transport("replay", self.cassette_path)
+        self.assertEqual(replayer.call("llm", "abc", lambda: self.fail("called")), "summary")
+        with self.assertRaises(CassetteMiss):
+            replayer.call("llm", "missing", lambda: None)
+
+if __name__ == "__main__":
+    unittest.main()
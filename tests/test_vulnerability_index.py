@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from pathlib import Path
+from repo_radar.models.dependency import Dependency
+from repo_radar.services.vulnerability_index import VulnerabilityIndex, cvss3_base_score, severity_counts
+from repo_radar.utils.version_keys import version_key
+
+RECORDS = [
+    {
+        "id": "GHSA-aaaa", "aliases": ["CVE-2023-0001"], "summary": "RCE in Jinja2",
+        "severity": [{"type": "CVSS_V3", "score": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"}],
+        "affected": [{"package": {"ecosystem": "PyPI", "name": "Jinja2"},
+                      "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}, {"fixed": "3.1.3"}]}]}],
+    },
+    {
+        "id": "GHSA-bbbb", "summary": "Prototype pollution", "database_specific": {"severity": "MODERATE"},
+        "affected": [{"package": {"ecosystem": "npm", "name": "lodash"},
+                      "ranges": [{"type": "SEMVER", "events": [{"introduced": "4.0.0"}, {"last_affected": "4.17.20"}]}]}],
+    },
+    {
+        "id": "PYSEC-cccc", "aliases": ["CVE-2023-0003"],
+        "affected": [{"package": {"ecosystem": "PyPI", "name": "flask"}, "versions": ["2.2.0", "2.2.1"]}],
+    },
+    {"id": "GHSA-withdrawn", "withdrawn": "2024-01-01T00:00:00Z", "affected": []},
+]
+
+class TestVersionKey(unittest.TestCase):
+
+    def test_ordering(self):
+        ordered = ["0.9", "1.0.dev1", "1.0a1", "1.0b2", "1.0rc1", "1.0", "1.0.post1", "1.0.1", "1.10", "2.0.0-alpha.1", "2.0.0", "v2.0.1"]
+        keys = [version_key(v, "PyPI") for v in ordered]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_equivalent_versions(self):
+        self.assertEqual(version_key("1.0.0"), version_key("v1"))
+        self.assertIsNone(version_key("latest"))
+
+class TestVulnerabilityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = VulnerabilityIndex(Path(tempfile.mkdtemp()) / "osv.sqlite")
+        self.addCleanup(self.index.close)
+        self.assertEqual(self.index.import_records(RECORDS), 3)
+
+    def test_cvss3_base_score(self):
+        self.assertEqual(cvss3_base_score("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"), 9.8)
+        self.assertEqual(cvss3_base_score("CVSS:3.1/AV:N/AC:L/PR:L/UI:N/S:C/C:L/I:L/A:N"), 6.4)
+        self.assertIsNone(cvss3_base_score("CVSS:4.0/AV:N"))
+
+    def test_bulk_match(self):
+        deps = [
+            Dependency("PyPI", "jinja2", "3.1.2", manifest="uv.lock"),
+            Dependency("PyPI", "Jinja2", "3.1.2", manifest="requirements.txt"),
+            Dependency("PyPI", "jinja2", "3.1.3", manifest="other/uv.lock"),
+            Dependency("npm", "lodash", "4.17.20", manifest="package.json"),
+            Dependency("npm", "lodash", "4.17.21", manifest="package.json"),
+            Dependency("PyPI", "flask", "2.2.1", manifest="requirements.txt"),
+            Dependency("PyPI", "flask", "2.2.2", manifest="requirements.txt"),
+            Dependency("PyPI", "requests", None, ">=2", "requirements.txt"),
+        ]
+        matches = self.index.match(deps)
+        found = [(m.vuln_id, m.package, m.version, m.severity) for m in matches]
+        self.assertEqual(found, [
+            ("GHSA-aaaa", "jinja2", "3.1.2", "CRITICAL"),
+            ("GHSA-bbbb", "lodash", "4.17.20", "MEDIUM"),
+            ("PYSEC-cccc", "flask", "2.2.1", "UNKNOWN"),
+        ])
+        self.assertEqual(matches[0].manifests, ("requirements.txt", "uv.lock"))
+        self.assertEqual(matches[0].cve_ids(), ("CVE-2023-0001",))
+        self.assertEqual(severity_counts(matches)["CRITICAL"], 1)
+
+    def test_reimport_replaces_ranges(self):
+        fixed = dict(RECORDS[0])
+        fixed["affected"] = [{"package": {"ecosystem": "PyPI", "name": "jinja2"},
+                              "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}, {"fixed": "3.0.0"}]}]}]
+        self.index.import_records([fixed])
+        self.assertEqual(self.index.match([Dependency("PyPI", "jinja2", "3.1.2")]), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from repo_radar.api.transport import build_response
+from repo_radar.models.github_url import GitHubUrl
+from repo_radar.models.repo_state import RepoSnapshot
+from repo_radar.services.repo_state import RepoStateStore
+from repo_radar.services.watch_scheduler import WatchScheduler
+from repo_radar.utils.priority_lanes import current_priority
+
+HOUR = 3600
+
+class FakeRateManager:
+    def __init__(self, limit=5000, remaining=5000, reset_time=HOUR):
+        self.limit, self.remaining, self.reset_time = limit, remaining, reset_time
+
+class FakeClient:
+    """Answers the three refresh calls; each call costs one request of the fake rate limit."""
+    def __init__(self, pushed_at):
+        self.rate_manager = FakeRateManager()
+        self.pushed_at = pushed_at
+        self.calls = []
+        self.lanes = []
+
+    def _response(self, payload, status=200):
+        self.rate_manager.remaining -= 1
+        return build_response(status, {}, json.dumps(payload).encode())
+
+    async def get_repository(self, url):
+        self.calls.append(url.repo)
+        self.lanes.append(current_priority())
+        return self._response({"default_branch": "main", "pushed_at": self.pushed_at[url.repo]})
+
+    async def get_languages(self, url):
+        return self._response({"Python": 100})
+
+    async def get_stats(self, url, kind):
+        return self._response([{"total": 2}] * 52)
+
+class TestWatchScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.store = RepoStateStore(Path(tempfile.mkdtemp()) / "state.json")
+        self.repos = [GitHubUrl("", "octo", "hot"), GitHubUrl("", "octo", "cold")]
+
+    def scheduler(self, client, **kwargs):
+        async def sleep(seconds):
+            self.now += seconds
+        return WatchScheduler(client, self.store, self.repos, clock=lambda: self.now, sleep=sleep, **kwargs)
+
+    def test_interval_follows_push_age(self):
+        scheduler = self.scheduler(FakeClient({}))
+        self.assertEqual(scheduler.interval_for(RepoSnapshot("r", 10 * HOUR, pushed_at=10 * HOUR - 60)), 300)
+        self.assertEqual(scheduler.interval_for(RepoSnapshot("r", 100 * HOUR, pushed_at=0)), 10 * HOUR)
+        self.assertEqual(scheduler.interval_for(RepoSnapshot("r", 0)), 86400)
+
+    def test_budget_is_paced_across_the_window(self):
+        scheduler = self.scheduler(FakeClient({}), budget_share=0.1)  # 500 requests per hour
+        self.assertEqual(scheduler.budget_delay(0), 0)
+        scheduler._spent = 250  # half the budget spent at the start of the window
+        self.assertAlmostEqual(scheduler.budget_delay(0), 250 / 500 * HOUR)
+        scheduler._spent = 499
+        self.assertEqual(scheduler.budget_delay(600), HOUR - 600)  # wait for the reset
+
+    def test_hot_repos_refresh_more_often_within_budget(self):
+        client = FakeClient({"hot": "1970-01-01T00:00:00Z", "cold": "1969-12-01T00:00:00Z"})
+        scheduler = self.scheduler(client, budget_share=0.05, min_interval=60)
+        asyncio.run(scheduler.run(max_refreshes=12))
+        self.assertEqual(client.calls[:2], ["hot", "cold"])
+        self.assertGreater(client.calls.count("hot"), client.calls.count("cold"))
+        spent = 5000 - client.rate_manager.remaining
+        self.assertLessEqual(spent, 5000 * 0.05)
+        self.assertAlmostEqual(scheduler.cost_estimate, 3.0)
+        saved = RepoStateStore(self.store.path).get("octo/hot")
+        self.assertEqual((saved.languages, saved.recent_commits), ({"Python": 100}, 8))
+
+    def test_webhook_repos_are_reconciled_first_and_keep_their_events(self):
+        self.store.put(RepoSnapshot("octo/hot", 0.0, pushed_at=0.0))
+        self.store.put(RepoSnapshot("octo/cold", 0.0, issues_opened=[1.0], events_since=0.0, reconcile=True))
+        scheduler = self.scheduler(FakeClient({"hot": "1970-01-01T00:00:00Z", "cold": "1970-01-01T00:00:00Z"}))
+        self.assertEqual(scheduler.next_repo(0.0)[0].repo, "cold")
+        asyncio.run(scheduler.run(max_refreshes=1))
+        cold = self.store.get("octo/cold")
+        self.assertEqual((cold.issues_opened, cold.reconcile, cold.dirty), ([1.0], False, True))
+        self.assertEqual(scheduler.interval_for(cold), 86400)
+
+    def test_refresh_keeps_events_that_arrive_while_fetching(self):
+        client = FakeClient({"hot": "1970-01-01T00:00:00Z"})
+        fetch = client.get_languages
+
+        async def get_languages(url):
+            self.store.update("octo/hot", lambda s: s.issues_opened.append(5.0))  # a webhook delivery meanwhile
+            return await fetch(url)
+        client.get_languages = get_languages
+        snapshot = asyncio.run(self.scheduler(client).refresh(self.repos[0]))
+        self.assertIs(self.store.get("octo/hot"), snapshot)
+        self.assertEqual((snapshot.issues_opened, snapshot.recent_commits, snapshot.dirty), ([5.0], 8, True))
+
+    def test_failed_refresh_waits_its_interval(self):
+        self.store.put(RepoSnapshot("octo/hot", 0.0, issues_opened=[1.0], reconcile=True))
+        client = FakeClient({})  # no pushed_at, so fetching the repository fails
+        self.now = 50.0
+        asyncio.run(self.scheduler(client).run(max_refreshes=1))
+        hot = self.store.get("octo/hot")
+        self.assertEqual((hot.refreshed_at, hot.reconcile, hot.issues_opened), (50.0, False, [1.0]))
+
+    def test_on_demand_refresh_goes_in_the_interactive_lane(self):
+        client = FakeClient({"hot": "1969-12-31T00:00:00Z", "cold": "1969-12-01T00:00:00Z"})
+
+        async def sleep(seconds):
+            self.now += seconds
+            await asyncio.sleep(0.01)
+        scheduler = WatchScheduler(client, self.store, self.repos, clock=lambda: self.now, sleep=sleep)
+        self.assertIsNone(scheduler.request_refresh("octo/hot"))  # not running
+
+        async def watch_and_refresh():
+            watching = asyncio.ensure_future(scheduler.run())
+            await asyncio.sleep(0.05)
+            self.assertIsNone(await asyncio.to_thread(scheduler.request_refresh, "octo/missing"))
+            pending = await asyncio.to_thread(scheduler.request_refresh, "OCTO/Hot")
+            snapshot = await asyncio.wrap_future(pending)
+            watching.cancel()
+            await asyncio.gather(watching, return_exceptions=True)
+            return snapshot
+        snapshot = asyncio.run(watch_and_refresh())
+        self.assertEqual((client.calls, client.lanes), (["hot", "cold", "hot"], ["backfill", "backfill", "interactive"]))
+        self.assertIs(self.store.get("octo/hot"), snapshot)
+        self.assertIsNone(scheduler.request_refresh("octo/hot"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import hashlib
+import hmac
+import json
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from http import HTTPStatus
+from pathlib import Path
+from repo_radar.services.repo_state import RepoStateStore
+from repo_radar.services.webhooks import WebhookReceiver, WebhookServer, apply_event, verify_signature
+
+SECRET = "It's a Secret to Everybody"
+NOW = 1_700_000_000.0
+REPOSITORY = {"full_name": "octo/widgets", "default_branch": "main", "open_issues_count": 7, "pushed_at": NOW - 5}
+
+# Trimmed payloads as GitHub delivers them, replayed in order
+DELIVERIES = [
+    ("push", {"ref": "refs/heads/main", "repository": REPOSITORY,
+              "commits": [{"id": "a", "distinct": True}, {"id": "b", "distinct": True}, {"id": "c", "distinct": False}]}),
+    ("push", {"ref": "refs/heads/feature", "repository": REPOSITORY, "commits": [{"id": "d"}]}),
+    ("issues", {"action": "opened", "repository": REPOSITORY, "issue": {"created_at": "2023-11-14T22:00:00Z"}}),
+    ("issues", {"action": "opened", "repository": REPOSITORY, "issue": {"created_at": "2023-11-14T22:05:00Z"}}),
+    ("issues", {"action": "closed", "repository": REPOSITORY, "issue": {"closed_at": "2023-11-14T22:10:00Z"}}),
+    ("pull_request", {"action": "opened", "repository": REPOSITORY, "pull_request": {"created_at": "2023-11-14T22:00:00Z"}}),
+    ("pull_request", {"action": "closed", "repository": REPOSITORY,
+                      "pull_request": {"merged": True, "merged_at": "2023-11-14T22:11:00Z"}}),
+    ("pull_request", {"action": "closed", "repository": REPOSITORY, "pull_request": {"merged": False}}),
+]
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+class TestWebhooks(unittest.TestCase):
+
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "state.json"
+        self.store = RepoStateStore(self.path)
+
+    def test_verify_signature(self):
+        # Example from GitHub's webhook documentation
+        self.assertTrue(verify_signature(
+            SECRET, b"Hello, World!",
+            "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17",
+        ))
+        self.assertFalse(verify_signature(SECRET, b"Hello, World?", sign(b"Hello, World!")))
+        self.assertFalse(verify_signature(SECRET, b"Hello, World!", None))
+
+    def test_replayed_events_update_snapshot(self):
+        for event, payload in DELIVERIES:
+            self.assertEqual(apply_event(self.store, event, payload, NOW), "octo/widgets")
+        snapshot = self.store.get("octo/widgets")
+        self.assertTrue(snapshot.dirty and snapshot.reconcile)
+        self.assertIsNone(snapshot.recent_commits)  # unknown until reconciled, never guessed
+        self.assertEqual((snapshot.open_issues, snapshot.pushed_at), (7, NOW - 5))
+        self.assertEqual(self.store.activity(["octo/widgets"], NOW), {
+            "issues_opened": 2, "issues_closed": 1, "pulls_opened": 1, "pulls_merged": 1, "covered_since": int(NOW),
+        })
+        self.assertEqual(self.store.dirty(), ["octo/widgets"])
+        self.store.mark_clean(["octo/widgets"])
+        self.assertEqual(self.store.dirty(), [])
+
+    def test_push_adds_to_known_commit_count(self):
+        self.store.update("octo/widgets", lambda s: setattr(s, "recent_commits", 10))
+        apply_event(self.store, *DELIVERIES[0], NOW)
+        apply_event(self.store, *DELIVERIES[1], NOW)
+        self.assertEqual(self.store.get("octo/widgets").recent_commits, 12)
+
+    def test_old_activity_is_pruned_and_unknown_events_ignored(self):
+        opened = {"action": "opened", "repository": REPOSITORY, "issue": {}}
+        apply_event(self.store, "issues", opened, NOW)
+        apply_event(self.store, "issues", opened, NOW + 31 * 86400)
+        self.assertEqual(self.store.get("octo/widgets").issues_opened, [NOW + 31 * 86400])
+        self.assertIsNone(apply_event(self.store, "star", {"repository": REPOSITORY}, NOW))
+        self.assertIsNone(self.store.activity(["octo/other"], NOW))
+
+    def test_receiver_checks_signature_and_deduplicates(self):
+        receiver = WebhookReceiver(self.store, SECRET, clock=lambda: NOW)
+        body = json.dumps(DELIVERIES[2][1]).encode()
+        self.assertEqual(receiver.handle("issues", "1", sign(body, "wrong"), body), HTTPStatus.UNAUTHORIZED)
+        self.assertEqual(receiver.handle("issues", "1", sign(body), body), HTTPStatus.ACCEPTED)
+        self.assertEqual(receiver.handle("issues", "1", sign(body), body), HTTPStatus.OK)
+        self.assertEqual(receiver.handle("issues", "2", sign(b"{"), b"{"), HTTPStatus.BAD_REQUEST)
+        self.assertEqual(len(self.store.get("octo/widgets").issues_opened), 1)
+
+    def test_receiver_rejects_unreadable_times_without_recording_the_delivery(self):
+        receiver = WebhookReceiver(self.store, SECRET, clock=lambda: NOW)
+        bad = json.dumps({"action": "opened", "repository": REPOSITORY, "issue": {"created_at": "not-a-date"}}).encode()
+        self.assertEqual(receiver.handle("issues", "9", sign(bad), bad), HTTPStatus.BAD_REQUEST)
+        self.assertIsNone(self.store.get("octo/widgets"))
+        body = json.dumps(DELIVERIES[2][1]).encode()
+        self.assertEqual(receiver.handle("issues", "9", sign(body), body), HTTPStatus.ACCEPTED)
+        self.assertEqual(len(self.store.get("octo/widgets").issues_opened), 1)
+
+    def test_server_applies_posted_payloads_and_saves(self):
+        with WebhookServer(self.store, SECRET, port=0, clock=lambda: NOW) as server:
+            host, port = server.address
+            for i, (event, payload) in enumerate(DELIVERIES):
+                body = json.dumps(payload).encode()
+                request = urllib.request.Request(f"http://{host}:{port}/webhook", data=body, headers={
+                    "X-GitHub-Event": event, "X-GitHub-Delivery": str(i), "X-Hub-Signature-256": sign(body),
+                })
+                with urllib.request.urlopen(request) as response:
+                    self.assertEqual(response.status, HTTPStatus.ACCEPTED)
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(urllib.request.Request(f"http://{host}:{port}/webhook", data=b"{}"))
+            self.assertEqual(ctx.exception.code, HTTPStatus.UNAUTHORIZED)
+
+        saved = RepoStateStore(self.path).get("octo/widgets")
+        self.assertEqual((len(saved.issues_opened), len(saved.pulls_merged), saved.dirty), (2, 1, True))
+
+if __name__ == "__main__":
+    unittest.main()